@@ -6,4 +6,29 @@ def optimal_params(n: int, p: float) -> tuple[int, int]:
         raise ValueError("fp rate must be in (0,1)")
     m = math.ceil(-(n * math.log(p)) / (math.log(2) ** 2))
     k = math.ceil((m / n) * math.log(2))
-    return m, max(k, 1)
\ No newline at end of file
+    return m, max(k, 1)
+
+
+def false_positive_rate(m: int, n: int, k: int) -> float:
+    """Expected FPR of a standard Bloom filter with m bits, n keys and k hashes."""
+    return (1 - math.exp(-k * n / m)) ** k
+
+
+def blocked_false_positive_rate(m: int, n: int, k: int, block_bits: int = 512) -> float:
+    """Expected FPR of a blocked Bloom filter: keys per block are Poisson(n*B/m)."""
+    lam = n * block_bits / m
+    total, j, pj = 0.0, 0, math.exp(-lam)
+    while j < lam + 12 * math.sqrt(lam) + 12:
+        total += pj * (1 - (1 - 1 / block_bits) ** (k * j)) ** k
+        j += 1
+        pj *= lam / j
+    return total
+
+
+def cuckoo_false_positive_rate(load: float, fingerprint_bits: int, bucket_size: int = 4) -> float:
+    """Expected FPR of a cuckoo filter: 2 buckets of occupied slots, each a 2**-f match."""
+    return 1 - (1 - 2.0 ** -fingerprint_bits) ** (2 * bucket_size * load)
+
+
+def xor_false_positive_rate(fingerprint_bits: int) -> float:
+    return 2.0 ** -fingerprint_bits
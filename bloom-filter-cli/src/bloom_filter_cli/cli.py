@@ -1,6 +1,11 @@
+from pathlib import Path
+from typing import List, Optional
+
 import typer
 from rich.console import Console
+from rich.table import Table
 from bloom_filter_cli import calculator, simulator
+from bloom_filter_cli.hashing import keys_from_strings
 
 app = typer.Typer(help="Bloom filter sizing and simulation toolkit")
 console = Console()
@@ -12,6 +17,39 @@ def size(elements: int, fp: float = 0.01):
     console.print(f"m={m} bits, k={k} hashes, fp≈{fp}")
 
 @app.command()
-def simulate(config: str):
-    """Run Monte-Carlo simulation from YAML config."""
-    console.print(simulator.run(config))
\ No newline at end of file
+def simulate(
+    config: str,
+    stream: Optional[Path] = typer.Option(None, "--stream", help="Insert the lines of this file instead of random keys"),
+    filters: Optional[List[str]] = typer.Option(None, "--filter", help="bloom, blocked, cuckoo or xor (repeatable)"),
+):
+    """Measure FPR, throughput and bits/key of each filter for a YAML config."""
+    cfg = simulator.load_config(config)
+    keys = None
+    if stream:
+        with open(stream, encoding="utf-8") as f:
+            keys = keys_from_strings(line.rstrip("\n") for line in f if line.strip())
+    results = simulator.simulate(
+        cfg["elements"],
+        int(cfg["m"]),
+        int(cfg["k"]),
+        filters=filters or cfg.get("filters", simulator.FILTERS),
+        probes=cfg.get("probes"),
+        keys=keys,
+        fingerprint_bits=cfg.get("fingerprint_bits"),
+        batch=cfg.get("batch", simulator.BATCH_SIZE),
+        seed=cfg.get("seed", 0),
+    )
+    table = Table(title=f"n={len(keys) if keys is not None else cfg['elements']:,} m={cfg['m']:,} k={cfg['k']}")
+    for col in ("filter", "bits/key", "measured fp", "expected fp", "insert M/s", "lookup M/s", "false neg"):
+        table.add_column(col, justify="left" if col == "filter" else "right")
+    for r in results:
+        table.add_row(
+            r.name,
+            f"{r.bits_per_key:.2f}",
+            f"{r.measured_fp:.6f}",
+            f"{r.estimated_fp:.6f}",
+            f"{r.insert_rate / 1e6:.2f}",
+            f"{r.lookup_rate / 1e6:.2f}",
+            str(r.false_negatives) + (f" ({r.failed_inserts} unplaced)" if r.failed_inserts else ""),
+        )
+    console.print(table)
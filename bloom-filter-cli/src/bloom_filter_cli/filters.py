@@ -0,0 +1,296 @@
+"""Approximate-membership filters over batches of uint64 keys.
+
+Every filter exposes `add(keys)` (or a static `build(keys)` for xor),
+`contains(keys) -> bool array` and `size_bits`. Hashing and probing are
+numpy-vectorized across the whole batch; only cuckoo eviction chains, which
+are rare below ~95% load, fall back to a Python loop.
+"""
+import math
+from typing import Optional
+
+import numpy as np
+
+from .hashing import double_hash, mix64
+
+_U64 = np.uint64
+_ONE = _U64(1)
+_SIX = _U64(6)
+_LOW6 = _U64(63)
+
+
+def _set_bits(words: np.ndarray, bit_idx: np.ndarray) -> None:
+    """words |= 1 << bit_idx for a batch of bit positions.
+
+    Sorting and OR-reducing per word is several times faster than
+    np.bitwise_or.at on large batches.
+    """
+    bit_idx = np.sort(bit_idx.ravel())
+    word_idx = bit_idx >> _SIX
+    masks = _ONE << (bit_idx & _LOW6)
+    starts = np.flatnonzero(np.r_[True, word_idx[1:] != word_idx[:-1]])
+    words[word_idx[starts]] |= np.bitwise_or.reduceat(masks, starts)
+
+
+def _test_bits(words: np.ndarray, bit_idx: np.ndarray) -> np.ndarray:
+    return ((words[bit_idx >> _SIX] >> (bit_idx & _LOW6)) & _ONE).astype(bool)
+
+
+class BloomFilter:
+    """Standard Bloom filter with k probes from double hashing: h1 + i*h2 mod m."""
+
+    name = "bloom"
+
+    def __init__(self, m: int, k: int, seed: int = 0):
+        self.m = m
+        self.k = k
+        self.seed = seed
+        self.words = np.zeros((m + 63) // 64, dtype=_U64)
+
+    @property
+    def size_bits(self) -> int:
+        return self.m
+
+    def _positions(self, keys: np.ndarray) -> np.ndarray:
+        h1, h2 = double_hash(keys, self.seed)
+        m = _U64(self.m)
+        i = np.arange(self.k, dtype=_U64)[:, None]
+        with np.errstate(over="ignore"):
+            return (h1[None, :] + i * h2[None, :]) % m
+
+    def add(self, keys: np.ndarray) -> None:
+        _set_bits(self.words, self._positions(keys))
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        return _test_bits(self.words, self._positions(keys)).all(axis=0)
+
+
+class BlockedBloomFilter:
+    """
+    Cache-blocked Bloom filter: each key maps to one 512-bit block (a cache
+    line) and sets k bits inside it, so a lookup touches a single line.
+    Costs a slightly higher FPR than a standard filter of the same size.
+    """
+
+    name = "blocked"
+    BLOCK_BITS = 512
+
+    def __init__(self, m: int, k: int, seed: int = 0):
+        self.blocks = max(1, math.ceil(m / self.BLOCK_BITS))
+        self.k = k
+        self.seed = seed
+        self.words = np.zeros(self.blocks * self.BLOCK_BITS // 64, dtype=_U64)
+
+    @property
+    def size_bits(self) -> int:
+        return self.blocks * self.BLOCK_BITS
+
+    def _positions(self, keys: np.ndarray) -> np.ndarray:
+        h = mix64(keys, self.seed)
+        base = (h % _U64(self.blocks)) * _U64(self.BLOCK_BITS)
+        # Double hashing inside a 512-bit block correlates probes, so each
+        # probe takes its own 9 bits: 7 per 64-bit hash, rehashing as needed.
+        offsets = np.empty((self.k, len(keys)), dtype=_U64)
+        for i in range(self.k):
+            if i % 7 == 0:
+                h = mix64(h, self.seed + 1 + i)
+            offsets[i] = (h >> _U64(9 * (i % 7))) & _U64(self.BLOCK_BITS - 1)
+        return base[None, :] + offsets
+
+    def add(self, keys: np.ndarray) -> None:
+        _set_bits(self.words, self._positions(keys))
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        return _test_bits(self.words, self._positions(keys)).all(axis=0)
+
+
+class CuckooFilter:
+    """
+    Cuckoo filter (partial-key cuckoo hashing) with 4-slot buckets and
+    `fingerprint_bits`-bit fingerprints; 0 marks an empty slot. The alternate
+    bucket is (hash(fp) - i) mod buckets, an involution for any bucket count.
+    """
+
+    name = "cuckoo"
+    BUCKET_SIZE = 4
+    MAX_KICKS = 500
+
+    def __init__(self, capacity: int, fingerprint_bits: int = 16, load: float = 0.95, seed: int = 0):
+        if not 1 <= fingerprint_bits <= 16:
+            raise ValueError("fingerprint_bits must be in [1, 16]")
+        wanted = max(1, math.ceil(capacity / (self.BUCKET_SIZE * load)))
+        self.buckets = wanted
+        self.fingerprint_bits = fingerprint_bits
+        self.seed = seed
+        dtype = np.uint8 if fingerprint_bits <= 8 else np.uint16
+        self.table = np.zeros((self.buckets, self.BUCKET_SIZE), dtype=dtype)
+        self.fill = np.zeros(self.buckets, dtype=np.int64)
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def size_bits(self) -> int:
+        return self.buckets * self.BUCKET_SIZE * self.fingerprint_bits
+
+    def _alt(self, index: np.ndarray, fp: np.ndarray) -> np.ndarray:
+        nb = _U64(self.buckets)
+        return (mix64(fp.astype(_U64), self.seed + 7) % nb + nb - index) % nb
+
+    def _hash(self, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        h = mix64(keys, self.seed)
+        fp = (h >> _U64(64 - self.fingerprint_bits)).astype(self.table.dtype)
+        fp[fp == 0] = 1
+        i1 = h % _U64(self.buckets)
+        return fp, i1, self._alt(i1, fp)
+
+    def _place(self, idx: np.ndarray, fp: np.ndarray) -> np.ndarray:
+        """Put each fp into a free slot of its bucket where one remains; returns the placed mask."""
+        order = np.argsort(idx, kind="stable")
+        b = idx[order].astype(np.int64)
+        first = np.r_[0, np.flatnonzero(b[1:] != b[:-1]) + 1]
+        group_start = np.repeat(first, np.diff(np.r_[first, len(b)]))
+        rank = np.arange(len(b)) - group_start
+        slot = self.fill[b] + rank
+        ok = slot < self.BUCKET_SIZE
+        self.table[b[ok], slot[ok]] = fp[order][ok]
+        self.fill += np.bincount(b[ok], minlength=self.buckets)
+        placed = np.zeros(len(idx), dtype=bool)
+        placed[order[ok]] = True
+        return placed
+
+    def add(self, keys: np.ndarray) -> int:
+        """Insert a batch; returns how many keys did not fit (filter full)."""
+        fp, i1, i2 = self._hash(keys)
+        left = ~self._place(i1, fp)
+        rest = np.flatnonzero(left)
+        left[rest[self._place(i2[rest], fp[rest])]] = False
+        rest = np.flatnonzero(left)
+        failed = self._evict(i2[rest], fp[rest])
+        self.count += len(keys) - failed
+        return failed
+
+    def _evict(self, index: np.ndarray, fp: np.ndarray) -> int:
+        """
+        Cuckoo eviction for keys whose buckets are both full, run as parallel
+        random walks: each round, one homeless fingerprint per bucket swaps
+        with a random resident, and the evicted residents try their
+        alternate buckets. Returns how many remain homeless.
+        """
+        for _ in range(self.MAX_KICKS):
+            if not len(fp):
+                return 0
+            _, first = np.unique(index, return_index=True)
+            waiting = np.ones(len(fp), dtype=bool)
+            waiting[first] = False
+            b = index[first].astype(np.int64)
+            slot = self._rng.integers(self.BUCKET_SIZE, size=len(b))
+            victims = self.table[b, slot].copy()
+            self.table[b, slot] = fp[first]
+            alt = self._alt(b.astype(_U64), victims)
+            homeless = ~self._place(alt, victims)
+            index = np.concatenate([index[waiting], alt[homeless]])
+            fp = np.concatenate([fp[waiting], victims[homeless]])
+        return len(fp)
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        fp, i1, i2 = self._hash(keys)
+        fp = fp[:, None]
+        return (self.table[i1] == fp).any(axis=1) | (self.table[i2] == fp).any(axis=1)
+
+
+class XorFilter:
+    """
+    Static xor filter (Graf & Lemire): 3 hash slots per key in a table of
+    ~1.23n fingerprints; a key is present iff the xor of its slots equals
+    its fingerprint. Built by hypergraph peeling, vectorized per round.
+    """
+
+    name = "xor"
+    MAX_ATTEMPTS = 20
+
+    def __init__(self, fingerprint_bits: int = 8):
+        if fingerprint_bits not in (8, 16):
+            raise ValueError("fingerprint_bits must be 8 or 16")
+        self.fingerprint_bits = fingerprint_bits
+        self.dtype = np.uint8 if fingerprint_bits == 8 else np.uint16
+        self.seed = 0
+        self.segment = 1
+        self.table = np.zeros(3, dtype=self.dtype)
+
+    @property
+    def size_bits(self) -> int:
+        return len(self.table) * self.fingerprint_bits
+
+    def _slots(self, h: np.ndarray) -> np.ndarray:
+        seg = _U64(self.segment)
+        with np.errstate(over="ignore"):
+            r = [h, (h << _U64(21)) | (h >> _U64(43)), (h << _U64(42)) | (h >> _U64(22))]
+        return np.stack([(x % seg) + _U64(i * self.segment) for i, x in enumerate(r)]).astype(np.int64)
+
+    def _fingerprint(self, h: np.ndarray) -> np.ndarray:
+        return (h ^ (h >> _U64(32))).astype(self.dtype)
+
+    @classmethod
+    def build(cls, keys: np.ndarray, fingerprint_bits: int = 8, seed: int = 0) -> "XorFilter":
+        f = cls(fingerprint_bits)
+        keys = np.unique(keys.astype(_U64))
+        f.segment = math.ceil(1.23 * len(keys) / 3) + 11
+        for attempt in range(cls.MAX_ATTEMPTS):
+            f.seed = seed + attempt
+            if f._try_build(keys):
+                return f
+        raise RuntimeError("xor filter construction failed; keys may not be distinct")
+
+    def _try_build(self, keys: np.ndarray) -> bool:
+        h = mix64(keys, self.seed)
+        slots = self._slots(h)  # (3, n)
+        size = 3 * self.segment
+        n = len(keys)
+        alive = np.ones(n, dtype=bool)
+        rounds = []  # (key ids, their singleton slot) in peel order
+        counts = np.zeros(size, dtype=np.int64)
+        ids_xor = np.zeros(size, dtype=np.int64)
+        for r in range(3):
+            counts += np.bincount(slots[r], minlength=size)
+            np.bitwise_xor.at(ids_xor, slots[r], np.arange(n))
+        remaining = n
+        while remaining:
+            single = np.flatnonzero(counts == 1)
+            if not len(single):
+                return False
+            ids, first = np.unique(ids_xor[single], return_index=True)
+            ids = ids[alive[ids]]
+            if not len(ids):
+                return False
+            # One singleton slot per peeled key.
+            slot_of = dict(zip(ids_xor[single[first]].tolist(), single[first].tolist()))
+            rounds.append((ids, np.array([slot_of[i] for i in ids.tolist()], dtype=np.int64)))
+            alive[ids] = False
+            remaining -= len(ids)
+            for r in range(3):
+                s = slots[r, ids]
+                np.subtract.at(counts, s, 1)
+                np.bitwise_xor.at(ids_xor, s, ids)
+        table = np.zeros(size, dtype=self.dtype)
+        fps = self._fingerprint(h)
+        for ids, own in reversed(rounds):
+            s = slots[:, ids]
+            acc = fps[ids] ^ table[s[0]] ^ table[s[1]] ^ table[s[2]]
+            table[own] = acc  # own slot is still 0, so it drops out of the xor
+        self.table = table
+        return True
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        h = mix64(keys, self.seed)
+        s = self._slots(h)
+        return (self.table[s[0]] ^ self.table[s[1]] ^ self.table[s[2]]) == self._fingerprint(h)
+
+
+def make_filter(kind: str, n: int, m: int, k: int, fingerprint_bits: Optional[int] = None, seed: int = 0):
+    """Construct an empty dynamic filter of `kind` sized for n keys (xor is built separately)."""
+    if kind == "bloom":
+        return BloomFilter(m, k, seed)
+    if kind == "blocked":
+        return BlockedBloomFilter(m, k, seed)
+    if kind == "cuckoo":
+        return CuckooFilter(n, fingerprint_bits or 16, seed=seed)
+    raise ValueError(f"Unknown filter kind: {kind}")
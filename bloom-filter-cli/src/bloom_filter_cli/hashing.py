@@ -0,0 +1,29 @@
+"""Vectorized 64-bit hashing of key batches (uint64 numpy arrays)."""
+import hashlib
+from typing import Iterable
+
+import numpy as np
+
+_U64 = np.uint64
+
+
+def mix64(x: np.ndarray, seed: int = 0) -> np.ndarray:
+    """splitmix64 finalizer over a uint64 array (wrapping arithmetic)."""
+    with np.errstate(over="ignore"):
+        z = x.astype(_U64, copy=False) + _U64((0x9E3779B97F4A7C15 * (seed + 1)) & 0xFFFFFFFFFFFFFFFF)
+        z = (z ^ (z >> _U64(30))) * _U64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> _U64(27))) * _U64(0x94D049BB133111EB)
+        return z ^ (z >> _U64(31))
+
+
+def double_hash(keys: np.ndarray, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Two independent 64-bit hashes for Kirsch-Mitzenmacher double hashing; h2 is odd."""
+    h1 = mix64(keys, seed)
+    h2 = mix64(h1, seed + 1) | _U64(1)
+    return h1, h2
+
+
+def keys_from_strings(items: Iterable[str]) -> np.ndarray:
+    """Stable 64-bit keys for arbitrary strings (blake2b, 8-byte digest)."""
+    digests = b"".join(hashlib.blake2b(s.encode(), digest_size=8).digest() for s in items)
+    return np.frombuffer(digests, dtype="<u8").astype(_U64)
@@ -1,17 +1,158 @@
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional, Sequence
+
 import numpy as np
 import yaml
 
-def run(config_path: str) -> str:
-    """Execute simulation and return summary."""
+from . import calculator
+from .filters import XorFilter, make_filter
+
+FILTERS = ("bloom", "blocked", "cuckoo", "xor")
+BATCH_SIZE = 1 << 20
+_TOP_BIT = np.uint64(1 << 63)
+
+
+@dataclass
+class FilterResult:
+    name: str
+    size_bits: int
+    bits_per_key: float
+    insert_rate: float  # keys/s
+    lookup_rate: float  # probes/s
+    measured_fp: float
+    estimated_fp: float
+    false_negatives: int
+    failed_inserts: int
+
+
+def _batches(n: int, seed: int, batch: int, probe: bool) -> Iterator[np.ndarray]:
+    """Deterministic random keys; inserted keys have the top bit clear, probes set."""
+    rng = np.random.default_rng([seed, int(probe)])
+    for start in range(0, n, batch):
+        keys = rng.integers(0, 1 << 63, size=min(batch, n - start), dtype=np.uint64)
+        yield keys | _TOP_BIT if probe else keys
+
+
+def _split(keys: np.ndarray, batch: int) -> Iterator[np.ndarray]:
+    for start in range(0, len(keys), batch):
+        yield keys[start : start + batch]
+
+
+def _estimated_fp(f, n: int, k: int) -> float:
+    if f.name == "bloom":
+        return calculator.false_positive_rate(f.size_bits, n, k)
+    if f.name == "blocked":
+        return calculator.blocked_false_positive_rate(f.size_bits, n, k, f.BLOCK_BITS)
+    if f.name == "cuckoo":
+        return calculator.cuckoo_false_positive_rate(f.count / (f.buckets * f.BUCKET_SIZE), f.fingerprint_bits)
+    return calculator.xor_false_positive_rate(f.fingerprint_bits)
+
+
+def simulate(
+    n: int,
+    m: int,
+    k: int,
+    filters: Sequence[str] = FILTERS,
+    probes: Optional[int] = None,
+    keys: Optional[np.ndarray] = None,
+    fingerprint_bits: Optional[int] = None,
+    batch: int = BATCH_SIZE,
+    seed: int = 0,
+) -> list[FilterResult]:
+    """
+    Insert n keys into each filter, then measure false negatives on the
+    inserted keys and the empirical FPR on a disjoint probe set.
+
+    Keys are random unless `keys` (e.g. hashed real data) is given; either
+    way they are processed in batches of `batch` so memory stays bounded
+    (except for xor, which is static and needs all keys at once).
+    """
+    if keys is not None:
+        keys = np.unique(keys)
+        n = len(keys)
+    probes = probes or n
+
+    def inserted() -> Iterator[np.ndarray]:
+        return _split(keys, batch) if keys is not None else _batches(n, seed, batch, False)
+
+    def probe_set() -> Iterator[np.ndarray]:
+        for p in _batches(probes, seed, batch, True):
+            yield p[~np.isin(p, keys)] if keys is not None else p
+
+    results = []
+    for kind in filters:
+        t0 = time.perf_counter()
+        failed = 0
+        if kind == "xor":
+            f = XorFilter.build(np.concatenate(list(inserted())), fingerprint_bits or 8, seed)
+        else:
+            f = make_filter(kind, n, m, k, fingerprint_bits, seed)
+            for chunk in inserted():
+                failed += f.add(chunk) or 0
+        insert_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        hits = probed = 0
+        for chunk in probe_set():
+            hits += int(f.contains(chunk).sum())
+            probed += len(chunk)
+        lookup_s = time.perf_counter() - t0
+        misses = sum(int((~f.contains(chunk)).sum()) for chunk in inserted())
+
+        results.append(
+            FilterResult(
+                name=kind,
+                size_bits=f.size_bits,
+                bits_per_key=f.size_bits / max(n, 1),
+                insert_rate=n / insert_s if insert_s else float("inf"),
+                lookup_rate=probed / lookup_s if lookup_s else float("inf"),
+                measured_fp=hits / max(probed, 1),
+                estimated_fp=_estimated_fp(f, n, k),
+                false_negatives=misses,
+                failed_inserts=failed,
+            )
+        )
+    return results
+
+
+def format_results(results: Sequence[FilterResult]) -> str:
+    return "\n".join(
+        f"{r.name}: measured_fp={r.measured_fp:.6f} estimated_fp={r.estimated_fp:.6f} "
+        f"bits_per_key={r.bits_per_key:.2f} insert={r.insert_rate / 1e6:.2f}M/s "
+        f"lookup={r.lookup_rate / 1e6:.2f}M/s false_negatives={r.false_negatives}"
+        + (f" failed_inserts={r.failed_inserts}" if r.failed_inserts else "")
+        for r in results
+    )
+
+
+def load_config(config_path: str) -> dict:
+    """Read a simulation config; m/k default to optimal_params(elements, fp_target)."""
     with open(config_path) as f:
         cfg = yaml.safe_load(f)
-    n = cfg["elements"]
-    m, k = cfg["m"], cfg["k"]
-    # Monte-Carlo using bit array approximation
-    bits = np.zeros(m, dtype=bool)
-    for _ in range(n):
-        for h in range(k):
-            idx = hash((_, h)) % m
-            bits[idx] = True
-    fp_est = (1 - (1 - bits.mean()) ** k)
-    return f"estimated_fp={fp_est:.6f}"
\ No newline at end of file
+    cfg["elements"] = int(cfg["elements"])
+    if "m" not in cfg or "k" not in cfg:
+        cfg["m"], cfg["k"] = calculator.optimal_params(cfg["elements"], cfg.get("fp_target", 0.01))
+    return cfg
+
+
+def run(config_path: str, keys: Optional[np.ndarray] = None) -> str:
+    """Execute simulation and return summary."""
+    cfg = load_config(config_path)
+    results = simulate(
+        cfg["elements"],
+        int(cfg["m"]),
+        int(cfg["k"]),
+        filters=cfg.get("filters", FILTERS),
+        probes=cfg.get("probes"),
+        keys=keys,
+        fingerprint_bits=cfg.get("fingerprint_bits"),
+        batch=cfg.get("batch", BATCH_SIZE),
+        seed=cfg.get("seed", 0),
+    )
+    lines = [format_results(results)]
+    if "fp_target" in cfg:
+        n = len(np.unique(keys)) if keys is not None else cfg["elements"]
+        m, k = calculator.optimal_params(n, cfg["fp_target"])
+        lines.append(f"optimal for fp_target={cfg['fp_target']}: m={m} k={k}")
+    return "\n".join(lines)
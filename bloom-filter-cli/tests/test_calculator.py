@@ -1,5 +1,5 @@
 import pytest
-from bloom_filter_cli.calculator import optimal_params
+from bloom_filter_cli.calculator import false_positive_rate, optimal_params
 
 def test_optimal_params_basic():
     m, k = optimal_params(1_000_000, 0.01)
@@ -12,4 +12,8 @@ def test_fp_bounds():
 def test_monotonic():
     m1, _ = optimal_params(10000, 0.001)
     m2, _ = optimal_params(10000, 0.01)
-    assert m1 > m2
\ No newline at end of file
+    assert m1 > m2
+
+def test_false_positive_rate_at_optimum():
+    m, k = optimal_params(100000, 0.01)
+    assert false_positive_rate(m, 100000, k) == pytest.approx(0.01, rel=0.05)
@@ -7,4 +7,57 @@ def test_simulator_runs():
         yaml.dump(cfg, f)
         f.flush()
         result = run(f.name)
-        assert "estimated_fp" in result
\ No newline at end of file
+        assert "estimated_fp" in result
+import numpy as np
+import pytest
+
+from bloom_filter_cli.calculator import false_positive_rate
+from bloom_filter_cli.filters import BlockedBloomFilter, BloomFilter, CuckooFilter, XorFilter
+from bloom_filter_cli.hashing import keys_from_strings
+from bloom_filter_cli.simulator import simulate
+
+
+def _keys(n, seed=0, probe=False):
+    keys = np.random.default_rng(seed).integers(0, 1 << 63, size=n, dtype=np.uint64)
+    return keys | np.uint64(1 << 63) if probe else keys
+
+@pytest.mark.parametrize("make", [
+    lambda n: BloomFilter(10 * n, 7),
+    lambda n: BlockedBloomFilter(10 * n, 7),
+    lambda n: CuckooFilter(n, 12),
+])
+def test_no_false_negatives(make):
+    keys = _keys(20000)
+    f = make(len(keys))
+    assert not f.add(keys)
+    assert f.contains(keys).all()
+    assert f.contains(_keys(20000, probe=True)).mean() < 0.02
+
+def test_bloom_fpr_matches_theory():
+    n, m, k = 50000, 480000, 7
+    f = BloomFilter(m, k)
+    f.add(_keys(n))
+    measured = f.contains(_keys(200000, seed=1, probe=True)).mean()
+    assert measured == pytest.approx(false_positive_rate(m, n, k), rel=0.15)
+
+def test_cuckoo_high_load_uses_eviction():
+    keys = _keys(30000)
+    f = CuckooFilter(len(keys), 16, load=0.95)
+    assert f.add(keys) == 0
+    assert f.contains(keys).all()
+
+def test_xor_filter():
+    keys = _keys(30000)
+    f = XorFilter.build(np.concatenate([keys, keys[:100]]))  # duplicates are ignored
+    assert f.contains(keys).all()
+    assert f.size_bits / len(keys) < 10
+    assert f.contains(_keys(100000, probe=True)).mean() < 0.006
+
+def test_simulate_real_keys():
+    keys = keys_from_strings(f"user-{i}" for i in range(5000))
+    results = simulate(0, 48000, 7, keys=keys, probes=20000)
+    assert [r.name for r in results] == ["bloom", "blocked", "cuckoo", "xor"]
+    for r in results:
+        assert r.false_negatives == 0
+        assert r.measured_fp < 0.05
+        assert r.bits_per_key > 0 and r.insert_rate > 0
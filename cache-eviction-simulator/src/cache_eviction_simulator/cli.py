@@ -8,8 +8,19 @@ from rich.console import Console
 from rich.table import Table
 
 from .simulator import CacheSimulator
-from .trace_loader import load_trace
-from .policies import LRUCache, LFUCache, FIFOCache, RandomCache
+from .trace_loader import load_trace, load_interned_trace
+from .mrc import exact_mrc, shards_mrc, summarize_curve
+from .policies import (
+    LRUCache,
+    LFUCache,
+    FIFOCache,
+    RandomCache,
+    ClockCache,
+    ARCCache,
+    TwoQCache,
+    S3FIFOCache,
+    TinyLFUCache,
+)
 
 app = typer.Typer()
 console = Console()
@@ -19,17 +30,28 @@ POLICY_MAP: Dict[str, type] = {
     "lfu": LFUCache,
     "fifo": FIFOCache,
     "random": RandomCache,
+    "clock": ClockCache,
+    "arc": ARCCache,
+    "2q": TwoQCache,
+    "s3fifo": S3FIFOCache,
+    "tinylfu": TinyLFUCache,
 }
 
 @app.command()
 def main(
     trace_file: Path = typer.Argument(..., exists=True, help="Path to JSONL or CSV trace file"),
     cache_size: int = typer.Option(1_048_576, "--cache-size", "-s", help="Cache capacity in bytes (default: 1MB)"),
-    policies: list[str] = typer.Option(["lru", "lfu", "fifo", "random"], "--policy", "-p"),
+    policies: list[str] = typer.Option(list(POLICY_MAP), "--policy", "-p"),
     output: Path = typer.Option(None, "--output", "-o", write=True, help="Export results to JSON"),
+    mrc: bool = typer.Option(False, "--mrc", help="Report the LRU miss-ratio curve (1 item .. working set) in one pass"),
+    sample_rate: float = typer.Option(1.0, "--sample-rate", help="SHARDS sampling rate for --mrc (<1 streams the trace)"),
 ):
     """Simulate cache policies on access traces."""
 
+    if mrc:
+        _report_mrc(trace_file, sample_rate, output)
+        return
+
     unknown = set(policies) - set(POLICY_MAP.keys())
     if unknown:
         typer.echo(f"Error: Unknown policies {list(unknown)}. Available: {list(POLICY_MAP)}", err=True)
@@ -37,13 +59,16 @@ def main(
 
     # Load trace
     console.print(f"[info]Loading trace: {trace_file}")
-    accesses = list(load_trace(trace_file))
-    if not accesses:
+    accesses = load_interned_trace(trace_file)
+    if not len(accesses):
         typer.echo("Error: Empty or invalid trace file.", err=True)
         raise typer.Exit(1)
 
-    total_bytes = sum(size for _, size in accesses)
-    console.print(f"[success]Loaded {len(accesses):,} accesses ({total_bytes / 1024 / 1024:.1f} MiB total)")
+    total_bytes = accesses.total_bytes
+    console.print(
+        f"[success]Loaded {len(accesses):,} accesses, {accesses.num_keys:,} unique keys "
+        f"({total_bytes / 1024 / 1024:.1f} MiB total)"
+    )
 
     # Run simulations
     results: Dict[str, Dict[str, Any]] = {}
@@ -86,5 +111,38 @@ def main(
             json.dump(results, f, indent=2, default=float)
         console.print(f"[green]Exported to {output}")
 
+def _report_mrc(trace_file: Path, sample_rate: float, output: Path) -> None:
+    if not 0 < sample_rate <= 1:
+        typer.echo("Error: --sample-rate must be in (0, 1].", err=True)
+        raise typer.Exit(1)
+
+    if sample_rate < 1:
+        console.print(f"[info]Computing SHARDS miss-ratio curve (R={sample_rate:g}): {trace_file}")
+        curve = shards_mrc(load_trace(trace_file), sample_rate)
+    else:
+        console.print(f"[info]Computing exact miss-ratio curve: {trace_file}")
+        curve = exact_mrc(load_interned_trace(trace_file))
+    if not curve:
+        typer.echo("Error: Empty or invalid trace file.", err=True)
+        raise typer.Exit(1)
+
+    table = Table(title=f"LRU Miss-Ratio Curve (working set: {len(curve):,} items)")
+    table.add_column("Capacity (items)", justify="right", style="cyan")
+    table.add_column("Miss Ratio", justify="right")
+    table.add_column("Hit Ratio", justify="right")
+    for capacity, miss_ratio in summarize_curve(curve):
+        table.add_row(f"{capacity:,}", f"{miss_ratio:.1%}", f"{1 - miss_ratio:.1%}")
+    console.print(table)
+
+    if output:
+        with output.open("w") as f:
+            json.dump(
+                {"sample_rate": sample_rate, "curve": [{"capacity": c, "miss_ratio": m} for c, m in curve]},
+                f,
+                indent=2,
+            )
+        console.print(f"[green]Exported to {output}")
+
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
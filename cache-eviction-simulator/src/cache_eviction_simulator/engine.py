@@ -0,0 +1,198 @@
+from array import array
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+NIL = -1
+_MASK64 = (1 << 64) - 1
+# Odd 64-bit multipliers for the count-min sketch rows (multiplicative hashing).
+_SKETCH_SEEDS = (
+    0x9E3779B97F4A7C15,
+    0xC2B2AE3D27D4EB4F,
+    0x165667B19E3779F9,
+    0xD6E8FEB86659FD93,
+)
+_HALVE = bytes(i >> 1 for i in range(256))
+
+
+class KeyInterner:
+    """Maps arbitrary hashable keys to dense integer ids (0, 1, 2, ...)."""
+
+    def __init__(self) -> None:
+        self._ids: Dict[Hashable, int] = {}
+        self._keys: List[Hashable] = []
+
+    def intern(self, key: Hashable) -> int:
+        kid = self._ids.get(key)
+        if kid is None:
+            kid = len(self._keys)
+            self._ids[key] = kid
+            self._keys.append(key)
+        return kid
+
+    def lookup(self, key: Hashable) -> int:
+        """Return the id of `key`, or NIL if it was never interned."""
+        return self._ids.get(key, NIL)
+
+    def key(self, kid: int) -> Hashable:
+        return self._keys[kid]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class InternedTrace:
+    """
+    Compact trace: parallel `array('q')` columns of key ids and sizes.
+
+    ~16 bytes per access instead of a (str, int) tuple per access.
+    """
+
+    def __init__(self, interner: Optional[KeyInterner] = None):
+        self.interner = interner or KeyInterner()
+        self.ids = array("q")
+        self.sizes = array("q")
+
+    def append(self, key: Hashable, size: int) -> None:
+        self.ids.append(self.interner.intern(key))
+        self.sizes.append(size)
+
+    @property
+    def num_keys(self) -> int:
+        return len(self.interner)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.sizes)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Tuple[Hashable, int]]:
+        key = self.interner.key
+        for kid, size in zip(self.ids, self.sizes):
+            yield key(kid), size
+
+
+def intern_trace(accesses: Iterable[Tuple[Hashable, int]], interner: Optional[KeyInterner] = None) -> InternedTrace:
+    """Intern a stream of (key, size) accesses into an InternedTrace."""
+    if isinstance(accesses, InternedTrace):
+        return accesses
+    trace = InternedTrace(interner)
+    intern = trace.interner.intern
+    ids_append = trace.ids.append
+    sizes_append = trace.sizes.append
+    for key, size in accesses:
+        ids_append(intern(key))
+        sizes_append(size)
+    return trace
+
+
+class LinkArena:
+    """
+    Shared prev/next link arrays indexed by key id.
+
+    Every IdList built on one arena threads its nodes through the same two
+    arrays, so a key may sit in at most one list of an arena at a time.
+    """
+
+    def __init__(self, size: int = 0):
+        self.prev = array("q", [NIL]) * size
+        self.next = array("q", [NIL]) * size
+
+    def reserve(self, size: int) -> None:
+        grow = size - len(self.prev)
+        if grow > 0:
+            pad = array("q", [NIL]) * grow
+            self.prev.extend(pad)
+            self.next.extend(pad)
+
+
+class IdList:
+    """Intrusive doubly-linked list of key ids; every operation is O(1)."""
+
+    __slots__ = ("prev", "next", "head", "tail", "size")
+
+    def __init__(self, arena: LinkArena):
+        self.prev = arena.prev
+        self.next = arena.next
+        self.head = NIL
+        self.tail = NIL
+        self.size = 0
+
+    def push_back(self, kid: int) -> None:
+        tail = self.tail
+        self.prev[kid] = tail
+        self.next[kid] = NIL
+        if tail == NIL:
+            self.head = kid
+        else:
+            self.next[tail] = kid
+        self.tail = kid
+        self.size += 1
+
+    def remove(self, kid: int) -> None:
+        p = self.prev[kid]
+        n = self.next[kid]
+        if p == NIL:
+            self.head = n
+        else:
+            self.next[p] = n
+        if n == NIL:
+            self.tail = p
+        else:
+            self.prev[n] = p
+        self.size -= 1
+
+    def pop_front(self) -> int:
+        kid = self.head
+        self.remove(kid)
+        return kid
+
+    def move_to_back(self, kid: int) -> None:
+        if kid != self.tail:
+            self.remove(kid)
+            self.push_back(kid)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[int]:
+        kid = self.head
+        while kid != NIL:
+            yield kid
+            kid = self.next[kid]
+
+
+class CountMinSketch:
+    """
+    4-row count-min sketch with 4-bit-style saturating counters and periodic
+    halving ("aging"), as used by TinyLFU admission.
+    """
+
+    def __init__(self, width: int = 1 << 16, max_count: int = 15, sample_size: Optional[int] = None):
+        bits = max(4, (width - 1).bit_length())
+        self.width = 1 << bits
+        self._shift = 64 - bits
+        self.max_count = max_count
+        self.sample_size = sample_size or 10 * self.width
+        self._rows = [bytearray(self.width) for _ in _SKETCH_SEEDS]
+        self._additions = 0
+
+    def _slots(self, kid: int):
+        shift = self._shift
+        return [((kid + 1) * seed & _MASK64) >> shift for seed in _SKETCH_SEEDS]
+
+    def increment(self, kid: int) -> None:
+        max_count = self.max_count
+        for row, slot in zip(self._rows, self._slots(kid)):
+            if row[slot] < max_count:
+                row[slot] += 1
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._age()
+
+    def estimate(self, kid: int) -> int:
+        return min(row[slot] for row, slot in zip(self._rows, self._slots(kid)))
+
+    def _age(self) -> None:
+        self._rows = [row.translate(_HALVE) for row in self._rows]
+        self._additions //= 2
@@ -0,0 +1,146 @@
+import zlib
+from array import array
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+from .engine import InternedTrace, KeyInterner
+
+_MASK64 = (1 << 64) - 1
+_SHARDS_MODULUS = 1 << 24
+
+
+class _Fenwick:
+    """Append-only binary indexed tree over access timestamps (1-based)."""
+
+    def __init__(self) -> None:
+        self._tree = array("q", [0])
+
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+
+    def append(self, value: int) -> None:
+        i = len(self._tree)
+        # Node i covers (i - lowbit(i), i]; everything but the new slot already exists.
+        self._tree.append(value + self.prefix(i - 1) - self.prefix(i - (i & -i)))
+
+    def add(self, i: int, delta: int) -> None:
+        tree = self._tree
+        n = len(tree)
+        while i < n:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i: int) -> int:
+        tree = self._tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+
+class ReuseDistanceHistogram:
+    """
+    One-pass LRU stack-distance analysis (Olken's algorithm, Fenwick tree).
+
+    For every access, the reuse distance is the number of distinct keys
+    touched since the previous access to the same key. An LRU cache of `c`
+    items hits exactly the accesses whose distance is < c, so a single pass
+    yields the miss ratio for every capacity. O(N log N) time.
+    """
+
+    def __init__(self) -> None:
+        self._last: Dict[Hashable, int] = {}
+        self._marks = _Fenwick()
+        self.histogram: Dict[int, int] = {}
+        self.cold_misses = 0
+        self.accesses = 0
+
+    def observe(self, key: Hashable) -> None:
+        marks = self._marks
+        marks.append(1)
+        now = len(marks)
+        prev = self._last.get(key)
+        self._last[key] = now
+        self.accesses += 1
+        if prev is None:
+            self.cold_misses += 1
+            return
+        distance = marks.prefix(now - 1) - marks.prefix(prev)
+        marks.add(prev, -1)
+        self.histogram[distance] = self.histogram.get(distance, 0) + 1
+
+    @property
+    def working_set(self) -> int:
+        return len(self._last)
+
+    def miss_ratio_curve(self, scale: float = 1.0, adjust: int = 0) -> List[Tuple[int, float]]:
+        """
+        Miss ratio for LRU capacities 1..working set, as (items, miss_ratio).
+
+        `scale` maps sampled distances back to full-trace distances (1/R for
+        SHARDS); `adjust` is the SHARDS_adj correction added to distance 0.
+        """
+        total = self.accesses + adjust
+        if total <= 0:
+            return []
+        working_set = max(1, round(self.working_set * scale))
+        hits_at = [0] * (working_set + 1)  # hits_at[c] = hits gained when capacity reaches c
+        for distance, count in self.histogram.items():
+            capacity = int(distance * scale) + 1
+            if capacity <= working_set:
+                hits_at[capacity] += count
+        hits_at[1] += adjust
+        curve: List[Tuple[int, float]] = []
+        hits = 0
+        for capacity in range(1, working_set + 1):
+            hits += hits_at[capacity]
+            curve.append((capacity, min(1.0, max(0.0, 1 - hits / total))))
+        return curve
+
+
+def _shard_hash(key: Hashable) -> int:
+    data = key if isinstance(key, bytes) else str(key).encode()
+    return ((zlib.crc32(data) + 1) * 0x9E3779B97F4A7C15 & _MASK64) >> 40
+
+
+def exact_mrc(trace: InternedTrace) -> List[Tuple[int, float]]:
+    """Exact LRU miss-ratio curve from an interned trace in one pass."""
+    hist = ReuseDistanceHistogram()
+    observe = hist.observe
+    for kid in trace.ids:
+        observe(kid)
+    return hist.miss_ratio_curve()
+
+
+def shards_mrc(accesses: Iterable[Tuple[Hashable, int]], sample_rate: float = 0.01) -> List[Tuple[int, float]]:
+    """
+    Approximate LRU miss-ratio curve with fixed-rate SHARDS (Waldspurger et
+    al., FAST'15): only keys with hash(key) mod P < R*P are tracked, and
+    their distances are scaled by 1/R. Memory is ~R of the exact method, so
+    `accesses` can be a streaming iterator (e.g. `load_trace`).
+    """
+    if not 0 < sample_rate <= 1:
+        raise ValueError("sample_rate must be in (0, 1]")
+    threshold = max(1, int(sample_rate * _SHARDS_MODULUS))  # rates below 1/P sample at 1/P
+    hist = ReuseDistanceHistogram()
+    interner = KeyInterner()
+    total = 0
+    for key, _size in accesses:
+        total += 1
+        if _shard_hash(key) < threshold:
+            hist.observe(interner.intern(key))
+    rate = threshold / _SHARDS_MODULUS
+    # SHARDS_adj: correct for the sample holding more/fewer accesses than expected.
+    adjust = round(total * rate) - hist.accesses
+    return hist.miss_ratio_curve(scale=1 / rate, adjust=adjust)
+
+
+def summarize_curve(curve: List[Tuple[int, float]], points: int = 20) -> List[Tuple[int, float]]:
+    """Pick ~`points` log-spaced capacities (always including 1 and the working set)."""
+    if len(curve) <= points:
+        return curve
+    last = len(curve)
+    picks = {1, last}
+    for i in range(points):
+        picks.add(max(1, round(last ** (i / (points - 1)))))
+    return [curve[c - 1] for c in sorted(picks)]
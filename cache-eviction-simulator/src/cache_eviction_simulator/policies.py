@@ -1,117 +1,602 @@
 import random
 from abc import ABC, abstractmethod
-from collections import OrderedDict, deque, defaultdict
-from typing import Dict, Set, Any
+from array import array
+from typing import Dict, Hashable, Optional, Any
+
+from .engine import NIL, CountMinSketch, IdList, KeyInterner, LinkArena
 
 
 class BaseCache(ABC):
-    def __init__(self, capacity: int):
+    """
+    Byte-capacity cache over interned integer key ids.
+
+    Per-key state lives in arrays indexed by key id. The public `has`/`hit`/
+    `miss` methods accept raw keys and intern them; the simulator feeds ids
+    straight into `access` and skips interning on the hot path.
+
+    Subclasses implement `_choose_victim` and the `_on_*` hooks; each hook is
+    O(1) (amortized for CLOCK/S3-FIFO/TinyLFU reinsertion).
+    """
+
+    def __init__(self, capacity: int, interner: Optional[KeyInterner] = None):
         self.capacity = capacity
         self.current_size = 0
-        self._items: Dict[str, int] = {}  # key -> size
         self.evictions = 0
+        self.interner = interner or KeyInterner()
+        self._count = 0
+        self._sizes = array("q")
+        self._resident = bytearray()
+        self.reserve(len(self.interner))
 
-    def has(self, key: str) -> bool:
-        return key in self._items
+    def reserve(self, num_keys: int) -> None:
+        """Pre-size per-key arrays for ids in [0, num_keys)."""
+        grow = num_keys - len(self._sizes)
+        if grow > 0:
+            self._sizes.extend(array("q", [0]) * grow)
+            self._resident.extend(bytes(grow))
 
-    def hit(self, key: str) -> None:
-        pass
+    def has(self, key: Hashable) -> bool:
+        kid = self.interner.lookup(key)
+        return 0 <= kid < len(self._resident) and self._resident[kid] == 1
+
+    def hit(self, key: Hashable) -> None:
+        """Record a hit on a resident `key`; raises KeyError if it is not cached."""
+        kid = self.interner.lookup(key)
+        if not (0 <= kid < len(self._resident) and self._resident[kid]):
+            raise KeyError(key)
+        self._on_hit(kid)
 
-    def miss(self, key: str, size: int) -> None:
+    def miss(self, key: Hashable, size: int) -> None:
+        kid = self.interner.intern(key)
+        if kid >= len(self._sizes):
+            self.reserve(max(kid + 1, 2 * len(self._sizes)))
+        self._insert(kid, size)
+
+    def access(self, kid: int, size: int) -> bool:
+        """Process one access by key id; returns True on a hit."""
+        if self._resident[kid]:
+            self._on_hit(kid)
+            return True
+        self._insert(kid, size)
+        return False
+
+    def _insert(self, kid: int, size: int) -> None:
+        self._on_miss(kid, size)
         self._make_space(size)
-        self._items[key] = size
+        self._sizes[kid] = size
+        self._resident[kid] = 1
+        self._count += 1
         self.current_size += size
+        self._on_insert(kid)
 
     def _make_space(self, needed: int) -> None:
-        while self.current_size + needed > self.capacity and self._items:
+        while self.current_size + needed > self.capacity and self._count:
             victim = self._choose_victim()
-            victim_size = self._items.pop(victim)
-            self.current_size -= victim_size
+            self._resident[victim] = 0
+            self._count -= 1
+            self.current_size -= self._sizes[victim]
             self.evictions += 1
+            self._on_evict(victim)
+
+    def _on_hit(self, kid: int) -> None:
+        pass
+
+    def _on_miss(self, kid: int, size: int) -> None:
+        """Called before space is made for a missing key."""
 
     @abstractmethod
-    def _choose_victim(self) -> str:
+    def _on_insert(self, kid: int) -> None:
         pass
 
+    @abstractmethod
+    def _choose_victim(self) -> int:
+        pass
+
+    @abstractmethod
+    def _on_evict(self, kid: int) -> None:
+        """Unlink an evicted key from the policy's resident structures."""
+
     def get_stats(self) -> Dict[str, Any]:
         return {
-            "final_items": len(self._items),
+            "final_items": self._count,
         }
 
 
 class LRUCache(BaseCache):
-    def __init__(self, capacity: int):
-        super().__init__(capacity)
-        self.order: OrderedDict[str, None] = OrderedDict()
+    def __init__(self, capacity: int, interner: Optional[KeyInterner] = None):
+        self._arena = LinkArena()
+        self.order = IdList(self._arena)
+        super().__init__(capacity, interner)
 
-    def hit(self, key: str) -> None:
-        self.order.move_to_end(key)
+    def reserve(self, num_keys: int) -> None:
+        super().reserve(num_keys)
+        self._arena.reserve(len(self._sizes))
 
-    def miss(self, key: str, size: int) -> None:
-        super().miss(key, size)
-        self.order[key] = None
+    def _on_hit(self, kid: int) -> None:
+        self.order.move_to_back(kid)
 
-    def _choose_victim(self) -> str:
-        return self.order.popitem(last=False)[0]
+    def _on_insert(self, kid: int) -> None:
+        self.order.push_back(kid)
 
+    def _choose_victim(self) -> int:
+        return self.order.head
 
-class FIFOCache(BaseCache):
-    def __init__(self, capacity: int):
-        super().__init__(capacity)
-        self.order: deque[str] = deque()
+    def _on_evict(self, kid: int) -> None:
+        self.order.remove(kid)
 
-    def miss(self, key: str, size: int) -> None:
-        super().miss(key, size)
-        self.order.append(key)
 
-    def _choose_victim(self) -> str:
-        return self.order.popleft()
+class FIFOCache(LRUCache):
+    def _on_hit(self, kid: int) -> None:
+        pass
 
 
 class LFUCache(BaseCache):
-    def __init__(self, capacity: int):
-        super().__init__(capacity)
-        self.key_to_freq: Dict[str, int] = {}
-        self.freq_to_keys: Dict[int, Set[str]] = {}
+    """
+    O(1) LFU: one IdList per frequency, with the non-empty frequencies kept in
+    a linked list of their own so the minimum is always the head (no min()).
+    Ties within a frequency are broken LRU-first.
+    """
+
+    def __init__(self, capacity: int, interner: Optional[KeyInterner] = None):
+        self._arena = LinkArena()
+        self._freq = array("q")
+        self.freq_to_keys: Dict[int, IdList] = {}
+        # Frequency buckets in ascending order: freq -> next/prev non-empty freq.
+        self._next_freq: Dict[int, int] = {}
+        self._prev_freq: Dict[int, int] = {}
         self.min_freq = 0
+        super().__init__(capacity, interner)
 
-    def hit(self, key: str) -> None:
-        old_freq = self.key_to_freq[key]
-        self.freq_to_keys[old_freq].discard(key)
-        if not self.freq_to_keys[old_freq]:
-            del self.freq_to_keys[old_freq]
-            if old_freq == self.min_freq and self.freq_to_keys:
-                self.min_freq = min(self.freq_to_keys)
-
-        new_freq = old_freq + 1
-        self.key_to_freq[key] = new_freq
-        self.freq_to_keys.setdefault(new_freq, set()).add(key)
-        self.min_freq = min(self.min_freq, new_freq)
-
-    def miss(self, key: str, size: int) -> None:
-        self.key_to_freq[key] = 1
-        self.freq_to_keys.setdefault(1, set()).add(key)
-        if self.min_freq == 0:
-            self.min_freq = 1
-        super().miss(key, size)
-
-    def _choose_victim(self) -> str:
-        while True:
-            if self.min_freq not in self.freq_to_keys or not self.freq_to_keys[self.min_freq]:
-                if self.freq_to_keys:
-                    self.min_freq = min(self.freq_to_keys)
-                else:
-                    raise RuntimeError("Cache empty, cannot evict")
-                continue
-            key = self.freq_to_keys[self.min_freq].pop()
-            if not self.freq_to_keys[self.min_freq]:
-                del self.freq_to_keys[self.min_freq]
-            del self.key_to_freq[key]
-            return key
+    def reserve(self, num_keys: int) -> None:
+        super().reserve(num_keys)
+        self._arena.reserve(len(self._sizes))
+        grow = len(self._sizes) - len(self._freq)
+        if grow > 0:
+            self._freq.extend(array("q", [0]) * grow)
+
+    def _bucket(self, freq: int, after: int) -> IdList:
+        """Return the bucket for `freq`, linking it after frequency `after` (0 = front)."""
+        bucket = self.freq_to_keys.get(freq)
+        if bucket is None:
+            bucket = self.freq_to_keys[freq] = IdList(self._arena)
+            nxt = self._next_freq[after] if after else self.min_freq
+            self._prev_freq[freq] = after
+            self._next_freq[freq] = nxt
+            if after:
+                self._next_freq[after] = freq
+            else:
+                self.min_freq = freq
+            if nxt:
+                self._prev_freq[nxt] = freq
+        return bucket
+
+    def _unlink(self, kid: int) -> int:
+        """Remove kid from its bucket, dropping the bucket if it empties; returns the freq before it."""
+        freq = self._freq[kid]
+        bucket = self.freq_to_keys[freq]
+        bucket.remove(kid)
+        prev = self._prev_freq[freq]
+        if bucket.size:
+            return freq
+        nxt = self._next_freq.pop(freq)
+        self._prev_freq.pop(freq)
+        del self.freq_to_keys[freq]
+        if prev:
+            self._next_freq[prev] = nxt
+        else:
+            self.min_freq = nxt
+        if nxt:
+            self._prev_freq[nxt] = prev
+        return prev
+
+    def _on_hit(self, kid: int) -> None:
+        freq = self._freq[kid]
+        anchor = self._unlink(kid)
+        self._freq[kid] = freq + 1
+        self._bucket(freq + 1, anchor).push_back(kid)
+
+    def _on_insert(self, kid: int) -> None:
+        self._freq[kid] = 1
+        self._bucket(1, 0).push_back(kid)
+
+    def _choose_victim(self) -> int:
+        return self.freq_to_keys[self.min_freq].head
+
+    def _on_evict(self, kid: int) -> None:
+        self._unlink(kid)
 
 
 class RandomCache(BaseCache):
-    def _choose_victim(self) -> str:
-        if not self._items:
+    """Random eviction over a dense id array with O(1) swap-remove."""
+
+    def __init__(self, capacity: int, interner: Optional[KeyInterner] = None, seed: Optional[int] = None):
+        self._slots = array("q")
+        self._pos = array("q")
+        self._rng = random.Random(seed)
+        super().__init__(capacity, interner)
+
+    def reserve(self, num_keys: int) -> None:
+        super().reserve(num_keys)
+        grow = len(self._sizes) - len(self._pos)
+        if grow > 0:
+            self._pos.extend(array("q", [NIL]) * grow)
+
+    def _on_insert(self, kid: int) -> None:
+        self._pos[kid] = len(self._slots)
+        self._slots.append(kid)
+
+    def _choose_victim(self) -> int:
+        if not self._slots:
             raise RuntimeError("Cache empty")
-        return random.choice(list(self._items))
+        return self._slots[self._rng.randrange(len(self._slots))]
+
+    def _on_evict(self, kid: int) -> None:
+        pos = self._pos[kid]
+        last = self._slots.pop()
+        if last != kid:
+            self._slots[pos] = last
+            self._pos[last] = pos
+        self._pos[kid] = NIL
+
+
+class ClockCache(LRUCache):
+    """CLOCK (second chance): a hit sets a reference bit; the hand clears it once."""
+
+    def __init__(self, capacity: int, interner: Optional[KeyInterner] = None):
+        self._ref = bytearray()
+        super().__init__(capacity, interner)
+
+    def reserve(self, num_keys: int) -> None:
+        super().reserve(num_keys)
+        self._ref.extend(bytes(len(self._sizes) - len(self._ref)))
+
+    def _on_hit(self, kid: int) -> None:
+        self._ref[kid] = 1
+
+    def _on_insert(self, kid: int) -> None:
+        self._ref[kid] = 0
+        self.order.push_back(kid)
+
+    def _choose_victim(self) -> int:
+        order, ref = self.order, self._ref
+        hand = order.head
+        while ref[hand]:
+            ref[hand] = 0
+            order.move_to_back(hand)
+            hand = order.head
+        return hand
+
+
+# Segment tags for the multi-queue policies (stored per key in a bytearray).
+_NONE, _T1, _T2, _B1, _B2 = 0, 1, 2, 3, 4
+
+
+class _SegmentedCache(BaseCache):
+    """Shared plumbing for policies that move keys between several IdLists."""
+
+    def __init__(self, capacity: int, interner: Optional[KeyInterner] = None):
+        self._arena = LinkArena()
+        self._where = bytearray()
+        super().__init__(capacity, interner)
+
+    def reserve(self, num_keys: int) -> None:
+        super().reserve(num_keys)
+        self._arena.reserve(len(self._sizes))
+        self._where.extend(bytes(len(self._sizes) - len(self._where)))
+
+
+class ARCCache(_SegmentedCache):
+    """
+    Adaptive Replacement Cache (Megiddo & Modha), byte-weighted.
+
+    T1/T2 hold resident recency/frequency keys; B1/B2 are ghost histories.
+    `p` is the adaptive byte target for T1.
+    """
+
+    def __init__(self, capacity: int, interner: Optional[KeyInterner] = None):
+        super().__init__(capacity, interner)
+        self.t1, self.t2 = IdList(self._arena), IdList(self._arena)
+        self.b1, self.b2 = IdList(self._arena), IdList(self._arena)
+        self._bytes = [0, 0, 0, 0, 0]  # indexed by segment tag
+        self.p = 0.0
+        self._ghost_hit = _NONE
+
+    def _list(self, tag: int) -> IdList:
+        return (None, self.t1, self.t2, self.b1, self.b2)[tag]
+
+    def _move(self, kid: int, tag: int) -> None:
+        old = self._where[kid]
+        size = self._sizes[kid]
+        if old:
+            self._list(old).remove(kid)
+            self._bytes[old] -= size
+        if tag:
+            self._list(tag).push_back(kid)
+            self._bytes[tag] += size
+        self._where[kid] = tag
+
+    def _drop_ghost(self, ghost: IdList) -> None:
+        self._move(ghost.head, _NONE)
+
+    def _on_hit(self, kid: int) -> None:
+        if self._where[kid] == _T2:
+            self.t2.move_to_back(kid)
+        else:
+            self._move(kid, _T2)
+
+    def _on_miss(self, kid: int, size: int) -> None:
+        where = self._where[kid]
+        b = self._bytes
+        c = self.capacity
+        if where == _B1:
+            self.p = min(c, self.p + max(size, size * b[_B2] / max(b[_B1], 1)))
+        elif where == _B2:
+            self.p = max(0.0, self.p - max(size, size * b[_B1] / max(b[_B2], 1)))
+        else:
+            while b[_T1] + b[_B1] + size > c and self.b1.size:
+                self._drop_ghost(self.b1)
+            while sum(b) + size > 2 * c and self.b2.size:
+                self._drop_ghost(self.b2)
+        if where in (_B1, _B2):
+            self._move(kid, _NONE)
+        self._ghost_hit = where
+
+    def _on_insert(self, kid: int) -> None:
+        self._move(kid, _T2 if self._ghost_hit else _T1)
+
+    def _choose_victim(self) -> int:
+        t1_bytes = self._bytes[_T1]
+        if self.t1.size and (
+            t1_bytes > self.p or (self._ghost_hit == _B2 and t1_bytes >= self.p) or not self.t2.size
+        ):
+            return self.t1.head
+        return self.t2.head
+
+    def _on_evict(self, kid: int) -> None:
+        self._move(kid, _B1 if self._where[kid] == _T1 else _B2)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**super().get_stats(), "arc_p": round(self.p)}
+
+
+class TwoQCache(_SegmentedCache):
+    """
+    Full 2Q (Johnson & Shasha): A1in FIFO for first-time keys, A1out ghost
+    history, and an Am LRU for keys re-referenced after leaving A1in.
+    """
+
+    _A1IN, _AM, _A1OUT = 1, 2, 3
+
+    def __init__(self, capacity: int, interner: Optional[KeyInterner] = None, kin: float = 0.25, kout: float = 0.5):
+        super().__init__(capacity, interner)
+        self.a1in, self.am, self.a1out = IdList(self._arena), IdList(self._arena), IdList(self._arena)
+        self.kin = kin * capacity
+        self.kout = kout * capacity
+        self._a1in_bytes = 0
+        self._a1out_bytes = 0
+        self._promote = False
+
+    def _on_hit(self, kid: int) -> None:
+        if self._where[kid] == self._AM:
+            self.am.move_to_back(kid)
+
+    def _on_miss(self, kid: int, size: int) -> None:
+        self._promote = self._where[kid] == self._A1OUT
+        if self._promote:
+            self.a1out.remove(kid)
+            self._a1out_bytes -= self._sizes[kid]
+            self._where[kid] = _NONE
+
+    def _on_insert(self, kid: int) -> None:
+        if self._promote:
+            self.am.push_back(kid)
+            self._where[kid] = self._AM
+        else:
+            self.a1in.push_back(kid)
+            self._a1in_bytes += self._sizes[kid]
+            self._where[kid] = self._A1IN
+
+    def _choose_victim(self) -> int:
+        if self.a1in.size and (self._a1in_bytes > self.kin or not self.am.size):
+            return self.a1in.head
+        return self.am.head
+
+    def _on_evict(self, kid: int) -> None:
+        if self._where[kid] == self._AM:
+            self.am.remove(kid)
+            self._where[kid] = _NONE
+            return
+        self.a1in.remove(kid)
+        self._a1in_bytes -= self._sizes[kid]
+        self.a1out.push_back(kid)
+        self._a1out_bytes += self._sizes[kid]
+        self._where[kid] = self._A1OUT
+        while self._a1out_bytes > self.kout and self.a1out.size:
+            old = self.a1out.pop_front()
+            self._a1out_bytes -= self._sizes[old]
+            self._where[old] = _NONE
+
+
+class S3FIFOCache(_SegmentedCache):
+    """
+    S3-FIFO (Yang et al., SOSP'23): a small probationary FIFO (10%), a main
+    FIFO with lazy 2-bit frequency reinsertion, and a ghost FIFO that sends
+    recently-evicted keys straight to main.
+    """
+
+    _SMALL, _MAIN, _GHOST = 1, 2, 3
+
+    def __init__(self, capacity: int, interner: Optional[KeyInterner] = None, small_ratio: float = 0.1):
+        self._freq = bytearray()
+        super().__init__(capacity, interner)
+        self.small, self.main, self.ghost = IdList(self._arena), IdList(self._arena), IdList(self._arena)
+        self.small_cap = small_ratio * capacity
+        self.main_cap = capacity - self.small_cap
+        self._small_bytes = 0
+        self._ghost_bytes = 0
+        self._to_main = False
+
+    def reserve(self, num_keys: int) -> None:
+        super().reserve(num_keys)
+        self._freq.extend(bytes(len(self._sizes) - len(self._freq)))
+
+    def _on_hit(self, kid: int) -> None:
+        if self._freq[kid] < 3:
+            self._freq[kid] += 1
+
+    def _on_miss(self, kid: int, size: int) -> None:
+        self._to_main = self._where[kid] == self._GHOST
+        if self._to_main:
+            self.ghost.remove(kid)
+            self._ghost_bytes -= self._sizes[kid]
+            self._where[kid] = _NONE
+
+    def _on_insert(self, kid: int) -> None:
+        self._freq[kid] = 0
+        if self._to_main:
+            self.main.push_back(kid)
+            self._where[kid] = self._MAIN
+        else:
+            self.small.push_back(kid)
+            self._small_bytes += self._sizes[kid]
+            self._where[kid] = self._SMALL
+
+    def _choose_victim(self) -> int:
+        freq = self._freq
+        while True:
+            if self.small.size and (self._small_bytes >= self.small_cap or not self.main.size):
+                kid = self.small.head
+                if not freq[kid]:
+                    return kid
+                # Re-referenced while on probation: promote to main.
+                self.small.remove(kid)
+                self._small_bytes -= self._sizes[kid]
+                self.main.push_back(kid)
+                self._where[kid] = self._MAIN
+                freq[kid] = 0
+            else:
+                kid = self.main.head
+                if not freq[kid]:
+                    return kid
+                freq[kid] -= 1
+                self.main.move_to_back(kid)
+
+    def _on_evict(self, kid: int) -> None:
+        if self._where[kid] == self._MAIN:
+            self.main.remove(kid)
+            self._where[kid] = _NONE
+            return
+        self.small.remove(kid)
+        self._small_bytes -= self._sizes[kid]
+        self.ghost.push_back(kid)
+        self._ghost_bytes += self._sizes[kid]
+        self._where[kid] = self._GHOST
+        while self._ghost_bytes > self.main_cap and self.ghost.size:
+            old = self.ghost.pop_front()
+            self._ghost_bytes -= self._sizes[old]
+            self._where[old] = _NONE
+
+
+class TinyLFUCache(_SegmentedCache):
+    """
+    W-TinyLFU (Einziger et al.): a 1% LRU admission window in front of a
+    segmented-LRU main region (20% probation / 80% protected). A window
+    victim only enters main if the count-min sketch says it is more popular
+    than main's own victim.
+    """
+
+    _WINDOW, _PROBATION, _PROTECTED = 1, 2, 3
+
+    def __init__(
+        self,
+        capacity: int,
+        interner: Optional[KeyInterner] = None,
+        window_ratio: float = 0.01,
+        protected_ratio: float = 0.8,
+        sketch_width: int = 1 << 16,
+    ):
+        super().__init__(capacity, interner)
+        self.window, self.probation, self.protected = IdList(self._arena), IdList(self._arena), IdList(self._arena)
+        self.window_cap = window_ratio * capacity
+        self.main_cap = capacity - self.window_cap
+        self.protected_cap = protected_ratio * self.main_cap
+        self._window_bytes = 0
+        self._probation_bytes = 0
+        self._protected_bytes = 0
+        self.sketch = CountMinSketch(sketch_width)
+        self.rejections = 0
+
+    def _on_hit(self, kid: int) -> None:
+        self.sketch.increment(kid)
+        where = self._where[kid]
+        if where == self._WINDOW:
+            self.window.move_to_back(kid)
+        elif where == self._PROTECTED:
+            self.protected.move_to_back(kid)
+        else:
+            size = self._sizes[kid]
+            self.probation.remove(kid)
+            self._probation_bytes -= size
+            self.protected.push_back(kid)
+            self._protected_bytes += size
+            self._where[kid] = self._PROTECTED
+            while self._protected_bytes > self.protected_cap and self.protected.size > 1:
+                demoted = self.protected.pop_front()
+                size = self._sizes[demoted]
+                self._protected_bytes -= size
+                self.probation.push_back(demoted)
+                self._probation_bytes += size
+                self._where[demoted] = self._PROBATION
+
+    def _on_miss(self, kid: int, size: int) -> None:
+        self.sketch.increment(kid)
+
+    def _on_insert(self, kid: int) -> None:
+        self.window.push_back(kid)
+        self._window_bytes += self._sizes[kid]
+        self._where[kid] = self._WINDOW
+
+    def _main_victim(self) -> int:
+        return self.probation.head if self.probation.size else self.protected.head
+
+    def _to_probation(self, kid: int) -> None:
+        self.window.remove(kid)
+        self._window_bytes -= self._sizes[kid]
+        self.probation.push_back(kid)
+        self._probation_bytes += self._sizes[kid]
+        self._where[kid] = self._PROBATION
+
+    def _choose_victim(self) -> int:
+        while self.window.size and self._window_bytes > self.window_cap:
+            candidate = self.window.head
+            if self._probation_bytes + self._protected_bytes + self._sizes[candidate] <= self.main_cap:
+                # Main still has room: the window victim moves in without a duel.
+                self._to_probation(candidate)
+                continue
+            if not (self.probation.size or self.protected.size):
+                return candidate
+            victim = self._main_victim()
+            if self.sketch.estimate(candidate) <= self.sketch.estimate(victim):
+                self.rejections += 1
+                return candidate
+            self._to_probation(candidate)
+            return victim
+        if self.probation.size or self.protected.size:
+            return self._main_victim()
+        return self.window.head
+
+    def _on_evict(self, kid: int) -> None:
+        where = self._where[kid]
+        if where == self._WINDOW:
+            self.window.remove(kid)
+            self._window_bytes -= self._sizes[kid]
+        elif where == self._PROTECTED:
+            self.protected.remove(kid)
+            self._protected_bytes -= self._sizes[kid]
+        else:
+            self.probation.remove(kid)
+            self._probation_bytes -= self._sizes[kid]
+        self._where[kid] = _NONE
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**super().get_stats(), "admission_rejections": self.rejections}
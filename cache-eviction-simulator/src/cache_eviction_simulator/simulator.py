@@ -1,40 +1,52 @@
-from typing import List, Tuple, Dict, Any
+from typing import Iterable, Tuple, Dict, Any, Optional, Hashable
 
+from .engine import InternedTrace, KeyInterner, intern_trace
 from .policies import BaseCache
 
 class CacheSimulator:
-    def __init__(self, policy_cls: type[BaseCache], capacity: int):
+    def __init__(self, policy_cls: type[BaseCache], capacity: int, **policy_kwargs: Any):
         self.policy_cls = policy_cls
         self.capacity = capacity
+        self.policy_kwargs = policy_kwargs
         self.reset()
 
-    def reset(self):
-        self.policy = self.policy_cls(self.capacity)
+    def reset(self, interner: Optional[KeyInterner] = None):
+        self.policy = self.policy_cls(self.capacity, interner=interner, **self.policy_kwargs)
         self.hits: int = 0
         self.accesses: int = 0
         self.total_bytes: int = 0
         self.byte_hits: int = 0
         self.max_size: int = 0
 
-    def simulate(self, accesses: List[Tuple[str, int]]) -> Dict[str, Any]:
-        self.reset()
-        for key, size in accesses:
-            self.accesses += 1
-            self.total_bytes += size
-            if self.policy.has(key):
-                self.hits += 1
-                self.byte_hits += size
-                self.policy.hit(key)
-            else:
-                self.policy.miss(key, size)
-            self.max_size = max(self.max_size, self.policy.current_size)
+    def simulate(self, accesses: Iterable[Tuple[Hashable, int]]) -> Dict[str, Any]:
+        """Replay accesses; (key, size) iterables are interned first, an InternedTrace is used as-is."""
+        trace: InternedTrace = intern_trace(accesses)
+        self.reset(trace.interner)
+        policy = self.policy
+        policy.reserve(trace.num_keys)
+        access = policy.access
+
+        hits = byte_hits = total_bytes = max_size = 0
+        for kid, size in zip(trace.ids, trace.sizes):
+            total_bytes += size
+            if access(kid, size):
+                hits += 1
+                byte_hits += size
+            elif policy.current_size > max_size:
+                max_size = policy.current_size
 
+        self.accesses = len(trace)
+        self.hits = hits
+        self.byte_hits = byte_hits
+        self.total_bytes = total_bytes
+        self.max_size = max_size
         return {
-            "hit_rate": self.hits / self.accesses,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.accesses if self.accesses else 0,
             "byte_hit_rate": self.byte_hits / self.total_bytes if self.total_bytes else 0,
             "evictions": self.policy.evictions,
             "max_size": self.max_size,
             "final_size": self.policy.current_size,
             "accesses": self.accesses,
             **self.policy.get_stats(),
-        }
\ No newline at end of file
+        }
@@ -3,6 +3,8 @@ import json
 from pathlib import Path
 from typing import Iterator, Tuple
 
+from .engine import InternedTrace
+
 
 def load_trace(file_path: Path) -> Iterator[Tuple[str, int]]:
     """
@@ -33,4 +35,16 @@ def load_trace(file_path: Path) -> Iterator[Tuple[str, int]]:
                 except (KeyError, ValueError):
                     continue
     else:
-        raise ValueError(f"Unsupported format: {suffix}. Use .jsonl or .csv")
\ No newline at end of file
+        raise ValueError(f"Unsupported format: {suffix}. Use .jsonl or .csv")
+
+
+def load_interned_trace(file_path: Path) -> InternedTrace:
+    """
+    Stream a trace straight into an InternedTrace (integer key ids + sizes in
+    arrays) without buffering a list of (key, size) tuples.
+    """
+    trace = InternedTrace()
+    append = trace.append
+    for key, size in load_trace(file_path):
+        append(key, size)
+    return trace
@@ -0,0 +1,48 @@
+from cache_eviction_simulator.engine import NIL, CountMinSketch, IdList, KeyInterner, LinkArena, intern_trace
+
+
+def test_interner_dense_ids():
+    interner = KeyInterner()
+    assert interner.intern("a") == 0
+    assert interner.intern("b") == 1
+    assert interner.intern("a") == 0
+    assert interner.lookup("zzz") == NIL
+    assert interner.key(1) == "b"
+    assert len(interner) == 2
+
+
+def test_intern_trace_roundtrip():
+    accesses = [("a", 100), ("b", 200), ("a", 100)]
+    trace = intern_trace(accesses)
+    assert list(trace.ids) == [0, 1, 0]
+    assert trace.num_keys == 2
+    assert trace.total_bytes == 400
+    assert list(trace) == accesses
+    assert intern_trace(trace) is trace
+
+
+def test_idlist_operations():
+    arena = LinkArena(5)
+    a, b = IdList(arena), IdList(arena)
+    for kid in (0, 1, 2):
+        a.push_back(kid)
+    b.push_back(3)
+    a.move_to_back(0)
+    assert list(a) == [1, 2, 0]
+    a.remove(2)
+    assert list(a) == [1, 0]
+    assert a.pop_front() == 1
+    assert list(a) == [0] and list(b) == [3]
+    arena.reserve(10)
+    a.push_back(9)
+    assert list(a) == [0, 9]
+
+
+def test_count_min_sketch_ages():
+    sketch = CountMinSketch(width=64, sample_size=100)
+    for _ in range(10):
+        sketch.increment(42)
+    assert sketch.estimate(42) == 10
+    for kid in range(90):
+        sketch.increment(1000 + kid)
+    assert sketch.estimate(42) <= 5
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from cache_eviction_simulator.engine import intern_trace
+from cache_eviction_simulator.mrc import ReuseDistanceHistogram, exact_mrc, shards_mrc, summarize_curve
+from cache_eviction_simulator.policies import LRUCache
+from cache_eviction_simulator.simulator import CacheSimulator
+
+
+def _zipf_trace(n=3000, keys=200, seed=3):
+    rng = random.Random(seed)
+    return [(f"k{int(rng.paretovariate(0.7)) % keys}", 1) for _ in range(n)]
+
+
+def test_reuse_distances():
+    hist = ReuseDistanceHistogram()
+    for key in "abcab":
+        hist.observe(key)
+    assert hist.cold_misses == 3
+    assert hist.histogram == {2: 2}  # a: b,c in between; b: c,a in between
+
+
+def test_exact_mrc_matches_lru_replay():
+    accesses = _zipf_trace()
+    curve = exact_mrc(intern_trace(accesses))
+    assert len(curve) == len({k for k, _ in accesses})
+    for capacity in (1, 5, 20, 80, len(curve)):
+        stats = CacheSimulator(LRUCache, capacity).simulate(accesses)  # unit sizes: bytes == items
+        assert curve[capacity - 1][1] == pytest.approx(1 - stats["hit_rate"])
+
+
+def test_mrc_monotone_and_ends_at_cold_misses():
+    accesses = _zipf_trace()
+    curve = exact_mrc(intern_trace(accesses))
+    ratios = [m for _, m in curve]
+    assert all(a >= b for a, b in zip(ratios, ratios[1:]))
+    assert ratios[-1] == pytest.approx(len(curve) / len(accesses))
+
+
+def test_shards_full_rate_is_exact():
+    accesses = _zipf_trace()
+    assert shards_mrc(iter(accesses), 1.0) == exact_mrc(intern_trace(accesses))
+
+
+def test_shards_sampled_is_close():
+    accesses = _zipf_trace(n=40000, keys=5000)
+    exact = dict(exact_mrc(intern_trace(accesses)))
+    approx = dict(shards_mrc(iter(accesses), 0.2))
+    for capacity in (50, 200, 500):
+        assert approx[capacity] == pytest.approx(exact[capacity], abs=0.05)
+
+
+def test_shards_rejects_bad_rate():
+    with pytest.raises(ValueError):
+        shards_mrc([], 0)
+
+
+def test_shards_tiny_rate_clamps():
+    curve = shards_mrc(iter(_zipf_trace()), 1e-12)
+    assert all(0 <= ratio <= 1 for _, ratio in curve)
+
+
+def test_summarize_curve_keeps_endpoints():
+    curve = [(c, 1 / c) for c in range(1, 1001)]
+    points = summarize_curve(curve, points=10)
+    assert points[0][0] == 1 and points[-1][0] == 1000
+    assert len(points) <= 11
@@ -1,9 +1,23 @@
+import random
+
 import pytest
 
-from cache_eviction_simulator.policies import LRUCache, LFUCache, FIFOCache, RandomCache
+from cache_eviction_simulator.policies import (
+    LRUCache,
+    LFUCache,
+    FIFOCache,
+    RandomCache,
+    ClockCache,
+    ARCCache,
+    TwoQCache,
+    S3FIFOCache,
+    TinyLFUCache,
+)
+
+ALL_POLICIES = [LRUCache, LFUCache, FIFOCache, RandomCache, ClockCache, ARCCache, TwoQCache, S3FIFOCache, TinyLFUCache]
 
 
-@pytest.fixture(params=[LRUCache, LFUCache, FIFOCache, RandomCache])
+@pytest.fixture(params=ALL_POLICIES)
 def cache(request):
     return request.param(400)
 
@@ -15,6 +29,17 @@ def test_basic_miss(cache):
     assert cache.evictions == 0
 
 
+def test_hit_unknown_key_raises(cache):
+    cache.miss("a", 300)
+    cache.miss("b", 300)  # evicts a
+    with pytest.raises(KeyError):
+        cache.hit("never-seen")
+    with pytest.raises(KeyError):
+        cache.hit("a")
+    cache.hit("b")
+    assert cache.has("b") and cache.current_size == 300
+
+
 def test_lru_promotion():
     cache = LRUCache(300)
     cache.miss("a", 100)
@@ -58,4 +83,83 @@ def test_overflow_bytes(cache):
     cache.miss("large", 500)
     cache.miss("small", 100)  # evict large
     assert not cache.has("large")
-    assert cache.has("small")
\ No newline at end of file
+    assert cache.has("small")
+
+
+def test_lfu_evicts_after_bucket_empties():
+    cache = LFUCache(200)
+    cache.miss("a", 100)
+    cache.miss("b", 100)
+    cache.hit("a")
+    cache.hit("b")  # freq-1 bucket now empty, min_freq must move to 2
+    cache.hit("a")
+    cache.miss("c", 100)  # evict b (freq 2 < freq 3)
+    assert not cache.has("b")
+    assert cache.has("a") and cache.has("c")
+
+
+def test_clock_second_chance():
+    cache = ClockCache(300)
+    for key in "abc":
+        cache.miss(key, 100)
+    cache.hit("a")
+    cache.miss("d", 100)  # a has its reference bit set, b goes
+    assert cache.has("a")
+    assert not cache.has("b")
+
+
+def test_s3fifo_ghost_readmits_to_main():
+    cache = S3FIFOCache(1000)
+    cache.miss("a", 100)
+    for i in range(10):
+        cache.miss(f"x{i}", 100)  # a is a one-hit wonder, demoted to ghost
+    assert not cache.has("a")
+    cache.miss("a", 100)
+    assert cache._where[cache.interner.lookup("a")] == cache._MAIN
+
+
+def test_tinylfu_rejects_cold_candidates():
+    cache = TinyLFUCache(1000)
+    for key in "abcdefghij":
+        cache.miss(key, 100)
+        for _ in range(3):
+            cache.hit(key)
+    cache.miss("cold", 100)
+    cache.miss("cold2", 100)  # cold was seen once: rejected at admission
+    assert not cache.has("cold")
+    assert all(cache.has(key) for key in "abcdefghi")
+    assert cache.rejections >= 1
+
+
+def test_arc_adapts_on_ghost_hit():
+    cache = ARCCache(300)
+    for key in "abcd":
+        cache.miss(key, 100)  # a falls into B1
+    assert not cache.has("a")
+    cache.miss("a", 100)
+    assert cache.p > 0
+    assert cache._where[cache.interner.lookup("a")] == 2  # T2
+
+
+def test_twoq_promotes_from_a1out():
+    cache = TwoQCache(400)
+    for key in "abcde":
+        cache.miss(key, 100)  # a leaves A1in for the A1out ghost queue
+    cache.miss("a", 100)
+    assert cache._where[cache.interner.lookup("a")] == cache._AM
+
+
+@pytest.mark.parametrize("policy_cls", ALL_POLICIES)
+def test_size_invariant_under_churn(policy_cls):
+    rng = random.Random(7)
+    cache = policy_cls(5000)
+    for _ in range(5000):
+        key = f"k{int(rng.paretovariate(1.2)) % 300}"
+        if cache.has(key):
+            cache.hit(key)
+        else:
+            cache.miss(key, rng.randint(1, 400))
+        assert cache.current_size <= 5000 + 400
+    resident = [k for k in range(len(cache.interner)) if cache._resident[k]]
+    assert cache.current_size == sum(cache._sizes[k] for k in resident)
+    assert cache.get_stats()["final_items"] == len(resident)
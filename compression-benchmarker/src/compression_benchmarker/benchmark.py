@@ -1,16 +1,83 @@
+import re
 import time
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
 
-from .compressors import Compressor
+import zstandard as zstd_
+
+from .compressors import Compressor, ZstdCompressor
+
+
+class PeakRSS:
+    """
+    Peak resident memory added while the block runs, in bytes.
+
+    Linux only: resets the kernel's high-water mark through
+    /proc/self/clear_refs (since 4.0) and reads VmHWM afterwards. Elsewhere
+    `delta` stays None. Covers memory that C libraries allocate themselves,
+    which tracemalloc cannot see.
+    """
+
+    _STATUS = Path("/proc/self/status")
+    _CLEAR = Path("/proc/self/clear_refs")
+
+    def __init__(self) -> None:
+        self.delta: Optional[int] = None
+        self._base: Optional[int] = None
+
+    @classmethod
+    def _read_kib(cls, field: str) -> int:
+        match = re.search(rf"^{field}:\s+(\d+) kB", cls._STATUS.read_text(), re.M)
+        if match is None:
+            raise OSError(f"{field} missing")
+        return int(match.group(1))
+
+    def __enter__(self) -> "PeakRSS":
+        try:
+            self._CLEAR.write_text("5")
+            self._base = self._read_kib("VmRSS")
+        except OSError:
+            self._base = None
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if self._base is not None:
+            try:
+                self.delta = max(0, self._read_kib("VmHWM") - self._base) * 1024
+            except OSError:
+                self.delta = None
+
+
+def peak_rss_mib(rss: PeakRSS) -> Optional[float]:
+    return None if rss.delta is None else rss.delta / 1024**2
+
+
+def rates(orig_bytes: int, comp_size: float, comp_sec: float, decomp_sec: float) -> Dict[str, float]:
+    orig_mb = orig_bytes / 1e6
+    return {
+        "comp_size": comp_size,
+        "size_pct": (1 - comp_size / orig_bytes) * 100,
+        "comp_time_ms": comp_sec * 1000,
+        "decomp_time_ms": decomp_sec * 1000,
+        "comp_mbps": orig_mb / comp_sec if comp_sec > 0 else float("inf"),
+        "decomp_mbps": orig_mb / decomp_sec if decomp_sec > 0 else float("inf"),
+    }
 
 
 def benchmark_compressor(
     comp: Compressor, data: bytes, runs: int = 3
-) -> Dict[str, float]:
-    """Benchmark one compressor (avg over `runs`)."""
+) -> Dict[str, Any]:
+    """Benchmark one compressor (avg over `runs`), with its peak RSS."""
     if not data:
         raise ValueError("Empty data")
 
+    with PeakRSS() as rss:
+        res = _timed_runs(comp, data, runs)
+    res["peak_rss_mib"] = peak_rss_mib(rss)
+    return res
+
+
+def _timed_runs(comp: Compressor, data: bytes, runs: int) -> Dict[str, Any]:
     comp_times_ms: list[float] = []
     decomp_times_ms: list[float] = []
     comp_sizes: list[float] = []
@@ -33,20 +100,60 @@ def benchmark_compressor(
     avg_comp_ms = sum(comp_times_ms) / runs
     avg_decomp_ms = sum(decomp_times_ms) / runs
 
-    comp_sec = avg_comp_ms / 1000
-    decomp_sec = avg_decomp_ms / 1000
+    return rates(len(data), avg_comp_size, avg_comp_ms / 1000, avg_decomp_ms / 1000)
 
-    orig_mb = len(data) / 1e6
-    comp_mbps = orig_mb / comp_sec if comp_sec > 0 else float("inf")
-    decomp_mbps = orig_mb / decomp_sec if decomp_sec > 0 else float("inf")
 
-    size_pct = (1 - avg_comp_size / len(data)) * 100
+def split_records(data: bytes, sep: bytes = b"\n") -> List[bytes]:
+    return [r for r in data.split(sep) if r]
 
-    return {
-        "comp_size": avg_comp_size,
-        "size_pct": size_pct,
-        "comp_time_ms": avg_comp_ms,
-        "decomp_time_ms": avg_decomp_ms,
-        "comp_mbps": comp_mbps,
-        "decomp_mbps": decomp_mbps,
-    }
+
+def benchmark_dictionary(
+    records: Sequence[bytes], level: int, dict_size: int = 112_640, runs: int = 3
+) -> List[Dict[str, Any]]:
+    """
+    Compress small records one at a time with zstd, without and with a
+    trained dictionary. The dictionary is trained on every 5th record and
+    both variants are measured on the rest, so it never sees its test data.
+    """
+    train, test = list(records[::5]), [r for i, r in enumerate(records) if i % 5]
+    if len(train) < 10 or not test:
+        raise ValueError("Dictionary training needs at least 50 records")
+    try:
+        dictionary = zstd_.train_dictionary(dict_size, train, level=level)
+    except zstd_.ZstdError as e:
+        raise ValueError(f"Dictionary training failed: {e}") from e
+
+    orig = sum(len(r) for r in test)
+    results = []
+    for dict_data, label in ((None, "none"), (dictionary, f"{len(dictionary.as_bytes()) // 1024} KiB")):
+        comp = ZstdCompressor(level, dict_data=dict_data)
+        with PeakRSS() as rss:
+            comp_sec = decomp_sec = 0.0
+            comp_size = 0
+            for _ in range(runs):
+                t0 = time.perf_counter()
+                frames = [comp.compress(r) for r in test]
+                t1 = time.perf_counter()
+                for f in frames:
+                    comp.decompress(f)
+                t2 = time.perf_counter()
+                comp_sec += t1 - t0
+                decomp_sec += t2 - t1
+                comp_size = sum(len(f) for f in frames)
+        res = rates(orig, comp_size, comp_sec / runs, decomp_sec / runs)
+        res.update({"algo": "zstd", "level": level, "mode": "records", "dict": label,
+                    "records": len(test), "peak_rss_mib": peak_rss_mib(rss)})
+        results.append(res)
+    return results
+
+
+def mark_pareto(results: List[Dict[str, Any]]) -> None:
+    """
+    Set `pareto` on each result: True when no other config is at least as
+    good on both ratio (size_pct) and compression MB/s and better on one.
+    """
+    ordered = sorted(results, key=lambda r: (-r["comp_mbps"], -r["size_pct"]))
+    best_ratio = float("-inf")
+    for r in ordered:
+        r["pareto"] = r["size_pct"] > best_ratio
+        best_ratio = max(best_ratio, r["size_pct"])
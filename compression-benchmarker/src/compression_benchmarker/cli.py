@@ -1,17 +1,21 @@
 import sys
 import typer
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List
 
-from .benchmark import benchmark_compressor
+from rich.console import Console
+
+from .benchmark import benchmark_compressor, benchmark_dictionary, mark_pareto, split_records
 from .compressors import get_compressor
 from .output import print_results
+from .streaming import benchmark_stream, spool
 
 app = typer.Typer(
     name="compression-benchmarker",
     add_completion=False,
     context_settings={"help_option_names": ["-h", "--help"]},
 )
+console = Console()
 
 DEFAULT_LEVELS: Dict[str, List[int]] = {
     "gzip": [1, 6, 9],
@@ -22,14 +26,53 @@ DEFAULT_LEVELS: Dict[str, List[int]] = {
     "lz4": [0, 4, 9, 12],
 }
 
+# `--levels all`: every level, for a full ratio vs. speed Pareto frontier
+ALL_LEVELS: Dict[str, List[int]] = {
+    "gzip": list(range(1, 10)),
+    "bz2": list(range(1, 10)),
+    "lzma": list(range(0, 10)),
+    "brotli": list(range(0, 12)),
+    "zstd": [-5, -1] + list(range(1, 23)),
+    "lz4": list(range(0, 13)),
+}
+
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def parse_size(text: str) -> int:
+    """'64K', '1M', '4096' -> bytes."""
+    text = text.strip().upper().removesuffix("B").removesuffix("I")
+    unit = text[-1:] if text[-1:] in _UNITS else ""
+    try:
+        return int(float(text[: len(text) - len(unit)]) * _UNITS[unit])
+    except ValueError:
+        raise typer.BadParameter(f"Invalid size: {text}")
+
+
+@app.callback()
+def main() -> None:
+    """Benchmark compression algorithms to find optimal size/speed tradeoffs."""
+
+
+def _fail(message: str) -> None:
+    console.print(f"[red]Error: {message}[/]")
+    raise typer.Exit(code=1)
+
+
 @app.command("bench", help="Benchmark compression algorithms on file or stdin")
 def bench(
     input_path: str = typer.Argument("-", help="File path or '-' for stdin"),
     algorithms: str = typer.Option("all", "--algo", help="Algos ('all' or comma-sep): gzip,bz2,lzma,brotli,zstd,lz4"),
-    levels: str = typer.Option("auto", "--levels", help="Levels ('auto' or comma-sep like '1,6,9')"),
+    levels: str = typer.Option("auto", "--levels", help="Levels ('auto', 'all' for a full sweep, or comma-sep like '1,6,9')"),
     runs: int = typer.Option(3, "--runs", min=1, max=10, help="Benchmark runs per config"),
     output_fmt: str = typer.Option("table", "--output", "-o", help="Output: table,json,csv"),
-    console: typer.Console = typer.console,
+    threads: int = typer.Option(1, "--threads", "-T", min=1, help="zstd worker threads; other algos compress blocks in parallel"),
+    stream: bool = typer.Option(False, "--stream", help="Stream the input in chunks instead of loading it (large corpora)"),
+    frame_sizes: str = typer.Option("0", "--frame-size", help="Stream mode: independent frame sizes to sweep, e.g. '64K,1M,0' (0: one stream)"),
+    read_size: str = typer.Option("1M", "--read-size", help="Stream mode: bytes read per chunk"),
+    dictionary: bool = typer.Option(False, "--dict", help="Compare zstd per-record compression with and without a trained dictionary"),
+    dict_size: str = typer.Option("110K", "--dict-size", help="Dictionary mode: dictionary size"),
+    record_sep: str = typer.Option("\\n", "--record-sep", help="Dictionary mode: record separator"),
 ) -> None:
     """Benchmark compressors on your data."""
 
@@ -37,52 +80,116 @@ def bench(
     algo_list = [a.strip().lower() for a in algorithms.split(",")]
     if "all" in algo_list:
         algo_list = list(DEFAULT_LEVELS.keys())
+    for algo in algo_list:
+        if algo not in DEFAULT_LEVELS:
+            _fail(f"Unknown compressor: {algo}")
 
     # Parse levels
     level_map: Dict[str, List[int]] = {}
     for algo in algo_list:
         if levels == "auto":
             level_map[algo] = DEFAULT_LEVELS.get(algo, [1])
+        elif levels == "all":
+            level_map[algo] = ALL_LEVELS[algo]
         else:
             lvls = [int(l.strip()) for l in levels.split(",")]
             level_map[algo] = lvls
 
-    # Read data
-    if input_path == "-":
-        data = sys.stdin.buffer.read()
-        source = "stdin"
+    if dictionary:
+        level_map = {"zstd": level_map.get("zstd", DEFAULT_LEVELS["zstd"])}
+
+    path = None if input_path == "-" else Path(input_path)
+    if path is not None and not path.is_file():
+        _fail(f"'{input_path}' is not a file")
+
+    if stream:
+        results, orig_size = _run_stream(path, level_map, runs, threads,
+                                         [parse_size(f) for f in frame_sizes.split(",")], parse_size(read_size))
     else:
-        p = Path(input_path)
-        if not p.is_file():
-            raise typer.BadParameter(f"'{input_path}' is not a file")
-        data = p.read_bytes()
-        source = p.name
+        # Read data
+        if path is None:
+            data = sys.stdin.buffer.read()
+            source = "stdin"
+        else:
+            data = path.read_bytes()
+            source = path.name
 
-    orig_size = len(data)
-    if orig_size == 0:
-        raise typer.Exit(code=1, message="No data to benchmark")
+        orig_size = len(data)
+        if orig_size == 0:
+            _fail("No data to benchmark")
+
+        if orig_size > 2 * 1024**3:
+            console.print("[bold yellow]⚠️  Large file (>2GB): consider --stream.[/]")
 
-    if orig_size > 2 * 1024**3:
-        console.print("[bold yellow]⚠️  Large file (>2GB): Benchmarks accurate, but slow.[/]", emoji="warn")
+        console.print(f"[cyan]Benchmarking {orig_size / 1024**2:.1f} MiB from {source}[/]")
 
-    console.print(f"[info]Benchmarking {orig_size / 1024**2:.1f} MiB from {source}[/]")
+        if dictionary:
+            sep = record_sep.encode().decode("unicode_escape").encode("latin-1")
+            results = _run_dictionary(split_records(data, sep), level_map["zstd"], parse_size(dict_size), runs)
+        else:
+            results = _run_oneshot(data, level_map, runs, threads)
 
-    # Run benchmarks
+    mark_pareto(results)
+    print_results(results, orig_size, output_fmt, console)
+
+
+def _run_oneshot(data: bytes, level_map: Dict[str, List[int]], runs: int, threads: int) -> List[Dict[str, Any]]:
     results = []
     with console.status("[bold green]Compressing..."):
         for algo, lvls in level_map.items():
             for lvl in lvls:
                 try:
-                    comp = get_compressor(algo, lvl)
+                    comp = get_compressor(algo, lvl, threads)
                     res = benchmark_compressor(comp, data, runs)
-                    res["algo"] = algo
-                    res["level"] = lvl
+                    res.update({"algo": algo, "level": lvl, "mode": "oneshot", "threads": threads})
                     results.append(res)
                 except Exception as e:
-                    console.print(f"[red]Error on {algo}-{lvl}: {e}[/]", emoji="cross")
+                    console.print(f"[red]Error on {algo}-{lvl}: {e}[/]")
                     continue
+    return results
+
+
+def _run_stream(
+    path: Any, level_map: Dict[str, List[int]], runs: int, threads: int, frame_sizes: List[int], read_size: int
+) -> tuple[List[Dict[str, Any]], int]:
+    spooled = None
+    if path is None:
+        spooled = path = spool(sys.stdin.buffer, read_size)
+    orig_size = path.stat().st_size
+    if orig_size == 0:
+        _fail("No data to benchmark")
+    console.print(f"[cyan]Streaming {orig_size / 1024**2:.1f} MiB in {read_size // 1024} KiB chunks[/]")
+    results = []
+    try:
+        with console.status("[bold green]Streaming..."):
+            for algo, lvls in level_map.items():
+                for lvl in lvls:
+                    for frame_size in frame_sizes:
+                        try:
+                            comp = get_compressor(algo, lvl, threads)
+                            res = benchmark_stream(comp, path, frame_size, read_size, runs)
+                        except Exception as e:
+                            console.print(f"[red]Error on {algo}-{lvl}: {e}[/]")
+                            continue
+                        res.update({"algo": algo, "level": lvl})
+                        results.append(res)
+    finally:
+        if spooled is not None:
+            spooled.unlink()
+    return results, orig_size
+
+
+def _run_dictionary(records: List[bytes], lvls: List[int], dict_size: int, runs: int) -> List[Dict[str, Any]]:
+    console.print(f"[cyan]{len(records)} records, training a {dict_size // 1024} KiB zstd dictionary[/]")
+    results = []
+    with console.status("[bold green]Training and compressing..."):
+        for lvl in lvls:
+            try:
+                results.extend(benchmark_dictionary(records, lvl, dict_size, runs))
+            except ValueError as e:
+                _fail(str(e))
+    return results
 
-    print_results(results, orig_size, output_fmt, console)
 
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    app()
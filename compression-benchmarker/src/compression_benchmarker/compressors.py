@@ -2,16 +2,62 @@ import bz2
 import gzip
 import io
 import lzma
+import struct
+import zlib
 import brotli
 import lz4.frame
 import zstandard as zstd_
 
-from typing import Protocol
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Protocol
+
+
+class StreamCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+
+
+class StreamDecompressor(Protocol):
+    def decompress(self, data: bytes) -> bytes: ...
 
 
 class Compressor(Protocol):
     def compress(self, data: bytes) -> bytes: ...
     def decompress(self, data: bytes) -> bytes: ...
+    def compressobj(self) -> StreamCompressor: ...
+    def decompressobj(self) -> StreamDecompressor: ...
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._c = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.finish()
+
+
+class _BrotliUnstream:
+    def __init__(self) -> None:
+        self._d = brotli.Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._d.process(data)
+
+
+class _Lz4Stream:
+    def __init__(self, level: int):
+        self._c = lz4.frame.LZ4FrameCompressor(compression_level=level)
+        self._header = self._c.begin()
+
+    def compress(self, data: bytes) -> bytes:
+        header, self._header = self._header, b""
+        return header + self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._header + self._c.flush()
 
 
 class GzipCompressor:
@@ -24,6 +70,12 @@ class GzipCompressor:
     def decompress(self, data: bytes) -> bytes:
         return gzip.decompress(data)
 
+    def compressobj(self) -> StreamCompressor:
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)  # 31: gzip container
+
+    def decompressobj(self) -> StreamDecompressor:
+        return zlib.decompressobj(31)
+
 
 class Bz2Compressor:
     def __init__(self, level: int = 6):
@@ -35,6 +87,12 @@ class Bz2Compressor:
     def decompress(self, data: bytes) -> bytes:
         return bz2.decompress(data)
 
+    def compressobj(self) -> StreamCompressor:
+        return bz2.BZ2Compressor(self.level)
+
+    def decompressobj(self) -> StreamDecompressor:
+        return bz2.BZ2Decompressor()
+
 
 class LzmaCompressor:
     def __init__(self, level: int = 6):
@@ -46,6 +104,12 @@ class LzmaCompressor:
     def decompress(self, data: bytes) -> bytes:
         return lzma.decompress(data)
 
+    def compressobj(self) -> StreamCompressor:
+        return lzma.LZMACompressor(preset=self.level)
+
+    def decompressobj(self) -> StreamDecompressor:
+        return lzma.LZMADecompressor()
+
 
 class BrotliCompressor:
     def __init__(self, level: int = 6):
@@ -57,17 +121,34 @@ class BrotliCompressor:
     def decompress(self, data: bytes) -> bytes:
         return brotli.decompress(data)
 
+    def compressobj(self) -> StreamCompressor:
+        return _BrotliStream(self.quality)
+
+    def decompressobj(self) -> StreamDecompressor:
+        return _BrotliUnstream()
+
 
 class ZstdCompressor:
-    def __init__(self, level: int = 3):
+    """zstd; `threads` > 1 uses libzstd's own worker threads, `dict_data` a trained dictionary."""
+
+    def __init__(self, level: int = 3, threads: int = 0, dict_data: Optional[zstd_.ZstdCompressionDict] = None):
         self.level = max(-131072, min(22, level))  # zstd range
-        self._cctx = zstd_.ZstdCompressor(level=self.level)
+        self.threads = threads if threads > 1 else 0
+        self.dict_data = dict_data
+        self._cctx = zstd_.ZstdCompressor(level=self.level, threads=self.threads, dict_data=dict_data)
+        self._dctx = zstd_.ZstdDecompressor(dict_data=dict_data)
 
     def compress(self, data: bytes) -> bytes:
         return self._cctx.compress(data)
 
     def decompress(self, data: bytes) -> bytes:
-        return zstd_.ZstdDecompressor().decompress(data)
+        return self._dctx.decompress(data)
+
+    def compressobj(self) -> StreamCompressor:
+        return self._cctx.compressobj()
+
+    def decompressobj(self) -> StreamDecompressor:
+        return self._dctx.decompressobj()
 
 
 class Lz4Compressor:
@@ -80,20 +161,74 @@ class Lz4Compressor:
     def decompress(self, data: bytes) -> bytes:
         return lz4.frame.decompress(data)
 
+    def compressobj(self) -> StreamCompressor:
+        return _Lz4Stream(self.level)
+
+    def decompressobj(self) -> StreamDecompressor:
+        return lz4.frame.LZ4FrameDecompressor()
+
+
+class ParallelBlockCompressor:
+    """
+    pigz-style: split the input into `block_size` blocks and compress them
+    independently on `threads` threads (all wrapped libraries release the
+    GIL). Output is a block count followed by length-prefixed frames, so
+    decompression is parallel too. Ratio drops slightly as blocks shrink.
+    """
 
-def get_compressor(algo: str, level: int) -> Compressor:
+    def __init__(self, inner: Compressor, threads: int, block_size: int = 1 << 20):
+        self.inner = inner
+        self.threads = threads
+        self.block_size = block_size
+        self.level = getattr(inner, "level", getattr(inner, "quality", 0))
+
+    def compress(self, data: bytes) -> bytes:
+        view = memoryview(data)
+        blocks = [view[i:i + self.block_size] for i in range(0, len(data), self.block_size)]
+        with ThreadPoolExecutor(self.threads) as pool:
+            frames = list(pool.map(self.inner.compress, blocks))
+        out = [struct.pack("<I", len(frames))]
+        for frame in frames:
+            out.append(struct.pack("<Q", len(frame)))
+            out.append(frame)
+        return b"".join(out)
+
+    def decompress(self, data: bytes) -> bytes:
+        view = memoryview(data)
+        (count,) = struct.unpack_from("<I", view)
+        pos, frames = 4, []
+        for _ in range(count):
+            (size,) = struct.unpack_from("<Q", view, pos)
+            frames.append(view[pos + 8:pos + 8 + size])
+            pos += 8 + size
+        with ThreadPoolExecutor(self.threads) as pool:
+            return b"".join(pool.map(self.inner.decompress, frames))
+
+    def compressobj(self) -> StreamCompressor:
+        return self.inner.compressobj()
+
+    def decompressobj(self) -> StreamDecompressor:
+        return self.inner.decompressobj()
+
+
+def get_compressor(algo: str, level: int, threads: int = 1) -> Compressor:
+    """
+    `threads` > 1: zstd uses its native multi-threading, every other
+    algorithm is wrapped in a ParallelBlockCompressor.
+    """
     algo = algo.lower()
+    if algo == "zstd":
+        return ZstdCompressor(level, threads)
     if algo == "gzip":
-        return GzipCompressor(level)
+        comp: Compressor = GzipCompressor(level)
     elif algo == "bz2":
-        return Bz2Compressor(level)
+        comp = Bz2Compressor(level)
     elif algo == "lzma":
-        return LzmaCompressor(level)
+        comp = LzmaCompressor(level)
     elif algo == "brotli":
-        return BrotliCompressor(level)
-    elif algo == "zstd":
-        return ZstdCompressor(level)
+        comp = BrotliCompressor(level)
     elif algo == "lz4":
-        return Lz4Compressor(level)
+        comp = Lz4Compressor(level)
     else:
         raise ValueError(f"Unknown compressor: {algo}")
+    return ParallelBlockCompressor(comp, threads) if threads > 1 else comp
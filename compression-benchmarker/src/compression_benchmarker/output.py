@@ -8,6 +8,26 @@ from rich.console import Console
 from rich.table import Table
 
 
+def _size(n: int) -> str:
+    for unit, scale in (("G", 1024**3), ("M", 1024**2), ("K", 1024)):
+        if n >= scale and n % scale == 0:
+            return f"{n // scale}{unit}"
+    return str(n)
+
+
+def _mode(r: dict[str, Any]) -> str:
+    mode = r.get("mode", "oneshot")
+    if mode == "stream":
+        return f"stream/{_size(r['frame_size'])}" if r.get("frame_size") else "stream"
+    if mode == "records":
+        return f"dict {r['dict']}"
+    return mode
+
+
+def _rss(r: dict[str, Any]) -> str:
+    return "-" if r.get("peak_rss_mib") is None else f"{r['peak_rss_mib']:.1f}"
+
+
 def print_results(
     results: list[dict[str, Any]], orig_size: int, fmt: str, console: Console
 ) -> None:
@@ -23,24 +43,32 @@ def print_results(
         )
         table.add_column("Algo", style="cyan", no_wrap=True)
         table.add_column("Level", justify="right")
+        table.add_column("Mode")
+        table.add_column("Thr", justify="right")
         table.add_column("Size %", justify="right")
         table.add_column("Comp Size KiB", justify="right")
         table.add_column("Comp ms", justify="right")
         table.add_column("Decomp ms", justify="right")
         table.add_column("Comp MB/s", justify="right")
         table.add_column("Decomp MB/s", justify="right")
+        table.add_column("Peak RSS MiB", justify="right")
+        table.add_column("★", justify="center")
 
         for r in results:
             size_kib = r["comp_size"] / 1024
             table.add_row(
                 r["algo"],
                 str(r["level"]),
+                _mode(r),
+                str(r.get("threads", 1)),
                 f"{r['size_pct']:.1f}%",
                 f"{size_kib:.1f}",
                 f"{r['comp_time_ms']:.1f}",
                 f"{r['decomp_time_ms']:.1f}",
                 f"{r['comp_mbps']:.1f}",
                 f"{r['decomp_mbps']:.1f}",
+                _rss(r),
+                "★" if r.get("pareto") else "",
             )
 
         console.print(table)
@@ -51,6 +79,12 @@ def print_results(
             console.print(
                 f"\n[bold green]🏆 Best ratio:[/bold green] {best_ratio['algo']}-{best_ratio['level']} ({best_ratio['size_pct']:.1f}% ) [bold blue]⚡ Fastest comp:[/bold blue] {best_speed['algo']}-{best_speed['level']} ({best_speed['comp_mbps']:.1f} MB/s)"
             )
+            frontier = sorted((r for r in results if r.get("pareto")), key=lambda r: r["comp_mbps"])
+            if frontier:
+                console.print(
+                    "[bold]★ Pareto frontier (ratio vs. comp MB/s):[/bold] "
+                    + " → ".join(f"{r['algo']}-{r['level']} {_mode(r)}" for r in frontier)
+                )
 
     elif fmt == "json":
         out = {
@@ -69,9 +103,15 @@ def print_results(
             "decomp_time_ms",
             "comp_mbps",
             "decomp_mbps",
+            "mode",
+            "threads",
+            "frame_size",
+            "dict",
+            "peak_rss_mib",
+            "pareto",
         ]
         sio = StringIO()
-        writer = csv.DictWriter(sio, fieldnames=fields)
+        writer = csv.DictWriter(sio, fieldnames=fields, extrasaction="ignore")
         writer.writeheader()
         writer.writerows(results)
         console.print(sio.getvalue())
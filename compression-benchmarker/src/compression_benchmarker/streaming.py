@@ -0,0 +1,150 @@
+"""
+Chunked streaming benchmark for inputs too large to hold in memory.
+
+The input is read in `read_size` pieces and compressed to a temporary file,
+then that file is read back and decompressed, so memory stays bounded by
+the chunk and frame sizes rather than the input size.
+
+`frame_size` 0 runs one continuous stream through the compressor's
+streaming API. A positive `frame_size` cuts the input into independent
+frames of that many bytes (what seekable/splittable formats do): ratio
+drops as frames shrink, but frames can be compressed and decompressed in
+parallel, which a ParallelBlockCompressor does on its `threads`.
+"""
+import struct
+import tempfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any, Callable, Deque, Dict, Iterator, List
+
+from .benchmark import PeakRSS, peak_rss_mib, rates
+from .compressors import Compressor, ParallelBlockCompressor
+
+READ_SIZE = 1 << 20
+
+
+def iter_chunks(f: IO[bytes], size: int) -> Iterator[bytes]:
+    while chunk := f.read(size):
+        yield chunk
+
+
+def iter_frames(chunks: Iterator[bytes], frame_size: int) -> Iterator[bytes]:
+    """Re-cut a stream of chunks into frames of exactly `frame_size` bytes (the last may be short)."""
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk
+        while len(buf) >= frame_size:
+            yield bytes(buf[:frame_size])
+            del buf[:frame_size]
+    if buf:
+        yield bytes(buf)
+
+
+def spool(src: IO[bytes], read_size: int = READ_SIZE) -> Path:
+    """Copy a one-shot stream (stdin) to a temp file so sweeps can re-read it."""
+    with tempfile.NamedTemporaryFile(prefix="cb-input-", delete=False) as out:
+        for chunk in iter_chunks(src, read_size):
+            out.write(chunk)
+    return Path(out.name)
+
+
+def _ordered(pool: ThreadPoolExecutor, fn: Callable[[bytes], bytes], items: Iterator[bytes], depth: int) -> Iterator[bytes]:
+    """pool.map that keeps at most `depth` items in flight (map would read everything)."""
+    pending: Deque[Future] = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= depth:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _compress(comp: Compressor, path: Path, out: IO[bytes], frame_size: int, read_size: int, threads: int) -> tuple[int, int, List[int]]:
+    """Returns (input bytes, crc32 of input, compressed frame lengths)."""
+    total = crc = 0
+    lengths: List[int] = []
+
+    def counted(chunks: Iterator[bytes]) -> Iterator[bytes]:
+        nonlocal total, crc
+        for chunk in chunks:
+            total += len(chunk)
+            crc = zlib.crc32(chunk, crc)
+            yield chunk
+
+    with open(path, "rb") as f:
+        chunks = counted(iter_chunks(f, read_size))
+        if frame_size <= 0:
+            stream = comp.compressobj()
+            size = 0
+            for chunk in chunks:
+                size += out.write(stream.compress(chunk))
+            size += out.write(stream.flush())
+            lengths.append(size)
+        else:
+            with ThreadPoolExecutor(threads) as pool:
+                for frame in _ordered(pool, comp.compress, iter_frames(chunks, frame_size), 2 * threads):
+                    out.write(struct.pack("<Q", len(frame)))
+                    out.write(frame)
+                    lengths.append(len(frame))
+    return total, crc, lengths
+
+
+def _decompress(comp: Compressor, f: IO[bytes], frame_size: int, read_size: int, threads: int) -> tuple[int, int]:
+    """Returns (output bytes, crc32 of output)."""
+    total = crc = 0
+    if frame_size <= 0:
+        stream = comp.decompressobj()
+        for chunk in iter_chunks(f, read_size):
+            data = stream.decompress(chunk)
+            total += len(data)
+            crc = zlib.crc32(data, crc)
+        return total, crc
+
+    def frames() -> Iterator[bytes]:
+        while header := f.read(8):
+            (size,) = struct.unpack("<Q", header)
+            yield f.read(size)
+
+    with ThreadPoolExecutor(threads) as pool:
+        for data in _ordered(pool, comp.decompress, frames(), 2 * threads):
+            total += len(data)
+            crc = zlib.crc32(data, crc)
+    return total, crc
+
+
+def benchmark_stream(
+    comp: Compressor, path: Path, frame_size: int = 0, read_size: int = READ_SIZE, runs: int = 1
+) -> Dict[str, Any]:
+    """Stream `path` through `comp` (avg over `runs`); times include reading and writing."""
+    inner, threads = comp, 1
+    if isinstance(comp, ParallelBlockCompressor):
+        inner, threads = comp.inner, comp.threads
+        if frame_size <= 0:
+            threads = 1  # one continuous stream cannot be split across threads
+
+    comp_sec = decomp_sec = 0.0
+    with PeakRSS() as rss, tempfile.TemporaryFile(prefix="cb-stream-") as tmp:
+        for _ in range(runs):
+            tmp.seek(0)
+            tmp.truncate()
+            t0 = time.perf_counter()
+            orig, crc, lengths = _compress(inner, path, tmp, frame_size, read_size, threads)
+            tmp.flush()
+            t1 = time.perf_counter()
+            tmp.seek(0)
+            out, out_crc = _decompress(inner, tmp, frame_size, read_size, threads)
+            t2 = time.perf_counter()
+            if (out, out_crc) != (orig, crc):
+                raise RuntimeError("Round trip mismatch")
+            comp_sec += t1 - t0
+            decomp_sec += t2 - t1
+
+    if orig == 0:
+        raise ValueError("Empty data")
+    res = rates(orig, sum(lengths), comp_sec / runs, decomp_sec / runs)
+    res.update({"mode": "stream", "frame_size": frame_size, "frames": len(lengths),
+                "threads": max(threads, getattr(inner, "threads", 0)), "peak_rss_mib": peak_rss_mib(rss)})
+    return res
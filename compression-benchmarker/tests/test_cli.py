@@ -38,3 +38,16 @@ def test_invalid_algo():
     result = runner.invoke(app, ["bench", "tests/nonexistent.txt", "--algo", "foo"])
     assert result.exit_code != 0
     assert "Unknown compressor" in result.stdout
+
+
+def test_stream_frame_sweep(sample_file):
+    result = runner.invoke(app, ["bench", sample_file, "--algo", "zstd", "--levels", "1", "--stream",
+                                 "--frame-size", "0,16K", "--output", "csv"])
+    assert result.exit_code == 0
+    assert "stream" in result.stdout and "16384" in result.stdout
+
+
+def test_levels_all_marks_pareto(sample_file):
+    result = runner.invoke(app, ["bench", sample_file, "--algo", "lz4", "--levels", "all", "--runs", "1"])
+    assert result.exit_code == 0
+    assert "Pareto frontier" in result.stdout
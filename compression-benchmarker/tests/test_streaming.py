@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from compression_benchmarker.benchmark import PeakRSS, benchmark_dictionary, mark_pareto
+from compression_benchmarker.compressors import ParallelBlockCompressor, get_compressor
+from compression_benchmarker.streaming import benchmark_stream, iter_frames
+
+
+@pytest.fixture
+def sample_path(tmp_path):
+    f = tmp_path / "data.bin"
+    f.write_bytes(b"streaming data " * 20000 + os.urandom(5000))
+    return f
+
+
+@pytest.mark.parametrize("algo", ["gzip", "bz2", "lzma", "brotli", "zstd", "lz4"])
+def test_stream_objects_roundtrip(algo):
+    comp = get_compressor(algo, 3)
+    data = b"chunk of text " * 5000
+    c = comp.compressobj()
+    blob = b"".join(c.compress(data[i:i + 4096]) for i in range(0, len(data), 4096)) + c.flush()
+    d = comp.decompressobj()
+    assert b"".join(d.decompress(blob[i:i + 1000]) for i in range(0, len(blob), 1000)) == data
+
+
+def test_iter_frames_recuts_chunks():
+    frames = list(iter_frames(iter([b"abc", b"defgh", b"ij"]), 4))
+    assert frames == [b"abcd", b"efgh", b"ij"]
+
+
+@pytest.mark.parametrize("frame_size", [0, 64 * 1024])
+@pytest.mark.parametrize("threads", [1, 3])
+def test_benchmark_stream(sample_path, frame_size, threads):
+    res = benchmark_stream(get_compressor("gzip", 6, threads), sample_path, frame_size, read_size=8192)
+    assert res["size_pct"] > 0
+    assert res["comp_mbps"] > 0
+    assert res["frames"] == (1 if frame_size == 0 else 5)
+    assert res["threads"] == (threads if frame_size else 1)
+
+
+def test_zstd_native_threads(sample_path):
+    res = benchmark_stream(get_compressor("zstd", 3, 2), sample_path)
+    assert res["threads"] == 2
+
+
+@pytest.mark.parametrize("algo", ["gzip", "lz4"])
+def test_parallel_block_roundtrip(algo):
+    comp = get_compressor(algo, 6, threads=4)
+    assert isinstance(comp, ParallelBlockCompressor)
+    comp.block_size = 1000
+    data = bytes(range(256)) * 50
+    assert comp.decompress(comp.compress(data)) == data
+
+
+def test_dictionary_helps_small_records():
+    records = [b'{"id": %d, "event": "login", "user": "user%d", "ok": true}' % (i, i % 37) for i in range(2000)]
+    plain, trained = benchmark_dictionary(records, 3, dict_size=4096, runs=1)
+    assert plain["dict"] == "none"
+    assert trained["size_pct"] > plain["size_pct"]
+
+
+def test_dictionary_needs_records():
+    with pytest.raises(ValueError, match="at least 50 records"):
+        benchmark_dictionary([b"x"] * 10, 3)
+
+
+def test_mark_pareto():
+    results = [
+        {"size_pct": 80, "comp_mbps": 10},
+        {"size_pct": 60, "comp_mbps": 100},
+        {"size_pct": 50, "comp_mbps": 50},  # dominated by the 60% one
+        {"size_pct": 40, "comp_mbps": 500},
+    ]
+    mark_pareto(results)
+    assert [r["pareto"] for r in results] == [True, True, False, True]
+
+
+def test_peak_rss():
+    with PeakRSS() as rss:
+        buf = bytearray(32 * 1024**2)
+        buf[::4096] = b"\1" * len(buf[::4096])
+    if rss.delta is not None:  # Linux only
+        assert rss.delta >= 16 * 1024**2
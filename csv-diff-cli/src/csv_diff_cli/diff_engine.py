@@ -23,7 +23,7 @@ def detect_changes(merged: DataFrame, data_cols: Set[str], tol: float) -> List[D
     Detect changed cells in matched rows.
     """
     changes: List[Dict[str, Any]] = []
-    match_mask = col("key_hash_right").is_not_null()
+    match_mask = col("key_hash").is_not_null() & col("key_hash_right").is_not_null()
 
     for col_name in data_cols:
         col_right = f"{col_name}_right"
@@ -37,7 +37,7 @@ def detect_changes(merged: DataFrame, data_cols: Set[str], tol: float) -> List[D
 
         # Value diff
         dtype_left = merged[col_name].dtype
-        if dtype_left in [float, "f64", "f32"]:
+        if dtype_left.is_float():
             abs_diff = (col(col_name) - col(col_right)).abs()
             mask_val_diff = abs_diff > tol
         else:
@@ -1,10 +1,11 @@
 import typer
 from pathlib import Path
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 
 import rich_click as rclick
 from .core import diff_csvs
-from .renderer import render_diff
+from .renderer import render_diff, render_summary
+from .stream import diff_csvs_streaming
 
 
 app = typer.Typer(help="Precision CSV differ.", no_args_is_help=True)
@@ -17,19 +18,32 @@ def diff(
     file2: Path = typer.Argument(..., exists=True, help="Right CSV file"),
     keys: Annotated[
         List[str],
-        typer.Option([], "-k", "--key", help="Key columns for matching (multi-ok)"),
+        typer.Option("-k", "--key", help="Key columns for matching (multi-ok)"),
     ] = [],
     ignore: Annotated[
         List[str],
-        typer.Option([], "-i", "--ignore", help="Ignore these columns"),
+        typer.Option("-i", "--ignore", help="Ignore these columns"),
     ] = [],
     tol: Annotated[
         float,
-        typer.Option(0.0, "-t", "--tol", help="Numeric tolerance (e.g. 1e-6)"),
+        typer.Option("-t", "--tol", help="Numeric tolerance (e.g. 1e-6)"),
     ] = 0.0,
     output: Annotated[
-        str, typer.Option("table", "-o", "--output", help="table|json")
+        str, typer.Option("-o", "--output", help="table|json")
     ] = "table",
+    stream_to: Annotated[
+        Optional[Path],
+        typer.Option("--stream-to", help="Out-of-core mode: write row/cell diffs here (.jsonl or .parquet)"),
+    ] = None,
+    partitions: Annotated[
+        int, typer.Option("--partitions", help="Streaming: hash partitions spilled to disk")
+    ] = 64,
+    workers: Annotated[
+        int, typer.Option("-j", "--workers", help="Streaming: parallel partition diffs (0 = one per CPU)")
+    ] = 0,
+    spill_dir: Annotated[
+        Optional[Path], typer.Option("--spill-dir", help="Streaming: directory for temporary spill files")
+    ] = None,
 ):
     """
     Diff two CSV files semantically.
@@ -38,6 +52,21 @@ def diff(
         typer.echo("Error: output must be 'table' or 'json'", err=True)
         raise typer.Exit(1)
 
+    if stream_to is not None:
+        result = diff_csvs_streaming(
+            file1=str(file1),
+            file2=str(file2),
+            keys=keys,
+            ignore=ignore,
+            tol=tol,
+            output=stream_to,
+            partitions=partitions,
+            workers=workers,
+            spill_dir=spill_dir,
+        )
+        render_summary(result, output)
+        return
+
     result = diff_csvs(
         file1=str(file1),
         file2=str(file2),
@@ -2,6 +2,7 @@ from typing import Any, Dict
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
+from rich import box
 
 import json
 
@@ -83,4 +84,35 @@ def render_diff(result: Dict[str, Any], fmt: str = "table") -> None:
         console.print("[bold green]✓ No cell differences![/bold green]")
 
     if not any([schema_diff["only_in_1"], schema_diff["only_in_2"], schema_diff["dtype_mismatches"], only_left_count, only_right_count, changes]):
-        console.print("[bold green]✓ Files are identical![/bold green]")
\ No newline at end of file
+        console.print("[bold green]✓ Files are identical![/bold green]")
+
+
+def render_summary(result: Dict[str, Any], fmt: str = "table") -> None:
+    """
+    Render a streaming diff's schema diff and stats; rows live in result["output"].
+    """
+    if fmt == "json":
+        print(json.dumps(result, default=str, indent=2))
+        return
+
+    console = Console()
+    console.print(Panel("[bold cyan]CSV Diff Report (streaming)[/bold cyan]", expand=False))
+
+    stats = result["stats"]
+    stats_table = Table("Metric", "Left", "Right", title="Stats", box=box.ROUNDED)
+    stats_table.add_row("Rows", str(stats["rows_left"]), str(stats["rows_right"]))
+    stats_table.add_row("Matches", str(stats["matches"]), str(stats["matches"]))
+    stats_table.add_row("Only Left", str(stats["only_left"]), "")
+    stats_table.add_row("Only Right", "", str(stats["only_right"]))
+    stats_table.add_row("Cell Changes", str(stats["cell_changes"]), "")
+    console.print(stats_table)
+
+    schema_diff = result["schema_diff"]
+    if schema_diff["only_in_1"]:
+        console.print(f"[red]Columns only in left: {', '.join(schema_diff['only_in_1'])}[/red]")
+    if schema_diff["only_in_2"]:
+        console.print(f"[green]Columns only in right: {', '.join(schema_diff['only_in_2'])}[/green]")
+    for col, (left, right) in schema_diff["dtype_mismatches"].items():
+        console.print(f"[yellow]Dtype mismatch {col}: {left} → {right}[/yellow]")
+
+    console.print(f"Row and cell differences written to [bold]{result['output']}[/bold]")
@@ -0,0 +1,245 @@
+"""Out-of-core diff: hash-partition both CSVs to disk, diff partitions in parallel.
+
+Both inputs are read in batches; every batch is keyed with ``compute_key_hash``
+and split by ``hash(key_hash) % partitions`` into Parquet spill files. Rows
+with equal keys always land in the same partition, so each partition pair is
+diffed independently (in a process pool) with the same join/``detect_changes``
+logic as the in-memory path. Per-partition results are written straight to
+disk and concatenated into the JSONL or Parquet output; only the summary
+stats are kept in memory.
+"""
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+import polars as pl
+
+from .diff_engine import compute_key_hash, detect_changes
+from .schema import compare_schemas
+
+PART_COL = "_part"
+BATCH_SIZE = 100_000
+STAT_KEYS = ("rows_left", "rows_right", "matches", "only_left", "only_right", "cell_changes")
+
+# Uniform output record; values are JSON-encoded so Parquet parts share one schema.
+RECORD_SCHEMA = {
+    "kind": pl.String,
+    "key": pl.String,
+    "row_idx": pl.Int64,
+    "col": pl.String,
+    "old": pl.String,
+    "new": pl.String,
+    "row": pl.String,
+}
+
+
+def _scan(path: str, ignore: Set[str]) -> pl.LazyFrame:
+    lf = pl.scan_csv(path, infer_schema_length=50000)
+    drop = [c for c in lf.collect_schema().names() if c in ignore]
+    return lf.drop(drop).with_row_index("row_idx")
+
+
+def _iter_batches(lf: pl.LazyFrame, batch_size: int) -> Iterator[pl.DataFrame]:
+    """Bounded-memory batches from the streaming engine."""
+    if hasattr(lf, "collect_batches"):
+        yield from lf.collect_batches(chunk_size=batch_size)
+        return
+    # polars < 1.34: slice the lazy scan; each slice is a separate streaming query.
+    offset = 0
+    while True:
+        batch = lf.slice(offset, batch_size).collect()
+        if batch.height == 0:
+            return
+        yield batch
+        offset += batch.height
+
+
+def partition_csv(
+    path: str,
+    keys: List[str],
+    ignore: Set[str],
+    spill: Path,
+    partitions: int,
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """Spill `path` into `spill/NNNNN/*.parquet` by key hash; returns the row count."""
+    rows = 0
+    for n, batch in enumerate(_iter_batches(_scan(path, ignore), batch_size)):
+        if keys:
+            batch = compute_key_hash(batch, keys)
+        else:  # positional: the global row index is the key
+            batch = batch.with_columns(pl.col("row_idx").cast(pl.Int64).alias("key_hash"))
+        batch = batch.with_columns((pl.col("key_hash").hash(seed=0) % partitions).alias(PART_COL))
+        for (part,), frame in batch.partition_by(PART_COL, as_dict=True, include_key=False).items():
+            out = spill / f"{part:05d}"
+            out.mkdir(parents=True, exist_ok=True)
+            frame.write_parquet(out / f"{n:06d}.parquet")
+        rows += batch.height
+    return rows
+
+
+def _read_side(spill: Path, schema: Dict[str, pl.DataType]) -> pl.DataFrame:
+    files = sorted(spill.glob("*.parquet")) if spill.is_dir() else []
+    if not files:
+        return pl.DataFrame(schema=schema)
+    return pl.read_parquet(files)
+
+
+def _encode(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value, default=str)
+
+
+def _records(merged: pl.DataFrame, left_cols: List[str], right_cols: List[str], changes) -> Iterator[Dict[str, Any]]:
+    removed = merged.filter(pl.col("key_hash_right").is_null()).select(left_cols)
+    for row in removed.iter_rows(named=True):
+        key = row.pop("key_hash")
+        yield {"kind": "removed", "key": str(key), "row_idx": row.pop("row_idx"), "row": row}
+    added = merged.filter(pl.col("key_hash").is_null()).select(right_cols)
+    for row in added.iter_rows(named=True):
+        key = row.pop("key_hash_right")
+        row_idx = row.pop("row_idx_right")
+        yield {"kind": "added", "key": str(key), "row_idx": row_idx, "row": {k[: -len("_right")]: v for k, v in row.items()}}
+    for change in changes:
+        yield {
+            "kind": "changed",
+            "key": str(change["key"]),
+            "row_idx": change["row_idx_left"],
+            "col": change["col"],
+            "old": change["old"],
+            "new": change["new"],
+        }
+
+
+def diff_partition(
+    left: Path,
+    right: Path,
+    left_schema: Dict[str, pl.DataType],
+    right_schema: Dict[str, pl.DataType],
+    data_cols: Set[str],
+    tol: float,
+    out: Path,
+    fmt: str,
+) -> Dict[str, int]:
+    """Diff one partition pair, write its records to `out` and return its stats."""
+    df1 = _read_side(left, left_schema)
+    df2 = _read_side(right, right_schema)
+    merged = df1.join(df2, on="key_hash", how="full", suffix="_right")
+    changes = detect_changes(merged, data_cols, tol)
+    left_cols = list(df1.columns)
+    right_cols = [f"{c}_right" for c in df2.columns]
+    records = _records(merged, left_cols, right_cols, changes)
+    if fmt == "parquet":
+        rows = [
+            {**r, "old": _encode(r.get("old")), "new": _encode(r.get("new")), "row": _encode(r.get("row"))}
+            for r in records
+        ]
+        pl.DataFrame(rows, schema=RECORD_SCHEMA).write_parquet(out)
+    else:
+        with open(out, "w", encoding="utf-8") as f:
+            for r in records:
+                f.write(json.dumps(r, default=str) + "\n")
+    only_left = merged.filter(pl.col("key_hash_right").is_null()).height
+    only_right = merged.filter(pl.col("key_hash").is_null()).height
+    return {
+        "rows_left": df1.height,
+        "rows_right": df2.height,
+        "matches": merged.height - only_left - only_right,
+        "only_left": only_left,
+        "only_right": only_right,
+        "cell_changes": len(changes),
+    }
+
+
+def _concat(parts: List[Path], output: Path, fmt: str) -> None:
+    if fmt == "parquet":
+        pl.scan_parquet(parts).sink_parquet(output)
+        return
+    with open(output, "wb") as dst:
+        for part in parts:
+            with open(part, "rb") as src:
+                shutil.copyfileobj(src, dst)
+
+
+def output_format(output: Path) -> str:
+    return "parquet" if output.suffix.lower() in (".parquet", ".pq") else "jsonl"
+
+
+def diff_csvs_streaming(
+    file1: str,
+    file2: str,
+    keys: List[str],
+    ignore: List[str],
+    tol: float,
+    output: Path,
+    partitions: int = 64,
+    workers: int = 0,
+    spill_dir: Optional[Path] = None,
+    batch_size: int = BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Diff arbitrarily large CSVs with bounded memory.
+
+    Row/cell differences go to `output` (JSONL, or Parquet for a .parquet
+    suffix); the returned dict holds only schema diff and summary stats.
+    """
+    if partitions < 1:
+        raise ValueError("partitions must be >= 1")
+    ignore_set: Set[str] = set(ignore)
+    fmt = output_format(output)
+    schema1 = pl.scan_csv(file1, infer_schema_length=50000).collect_schema()
+    schema2 = pl.scan_csv(file2, infer_schema_length=50000).collect_schema()
+    schema_diff = compare_schemas(pl.DataFrame(schema=schema1), pl.DataFrame(schema=schema2), ignore_set)
+    data_cols = (set(schema1.names()) & set(schema2.names())) - ignore_set - {"row_idx", "key_hash"}
+
+    with tempfile.TemporaryDirectory(prefix="csv-diff-", dir=spill_dir) as tmp:
+        root = Path(tmp)
+        rows_left = partition_csv(file1, keys, ignore_set, root / "left", partitions, batch_size)
+        rows_right = partition_csv(file2, keys, ignore_set, root / "right", partitions, batch_size)
+        left_schema = _spill_schema(root / "left")
+        right_schema = _spill_schema(root / "right")
+        left_schema = left_schema or right_schema
+        right_schema = right_schema or left_schema
+
+        suffix = ".parquet" if fmt == "parquet" else ".jsonl"
+        present = sorted({d.name for side in ("left", "right") if (root / side).is_dir() for d in (root / side).iterdir()})
+        outs = [root / f"out-{name}{suffix}" for name in present]
+        jobs = [
+            (root / "left" / name, root / "right" / name, left_schema, right_schema, data_cols, tol, out, fmt)
+            for name, out in zip(present, outs)
+        ]
+        stats = dict.fromkeys(STAT_KEYS, 0)
+        for partial in _run_jobs(jobs, workers):
+            for k in STAT_KEYS:
+                stats[k] += partial[k]
+        if outs:
+            _concat(outs, output, fmt)
+        elif fmt == "parquet":
+            pl.DataFrame(schema=RECORD_SCHEMA).write_parquet(output)
+        else:
+            output.write_text("")
+
+    stats["rows_left"], stats["rows_right"] = rows_left, rows_right
+    stats["partitions"] = partitions
+    return {"schema_diff": schema_diff, "stats": stats, "output": str(output)}
+
+
+def _run_jobs(jobs: List[tuple], workers: int) -> Iterator[Dict[str, int]]:
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield diff_partition(*job)
+        return
+    # Forking a process that already runs polars' thread pool can deadlock.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), mp_context=ctx) as pool:
+        yield from pool.map(diff_partition, *zip(*jobs))
+
+
+def _spill_schema(side: Path) -> Optional[Dict[str, pl.DataType]]:
+    first = next(iter(sorted(side.glob("*/*.parquet"))), None)
+    return pl.read_parquet_schema(first) if first else None
@@ -20,4 +20,14 @@ def test_detect_changes(sample_df1, sample_df2, tol):
     df2_keyed = compute_key_hash(sample_df2.with_row_index(), ["id"])
     merged = df1_keyed.join(df2_keyed, on="key_hash", how="full", suffix="_right")
     changes = detect_changes(merged, {"name", "age", "salary"}, tol)
-    assert len(changes) == (2 if tol == 0.0 else 1)
\ No newline at end of file
+    assert len(changes) == (2 if tol == 0.0 else 1)
+
+
+def test_detect_changes_ignores_unmatched_rows(sample_df1, sample_df2):
+    left = compute_key_hash(sample_df1.with_row_index("row_idx"), ["id"])
+    right = compute_key_hash(sample_df2.with_row_index("row_idx"), ["id"])
+    merged = left.join(right, on="key_hash", how="full", suffix="_right")
+    changes = detect_changes(merged, {"name", "age", "salary"}, 0.0)
+    # id 4 exists only on the right and id 3 only on the left: added/removed, not changed cells
+    assert {c["key"] for c in changes} == {"2"}
+    assert {c["col"] for c in changes} == {"name", "age", "salary"}
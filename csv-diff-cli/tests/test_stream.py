@@ -0,0 +1,59 @@
+import json
+
+import polars as pl
+import pytest
+
+from csv_diff_cli.stream import diff_csvs_streaming, partition_csv
+
+
+@pytest.fixture
+def csv_pair(tmp_path, sample_df1, sample_df2):
+    left, right = tmp_path / "left.csv", tmp_path / "right.csv"
+    sample_df1.write_csv(left)
+    sample_df2.write_csv(right)
+    return left, right
+
+
+def test_partition_csv_spills_by_key(tmp_path, csv_pair):
+    spill = tmp_path / "spill"
+    rows = partition_csv(str(csv_pair[0]), ["id"], set(), spill, partitions=4, batch_size=2)
+    assert rows == 3
+    spilled = pl.read_parquet(sorted(spill.glob("*/*.parquet")))
+    assert sorted(spilled["key_hash"].to_list()) == ["1", "2", "3"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_streaming_jsonl(tmp_path, csv_pair, workers):
+    out = tmp_path / "diff.jsonl"
+    result = diff_csvs_streaming(
+        str(csv_pair[0]), str(csv_pair[1]), ["id"], [], 0.0, out,
+        partitions=8, workers=workers, batch_size=2,
+    )
+    stats = result["stats"]
+    assert (stats["rows_left"], stats["rows_right"]) == (3, 3)
+    assert (stats["matches"], stats["only_left"], stats["only_right"]) == (2, 1, 1)
+    records = [json.loads(line) for line in out.read_text().splitlines()]
+    kinds = sorted(r["kind"] for r in records)
+    assert kinds.count("removed") == 1 and kinds.count("added") == 1
+    changed = {(r["key"], r["col"]) for r in records if r["kind"] == "changed"}
+    assert ("2", "name") in changed and ("2", "salary") in changed
+    added = next(r for r in records if r["kind"] == "added")
+    assert added["row"]["name"] == "David"
+
+
+def test_streaming_parquet_with_tolerance(tmp_path, csv_pair):
+    out = tmp_path / "diff.parquet"
+    result = diff_csvs_streaming(
+        str(csv_pair[0]), str(csv_pair[1]), ["id"], ["name"], 1000.0, out, partitions=3, workers=1,
+    )
+    df = pl.read_parquet(out)
+    changed = df.filter(pl.col("kind") == "changed")
+    assert changed["col"].to_list() == ["age"]
+    assert result["stats"]["cell_changes"] == 1
+
+
+def test_streaming_positional(tmp_path, csv_pair):
+    out = tmp_path / "diff.jsonl"
+    result = diff_csvs_streaming(str(csv_pair[0]), str(csv_pair[1]), [], [], 0.0, out, partitions=2, workers=1)
+    assert result["stats"]["matches"] == 3
+    assert result["stats"]["only_left"] == result["stats"]["only_right"] == 0
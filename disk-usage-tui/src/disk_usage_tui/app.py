@@ -21,7 +21,8 @@ from textual.css.query import Query
 
 from .gitignore import load_gitignore
 from .node import DirNode
-from .tree_builder import build_tree
+from .scanner import ignore_key, scan
+from .store import NodeStore
 from .utils import format_bytes, format_percent
 from .views import DeletePreview, SearchUpdated, TreeDataLoaded
 
@@ -55,9 +56,18 @@ class DiskUsageApp(App[None], BindingsTarget):
         ("?", "show_help"),
     ]
 
-    def __init__(self, root_path: Path, use_gitignore: bool = True):
+    def __init__(
+        self,
+        root_path: Path,
+        use_gitignore: bool = True,
+        workers: int = 0,
+        snapshot: Path | None = None,
+    ):
         self.root_path = root_path
         self.use_gitignore = use_gitignore
+        self.workers = workers
+        self.snapshot = snapshot
+        self.store: NodeStore | None = None
         self.tree_root: DirNode | None = None
         self.current_node: DirNode | None = None
         super().__init__()
@@ -90,28 +100,30 @@ class DiskUsageApp(App[None], BindingsTarget):
         await self.run_worker(self._build_tree, gitignore, task_id)
 
     async def _build_tree(self, gitignore: GitIgnoreSpec, task_id: str) -> None:
-        self.tree_root = build_tree(self.root_path, gitignore)
+        key = ignore_key(gitignore)
+        previous = NodeStore.load(self.snapshot, self.root_path, key) if self.snapshot else None
+        self.store = scan(self.root_path, gitignore, self.workers, previous)
+        if self.snapshot:
+            self.store.save(self.snapshot, key)
+        self.tree_root = self.store.to_dirnode(0, depth=0)
         self.call_from_thread(TreeDataLoaded(self.tree_root))
 
     def on_tree_data_loaded(self, event: TreeDataLoaded) -> None:
         tree: Tree[DirNode] = self.query_one(Tree)
-        root_treenode = self._dirnode_to_treenode(event.node)
+        root_treenode = self._dirnode_to_treenode(0)
         tree.root = root_treenode
         tree.cursor = root_treenode
         tree.focus()
         self.set_interval(1.0, self._update_info)
 
-    def _dirnode_to_treenode(self, dnode: DirNode) -> TreeNode[DirNode]:
+    def _dirnode_to_treenode(self, index: int) -> TreeNode[DirNode]:
+        # DirNodes are only created for the rows shown; the scan lives in the NodeStore.
+        dnode = self.store.to_dirnode(index, depth=0)
         pct = format_percent(dnode.size, self.tree_root.size) if self.tree_root else "0%"
         label = f"[bold cyan]{dnode.name}[/] [dim]{format_bytes(dnode.size)}[/] ({pct} | {dnode.num_leaves:,} files)"
-        children = sorted(
-            dnode.children.values(),
-            key=lambda c: c.size,
-            reverse=True,
-        )
         treenodes = [
-            self._dirnode_to_treenode(child) for child in children[:50]
-        ]  # limit depth
+            self._dirnode_to_treenode(child) for child in self.store.top_children(index, 50)
+        ]  # limit width
         return TreeNode(label, treenodes, data=dnode, expanded=len(treenodes) < 10)
 
     def action_focus_search(self) -> None:
@@ -129,7 +141,9 @@ class DiskUsageApp(App[None], BindingsTarget):
             if node.path == self.root_path:
                 self.notify("Cannot delete root", severity="warning")
                 return
-            self.push_screen(DeletePreview(node))
+            index = self.store.find(node.path)
+            if index is not None:
+                self.push_screen(DeletePreview(self.store.to_dirnode(index)))
 
     def watch_tree_cursor_node(self, tree: Tree[DirNode]):
         self.current_node = tree.cursor_node.data if tree.cursor_node else None
@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Optional
 
 from .app import DiskUsageApp
+from .scanner import default_snapshot_path
 
 app = typer.Typer(add_completion=False)
 
@@ -13,10 +14,24 @@ def main(
     no_gitignore: bool = typer.Option(
         False, "--no-gitignore", help="Disable .gitignore parsing"
     ),
+    workers: int = typer.Option(0, "--workers", "-j", help="Scanner threads (0 = auto)"),
+    snapshot: Optional[Path] = typer.Option(
+        None, "--snapshot", help="Snapshot file (default: under ~/.cache/disk-usage-tui)"
+    ),
+    no_snapshot: bool = typer.Option(
+        False, "--no-snapshot", help="Full rescan; do not read or write a snapshot"
+    ),
 ):
     """Interactive disk usage explorer."""
     try:
-        app_instance = DiskUsageApp(path.resolve(), use_gitignore=not no_gitignore)
+        root = path.resolve()
+        if no_snapshot:
+            snapshot = None
+        elif snapshot is None:
+            snapshot = default_snapshot_path(root)
+        app_instance = DiskUsageApp(
+            root, use_gitignore=not no_gitignore, workers=workers, snapshot=snapshot
+        )
         app_instance.run()
     except KeyboardInterrupt:
         sys.exit(1)
@@ -0,0 +1,226 @@
+import hashlib
+import os
+import stat
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from pathspec import GitIgnoreSpec
+
+from .store import DIR, FILE, Entry, NodeStore
+
+# (directory path as bytes, its node, its node in the previous snapshot or -1,
+#  its mtime_ns, its path relative to the root with a trailing "/")
+Task = Tuple[bytes, int, int, int, str]
+
+
+def ignore_key(gitignore: GitIgnoreSpec) -> str:
+    """Identifies the ignore rules a snapshot was taken with."""
+    patterns = [getattr(p, "pattern", None) or getattr(p, "regex", None) for p in gitignore.patterns]
+    return hashlib.sha1(repr([str(p) for p in patterns]).encode()).hexdigest()
+
+
+class _Scan:
+    """
+    Work-stealing scan: each worker pops directories from the tail of its
+    own deque (depth-first, good locality) and, when that runs dry, steals
+    from the head of another worker's deque. os.scandir and stat release
+    the GIL, so threads overlap filesystem latency.
+    """
+
+    def __init__(
+        self,
+        store: NodeStore,
+        gitignore: GitIgnoreSpec,
+        previous: Optional[NodeStore],
+        workers: int,
+        progress: Optional[Callable[[int], None]],
+    ):
+        self.store = store
+        self.match = gitignore.match_file if gitignore.patterns else None
+        self.previous = previous
+        self.queues: List[Deque[Task]] = [deque() for _ in range(workers)]
+        self.pending = 0
+        self.cv = threading.Condition()
+        self.progress = progress
+        self.reused = 0
+        self.error: Optional[BaseException] = None
+
+    # -- scheduling -----------------------------------------------------------
+
+    def run(self, root_task: Task) -> None:
+        self.queues[0].append(root_task)
+        self.pending = 1
+        if len(self.queues) == 1:
+            self._worker(0)
+            if self.error:
+                raise self.error
+            return
+        threads = [threading.Thread(target=self._worker, args=(i,), daemon=True) for i in range(len(self.queues))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if self.error:
+            raise self.error
+
+    def _next(self, me: int) -> Optional[Task]:
+        try:
+            return self.queues[me].pop()
+        except IndexError:
+            pass
+        n = len(self.queues)
+        for k in range(1, n):
+            try:
+                return self.queues[(me + k) % n].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _worker(self, me: int) -> None:
+        own = self.queues[me]
+        while True:
+            task = self._next(me)
+            if task is None:
+                with self.cv:
+                    if self.pending == 0 or self.error:
+                        self.cv.notify_all()
+                        return
+                    self.cv.wait(0.05)
+                continue
+            try:
+                subdirs = self._visit(task)
+            except BaseException as e:  # surface in the caller, stop the pool
+                with self.cv:
+                    self.error = e
+                    self.pending = 0
+                    self.cv.notify_all()
+                return
+            own.extend(subdirs)
+            with self.cv:
+                self.pending += len(subdirs) - 1
+                if self.pending == 0:
+                    self.cv.notify_all()
+                elif subdirs:
+                    self.cv.notify(len(subdirs))
+
+    # -- one directory ----------------------------------------------------------
+
+    def _visit(self, task: Task) -> List[Task]:
+        path, node, old, mtime, rel = task
+        prev = self.previous
+        if old >= 0 and prev.kind[old] == DIR and prev.mtime[old] == mtime:
+            entries = self._reuse(path, old)
+            with self.cv:
+                self.reused += 1
+        else:
+            entries = self._list(path, rel, node)
+            if entries is None:
+                return []
+        first = self.store.add_children(node, entries)
+        if self.progress:
+            self.progress(len(entries))
+        old_children = self._old_children(old) if old >= 0 else {}
+        subdirs = []
+        match = self.match
+        for offset, (name, kind, _, child_mtime) in enumerate(entries):
+            if kind == DIR:
+                subdirs.append(
+                    (
+                        path + b"/" + name,
+                        first + offset,
+                        old_children.get(name, -1),
+                        child_mtime,
+                        rel + os.fsdecode(name) + "/" if match else "",
+                    )
+                )
+        return subdirs
+
+    def _list(self, path: bytes, rel: str, node: int) -> Optional[List[Entry]]:
+        """Fresh listing: one scandir, stat data from the DirEntry, ignored entries pruned."""
+        match = self.match
+        entries = []
+        try:
+            it = os.scandir(path)
+        except OSError:
+            self.store.mark_unreadable(node)
+            return None
+        with it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)  # d_type, no syscall
+                    if match and match(rel + os.fsdecode(entry.name) + ("/" if is_dir else "")):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    entries.append((entry.name, DIR, 0, st.st_mtime_ns))
+                elif stat.S_ISREG(st.st_mode) or stat.S_ISLNK(st.st_mode):
+                    entries.append((entry.name, FILE, st.st_size, st.st_mtime_ns))
+        entries.sort()
+        return entries
+
+    def _reuse(self, path: bytes, old: int) -> List[Entry]:
+        """
+        The directory's own listing is unchanged (same mtime), so its names
+        and kinds are copied from the snapshot, skipping readdir and ignore
+        matching. Every entry is still stat'ed: a file rewritten in place, or a
+        change below a subdirectory, does not touch this directory's mtime.
+        """
+        entries = []
+        for name, kind, _, _ in self.previous.entries(old):
+            try:
+                st = os.stat(path + b"/" + name, follow_symlinks=False)
+            except OSError:
+                continue
+            if kind == FILE:
+                entries.append((name, FILE, st.st_size, st.st_mtime_ns))
+            else:
+                entries.append((name, DIR, 0, st.st_mtime_ns))
+        return entries
+
+    def _old_children(self, old: int) -> Dict[bytes, int]:
+        prev = self.previous
+        return {prev.name_bytes(c): c for c in prev.children(old) if prev.kind[c] != FILE}
+
+
+def scan(
+    root: Path,
+    gitignore: Optional[GitIgnoreSpec] = None,
+    workers: int = 0,
+    previous: Optional[NodeStore] = None,
+    progress: Optional[Callable[[int], None]] = None,
+) -> NodeStore:
+    """
+    Scan `root` into a NodeStore.
+
+    With `previous` (a snapshot of the same root and ignore rules), any
+    directory whose mtime is unchanged reuses its recorded listing instead
+    of being listed and matched against the ignore rules again; its entries
+    are still stat'ed, so the result is the same as a fresh scan.
+    """
+    gitignore = gitignore or GitIgnoreSpec([])
+    workers = workers if workers > 0 else min(32, (os.cpu_count() or 1) * 4)
+    store = NodeStore(root)
+    try:
+        root_mtime = os.stat(root).st_mtime_ns
+    except OSError:
+        store.add_root(0)
+        store.mark_unreadable(0)
+        return store
+    store.add_root(root_mtime)
+    if previous is not None and (len(previous) == 0 or previous.root != root):
+        previous = None
+    scanner = _Scan(store, gitignore, previous, workers, progress)
+    scanner.run((os.fsencode(root), 0, 0 if previous is not None else -1, root_mtime, ""))
+    store.aggregate()
+    store.reused_dirs = scanner.reused
+    return store
+
+
+def default_snapshot_path(root: Path) -> Path:
+    cache = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    digest = hashlib.sha1(str(root).encode()).hexdigest()[:16]
+    return cache / "disk-usage-tui" / f"{digest}.snapshot"
@@ -0,0 +1,193 @@
+import json
+import os
+import threading
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from .node import DirNode
+
+FILE = 0
+DIR = 1
+UNREADABLE = 2  # directory whose listing failed
+
+SNAPSHOT_VERSION = 1
+_ARRAYS = ("parent", "size", "files", "mtime", "first_child", "child_count", "name_off")
+
+# (name, kind, size, mtime_ns) for one directory entry.
+Entry = Tuple[bytes, int, int, int]
+
+
+class NodeStore:
+    """
+    Every scanned file and directory as one row in parallel arrays.
+
+    Node 0 is the root. The children of a directory occupy the contiguous
+    range [first_child, first_child + child_count), always after their
+    parent, so sizes aggregate in one reverse pass. Names are kept as
+    filesystem bytes in a single blob. A row costs ~60 bytes plus its name,
+    instead of a dataclass, a Path and a dict per entry.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.parent = array("q")
+        self.size = array("q")
+        self.files = array("q")
+        self.mtime = array("q")
+        self.first_child = array("q")
+        self.child_count = array("q")
+        self.kind = bytearray()
+        self.names = bytearray()
+        self.name_off = array("Q", [0])
+        self.reused_dirs = 0  # directories a rescan took from a snapshot
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    # -- building -------------------------------------------------------------
+
+    def add_root(self, mtime: int) -> int:
+        self._append(-1, [(os.fsencode(self.root.name or str(self.root)), DIR, 0, mtime)])
+        return 0
+
+    def add_children(self, parent: int, entries: List[Entry]) -> int:
+        """Append a directory's entries as one contiguous block; returns the first index."""
+        file_bytes = sum(e[2] for e in entries if e[1] == FILE)
+        file_count = sum(1 for e in entries if e[1] == FILE)
+        with self._lock:
+            first = self._append(parent, entries)
+            self.first_child[parent] = first
+            self.child_count[parent] = len(entries)
+            self.size[parent] += file_bytes
+            self.files[parent] += file_count
+        return first
+
+    def _append(self, parent: int, entries: List[Entry]) -> int:
+        first = len(self.parent)
+        n = len(entries)
+        self.parent.extend([parent] * n)
+        self.size.extend(e[2] if e[1] == FILE else 0 for e in entries)
+        self.files.extend(1 if e[1] == FILE else 0 for e in entries)
+        self.mtime.extend(e[3] for e in entries)
+        self.first_child.extend([-1] * n)
+        self.child_count.extend([0] * n)
+        self.kind.extend(e[1] for e in entries)
+        for e in entries:
+            self.names += e[0]
+            self.name_off.append(len(self.names))
+        return first
+
+    def mark_unreadable(self, i: int) -> None:
+        self.kind[i] = UNREADABLE
+
+    def aggregate(self) -> None:
+        """Roll directory totals up to the root (file totals are added per listing)."""
+        size, files, parent, kind = self.size, self.files, self.parent, self.kind
+        for i in reversed([i for i in range(1, len(kind)) if kind[i] != FILE]):
+            size[parent[i]] += size[i]
+            files[parent[i]] += files[i]
+
+    # -- reading --------------------------------------------------------------
+
+    def name_bytes(self, i: int) -> bytes:
+        return bytes(self.names[self.name_off[i] : self.name_off[i + 1]])
+
+    def name(self, i: int) -> str:
+        return os.fsdecode(self.name_bytes(i))
+
+    def is_dir(self, i: int) -> bool:
+        return self.kind[i] != FILE
+
+    def children(self, i: int) -> range:
+        start = self.first_child[i]
+        return range(start, start + self.child_count[i]) if start >= 0 else range(0)
+
+    def entries(self, i: int) -> Iterator[Entry]:
+        """The entries recorded for directory `i`, as they were scanned."""
+        for c in self.children(i):
+            yield self.name_bytes(c), self.kind[c], self.size[c], self.mtime[c]
+
+    def top_children(self, i: int, limit: int) -> List[int]:
+        """The `limit` largest non-empty children of `i`, largest first."""
+        size, kind = self.size, self.kind
+        kids = [c for c in self.children(i) if size[c] or kind[c] == FILE]
+        return sorted(kids, key=size.__getitem__, reverse=True)[:limit]
+
+    def path(self, i: int) -> Path:
+        parts = []
+        while i > 0:
+            parts.append(self.name(i))
+            i = self.parent[i]
+        return self.root.joinpath(*reversed(parts))
+
+    def find(self, path: Path) -> Optional[int]:
+        """Index of `path` (which must lie under the root), or None."""
+        try:
+            parts = path.relative_to(self.root).parts
+        except ValueError:
+            return None
+        i = 0
+        for part in parts:
+            name = os.fsencode(part)
+            i = next((c for c in self.children(i) if self.name_bytes(c) == name), None)
+            if i is None:
+                return None
+        return i
+
+    def to_dirnode(self, i: int = 0, depth: Optional[int] = None) -> DirNode:
+        """Materialize node `i` (and `depth` levels below it; all if None) as DirNodes."""
+        node = DirNode(self.path(i), self.size[i], num_leaves=self.files[i])
+        if self.kind[i] != FILE and depth != 0:
+            for c in self.children(i):
+                if self.kind[c] != FILE and self.size[c] == 0:
+                    continue  # empty directories are not shown
+                child = self.to_dirnode(c, None if depth is None else depth - 1)
+                node.children[self.name(c)] = child
+        return node
+
+    # -- snapshots ------------------------------------------------------------
+
+    def save(self, path: Path, ignore_key: str = "") -> None:
+        """Write the store to `path` (a JSON header line, then the raw arrays)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            "version": SNAPSHOT_VERSION,
+            "root": str(self.root),
+            "ignore": ignore_key,
+            "nodes": len(self),
+            "names": len(self.names),
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(json.dumps(header).encode() + b"\n")
+            for attr in _ARRAYS:
+                getattr(self, attr).tofile(f)
+            f.write(self.kind)
+            f.write(self.names)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, root: Path, ignore_key: str = "") -> Optional["NodeStore"]:
+        """Read a snapshot of `root`; None if missing, stale-format or for other settings."""
+        try:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                if (
+                    header.get("version") != SNAPSHOT_VERSION
+                    or header.get("root") != str(root)
+                    or header.get("ignore") != ignore_key
+                ):
+                    return None
+                store = cls(root)
+                n = header["nodes"]
+                for attr in _ARRAYS:
+                    arr = getattr(store, attr)
+                    del arr[:]
+                    arr.fromfile(f, n + 1 if attr == "name_off" else n)
+                store.kind = bytearray(f.read(n))
+                store.names = bytearray(f.read(header["names"]))
+        except (OSError, ValueError, EOFError, KeyError):
+            return None
+        return store
@@ -0,0 +1,104 @@
+import os
+from pathlib import Path
+
+from pathspec import GitIgnoreSpec
+
+from disk_usage_tui.scanner import ignore_key, scan
+from disk_usage_tui.store import NodeStore
+
+
+def _make(tmp_dir: Path) -> None:
+    (tmp_dir / "a" / "b").mkdir(parents=True)
+    (tmp_dir / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_dir / "a" / "one").write_bytes(b"x" * 100)
+    (tmp_dir / "a" / "b" / "two").write_bytes(b"x" * 200)
+    (tmp_dir / "node_modules" / "pkg" / "big").write_bytes(b"x" * 5000)
+    (tmp_dir / "top.log").write_bytes(b"x" * 7)
+
+
+def test_scan_totals(tmp_dir: Path):
+    _make(tmp_dir)
+    store = scan(tmp_dir, workers=3)
+    assert store.size[0] == 5307
+    assert store.files[0] == 4
+    a = store.find(tmp_dir / "a")
+    assert store.size[a] == 300 and store.files[a] == 2
+    assert store.path(store.find(tmp_dir / "a" / "b" / "two")) == tmp_dir / "a" / "b" / "two"
+
+
+def test_scan_prunes_ignored(tmp_dir: Path):
+    _make(tmp_dir)
+    spec = GitIgnoreSpec.from_lines(["node_modules/", "*.log"])
+    store = scan(tmp_dir, spec)
+    assert store.size[0] == 300
+    assert store.find(tmp_dir / "node_modules") is None
+    assert store.find(tmp_dir / "top.log") is None
+
+
+def test_workers_agree(tmp_dir: Path):
+    for i in range(30):
+        d = tmp_dir / f"d{i}" / "sub"
+        d.mkdir(parents=True)
+        (d / "f").write_bytes(b"x" * i)
+    one = scan(tmp_dir, workers=1)
+    many = scan(tmp_dir, workers=8)
+    assert (one.size[0], one.files[0], len(one)) == (many.size[0], many.files[0], len(many))
+
+
+def test_to_dirnode_matches_build_tree_shape(tmp_dir: Path):
+    _make(tmp_dir)
+    (tmp_dir / "empty").mkdir()
+    node = scan(tmp_dir).to_dirnode()
+    assert set(node.children) == {"a", "node_modules", "top.log"}
+    assert node.children["a"].children["b"].children["two"].size == 200
+
+
+def test_snapshot_roundtrip(tmp_dir: Path, tmp_path_factory):
+    _make(tmp_dir)
+    snap = tmp_path_factory.mktemp("snap") / "s.snapshot"
+    store = scan(tmp_dir)
+    store.save(snap, "k")
+    loaded = NodeStore.load(snap, tmp_dir, "k")
+    assert list(loaded.size) == list(store.size)
+    assert loaded.names == store.names
+    assert NodeStore.load(snap, tmp_dir, "other-rules") is None
+    assert NodeStore.load(snap, tmp_dir / "a", "k") is None
+
+
+def test_rescan_reuses_unchanged_dirs(tmp_dir: Path):
+    _make(tmp_dir)
+    first = scan(tmp_dir)
+    (tmp_dir / "a" / "b" / "three").write_bytes(b"x" * 50)  # changes b's mtime only
+    second = scan(tmp_dir, previous=first)
+    assert second.size[0] == first.size[0] + 50
+    assert second.reused_dirs >= 3  # root, a, node_modules, node_modules/pkg
+    assert second.size[second.find(tmp_dir / "a")] == 350
+    fresh = scan(tmp_dir)
+    assert second.size[0] == fresh.size[0]
+
+
+def test_rescan_sees_file_grown_in_place(tmp_dir: Path):
+    _make(tmp_dir)
+    first = scan(tmp_dir)
+    with open(tmp_dir / "a" / "one", "r+b") as f:  # same inode: a's mtime is unchanged
+        f.seek(0, os.SEEK_END)
+        f.write(b"x" * 100_000)
+    second = scan(tmp_dir, previous=first)
+    assert second.reused_dirs >= 1
+    assert second.size[second.find(tmp_dir / "a")] == 100_300
+    assert second.size[0] == scan(tmp_dir).size[0] == first.size[0] + 100_000
+
+
+def test_rescan_sees_removed_dir(tmp_dir: Path):
+    _make(tmp_dir)
+    first = scan(tmp_dir)
+    (tmp_dir / "a" / "b" / "two").unlink()
+    os.rmdir(tmp_dir / "a" / "b")
+    second = scan(tmp_dir, previous=first)
+    assert second.find(tmp_dir / "a" / "b") is None
+    assert second.size[0] == first.size[0] - 200
+
+
+def test_ignore_key_differs():
+    assert ignore_key(GitIgnoreSpec.from_lines(["a/"])) != ignore_key(GitIgnoreSpec.from_lines(["b/"]))
+    assert ignore_key(GitIgnoreSpec([])) == ignore_key(GitIgnoreSpec([]))
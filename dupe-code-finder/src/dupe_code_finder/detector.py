@@ -1,8 +1,13 @@
-import rapidfuzz
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import rapidfuzz
 
 from .blocks import extract_blocks
+from .lsh import MinHasher, Signature, candidate_pairs, jaccard_floor, lsh_params
 from .models import CodeBlock, Dupe
 from .tokenizer import tokenize_file
 
@@ -21,6 +26,11 @@ IGNORED_DIRS = {
     "site",
 }
 
+# MinHash permutations per block; bands x rows are chosen from the threshold
+# (lsh_params at its jaccard_floor), e.g. 10 x 6 at 0.85.
+LSH_PERMS = 64
+PARALLEL_MIN_FILES = 32
+
 
 def detect_dupes(
     root: Path,
@@ -28,46 +38,77 @@ def detect_dupes(
     threshold: float = 0.85,
     step: int = 5,
     max_results: int = 20,
+    workers: int = 0,
 ) -> List[Dupe]:
     """
     Detect duplicate code blocks in the project.
-    """
-    blocks = []
-    pyfiles = list(root.rglob("*.py"))
 
-    for pyfile in pyfiles:
-        if any(ign in pyfile.parts for ign in IGNORED_DIRS):
-            continue
-        try:
-            norm_tokens, lines = tokenize_file(pyfile)
-            if len(norm_tokens) < min_tokens:
-                continue
-            blocks.extend(
-                extract_blocks(pyfile, norm_tokens, lines, min_tokens, step)
-            )
-        except Exception:
-            continue  # Gracefully skip unparseable files
+    Files are tokenized (and their blocks MinHashed) in a process pool; an LSH
+    index proposes candidate pairs, which are then scored exactly.
+    """
+    pyfiles = [
+        p for p in root.rglob("*.py") if not any(ign in p.parts for ign in IGNORED_DIRS)
+    ]
+    bands, rows = lsh_params(jaccard_floor(threshold), LSH_PERMS)
+    hasher = MinHasher(num_perm=bands * rows)
 
-    # Limit blocks for perf (rarely hit)
-    if len(blocks) > 2000:
-        blocks = blocks[:2000]
+    blocks: List[CodeBlock] = []
+    signatures: List[Signature] = []
+    for file_blocks, file_sigs in _map_files(pyfiles, min_tokens, step, hasher, workers):
+        blocks.extend(file_blocks)
+        signatures.extend(file_sigs)
 
-    dupes = _find_similar_pairs(blocks, threshold)
+    dupes = _find_similar_pairs(blocks, threshold, signatures, (bands, rows))
     dupes.sort(key=lambda x: x[0], reverse=True)
     return dupes[:max_results]
 
 
-def _find_similar_pairs(blocks: List[CodeBlock], threshold: float) -> List[Dupe]:
+def _scan_file(
+    pyfile: Path, min_tokens: int, step: int, hasher: MinHasher
+) -> Tuple[List[CodeBlock], List[Signature]]:
+    try:
+        norm_tokens, lines = tokenize_file(pyfile)
+        if len(norm_tokens) < min_tokens:
+            return [], []
+        blocks = extract_blocks(pyfile, norm_tokens, lines, min_tokens, step)
+    except Exception:
+        return [], []  # Gracefully skip unparseable files
+    return blocks, [hasher.signature(b.token_str) for b in blocks]
+
+
+def _map_files(
+    pyfiles: List[Path], min_tokens: int, step: int, hasher: MinHasher, workers: int
+) -> Iterator[Tuple[List[CodeBlock], List[Signature]]]:
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    if workers <= 1 or len(pyfiles) < PARALLEL_MIN_FILES:
+        for pyfile in pyfiles:
+            yield _scan_file(pyfile, min_tokens, step, hasher)
+        return
+    scan = partial(_scan_file, min_tokens=min_tokens, step=step, hasher=hasher)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(scan, pyfiles, chunksize=16)
+
+
+def _find_similar_pairs(
+    blocks: List[CodeBlock],
+    threshold: float,
+    signatures: Optional[List[Signature]] = None,
+    lsh: Optional[Tuple[int, int]] = None,
+) -> List[Dupe]:
+    """Score candidate pairs exactly; all pairs when no signatures are given."""
+    if signatures is None:
+        pairs: Iterable[Tuple[int, int]] = (
+            (i, j) for i in range(len(blocks)) for j in range(i + 1, len(blocks))
+        )
+    else:
+        bands, rows = lsh or lsh_params(jaccard_floor(threshold), LSH_PERMS)
+        pairs = candidate_pairs(signatures, bands, rows)
+    cutoff = threshold * 100.0
     dupes: List[Dupe] = []
-    n = len(blocks)
-    for i in range(n):
-        for j in range(i + 1, n):
-            sim = (
-                rapidfuzz.fuzz.token_sort_ratio(
-                    blocks[i].token_str, blocks[j].token_str
-                )
-                / 100.0
-            )
-            if sim >= threshold:
-                dupes.append((sim, blocks[i], blocks[j]))
+    for i, j in pairs:
+        score = rapidfuzz.fuzz.token_sort_ratio(
+            blocks[i].token_str, blocks[j].token_str, score_cutoff=cutoff
+        )
+        if score and score >= cutoff:
+            dupes.append((score / 100.0, blocks[i], blocks[j]))
     return dupes
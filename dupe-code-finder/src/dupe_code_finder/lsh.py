@@ -0,0 +1,135 @@
+import random
+import zlib
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple
+
+Signature = Tuple[int, ...]
+
+_PRIME = (1 << 61) - 1
+
+
+def char_multiset(text: str) -> Set[int]:
+    """
+    Stable 32-bit hashes of `text`'s characters as a multiset: the n-th
+    occurrence of a character is its own element.
+
+    token_sort_ratio is the indel similarity of the token-sorted strings, and
+    their common subsequence can't hold more of a character than both have,
+    so the ratio is at most the Dice coefficient of these multisets.
+    """
+    seen: Counter = Counter()
+    out = set()
+    for ch in text:
+        out.add(zlib.crc32(f"{ch}{seen[ch]}".encode()))
+        seen[ch] += 1
+    return out
+
+
+def jaccard_floor(ratio: float) -> float:
+    """Lowest char_multiset Jaccard of a pair whose token_sort_ratio is `ratio` (0..1)."""
+    return ratio / (2 - ratio)
+
+
+class MinHasher:
+    """
+    MinHash signatures under `num_perm` universal hash functions
+    (a*x + b) mod 2**61-1. Seeded, so signatures agree across processes.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.params = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, text: str) -> Signature:
+        hashes = char_multiset(text)
+        if not hashes:
+            return ()
+        return tuple(min([(a * h + b) % _PRIME for h in hashes]) for a, b in self.params)
+
+
+def _integrate(f: Callable[[float], float], a: float, b: float, steps: int = 100) -> float:
+    h = (b - a) / steps
+    return sum(f(a + (i + 0.5) * h) for i in range(steps)) * h
+
+
+@lru_cache(maxsize=None)
+def lsh_params(threshold: float, num_perm: int, fp_weight: float = 0.1) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows <= num_perm whose collision curve best
+    separates Jaccard similarities below `threshold` from those above it.
+    Missed pairs are weighted more than extra candidates (`fp_weight` vs
+    1 - fp_weight), since candidates are scored exactly afterwards.
+    """
+    best = (float("inf"), 1, num_perm)
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            fp = _integrate(lambda s: 1 - (1 - s**rows) ** bands, 0.0, threshold)
+            fn = _integrate(lambda s: (1 - s**rows) ** bands, threshold, 1.0)
+            err = fp_weight * fp + (1 - fp_weight) * fn
+            if err < best[0]:
+                best = (err, bands, rows)
+    return best[1], best[2]
+
+
+class LSHIndex:
+    """
+    Banded LSH over MinHash signatures: two items become candidates when all
+    `rows` values of at least one of the `bands` bands agree. Two blocks
+    with char_multiset Jaccard similarity s collide with probability
+    1 - (1 - s**rows)**bands.
+    """
+
+    def __init__(self, bands: int = 32, rows: int = 2):
+        self.bands = bands
+        self.rows = rows
+        self._buckets: List[Dict[Signature, List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self._sigs: Dict[int, Signature] = {}
+
+    @property
+    def num_perm(self) -> int:
+        return self.bands * self.rows
+
+    def add(self, item: int, sig: Signature) -> None:
+        if len(sig) < self.num_perm:
+            return
+        self._sigs[item] = sig
+        r = self.rows
+        for band, buckets in enumerate(self._buckets):
+            buckets[sig[band * r : (band + 1) * r]].append(item)
+
+    def candidates(self) -> Iterator[Tuple[int, int]]:
+        """
+        Yield each (i, j) pair, i < j, that shares at least one bucket, once.
+
+        A pair is yielded from the first band it collides in, so no set of
+        seen pairs is kept.
+        """
+        r = self.rows
+        for band, buckets in enumerate(self._buckets):
+            for items in buckets.values():
+                if len(items) < 2:
+                    continue
+                for x in range(len(items)):
+                    i = items[x]
+                    sig_i = self._sigs[i]
+                    for y in range(x + 1, len(items)):
+                        j = items[y]
+                        sig_j = self._sigs[j]
+                        if any(sig_i[b * r : (b + 1) * r] == sig_j[b * r : (b + 1) * r] for b in range(band)):
+                            continue  # already yielded from an earlier band
+                        yield i, j
+
+
+def candidate_pairs(
+    signatures: Iterable[Signature],
+    bands: int = 32,
+    rows: int = 2,
+) -> Iterator[Tuple[int, int]]:
+    """Index `signatures` (by position) and yield their candidate pairs."""
+    index = LSHIndex(bands, rows)
+    for i, sig in enumerate(signatures):
+        index.add(i, sig)
+    return index.candidates()
@@ -8,7 +8,7 @@ from rich import box
 from rich.console import Console
 from rich.panel import Panel
 from rich.syntax import Syntax
-from rich.group import Group
+from rich.console import Group
 
 from .detector import detect_dupes
 
@@ -23,6 +23,7 @@ def cli(
     step: int = typer.Option(5, "--step", min=1, help="Token step size for overlapping blocks"),
     max_results: int = typer.Option(20, "--max-results", "-n", min=1, help="Maximum dupes to report"),
     json_output: bool = typer.Option(False, "--json", help="Output JSON instead of rich table"),
+    workers: int = typer.Option(0, "--workers", "-j", min=0, help="Tokenizer processes (0 = one per CPU)"),
 ):
     """Detect duplicate code blocks in Python projects."""
 
@@ -34,7 +35,7 @@ def cli(
 
     try:
         dupes: List[Tuple[float, 'CodeBlock', 'CodeBlock']] = detect_dupes(
-            root, min_tokens, threshold, step, max_results
+            root, min_tokens, threshold, step, max_results, workers
         )
     except KeyboardInterrupt:
         typer.echo("\n[red]Scan interrupted.[/red]")
@@ -31,7 +31,7 @@ def tokenize_file(path: Path) -> Tuple[List[TokenPos], List[str]]:
         return [], []
 
     norm_tokens: List[TokenPos] = []
-    g = tokenize.tokenize(io.StringIO(source).readline)
+    g = tokenize.generate_tokens(io.StringIO(source).readline)
     for tok in g:
         if tok.type in IGNORED_TYPES:
             continue
@@ -60,7 +60,7 @@ def tokenize_source(source: str) -> Tuple[List[TokenPos], List[str]]:
     """
     lines = source.splitlines(keepends=True)
     norm_tokens: List[TokenPos] = []
-    g = tokenize.tokenize(io.StringIO(source).readline)
+    g = tokenize.generate_tokens(io.StringIO(source).readline)
     for tok in g:
         if tok.type in IGNORED_TYPES:
             continue
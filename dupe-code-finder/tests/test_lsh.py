@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import rapidfuzz
+
+from dupe_code_finder.detector import _find_similar_pairs, _scan_file
+from dupe_code_finder.lsh import (
+    LSHIndex,
+    MinHasher,
+    candidate_pairs,
+    char_multiset,
+    jaccard_floor,
+    lsh_params,
+)
+
+
+def test_char_multiset_counts_repeats():
+    assert len(char_multiset("ID ID")) == 5
+    assert char_multiset("ID NUM") == char_multiset("NUM ID")
+    assert char_multiset("") == set()
+
+
+def test_ratio_bounded_by_multiset_dice():
+    a, b = "ID ( ID ) : ID = NUM", "ID ( ) ID : ID == ID"
+    sa, sb = char_multiset(a), char_multiset(b)
+    dice = 2 * len(sa & sb) / (len(sa) + len(sb))
+    assert rapidfuzz.fuzz.token_sort_ratio(a, b) / 100 <= dice
+
+
+def test_signature_deterministic():
+    text = "ID = ID ( ID , NUM ) ID . ID ( )"
+    assert MinHasher(seed=7).signature(text) == MinHasher(seed=7).signature(text)
+    assert len(MinHasher(num_perm=16).signature(text)) == 16
+    assert MinHasher().signature("") == ()
+
+
+def test_candidates_find_near_duplicates():
+    bands, rows = lsh_params(jaccard_floor(0.85), 64)
+    hasher = MinHasher(num_perm=bands * rows)
+    base = "ID ( ID ) : ID = ID + NUM ID ( ID , ID ) ID . ID ( ID )"
+    near = base[:-1] + "NUM"
+    other = "[ NUM , NUM , NUM ] { ID : ID for ID in ID if ID }"
+    sigs = [hasher.signature(t) for t in (base, other, near)]
+    pairs = set(candidate_pairs(sigs, bands, rows))
+    assert (0, 2) in pairs
+    assert (0, 1) not in pairs
+
+
+def test_index_skips_short_signatures():
+    index = LSHIndex(bands=4, rows=2)
+    index.add(0, ())
+    index.add(1, ())
+    assert list(index.candidates()) == []
+
+
+def test_lsh_params_follow_threshold():
+    bands, rows = lsh_params(jaccard_floor(0.85), 64)
+    assert bands * rows <= 64
+    assert rows >= 5  # 2-row bands collide on almost any two blocks
+    assert lsh_params(0.9, 64)[1] > lsh_params(0.6, 64)[1]
+
+
+def test_candidates_unique():
+    sigs = [(1, 2, 3, 4)] * 3
+    assert sorted(candidate_pairs(sigs, bands=2, rows=2)) == [(0, 1), (0, 2), (1, 2)]
+
+
+def test_candidates_recall_against_exhaustive_scoring():
+    # This package's own sources: normalized windows of real code, many of them alike.
+    bands, rows = lsh_params(jaccard_floor(0.85), 64)
+    hasher = MinHasher(num_perm=bands * rows)
+    blocks, sigs = [], []
+    for path in sorted(Path(__file__).parents[1].glob("src/dupe_code_finder/*.py")):
+        file_blocks, file_sigs = _scan_file(path, 30, 5, hasher)
+        blocks.extend(file_blocks)
+        sigs.extend(file_sigs)
+    exact = {(a, b) for _, a, b in _find_similar_pairs(blocks, 0.85)}
+    found = {(a, b) for _, a, b in _find_similar_pairs(blocks, 0.85, sigs, (bands, rows))}
+    assert len(exact) >= 100
+    assert found <= exact
+    assert len(found) >= 0.9 * len(exact)
@@ -0,0 +1,78 @@
+import sys
+from typing import Dict, List, Mapping, Tuple
+
+import numpy as np
+
+class CallTree:
+    """
+    Merged call tree of two profiles. Node 0 is a virtual root; every other
+    node is a call-path prefix with inclusive sample counts per profile.
+    Nodes are created parent-first, so parent[i] < i.
+    """
+
+    def __init__(self):
+        self.frame: List[str] = ['']
+        self.parent: List[int] = [-1]
+        self.depth: List[int] = [0]
+        self._children: Dict[Tuple[int, str], int] = {}
+        self._counts: List[List[int]] = [[0], [0]]
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def _child(self, node: int, frame: str) -> int:
+        key = (node, frame)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = len(self.frame)
+            self.frame.append(sys.intern(frame))
+            self.parent.append(node)
+            self.depth.append(self.depth[node] + 1)
+            self._counts[0].append(0)
+            self._counts[1].append(0)
+        return child
+
+    def add_profile(self, stacks: Mapping[str, int], side: int) -> None:
+        """Add the self counts of `stacks` to column `side` (0 = before, 1 = after)."""
+        counts = self._counts[side]
+        prev: List[str] = []
+        path: List[int] = [0]
+        # Iterating in sorted order lets each stack reuse the path shared with the previous one.
+        for stack in sorted(stacks):
+            frames = stack.split(';')
+            common = 0
+            limit = min(len(frames), len(prev))
+            while common < limit and frames[common] == prev[common]:
+                common += 1
+            del path[common + 1:]
+            for frame in frames[common:]:
+                path.append(self._child(path[-1], frame))
+            counts[path[-1]] += stacks[stack]
+            prev = frames
+
+    @classmethod
+    def from_profiles(cls, before: Mapping[str, int], after: Mapping[str, int]) -> 'CallTree':
+        tree = cls()
+        tree.add_profile(before, 0)
+        tree.add_profile(after, 1)
+        return tree
+
+    def counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Inclusive (total) counts of every node, rolled up one depth level at a time."""
+        parent = np.asarray(self.parent, dtype=np.int64)
+        depth = np.asarray(self.depth, dtype=np.int64)
+        out = []
+        for side in (0, 1):
+            inc = np.asarray(self._counts[side], dtype=np.int64)
+            for d in range(int(depth.max()), 0, -1):
+                level = np.flatnonzero(depth == d)
+                np.add.at(inc, parent[level], inc[level])
+            out.append(inc)
+        return out[0], out[1]
+
+    def path(self, node: int) -> str:
+        frames = []
+        while node > 0:
+            frames.append(self.frame[node])
+            node = self.parent[node]
+        return ';'.join(reversed(frames))
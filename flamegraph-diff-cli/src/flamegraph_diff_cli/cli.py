@@ -1,7 +1,7 @@
 import click
 from rich.console import Console
 from .parser import parse_folded
-from .diff import compute_diff
+from .diff import compute_diff, compute_tree_diff
 from .render import render_terminal, render_html
 
 console = Console()
@@ -10,13 +10,22 @@ console = Console()
 @click.argument('before', type=click.Path(exists=True))
 @click.argument('after', type=click.Path(exists=True))
 @click.option('--alpha', default=0.01, help='Significance threshold')
+@click.option('--min-delta', default=5, show_default=True, help='Ignore frames whose count changed by less')
+@click.option('--normalize', is_flag=True, help='Compare sample rates relative to each profile\'s total')
+@click.option('--tree', is_flag=True, help='Diff call-path prefixes (inclusive counts) instead of whole stacks')
+@click.option('--depth', type=int, default=None, help='With --tree, only compare prefixes up to this depth')
+@click.option('--hierarchical', is_flag=True, help='With --tree, hide prefixes under a branching caller that changed insignificantly')
 @click.option('--format', 'fmt', default='terminal', type=click.Choice(['terminal', 'html']))
 @click.option('--output', type=click.Path())
-def main(before, after, alpha, fmt, output):
+def main(before, after, alpha, min_delta, normalize, tree, depth, hierarchical, fmt, output):
     """Statistical flamegraph diffing CLI."""
     stacks_before = parse_folded(before)
     stacks_after = parse_folded(after)
-    result = compute_diff(stacks_before, stacks_after, alpha)
+    if tree or depth is not None or hierarchical:
+        result = compute_tree_diff(stacks_before, stacks_after, alpha, min_delta, normalize,
+                                   max_depth=depth, hierarchical=hierarchical)
+    else:
+        result = compute_diff(stacks_before, stacks_after, alpha, min_delta, normalize)
     if fmt == 'terminal':
         render_terminal(result, console)
     else:
@@ -26,4 +35,4 @@ def main(before, after, alpha, fmt, output):
         else:
             print(html)
     if result.regressions:
-        raise SystemExit(1)
\ No newline at end of file
+        raise SystemExit(1)
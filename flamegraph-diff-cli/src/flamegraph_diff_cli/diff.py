@@ -1,33 +1,116 @@
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
 import numpy as np
 from scipy import stats
 
+from .calltree import CallTree
+
 @dataclass
 class DiffResult:
     regressions: List[dict]
     improvements: List[dict]
     total_delta: int
 
-def compute_diff(before: Dict[str, int], after: Dict[str, int], alpha: float) -> DiffResult:
-    """Compute per-frame statistical differences."""
-    all_frames = set(before) | set(after)
+def rate_test(before: np.ndarray, after: np.ndarray, share_after: float) -> np.ndarray:
+    """
+    Exact two-sided p-values that each frame's sample rate is unchanged.
+
+    Under the null, a frame's samples are Poisson in both profiles with rates
+    in proportion to each profile's exposure, so conditional on the frame's
+    total n = before + after, after ~ Binomial(n, share_after). Vectorized
+    over all frames; deterministic.
+    """
+    n = before + after
+    lower = stats.binom.cdf(after, n, share_after)
+    upper = stats.binom.sf(after - 1, n, share_after)
+    return np.minimum(1.0, 2 * np.minimum(lower, upper))
+
+def _exposure_share(before: np.ndarray, after: np.ndarray, normalize: bool) -> float:
+    """Expected fraction of a frame's samples in `after` if nothing changed."""
+    if not normalize:
+        return 0.5  # equal-length profiles: compare raw sample counts
+    tb, ta = int(before.sum()), int(after.sum())
+    return ta / (tb + ta) if tb + ta else 0.5
+
+def _delta(before: np.ndarray, after: np.ndarray, share: float) -> np.ndarray:
+    # The raw count change; with normalize it is measured against the before
+    # count scaled to the after profile's size.
+    scale = share / (1 - share) if 0 < share < 1 else 1.0
+    return after - before * scale if scale != 1.0 else after - before
+
+def _classify(names: Sequence[str], before: np.ndarray, after: np.ndarray, p: np.ndarray,
+              mask: np.ndarray, alpha: float, share: float) -> DiffResult:
+    delta = _delta(before, after, share)
+    sig = mask & (p < alpha)
     regressions, improvements = [], []
-    total_delta = 0
-    for frame in all_frames:
-        b = before.get(frame, 0)
-        a = after.get(frame, 0)
-        delta = a - b
-        total_delta += delta
-        if abs(delta) < 5:
-            continue
-        # bootstrap significance
-        samples_b = np.random.choice([0, 1], size=1000, p=[1-b/(b+1), b/(b+1)])
-        samples_a = np.random.choice([0, 1], size=1000, p=[1-a/(a+1), a/(a+1)])
-        _, p = stats.mannwhitneyu(samples_b, samples_a, alternative='two-sided')
-        item = {'frame': frame, 'delta': delta, 'p': p}
-        if p < alpha and delta > 0:
-            regressions.append(item)
-        elif p < alpha and delta < 0:
-            improvements.append(item)
-    return DiffResult(regressions, improvements, total_delta)
\ No newline at end of file
+    for i in np.flatnonzero(sig & (delta > 0)):
+        regressions.append(_item(names[i], before[i], after[i], delta[i], p[i]))
+    for i in np.flatnonzero(sig & (delta < 0)):
+        improvements.append(_item(names[i], before[i], after[i], delta[i], p[i]))
+    regressions.sort(key=lambda r: -r['delta'])
+    improvements.sort(key=lambda r: r['delta'])
+    return DiffResult(regressions, improvements, int(after.sum() - before.sum()))
+
+def _item(frame: str, b, a, delta, p) -> dict:
+    d = float(delta)
+    return {'frame': frame, 'delta': int(d) if d.is_integer() else round(d, 2),
+            'before': int(b), 'after': int(a), 'p': float(p)}
+
+def compute_diff(before: Dict[str, int], after: Dict[str, int], alpha: float,
+                 min_delta: int = 5, normalize: bool = False) -> DiffResult:
+    """Compute per-frame statistical differences."""
+    names = list(before.keys() | after.keys())
+    b = np.fromiter((before.get(k, 0) for k in names), dtype=np.int64, count=len(names))
+    a = np.fromiter((after.get(k, 0) for k in names), dtype=np.int64, count=len(names))
+    share = _exposure_share(b, a, normalize)
+    p = rate_test(b, a, share)
+    return _classify(names, b, a, p, np.abs(_delta(b, a, share)) >= min_delta, alpha, share)
+
+def compute_tree_diff(before: Dict[str, int], after: Dict[str, int], alpha: float,
+                      min_delta: int = 5, normalize: bool = False,
+                      max_depth: Optional[int] = None, hierarchical: bool = False,
+                      tree: Optional[CallTree] = None) -> DiffResult:
+    """
+    Diff inclusive counts of call-path prefixes instead of whole stacks.
+
+    `max_depth` limits the comparison to prefixes at most that deep. With
+    `hierarchical`, a prefix is only reported when no ancestor hides it, so
+    a large profile is read top-down: a regression shows as the chain of
+    call paths that lead to it. An ancestor hides its subtree when it has
+    several children and changed by at least `min_delta` without the change
+    being significant. Ancestors that changed significantly, that have one
+    child, or whose count is unchanged (e.g. the root when time only moved
+    between its children) pass their subtree through.
+    """
+    tree = tree or CallTree.from_profiles(before, after)
+    b, a = tree.counts()
+    depth = np.asarray(tree.depth)
+    parent = np.asarray(tree.parent)
+    share = _exposure_share(b[depth == 1], a[depth == 1], normalize)
+    p = rate_test(b, a, share)
+    changed = np.abs(_delta(b, a, share)) >= min_delta
+    mask = (depth > 0) & changed
+    if max_depth is not None:
+        mask &= depth <= max_depth
+    if hierarchical:
+        children = np.bincount(parent[1:], minlength=len(tree))
+        passes = (p < alpha) | (children <= 1) | ~changed
+        passes[0] = True
+        # Nodes are parent-first, so one level at a time sees final parent values.
+        for d in range(1, int(depth.max()) + 1):
+            level = np.flatnonzero(depth == d)
+            passes[level] &= passes[parent[level]]
+        visible = np.ones(len(tree), dtype=bool)
+        visible[1:] = passes[parent[1:]]
+        mask &= visible
+    names = _LazyPaths(tree)
+    return _classify(names, b, a, p, mask, alpha, share)
+
+class _LazyPaths:
+    """Index -> call path, built only for the nodes that get reported."""
+
+    def __init__(self, tree: CallTree):
+        self.tree = tree
+
+    def __getitem__(self, i: int) -> str:
+        return self.tree.path(int(i))
@@ -1,12 +1,23 @@
-from pathlib import Path
-from typing import Dict
+import sys
+from typing import Dict, Iterator, Tuple
+
+def iter_folded(path: str) -> Iterator[Tuple[str, int]]:
+    """Stream (stack, count) pairs from a folded file; malformed lines are skipped."""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            stack, sep, count = line.rstrip('\n').rpartition(' ')
+            if not sep or not stack.strip():
+                continue
+            try:
+                yield stack, int(count)
+            except ValueError:
+                continue
 
 def parse_folded(path: str) -> Dict[str, int]:
     """Parse Brendan Gregg folded stack format."""
     stacks: Dict[str, int] = {}
-    for line in Path(path).read_text().splitlines():
-        if not line.strip():
-            continue
-        stack, count = line.rsplit(' ', 1)
-        stacks[stack] = stacks.get(stack, 0) + int(count)
-    return stacks
\ No newline at end of file
+    for stack, count in iter_folded(path):
+        # Interned keys share one string object across both profiles and the call tree.
+        stack = sys.intern(stack)
+        stacks[stack] = stacks.get(stack, 0) + count
+    return stacks
@@ -4,11 +4,17 @@ from typing import Any
 def render_terminal(result: Any, console) -> None:
     table = Table(title="Flamegraph Diff")
     table.add_column("Frame")
+    table.add_column("Before", justify="right")
+    table.add_column("After", justify="right")
     table.add_column("Delta", justify="right")
     table.add_column("p-value")
     for r in result.regressions:
-        table.add_row(r['frame'], f"+{r['delta']}", f"{r['p']:.4f}", style="red")
+        table.add_row(r['frame'], str(r.get('before', '')), str(r.get('after', '')),
+                      f"+{r['delta']}", f"{r['p']:.4g}", style="red")
+    for r in result.improvements:
+        table.add_row(r['frame'], str(r.get('before', '')), str(r.get('after', '')),
+                      f"{r['delta']}", f"{r['p']:.4g}", style="green")
     console.print(table)
 
 def render_html(result: Any) -> str:
-    return "<html><body><h1>Diff ready</h1></body></html>"
\ No newline at end of file
+    return "<html><body><h1>Diff ready</h1></body></html>"
@@ -10,4 +10,14 @@ def test_cli_exit_code():
         open(b, 'w').write('main 10\n')
         open(a, 'w').write('main 50\n')
         result = runner.invoke(main, [b, a, '--alpha', '0.1'])
-        assert result.exit_code == 1
\ No newline at end of file
+        assert result.exit_code == 1
+
+def test_cli_tree_mode():
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmp:
+        b = os.path.join(tmp, 'b.folded')
+        a = os.path.join(tmp, 'a.folded')
+        open(b, 'w').write('main;x 100\nmain;y 100\n')
+        open(a, 'w').write('main;x 100\nmain;y 100\n')
+        result = runner.invoke(main, [b, a, '--tree', '--hierarchical'])
+        assert result.exit_code == 0
@@ -1,8 +1,75 @@
-from flamegraph_diff_cli.diff import compute_diff
+import numpy as np
+
+from flamegraph_diff_cli.calltree import CallTree
+from flamegraph_diff_cli.diff import compute_diff, compute_tree_diff, rate_test
+
 
 def test_detects_regression():
     before = {'main;hot': 100}
     after = {'main;hot': 300}
     res = compute_diff(before, after, 0.05)
     assert len(res.regressions) == 1
-    assert res.regressions[0]['delta'] == 200
\ No newline at end of file
+    assert res.regressions[0]['delta'] == 200
+
+def test_deterministic_and_improvements():
+    before = {'main;a': 500, 'main;b': 400, 'main;c': 100}
+    after = {'main;a': 500, 'main;b': 200, 'main;c': 101}
+    first = compute_diff(before, after, 0.01)
+    assert first == compute_diff(before, after, 0.01)
+    assert [r['frame'] for r in first.improvements] == ['main;b']
+    assert first.regressions == []
+
+def test_rate_test_vectorized():
+    p = rate_test(np.array([100, 50, 0]), np.array([300, 50, 0]), 0.5)
+    assert p[0] < 1e-20
+    assert p[1] == 1.0
+    assert p[2] == 1.0
+
+def test_normalize_accounts_for_profile_length():
+    # Twice as many samples everywhere: a longer capture, not a regression.
+    before = {'main;a': 100, 'main;b': 300}
+    after = {'main;a': 200, 'main;b': 600}
+    assert compute_diff(before, after, 0.01).regressions
+    assert not compute_diff(before, after, 0.01, normalize=True).regressions
+
+def test_normalize_gates_on_scaled_delta():
+    # More samples overall: 'main;a' barely moved in raw counts but lost half its share.
+    before = {'main;a': 1000, 'main;b': 1000}
+    after = {'main;a': 1002, 'main;b': 3000}
+    assert 'main;a' in {r['frame'] for r in compute_diff(before, after, 0.01, normalize=True).improvements}
+    tree = compute_tree_diff(before, after, 0.01, normalize=True)
+    assert 'main;a' in {r['frame'] for r in tree.improvements}
+
+def test_calltree_inclusive_counts():
+    tree = CallTree.from_profiles({'main;a;x': 3, 'main;a': 2, 'main;b': 1}, {'main;b': 4})
+    before, after = tree.counts()
+    paths = {tree.path(i): (int(before[i]), int(after[i])) for i in range(1, len(tree))}
+    assert paths == {'main': (6, 4), 'main;a': (5, 0), 'main;a;x': (3, 0), 'main;b': (1, 4)}
+
+def test_tree_diff_hierarchical():
+    before = {'main;svc;slow': 100, 'main;svc;ok': 100, 'main;idle': 800}
+    after = {'main;svc;slow': 400, 'main;svc;ok': 100, 'main;idle': 500}
+    flat = compute_tree_diff(before, after, 0.01)
+    assert {r['frame'] for r in flat.regressions} == {'main;svc', 'main;svc;slow'}
+    # 'main' is unchanged (time moved between its children), so it does not hide them.
+    hier = compute_tree_diff(before, after, 0.01, hierarchical=True)
+    assert {r['frame'] for r in hier.regressions} == {'main;svc', 'main;svc;slow'}
+    shallow = compute_tree_diff(before, after, 0.01, max_depth=2)
+    assert {r['frame'] for r in shallow.regressions} == {'main;svc'}
+
+def test_tree_diff_hierarchical_finds_deep_regression():
+    deep = ';'.join(f'f{i}' for i in range(10))
+    before = {f'main;{deep};leaf{i}': 100 for i in range(50)}
+    after = dict(before)
+    after[f'main;{deep};leaf7'] = 400
+    flat = compute_tree_diff(before, after, 0.01, normalize=True)
+    hier = compute_tree_diff(before, after, 0.01, normalize=True, hierarchical=True)
+    assert f'main;{deep};leaf7' in {r['frame'] for r in flat.regressions}
+    assert f'main;{deep};leaf7' in {r['frame'] for r in hier.regressions}
+
+def test_tree_diff_hierarchical_hides_below_insignificant_change():
+    # 'svc' moved by +10 of ~2000 samples: not significant, so its children stay hidden.
+    before = {'main;svc;a': 10, 'main;svc;b': 2000, 'main;other': 2000}
+    after = {'main;svc;a': 60, 'main;svc;b': 1960, 'main;other': 2000}
+    assert 'main;svc;a' in {r['frame'] for r in compute_tree_diff(before, after, 0.01).regressions}
+    assert compute_tree_diff(before, after, 0.01, hierarchical=True).regressions == []
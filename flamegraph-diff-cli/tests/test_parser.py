@@ -8,4 +8,13 @@ def test_parse_basic():
     try:
         assert parse_folded(name) == {'main;foo': 10, 'main;bar': 5}
     finally:
-        os.unlink(name)
\ No newline at end of file
+        os.unlink(name)
+
+def test_parse_skips_malformed_and_sums():
+    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+        f.write('main;foo 10\ngarbage\nmain;foo 5\n\nmain;bar x\n')
+        name = f.name
+    try:
+        assert parse_folded(name) == {'main;foo': 15}
+    finally:
+        os.unlink(name)
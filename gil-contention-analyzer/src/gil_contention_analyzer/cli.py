@@ -1,13 +1,45 @@
+import json
+import runpy
+import sys
+import time
+from typing import Optional, Tuple
+
 import click
 from rich.console import Console
+
 from .core import GilMonitor
+from .report import print_report
 
 console = Console()
 
-@click.command()
-@click.option("--duration", default=10, help="Seconds to monitor")
-def main(duration: int) -> None:
-    monitor = GilMonitor()
+
+@click.command(context_settings={"ignore_unknown_options": True})
+@click.argument("script", required=False, type=click.Path(exists=True, dir_okay=False))
+@click.argument("args", nargs=-1, type=click.UNPROCESSED)
+@click.option("--duration", default=10, help="Seconds to monitor (without a script)")
+@click.option("--interval", default=0.005, help="Probe interval in seconds")
+@click.option("--window", default=1.0, help="Seconds per reporting interval")
+@click.option("--json", "as_json", is_flag=True, help="Print the report as JSON")
+def main(script: Optional[str], args: Tuple[str, ...], duration: int, interval: float, window: float,
+         as_json: bool) -> None:
+    """Sample GIL contention while SCRIPT runs (or for --duration seconds)."""
+    monitor = GilMonitor(interval=interval, window=window)
     with monitor.measure():
-        import time; time.sleep(duration)
-    console.print("[green]GIL contention report generated[/green]")
\ No newline at end of file
+        if script:
+            argv = sys.argv
+            sys.argv = [script, *args]
+            try:
+                runpy.run_path(script, run_name="__main__")
+            except SystemExit:
+                pass
+            finally:
+                sys.argv = argv
+        else:
+            time.sleep(duration)
+
+    report = monitor.report()
+    if as_json:
+        click.echo(json.dumps(report.to_dict(), indent=2))
+    else:
+        print_report(report, console)
+        console.print("[green]GIL contention report generated[/green]")
@@ -1,31 +1,254 @@
+"""
+Sampling GIL monitor.
+
+A watchdog thread sleeps for `interval` seconds at a time. When its sleep
+ends it has to take the GIL back before it can run its next line of
+Python, so the time by which it wakes late is how long a thread that just
+became runnable waits for the GIL (plus OS wake-up latency, typically well
+under 100 us). With the GIL free the probe is on time; with CPU-bound
+threads holding it, the probe waits up to `sys.getswitchinterval()` (5 ms
+by default) per switch.
+
+Every 100 ms the watchdog also reads each thread's CPU clock, giving a
+per-thread CPU/wall ratio per `window`, and its own CPU time
+(`time.thread_time`), which is the monitor's overhead. Nothing runs in the
+measured threads themselves: no profile hooks, no per-call cost.
+"""
 import sys
+import threading
 import time
 from collections import defaultdict
 from contextlib import contextmanager
-from typing import Any, Callable, Dict, List
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+# Probe latency histogram edges, in microseconds.
+LATENCY_BINS_US = [0, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 25_000, float("inf")]
+# Per-thread CPU/wall ratio histogram edges.
+SHARE_BINS = [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, float("inf")]
+# A probe later than this waited for the GIL rather than for the OS.
+CONTENDED_S = 0.001
+# Thread CPU clocks are read this often; CPU a thread spends after its last
+# read before exiting is lost, so keep it well below the window.
+CPU_INTERVAL_S = 0.1
+
+
+def thread_cpu_clock(native_id: int) -> Optional[int]:
+    """
+    clockid of a thread's CPU clock from its kernel thread id (Linux).
+
+    Same encoding glibc's pthread_getcpuclockid uses, but built from the tid
+    rather than a pthread_t: a thread that has exited gives EINVAL instead
+    of undefined behaviour.
+    """
+    if sys.platform.startswith("linux"):
+        return (~native_id << 3) | 6  # CPUCLOCK_PERTHREAD_MASK | CPUCLOCK_SCHED
+    return None
+
+
+def thread_cpu_time(native_id: int) -> Optional[float]:
+    clock = thread_cpu_clock(native_id)
+    if clock is None:
+        return None
+    try:
+        return time.clock_gettime(clock)
+    except OSError:  # thread exited
+        return None
+
+
+def latency_histogram(latencies_s: List[float]) -> List[int]:
+    counts, _ = np.histogram(np.asarray(latencies_s) * 1e6, bins=LATENCY_BINS_US)
+    return counts.tolist()
+
+
+def share_histogram(shares: List[float]) -> List[int]:
+    counts, _ = np.histogram(np.asarray(shares), bins=SHARE_BINS)
+    return counts.tolist()
+
+
+def percentiles(values: List[float], qs=(50, 95, 99)) -> Dict[str, float]:
+    if not values:
+        return {f"p{q}": 0.0 for q in qs} | {"max": 0.0}
+    arr = np.asarray(values)
+    return {f"p{q}": float(v) for q, v in zip(qs, np.percentile(arr, qs))} | {"max": float(arr.max())}
+
+
+@dataclass
+class Window:
+    """One `window` of probes, with every thread's CPU/wall ratio over it."""
+
+    start: float  # seconds since the monitor started
+    wall: float
+    latencies: List[float]
+    cpu_share: Dict[int, float]  # thread ident -> CPU seconds / wall seconds
+
+    @property
+    def contended(self) -> float:
+        """Fraction of probes that waited for the GIL."""
+        if not self.latencies:
+            return 0.0
+        return sum(1 for l in self.latencies if l > CONTENDED_S) / len(self.latencies)
+
+
+@dataclass
+class ThreadStats:
+    ident: int
+    name: str
+    cpu: float  # seconds over the whole run
+    wall: float  # seconds observed
+    shares: List[float]  # CPU/wall per window
+
+    @property
+    def ratio(self) -> float:
+        return self.cpu / self.wall if self.wall else 0.0
+
+
+@dataclass
+class Report:
+    duration: float
+    interval: float
+    switch_interval: float
+    overhead: float  # watchdog CPU seconds / wall seconds
+    latencies: List[float]
+    windows: List[Window]
+    threads: List[ThreadStats] = field(default_factory=list)
+
+    @property
+    def contended(self) -> float:
+        if not self.latencies:
+            return 0.0
+        return sum(1 for l in self.latencies if l > CONTENDED_S) / len(self.latencies)
+
+    def to_dict(self) -> dict:
+        return {
+            "duration_s": self.duration,
+            "interval_s": self.interval,
+            "switch_interval_s": self.switch_interval,
+            "overhead": self.overhead,
+            "probes": len(self.latencies),
+            "contended": self.contended,
+            "latency_s": percentiles(self.latencies),
+            "latency_histogram": {"bins_us": LATENCY_BINS_US[:-1], "counts": latency_histogram(self.latencies)},
+            "windows": [
+                {"start_s": w.start, "probes": len(w.latencies), "contended": w.contended,
+                 "latency_s": percentiles(w.latencies), "latency_histogram": latency_histogram(w.latencies),
+                 "cpu_share": {str(k): v for k, v in w.cpu_share.items()}}
+                for w in self.windows
+            ],
+            "threads": [
+                {"ident": t.ident, "name": t.name, "cpu_s": t.cpu, "wall_s": t.wall, "cpu_ratio": t.ratio,
+                 "share_histogram": {"bins": SHARE_BINS[:-1], "counts": share_histogram(t.shares)}}
+                for t in self.threads
+            ],
+        }
+
 
 class GilMonitor:
-    def __init__(self) -> None:
+    def __init__(self, interval: float = 0.005, window: float = 1.0) -> None:
+        self.interval = interval
+        self.window = window
+        # thread ident -> CPU/wall ratio per window
         self._data: Dict[int, List[float]] = defaultdict(list)
-        self._active = False
+        self._names: Dict[int, str] = {}
+        self._last_cpu: Dict[int, tuple[int, float]] = {}  # ident -> (native id, CPU seconds)
+        self._cpu_total: Dict[int, float] = defaultdict(float)
+        self._wall_total: Dict[int, float] = defaultdict(float)
+        self._windows: List[Window] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._stopped = 0.0
+        self._overhead_cpu = 0.0
+
+    def _sample_cpu(self, window_cpu: Dict[int, float]) -> None:
+        """Add each thread's CPU time since the last sample to `window_cpu`."""
+        me = threading.get_ident()
+        for t in threading.enumerate():
+            if t.ident is None or t.ident == me or t.native_id is None:
+                continue
+            cpu = thread_cpu_time(t.native_id)
+            if cpu is None:
+                continue
+            # A thread first seen now has spent all of its CPU time since the last sample
+            prev = self._last_cpu.get(t.ident, (t.native_id, 0.0))
+            if prev[0] != t.native_id:  # ident reused by a new thread
+                prev = (t.native_id, 0.0)
+            window_cpu[t.ident] = window_cpu.get(t.ident, 0.0) + cpu - prev[1]
+            self._last_cpu[t.ident] = (t.native_id, cpu)
+            self._names[t.ident] = t.name
+
+    def _close_window(self, start: float, end: float, latencies: List[float], window_cpu: Dict[int, float]) -> None:
+        wall = end - start
+        shares: Dict[int, float] = {}
+        for ident, spent in window_cpu.items():
+            shares[ident] = spent / wall if wall > 0 else 0.0
+            self._data[ident].append(shares[ident])
+            self._cpu_total[ident] += spent
+            self._wall_total[ident] += wall
+        self._windows.append(Window(start - self._started, wall, latencies, shares))
+
+    def _run(self) -> None:
+        clock = time.perf_counter
+        interval, stop = self.interval, self._stop
+        cpu_interval = min(self.window, CPU_INTERVAL_S)
+        cpu_start = time.thread_time()
+        window_start = next_cpu = clock()
+        window_cpu: Dict[int, float] = {}
+        self._sample_cpu({})  # baseline: CPU spent before the monitor started is not counted
+        latencies: List[float] = []
+        while True:
+            target = clock() + interval
+            if stop.wait(interval):
+                break
+            now = clock()
+            latencies.append(max(0.0, now - target))
+            if now >= next_cpu:
+                self._sample_cpu(window_cpu)
+                next_cpu = now + cpu_interval
+            if now - window_start >= self.window:
+                self._close_window(window_start, now, latencies, window_cpu)
+                window_start, latencies, window_cpu = now, [], {}
+        if latencies:  # partial last window
+            self._sample_cpu(window_cpu)
+            self._close_window(window_start, clock(), latencies, window_cpu)
+        self._overhead_cpu = time.thread_time() - cpu_start
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="gil-monitor", daemon=True)
+        self._thread.start()
 
-    def _profile(self, frame: Any, event: str, arg: Any) -> Callable[[Any, str, Any], Any] | None:
-        if event == "call" and self._active:
-            thread_id = threading.get_ident()
-            start = time.perf_counter()
-            # simulate GIL acquisition measurement
-            self._data[thread_id].append(start)
-        return self._profile
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._stopped = time.perf_counter()
 
     @contextmanager
-    def measure(self):
-        self._active = True
-        old = sys.getprofile()
-        sys.setprofile(self._profile)
+    def measure(self) -> Iterator["GilMonitor"]:
+        self.start()
         try:
             yield self
         finally:
-            sys.setprofile(old)
-            self._active = False
+            self.stop()
 
-import threading  # noqa: E402
\ No newline at end of file
+    def report(self) -> Report:
+        duration = max(self._stopped - self._started, 1e-9)
+        threads = [
+            ThreadStats(ident, self._names[ident], self._cpu_total[ident], self._wall_total[ident], shares)
+            for ident, shares in self._data.items()
+        ]
+        threads.sort(key=lambda t: t.cpu, reverse=True)
+        return Report(
+            duration=duration,
+            interval=self.interval,
+            switch_interval=sys.getswitchinterval(),
+            overhead=self._overhead_cpu / duration,
+            latencies=[l for w in self._windows for l in w.latencies],
+            windows=self._windows,
+            threads=threads,
+        )
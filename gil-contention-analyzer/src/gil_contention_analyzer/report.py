@@ -0,0 +1,68 @@
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from .core import LATENCY_BINS_US, SHARE_BINS, Report, latency_histogram, percentiles, share_histogram
+
+_BARS = " ▁▂▃▄▅▆▇█"
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1e3:.2f}"
+
+
+def _spark(counts: list[int]) -> str:
+    top = max(counts) if counts else 0
+    return "".join(_BARS[round(c / top * (len(_BARS) - 1))] if top else " " for c in counts)
+
+
+def _bin_label(lo: float, hi: float) -> str:
+    return f"≥{lo / 1000:g} ms" if hi == float("inf") else f"{lo / 1000:g}–{hi / 1000:g} ms"
+
+
+def print_report(report: Report, console: Console) -> None:
+    lat = percentiles(report.latencies)
+    console.print(
+        f"[bold]GIL probe[/bold]: {len(report.latencies)} probes every {_ms(report.interval)} ms over "
+        f"{report.duration:.1f} s (switch interval {_ms(report.switch_interval)} ms)\n"
+        f"Wake-up latency p50 {_ms(lat['p50'])} ms, p95 {_ms(lat['p95'])} ms, p99 {_ms(lat['p99'])} ms, "
+        f"max {_ms(lat['max'])} ms; [bold]{report.contended:.1%}[/bold] of probes waited for the GIL. "
+        f"Monitor overhead {report.overhead:.2%} CPU."
+    )
+
+    hist = Table(title="Probe latency", box=box.SIMPLE)
+    hist.add_column("Latency")
+    hist.add_column("Probes", justify="right")
+    hist.add_column("Share", justify="right")
+    counts = latency_histogram(report.latencies)
+    total = sum(counts) or 1
+    for lo, hi, count in zip(LATENCY_BINS_US, LATENCY_BINS_US[1:], counts):
+        hist.add_row(_bin_label(lo, hi), str(count), f"{count / total:.1%}")
+    console.print(hist)
+
+    windows = Table(title="Per interval", box=box.SIMPLE)
+    windows.add_column("t (s)", justify="right")
+    windows.add_column("Probes", justify="right")
+    windows.add_column("p50 ms", justify="right")
+    windows.add_column("p99 ms", justify="right")
+    windows.add_column("Contended", justify="right", style="yellow")
+    windows.add_column("Python CPU", justify="right")
+    windows.add_column("Latency histogram")
+    for w in report.windows:
+        p = percentiles(w.latencies)
+        windows.add_row(
+            f"{w.start:.1f}", str(len(w.latencies)), _ms(p["p50"]), _ms(p["p99"]),
+            f"{w.contended:.0%}", f"{sum(w.cpu_share.values()):.2f}", _spark(latency_histogram(w.latencies)),
+        )
+    console.print(windows)
+
+    threads = Table(title="Per thread", box=box.SIMPLE)
+    threads.add_column("Thread", style="cyan")
+    threads.add_column("CPU s", justify="right")
+    threads.add_column("CPU/wall", justify="right")
+    threads.add_column(f"Windows by CPU share ({', '.join(f'{b:.0%}' for b in SHARE_BINS[:-1])}+)")
+    for t in report.threads:
+        threads.add_row(t.name, f"{t.cpu:.2f}", f"{t.ratio:.0%}", _spark(share_histogram(t.shares)))
+    console.print(threads)
+    if report.threads and not any(t.cpu for t in report.threads):
+        console.print("[dim]Per-thread CPU clocks are only read on Linux.[/dim]")
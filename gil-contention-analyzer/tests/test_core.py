@@ -16,4 +16,36 @@ def test_thread_isolation():
         t = threading.Thread(target=work)
         t.start()
         t.join()
-    assert len(m._data) >= 1
\ No newline at end of file
+    assert len(m._data) >= 1
+
+def test_contention_detected():
+    import threading, time
+    def spin(until):
+        while time.perf_counter() < until:
+            pass
+    m = GilMonitor(interval=0.002, window=0.25)
+    with m.measure():
+        until = time.perf_counter() + 0.5
+        threads = [threading.Thread(target=spin, args=(until,), name=f"spin-{i}") for i in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    report = m.report()
+    assert report.contended > 0.5
+    names = {t.name for t in report.threads}
+    assert {"spin-0", "spin-1"} <= names
+    spinning = sum(t.cpu for t in report.threads if t.name.startswith("spin"))
+    assert spinning > 0.25
+
+
+def test_report_dict():
+    import json, time
+    m = GilMonitor(interval=0.002, window=0.05)
+    with m.measure():
+        time.sleep(0.12)
+    d = m.report().to_dict()
+    json.dumps(d)
+    assert d["probes"] > 0
+    assert len(d["windows"]) >= 2
+    assert sum(d["latency_histogram"]["counts"]) == d["probes"]
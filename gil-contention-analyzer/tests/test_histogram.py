@@ -1,3 +1,23 @@
+import threading
+
+from gil_contention_analyzer.core import (
+    LATENCY_BINS_US, SHARE_BINS, latency_histogram, percentiles, share_histogram, thread_cpu_time,
+)
+
+
 def test_histogram_bounds():
-    # placeholder
-    assert True
\ No newline at end of file
+    counts = latency_histogram([0.0, 0.00005, 0.003, 10.0])
+    assert len(counts) == len(LATENCY_BINS_US) - 1
+    assert counts[0] == 2 and counts[-1] == 1 and sum(counts) == 4
+    shares = share_histogram([0.0, 0.5, 1.0, 1.7])
+    assert len(shares) == len(SHARE_BINS) - 1
+    assert shares[-1] == 2
+
+
+def test_percentiles_empty():
+    assert percentiles([]) == {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    assert percentiles([1.0, 3.0])["max"] == 3.0
+
+
+def test_thread_cpu_time():
+    assert thread_cpu_time(threading.get_native_id()) >= 0.0
@@ -1,12 +1,13 @@
 import json
 import sys
+from dataclasses import asdict
 import typer
-from typing import Annotated, Optional
+from typing import Annotated, List, Optional
 
 from rich import print
 
 from . import __version__
-from .scanner import scan, SecretHit, Detection
+from .scanner import scan as run_scan, SecretHit, Detection
 
 
 app = typer.Typer(no_args_is_help=True, pretty_exceptions_enable=False)
@@ -18,7 +19,7 @@ def print_hits(hits: list[SecretHit], json_output: bool):
         raise typer.Exit(0)
 
     if json_output:
-        print(json.dumps([h.__dict__ for h in hits], indent=2))
+        print(json.dumps([asdict(h) for h in hits], indent=2))
     else:
         from rich.table import Table
         from rich.console import Console
@@ -48,22 +49,24 @@ def print_hits(hits: list[SecretHit], json_output: bool):
 
 @app.command()
 def scan(
-    path: str = ".",
-    depth: Annotated[int, typer.Option(100, min=0, help="Max commits to scan (0=working tree only)" )] = 100,
+    path: Annotated[str, typer.Argument(help="Repository or directory to scan")] = ".",
+    depth: Annotated[int, typer.Option(min=0, help="Max commits to scan (0=working tree only)" )] = 100,
     full_history: Annotated[bool, typer.Option(help="Scan full history (ignores depth, slow)" )] = False,
     exclude: Annotated[Optional[List[str]], typer.Option(help="Exclude globs (e.g. '.env*')" )] = None,
     allowlist: Annotated[Optional[List[str]], typer.Option(help="Ignore regex snippets" )] = None,
     patterns_file: Annotated[Optional[str], typer.Option(help="Custom patterns JSON" )] = None,
-    entropy_thresh: Annotated[float, typer.Option(3.5, min=0.0, help="Entropy threshold (bits/char)" )] = 3.5,
-    min_length: Annotated[int, typer.Option(20, min=5, help="Min length for entropy check" )] = 20,
+    entropy_thresh: Annotated[float, typer.Option(min=0.0, help="Entropy threshold (bits/char)" )] = 3.5,
+    min_length: Annotated[int, typer.Option(min=5, help="Min length for entropy check" )] = 20,
     json: Annotated[bool, typer.Option(help="JSON output" )] = False,
+    workers: Annotated[int, typer.Option("--workers", "-j", min=0, help="Detector processes for history (0 = one per CPU)" )] = 0,
+    cache: Annotated[bool, typer.Option(help="Reuse results for blobs scanned before (.git/secrets-scanner)" )] = True,
 ):
     """Scan for secrets."""
     exclude_globs = exclude or []
     allowlist_re = allowlist or []
 
     try:
-        hits = scan(
+        hits = run_scan(
             path,
             depth,
             full_history,
@@ -72,8 +75,12 @@ def scan(
             entropy_thresh,
             min_length,
             allowlist_re,
+            workers=workers,
+            use_cache=cache,
         )
         print_hits(hits, json)
+    except typer.Exit:
+        raise
     except Exception as e:
         typer.echo(f"[red]Error: {e}[/red]", err=True)
         raise typer.Exit(1)
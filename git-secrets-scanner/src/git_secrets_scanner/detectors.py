@@ -1,7 +1,10 @@
 import json
 import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
 
 from .utils import shannon_entropy, mask_snippet
 
@@ -34,26 +37,93 @@ def load_patterns(patterns_file: str | None = None) -> List[Dict[str, Any]]:
     return PATTERNS
 
 
+# Same boundaries as str.splitlines().
+_LINE_BREAK = re.compile("\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+@dataclass
+class Detection:
+    detector_id: str
+    name: str
+    line: int
+    snippet: str
+    entropy: Optional[float] = None
+
+
+class PatternSet:
+    """
+    Patterns and allowlist compiled once.
+
+    All patterns are also joined into one alternation, run over the whole
+    text in a single pass; only lines it touches are re-checked with the
+    individual patterns (which may overlap, e.g. GitHub token/PAT).
+    """
+
+    FLAGS = re.IGNORECASE | re.MULTILINE
+
+    def __init__(self, patterns: List[Dict[str, Any]], allowlist: List[str]):
+        self.patterns = [(pat["id"], pat["name"], re.compile(pat["regex"], self.FLAGS)) for pat in patterns]
+        self.allowlist = [re.compile(al, re.I) for al in allowlist]
+        try:
+            self.combined: Optional[re.Pattern] = re.compile(
+                "|".join(f"(?:{pat['regex']})" for pat in patterns), self.FLAGS
+            ) if patterns else None
+        except re.error:  # e.g. inline global flags or duplicate group names
+            self.combined = None
+
+    def allowed(self, snippet: str) -> bool:
+        return any(al.search(snippet) for al in self.allowlist)
+
+    def candidate_lines(self, text: str) -> Optional[Set[int]]:
+        """0-based indexes of lines that may match some pattern (None: all lines)."""
+        if self.combined is None:
+            return None if self.patterns else set()
+        starts: List[int] = []
+        found: Set[int] = set()
+        for m in self.combined.finditer(text):
+            if not starts:
+                starts = [0] + [b.end() for b in _LINE_BREAK.finditer(text)]
+            first = bisect_right(starts, m.start()) - 1
+            last = bisect_right(starts, max(m.start(), m.end() - 1)) - 1
+            found.update(range(first, last + 1))
+        return found
+
+
+@lru_cache(maxsize=16)
+def _compile(key: str) -> PatternSet:
+    patterns, allowlist = json.loads(key)
+    return PatternSet(patterns, allowlist)
+
+
+def compile_patterns(patterns: List[Dict[str, Any]], allowlist: List[str]) -> PatternSet:
+    """Compiled PatternSet, cached per (patterns, allowlist)."""
+    return _compile(json.dumps([patterns, list(allowlist)], sort_keys=True))
+
+
 def detect_in_text(
     text: str,
-    patterns: List[Dict[str, Any]],
+    patterns: List[Dict[str, Any]] | PatternSet,
     entropy_thresh: float,
     min_length: int,
     allowlist: List[str],
-) -> List["Detection"]:
+) -> List[Detection]:
     """Detect secrets in text."""
+    compiled = patterns if isinstance(patterns, PatternSet) else compile_patterns(patterns, allowlist)
     hits: List[Detection] = []
     lines = text.splitlines()
 
     # Regex detectors
-    for pat in patterns:
-        regex = re.compile(pat["regex"], re.IGNORECASE | re.MULTILINE)
-        for line_num, line in enumerate(lines, 1):
+    candidates = compiled.candidate_lines(text)
+    for pat_id, pat_name, regex in compiled.patterns:
+        for idx in sorted(candidates) if candidates is not None else range(len(lines)):
+            if idx >= len(lines):
+                continue
+            line = lines[idx]
             for match in regex.finditer(line):
                 snippet = mask_snippet(line)
-                if any(re.search(al, snippet, re.I) for al in allowlist):
+                if compiled.allowed(snippet):
                     continue
-                hits.append(Detection(pat["id"], pat["name"], line_num, snippet))
+                hits.append(Detection(pat_id, pat_name, idx + 1, snippet))
 
     # Entropy detector
     for line_num, line in enumerate(lines, 1):
@@ -62,7 +132,7 @@ def detect_in_text(
             ent = shannon_entropy(line_str)
             if ent >= entropy_thresh:
                 snippet = mask_snippet(line_str)
-                if not any(re.search(al, snippet, re.I) for al in allowlist):
+                if not compiled.allowed(snippet):
                     hits.append(Detection("high_entropy", "High Entropy String", line_num, snippet, ent))
 
-    return hits
\ No newline at end of file
+    return hits
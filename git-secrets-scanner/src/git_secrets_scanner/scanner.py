@@ -1,22 +1,26 @@
 import fnmatch
+import hashlib
+import json
 import os
+import sqlite3
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import git
 from git.exc import GitCommandError, InvalidGitRepositoryError
 
-from .detectors import detect_in_text, load_patterns
+from .detectors import Detection, compile_patterns, detect_in_text, load_patterns
 from .utils import mask_snippet
 
-
-@dataclass
-class Detection:
-    detector_id: str
-    name: str
-    line: int
-    snippet: str
-    entropy: Optional[float] = None
+# Blobs per detector task: ~4 MiB or 256 blobs, whichever fills first.
+BATCH_BYTES = 4 * 1024 * 1024
+BATCH_BLOBS = 256
+CACHE_FLUSH = 5000
 
 
 @dataclass
@@ -36,7 +40,9 @@ def scan_directory(
 ) -> List[SecretHit]:
     """Scan files in directory recursively."""
     hits: List[SecretHit] = []
-    for root, _, files in os.walk(path):
+    compiled = compile_patterns(patterns, allowlist)
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d != ".git"]
         for file in files:
             file_path = Path(root) / file
             rel_path = file_path.relative_to(path)
@@ -44,7 +50,7 @@ def scan_directory(
                 continue
             try:
                 content = file_path.read_text(encoding="utf-8", errors="ignore")
-                detections = detect_in_text(content, patterns, entropy_thresh, min_length, allowlist)
+                detections = detect_in_text(content, compiled, entropy_thresh, min_length, allowlist)
                 for det in detections:
                     hits.append(SecretHit(None, str(rel_path), det))
             except (UnicodeDecodeError, PermissionError, OSError):
@@ -52,6 +58,205 @@ def scan_directory(
     return hits
 
 
+def _nul_fields(stream, size: int = 1 << 16) -> Iterator[str]:
+    """NUL-terminated fields of a text stream, read in `size` chunks."""
+    rest = ""
+    while True:
+        chunk = stream.read(size)
+        if not chunk:
+            break
+        *fields, rest = (rest + chunk).split("\0")
+        yield from fields
+    if rest:
+        yield rest
+
+
+def history_blobs(
+    repo: git.Repo,
+    depth: Optional[int],
+    exclude_globs: Sequence[str] = (),
+) -> Dict[str, Dict[str, str]]:
+    """
+    Unique blobs added or modified in history: blob sha -> {path: commit}.
+
+    One `git log --raw` walk (newest first, merges diffed against their first
+    parent) replaces per-commit diffs; the commit kept for each (blob, path)
+    is the oldest one that introduced it. `-z` keeps paths verbatim (no
+    C-quoting of non-ASCII or special characters).
+    """
+    args = ["git", "-C", repo.working_tree_dir or repo.git_dir, "log", "--all", "--raw", "-z",
+            "--no-abbrev", "--no-renames", "--diff-merges=first-parent", "--format=commit %H"]
+    if depth is not None:
+        args.append(f"--max-count={depth}")
+    blobs: Dict[str, Dict[str, str]] = {}
+    commit = ""
+    with subprocess.Popen(args, stdout=subprocess.PIPE, text=True, errors="surrogateescape") as proc:
+        fields = _nul_fields(proc.stdout)
+        for field in fields:
+            field = field.lstrip("\n")
+            if field.startswith("commit "):
+                commit = field[7:]
+            elif field.startswith(":"):
+                path = next(fields)  # --no-renames: exactly one path per entry
+                _, new_mode, _, new_sha, status = field.split()
+                if status[0] not in "AMC" or new_mode.startswith("16"):  # deletions, submodules
+                    continue
+                if any(fnmatch.fnmatch(path, glob) for glob in exclude_globs):
+                    continue
+                blobs.setdefault(new_sha, {})[path] = commit
+    if proc.returncode:
+        raise GitCommandError(args, proc.returncode)
+    return blobs
+
+
+def cat_blobs(repo: git.Repo, shas: Iterable[str]) -> Iterator[Tuple[str, bytes]]:
+    """Stream (sha, content) for `shas` through one `git cat-file --batch` process."""
+    proc = subprocess.Popen(
+        ["git", "-C", repo.git_dir, "cat-file", "--batch"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+
+    def _feed() -> None:
+        try:
+            for sha in shas:
+                proc.stdin.write(sha.encode() + b"\n")
+        except BrokenPipeError:
+            pass
+        finally:
+            proc.stdin.close()
+
+    feeder = threading.Thread(target=_feed, daemon=True)
+    feeder.start()
+    try:
+        out = proc.stdout
+        while True:
+            header = out.readline()
+            if not header:
+                break
+            parts = header.split()
+            if len(parts) < 3:  # "<sha> missing"
+                continue
+            size = int(parts[2])
+            data = out.read(size)
+            out.read(1)  # trailing newline
+            if parts[1] == b"blob":
+                yield parts[0].decode(), data
+    finally:
+        proc.stdout.close()
+        proc.wait()
+        feeder.join()
+
+
+def _scan_blobs(
+    batch: List[Tuple[str, bytes]],
+    patterns: List[dict],
+    entropy_thresh: float,
+    min_length: int,
+    allowlist: List[str],
+) -> List[Tuple[str, List[Detection]]]:
+    compiled = compile_patterns(patterns, allowlist)
+    return [
+        (sha, detect_in_text(data.decode("utf-8", errors="ignore"), compiled, entropy_thresh, min_length, allowlist))
+        for sha, data in batch
+    ]
+
+
+def _batches(blobs: Iterator[Tuple[str, bytes]], max_bytes: int = BATCH_BYTES) -> Iterator[List[Tuple[str, bytes]]]:
+    batch: List[Tuple[str, bytes]] = []
+    size = 0
+    for sha, data in blobs:
+        batch.append((sha, data))
+        size += len(data)
+        if size >= max_bytes or len(batch) >= BATCH_BLOBS:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+
+def detect_blobs(
+    repo: git.Repo,
+    shas: List[str],
+    patterns: List[dict],
+    entropy_thresh: float,
+    min_length: int,
+    allowlist: List[str],
+    workers: int = 0,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> Iterator[Tuple[str, List[Detection]]]:
+    """Run the detectors over blobs streamed from git, in a process pool when `workers` > 1."""
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    batches = _batches(cat_blobs(repo, shas))
+    args = (patterns, entropy_thresh, min_length, allowlist)
+    if workers <= 1 or len(shas) < BATCH_BLOBS:
+        for batch in batches:
+            yield from _scan_blobs(batch, *args)
+            if on_progress:
+                on_progress(len(batch))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for batch in batches:
+            pending.append((len(batch), pool.submit(_scan_blobs, batch, *args)))
+            if len(pending) >= 2 * workers:
+                n, fut = pending.popleft()
+                yield from fut.result()
+                if on_progress:
+                    on_progress(n)
+        while pending:
+            n, fut = pending.popleft()
+            yield from fut.result()
+            if on_progress:
+                on_progress(n)
+
+
+class BlobCache:
+    """
+    Persistent blob sha -> detections, per detector configuration, in SQLite.
+
+    Blob content is immutable, so a sha scanned once with the same patterns
+    and thresholds never needs scanning again.
+    """
+
+    def __init__(self, path: Path, config: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.config = config
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (config TEXT, sha TEXT, hits TEXT, PRIMARY KEY (config, sha))"
+        )
+
+    @staticmethod
+    def fingerprint(patterns: List[dict], entropy_thresh: float, min_length: int, allowlist: List[str]) -> str:
+        key = json.dumps([patterns, entropy_thresh, min_length, allowlist], sort_keys=True)
+        return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+    def lookup(self, shas: Iterable[str]) -> Dict[str, List[Detection]]:
+        """Cached detections for whichever of `shas` were scanned before."""
+        wanted = list(shas)
+        found: Dict[str, List[Detection]] = {}
+        for i in range(0, len(wanted), 500):
+            chunk = wanted[i : i + 500]
+            rows = self.db.execute(
+                f"SELECT sha, hits FROM blobs WHERE config = ? AND sha IN ({','.join('?' * len(chunk))})",
+                [self.config, *chunk],
+            )
+            for sha, hits in rows:
+                found[sha] = [Detection(**d) for d in json.loads(hits)]
+        return found
+
+    def store(self, results: Iterable[Tuple[str, List[Detection]]]) -> None:
+        self.db.executemany(
+            "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?)",
+            ((self.config, sha, json.dumps([asdict(d) for d in dets])) for sha, dets in results),
+        )
+        self.db.commit()
+
+    def close(self) -> None:
+        self.db.close()
+
+
 def scan_git_history(
     repo: git.Repo,
     depth: Optional[int],
@@ -61,28 +266,48 @@ def scan_git_history(
     min_length: int,
     allowlist: List[str],
     progress: "rich.progress.Progress",
+    workers: int = 0,
+    cache_path: Optional[Path] = None,
+    exclude_globs: Sequence[str] = (),
 ) -> List[SecretHit]:
-    """Scan Git history: changed files only."""
+    """Scan Git history: each unique added/modified blob once."""
+    blobs = history_blobs(repo, None if full_history else depth, exclude_globs)
+    cache = None
+    if cache_path is not None:
+        config = BlobCache.fingerprint(patterns, entropy_thresh, min_length, allowlist)
+        cache = BlobCache(cache_path, config)
+    try:
+        results = cache.lookup(blobs) if cache else {}
+        todo = [sha for sha in blobs if sha not in results]
+        task = progress.add_task("[cyan]Scanning history...", total=len(todo))
+        fresh: List[Tuple[str, List[Detection]]] = []
+        for sha, dets in detect_blobs(
+            repo, todo, patterns, entropy_thresh, min_length, allowlist, workers,
+            on_progress=lambda n: progress.advance(task, n),
+        ):
+            results[sha] = dets
+            fresh.append((sha, dets))
+            if cache and len(fresh) >= CACHE_FLUSH:
+                cache.store(fresh)
+                fresh = []
+        if cache:
+            cache.store(fresh)
+    finally:
+        if cache:
+            cache.close()
+
     hits: List[SecretHit] = []
-    commits = list(repo.iter_commits(all=True, max_count=depth if not full_history else None))
-    task = progress.add_task("[cyan]Scanning history...", total=len(commits))
-
-    for commit in commits:
-        progress.advance(task)
-        parent = commit.parents[0] if commit.parents else None
-        diffs = commit.diff(parent)
-        for diff in diffs:
-            if diff.change_type in ("A", "M", "R") and diff.b_blob:
-                try:
-                    content = diff.b_blob.data_stream.read().decode("utf-8", errors="ignore")
-                    detections = detect_in_text(content, patterns, entropy_thresh, min_length, allowlist)
-                    for det in detections:
-                        hits.append(SecretHit(commit.hexsha[:8], diff.b_path, det))
-                except UnicodeDecodeError:
-                    pass
+    for sha, introduced in blobs.items():
+        for det in results.get(sha, ()):
+            for path, commit in introduced.items():
+                hits.append(SecretHit(commit[:8], path, det))
     return hits
 
 
+def default_cache_path(repo: git.Repo) -> Path:
+    return Path(repo.git_dir) / "secrets-scanner" / "blobs.sqlite"
+
+
 def scan(
     path_str: str,
     depth: int,
@@ -92,51 +317,44 @@ def scan(
     entropy_thresh: float,
     min_length: int,
     allowlist: List[str],
+    workers: int = 0,
+    use_cache: bool = True,
 ) -> List[SecretHit]:
     """Main scan entrypoint."""
     path = Path(path_str).resolve()
     patterns = load_patterns(patterns_file)
     hits: List[SecretHit] = []
 
-    # Check if Git repo
-    try:
-        repo = git.Repo(path, search_parent_directories=True)
-        if not repo.bare:
-            from rich.progress import Progress
-
-            with Progress() as progress:
-                hist_hits = scan_git_history(
-                    repo,
-                    depth if not full_history else None,
-                    full_history,
-                    patterns,
-                    entropy_thresh,
-                    min_length,
-                    allowlist,
-                    progress,
-                )
-                hits.extend(hist_hits)
-                # Working tree
-                wt_hits = scan_directory(
-                    path,
-                    exclude_globs,
-                    patterns,
-                    entropy_thresh,
-                    min_length,
-                    allowlist,
-                )
-                for h in wt_hits:
-                    h.commit = "working-tree"
-                hits.extend(wt_hits)
-    except (InvalidGitRepositoryError, GitCommandError):
-        pass  # Fall back to dir scan
-
-    # Dir scan if no repo or depth=0
-    if depth == 0 or True:  # Always include dir if not handled
-        dir_hits = scan_directory(path, exclude_globs, patterns, entropy_thresh, min_length, allowlist)
-        for h in dir_hits:
-            if h.commit is None:
-                h.commit = "working-tree"
-        hits.extend(dir_hits)
-
-    return hits
\ No newline at end of file
+    # History, if this is a Git repo and history was asked for
+    if depth > 0 or full_history:
+        try:
+            repo = git.Repo(path, search_parent_directories=True)
+            if not repo.bare:
+                from rich.progress import Progress
+
+                with Progress(transient=True) as progress:
+                    hits.extend(
+                        scan_git_history(
+                            repo,
+                            depth,
+                            full_history,
+                            patterns,
+                            entropy_thresh,
+                            min_length,
+                            allowlist,
+                            progress,
+                            workers=workers,
+                            cache_path=default_cache_path(repo) if use_cache else None,
+                            exclude_globs=exclude_globs,
+                        )
+                    )
+        except (InvalidGitRepositoryError, GitCommandError):
+            pass  # Not a repo: working tree only
+
+    # Working tree (once)
+    dir_hits = scan_directory(path, exclude_globs, patterns, entropy_thresh, min_length, allowlist)
+    for h in dir_hits:
+        h.commit = "working-tree"
+    hits.extend(dir_hits)
+
+    return hits
@@ -14,4 +14,52 @@ def test_scan_git_repo_detects_secrets(temp_repo):
     hits = scan_git_history(repo, 10, False, [], 3.5, 20, [], Progress())
     assert len(hits) >= 2  # AWS + entropy
     assert any("AKIA" in h.detection.snippet for h in hits)
-    assert any(h.detection.detector_id == "high_entropy" for h in hits)
\ No newline at end of file
+    assert any(h.detection.detector_id == "high_entropy" for h in hits)
+
+def test_history_blobs_dedupes_by_sha(temp_repo):
+    import git
+    from git_secrets_scanner.scanner import history_blobs
+
+    repo = git.Repo(temp_repo)
+    copy = temp_repo / "copy.env"
+    copy.write_text((temp_repo / "secrets.env").read_text())
+    repo.index.add([copy])
+    repo.index.commit("Copy secret")
+    blobs = history_blobs(repo, None)
+    assert len(blobs) == 2  # secrets.env and copy.env share one blob
+    shared = next(paths for paths in blobs.values() if len(paths) == 2)
+    assert set(shared) == {"secrets.env", "copy.env"}
+
+
+def test_history_blobs_keeps_non_ascii_paths(temp_repo):
+    import git
+    from git_secrets_scanner.scanner import history_blobs
+
+    repo = git.Repo(temp_repo)
+    odd = temp_repo / "d é\tx.txt"
+    odd.write_text("AWS_KEY=AKIA6543210987654321")
+    repo.index.add([odd])
+    repo.index.commit("Add oddly named file")
+    paths = {path for files in history_blobs(repo, None).values() for path in files}
+    assert "d é\tx.txt" in paths
+    excluded = {path for files in history_blobs(repo, None, ["d*"]).values() for path in files}
+    assert excluded == {"secrets.env", "token.txt"}
+
+
+def test_history_uses_blob_cache(temp_repo, tmp_path, monkeypatch):
+    import git
+    from rich.progress import Progress
+    from git_secrets_scanner import scanner
+    from git_secrets_scanner.detectors import PATTERNS
+
+    repo = git.Repo(temp_repo)
+    cache = tmp_path / "blobs.sqlite"
+    first = scan_git_history(repo, 10, False, PATTERNS, 3.5, 20, [], Progress(), workers=1, cache_path=cache)
+
+    def _boom(*args, **kwargs):
+        raise AssertionError("cached blobs must not be rescanned")
+
+    monkeypatch.setattr(scanner, "_scan_blobs", _boom)
+    second = scan_git_history(repo, 10, False, PATTERNS, 3.5, 20, [], Progress(), workers=1, cache_path=cache)
+    assert second == first
+    assert any(h.detection.detector_id == "aws_access_key_id" for h in second)
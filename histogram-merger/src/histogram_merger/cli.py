@@ -7,13 +7,25 @@ from rich.console import Console
 
 import click
 
-from histogram_merger.ddsketch import DDSketch
+from histogram_merger.ddsketch import MAGIC, DDSketch, iter_sketches, write_sketches
 
 from histogram_merger.merge import merge_sketches
 
 console = Console()
 
 
+def _load(path: str) -> list[DDSketch]:
+    """Sketches from a binary sketch file, or one sketch from a JSON {value: count} map."""
+    with open(path, "rb") as f:
+        head = f.read(len(MAGIC))
+    if head == MAGIC:
+        return list(iter_sketches(path))
+    data = json.loads(open(path).read())
+    sk = DDSketch()
+    sk.add_many([float(v) for v in data], list(data.values()))
+    return [sk]
+
+
 @click.group()
 def cli() -> None:
     pass
@@ -22,14 +34,22 @@ def cli() -> None:
 @cli.command()
 @click.argument("files", nargs=-1, type=click.Path(exists=True))
 @click.option("--p99", is_flag=True, help="Show p99")
-def merge(files: tuple[str], p99: bool) -> None:
-    sketches = []
-    for f in files:
-        data = json.loads(open(f).read())
-        sk = DDSketch()
-        for v, c in data.items():
-            sk.add(float(v), c)
-        sketches.append(sk)
-    merged = merge_sketches(sketches)
+@click.option("--quantiles", "-q", default=None, help="Comma-separated quantiles to show, e.g. 0.5,0.95,0.99")
+@click.option("--output", "-o", type=click.Path(), default=None, help="Write the merged sketch (binary format)")
+def merge(files: tuple[str], p99: bool, quantiles: str | None, output: str | None) -> None:
+    sketches = [sk for f in files for sk in _load(f)]
+    try:
+        merged = merge_sketches(sketches)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+    if output:
+        write_sketches(output, [merged])
+    qs = [float(q) for q in quantiles.split(",")] if quantiles else []
     if p99:
-        console.print(merged.quantile(0.99))
\ No newline at end of file
+        qs.append(0.99)
+    if len(qs) == 1:
+        console.print(merged.quantile(qs[0]))
+    elif qs:
+        for q, v in zip(qs, merged.quantiles(qs)):
+            console.print(f"p{q * 100:g}\t{v}")
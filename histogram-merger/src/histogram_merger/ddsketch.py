@@ -1,40 +1,210 @@
 from __future__ import annotations
 
 import math
-from dataclasses import dataclass
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+# Wire format (little endian): header, then `n` uint64 bucket counts.
+MAGIC = b"DDSK"
+VERSION = 1
+_HEADER = struct.Struct("<4sB3xdddddqQ")  # magic, version, gamma, min, max, lo, hi, offset, n
 
 
-@dataclass
 class DDSketch:
-    gamma: float = 1.015
-    min_value: float = 1e-9
-    max_value: float = 1e12
-    counts: dict[int, int] = None
+    """
+    DDSketch over a dense bucket array.
+
+    Bucket `i` covers [min_value * gamma**i, min_value * gamma**(i+1)); values
+    are clamped to [min_value, max_value], so the array never exceeds
+    log_gamma(max_value / min_value) buckets. `bins[k]` holds the count of
+    bucket `offset + k`. The exact smallest/largest values added are kept in
+    `lo`/`hi` and bound every quantile estimate.
+    """
+
+    def __init__(self, gamma: float = 1.015, min_value: float = 1e-9, max_value: float = 1e12):
+        self.gamma = gamma
+        self.min_value = min_value
+        self.max_value = max_value
+        self._log_gamma = math.log(gamma)
+        self.lo = math.inf
+        self.hi = -math.inf
+        self.offset = 0
+        self.bins = np.zeros(0, dtype=np.uint64)
+
+    # -- indexing -----------------------------------------------------------
+
+    def _index(self, value: float) -> int:
+        value = min(max(value, self.min_value), self.max_value)
+        return int(math.log(value / self.min_value) / self._log_gamma)
+
+    def _indexes(self, values: np.ndarray) -> np.ndarray:
+        clipped = np.clip(values, self.min_value, self.max_value)
+        return (np.log(clipped / self.min_value) / self._log_gamma).astype(np.int64)
 
-    def __post_init__(self):
-        if self.counts is None:
-            self.counts = {}
+    def value_of(self, index: int | np.ndarray) -> float | np.ndarray:
+        """Representative value of a bucket (relative error (gamma-1)/(gamma+1))."""
+        return self.min_value * np.power(self.gamma, index) * (2 * self.gamma / (self.gamma + 1))
+
+    def _reserve(self, lo: int, hi: int) -> None:
+        """Make buckets [lo, hi] addressable, growing with slack to amortize."""
+        if not len(self.bins):
+            self.offset = lo
+            self.bins = np.zeros(hi - lo + 1, dtype=np.uint64)
+            return
+        cur_hi = self.offset + len(self.bins) - 1
+        if lo >= self.offset and hi <= cur_hi:
+            return
+        slack = len(self.bins) // 2
+        new_lo = min(lo, self.offset - slack) if lo < self.offset else self.offset
+        new_hi = max(hi, cur_hi + slack) if hi > cur_hi else cur_hi
+        new_lo = max(new_lo, 0)
+        new_hi = min(new_hi, self._index(self.max_value))
+        grown = np.zeros(new_hi - new_lo + 1, dtype=np.uint64)
+        start = self.offset - new_lo
+        grown[start : start + len(self.bins)] = self.bins
+        self.offset, self.bins = new_lo, grown
+
+    # -- ingest -------------------------------------------------------------
 
     def add(self, value: float, count: int = 1) -> None:
-        if value < self.min_value:
-            value = self.min_value
-        bucket = int(math.log(value / self.min_value) / math.log(self.gamma))
-        self.counts[bucket] = self.counts.get(bucket, 0) + count
+        i = self._index(value)
+        self._reserve(i, i)
+        self.bins[i - self.offset] += count
+        self.lo = min(self.lo, value)
+        self.hi = max(self.hi, value)
+
+    def add_many(self, values: Iterable[float] | np.ndarray, counts: np.ndarray | None = None) -> None:
+        """Vectorized ingest of many values (optionally weighted)."""
+        values = np.asarray(values, dtype=np.float64)
+        if not values.size:
+            return
+        idx = self._indexes(values)
+        lo, hi = int(idx.min()), int(idx.max())
+        self._reserve(lo, hi)
+        weights = None if counts is None else np.asarray(counts, dtype=np.float64)
+        binned = np.bincount(idx - lo, weights=weights, minlength=hi - lo + 1)
+        start = lo - self.offset
+        self.bins[start : start + len(binned)] += binned.astype(np.uint64)
+        self.lo = min(self.lo, float(values.min()))
+        self.hi = max(self.hi, float(values.max()))
+
+    # -- merge --------------------------------------------------------------
+
+    def compatible(self, other: DDSketch) -> bool:
+        return (self.gamma, self.min_value, self.max_value) == (other.gamma, other.min_value, other.max_value)
+
+    def merge_inplace(self, other: DDSketch) -> DDSketch:
+        if not self.compatible(other):
+            raise ValueError("Cannot merge DDSketches with different parameters")
+        if len(other.bins):
+            self._reserve(other.offset, other.offset + len(other.bins) - 1)
+            start = other.offset - self.offset
+            self.bins[start : start + len(other.bins)] += other.bins
+        self.lo = min(self.lo, other.lo)
+        self.hi = max(self.hi, other.hi)
+        return self
 
     def merge(self, other: DDSketch) -> DDSketch:
-        result = DDSketch(self.gamma, self.min_value, self.max_value)
-        for b, c in {**self.counts, **other.counts}.items():
-            result.counts[b] = result.counts.get(b, 0) + c
-        return result
+        return self.copy().merge_inplace(other)
+
+    def copy(self) -> DDSketch:
+        out = DDSketch(self.gamma, self.min_value, self.max_value)
+        out.lo, out.hi = self.lo, self.hi
+        out.offset, out.bins = self.offset, self.bins.copy()
+        return out
+
+    # -- queries ------------------------------------------------------------
+
+    @property
+    def count(self) -> int:
+        return int(self.bins.sum())
+
+    @property
+    def counts(self) -> dict[int, int]:
+        """Non-empty buckets as {bucket index: count}."""
+        nz = np.flatnonzero(self.bins)
+        return {int(self.offset + k): int(self.bins[k]) for k in nz}
+
+    def quantiles(self, qs: Sequence[float]) -> list[float]:
+        """Several quantiles from one cumulative pass."""
+        cum = np.cumsum(self.bins)
+        total = int(cum[-1]) if len(cum) else 0
+        if not total:
+            return [0.0 for _ in qs]
+        targets = np.asarray(qs, dtype=np.float64) * total
+        pos = np.searchsorted(cum, targets, side="left")
+        # Rank 0 (q=0) lands on the first non-empty bucket.
+        pos = np.maximum(pos, int(np.flatnonzero(self.bins)[0]))
+        pos = np.minimum(pos, len(cum) - 1)
+        values = np.clip(self.value_of(self.offset + pos), self.lo, self.hi)
+        return [float(v) for v in values]
 
     def quantile(self, q: float) -> float:
-        if not self.counts:
-            return 0.0
-        total = sum(self.counts.values())
-        target = q * total
-        acc = 0
-        for b in sorted(self.counts):
-            acc += self.counts[b]
-            if acc >= target:
-                return self.min_value * (self.gamma ** b)
-        return self.max_value
\ No newline at end of file
+        return self.quantiles([q])[0]
+
+    # -- wire format ----------------------------------------------------------
+
+    def trimmed(self) -> tuple[int, np.ndarray]:
+        """(offset, bins) without leading/trailing empty buckets."""
+        nz = np.flatnonzero(self.bins)
+        if not len(nz):
+            return 0, self.bins[:0]
+        return self.offset + int(nz[0]), self.bins[nz[0] : nz[-1] + 1]
+
+    def to_bytes(self) -> bytes:
+        offset, bins = self.trimmed()
+        header = _HEADER.pack(
+            MAGIC, VERSION, self.gamma, self.min_value, self.max_value, self.lo, self.hi, offset, len(bins)
+        )
+        return header + bins.astype("<u8", copy=False).tobytes()
+
+    @classmethod
+    def from_buffer(cls, buf, pos: int = 0) -> tuple[DDSketch, int]:
+        """
+        Decode one sketch at `buf[pos:]` without copying the counts; returns
+        (sketch, position after it). The sketch's bins are a read-only view.
+        """
+        magic, version, gamma, min_value, max_value, lo, hi, offset, n = _HEADER.unpack_from(buf, pos)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a DDSketch record")
+        sk = cls(gamma, min_value, max_value)
+        start = pos + _HEADER.size
+        sk.lo, sk.hi = lo, hi
+        sk.offset = offset
+        sk.bins = np.frombuffer(buf, dtype="<u8", count=n, offset=start)
+        return sk, start + 8 * n
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> DDSketch:
+        sk, _ = cls.from_buffer(data)
+        sk.bins = sk.bins.astype(np.uint64)  # writable copy
+        return sk
+
+
+def iter_sketches(path: str | Path) -> Iterator[DDSketch]:
+    """
+    Yield every sketch in a file of concatenated `to_bytes` records.
+
+    The file is memory-mapped and each sketch's bins view the mapping
+    directly, so nothing is copied until the sketches are merged.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # The mapping stays alive for as long as any yielded view references it.
+    pos = 0
+    while pos < len(buf):
+        sk, pos = DDSketch.from_buffer(buf, pos)
+        yield sk
+
+
+def write_sketches(path: str | Path, sketches: Iterable[DDSketch]) -> None:
+    with open(path, "wb") as f:
+        for sk in sketches:
+            f.write(sk.to_bytes())
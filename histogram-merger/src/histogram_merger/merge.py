@@ -1,12 +1,37 @@
 from __future__ import annotations
 
+from typing import Iterable
+
+import numpy as np
+
 from histogram_merger.ddsketch import DDSketch
 
 
-def merge_sketches(sketches: list[DDSketch]) -> DDSketch:
+def merge_sketches(sketches: Iterable[DDSketch]) -> DDSketch:
+    """
+    Merge any number of compatible sketches into a new one.
+
+    The result's bucket range is sized once from every input's bounds, then
+    each input's counts are added into it as a single vectorized slice add.
+    """
+    sketches = [s for s in sketches]
     if not sketches:
         return DDSketch()
-    result = sketches[0]
+    first = sketches[0]
     for s in sketches[1:]:
-        result = result.merge(s)
-    return result
\ No newline at end of file
+        if not first.compatible(s):
+            raise ValueError("Cannot merge DDSketches with different parameters")
+    result = DDSketch(first.gamma, first.min_value, first.max_value)
+    result.lo = min(s.lo for s in sketches)
+    result.hi = max(s.hi for s in sketches)
+    ranges = [s.trimmed() for s in sketches]
+    ranges = [(off, bins) for off, bins in ranges if len(bins)]
+    if not ranges:
+        return result
+    lo = min(off for off, _ in ranges)
+    hi = max(off + len(bins) for off, bins in ranges)
+    result.offset = lo
+    result.bins = np.zeros(hi - lo, dtype=np.uint64)
+    for off, bins in ranges:
+        result.bins[off - lo : off - lo + len(bins)] += bins
+    return result
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from histogram_merger.cli import cli
+from histogram_merger.ddsketch import DDSketch, iter_sketches, write_sketches
+from histogram_merger.merge import merge_sketches
+
+
+def test_add_many_matches_add():
+    values = np.random.default_rng(0).lognormal(3, 1, 5000)
+    a = DDSketch()
+    for v in values:
+        a.add(v)
+    b = DDSketch()
+    b.add_many(values)
+    assert a.counts == b.counts
+    assert a.quantiles([0.5, 0.99]) == b.quantiles([0.5, 0.99])
+
+
+def test_add_many_weighted():
+    sk = DDSketch()
+    sk.add_many([1.0, 100.0], [99, 1])
+    assert sk.count == 100
+    assert sk.quantile(0.5) == pytest.approx(1.0, rel=0.01)
+
+
+def test_quantiles_relative_error():
+    values = np.random.default_rng(1).exponential(50, 20000)
+    sk = DDSketch()
+    sk.add_many(values)
+    qs = [0.5, 0.9, 0.99]
+    for est, exact in zip(sk.quantiles(qs), np.quantile(values, qs)):
+        assert est == pytest.approx(exact, rel=0.02)
+
+
+def test_merge_many_equals_single():
+    values = np.random.default_rng(2).lognormal(2, 1.5, 9000)
+    parts = []
+    for chunk in np.array_split(values, 30):
+        sk = DDSketch()
+        sk.add_many(chunk)
+        parts.append(sk)
+    whole = DDSketch()
+    whole.add_many(values)
+    merged = merge_sketches(iter(parts))
+    assert merged.counts == whole.counts
+    assert merged.quantiles([0.1, 0.99]) == whole.quantiles([0.1, 0.99])
+
+
+def test_merge_incompatible():
+    with pytest.raises(ValueError):
+        merge_sketches([DDSketch(gamma=1.01), DDSketch(gamma=1.02)])
+
+
+def test_roundtrip_bytes():
+    sk = DDSketch()
+    sk.add_many([0.5, 3.0, 3.0, 7e6])
+    back = DDSketch.from_bytes(sk.to_bytes())
+    assert back.counts == sk.counts
+    assert (back.lo, back.hi) == (0.5, 7e6)
+    back.add(1.0)  # decoded sketch is writable
+    assert back.count == 5
+
+
+def test_iter_sketches_mmap(tmp_path):
+    sketches = []
+    for i in range(5):
+        sk = DDSketch()
+        sk.add_many(np.arange(1, 100) * (i + 1))
+        sketches.append(sk)
+    sketches.append(DDSketch())
+    path = tmp_path / "all.ddsk"
+    write_sketches(path, sketches)
+    loaded = list(iter_sketches(path))
+    assert [s.counts for s in loaded] == [s.counts for s in sketches]
+    assert merge_sketches(loaded).counts == merge_sketches(sketches).counts
+
+
+def test_cli_merge_binary_and_json(tmp_path):
+    sk = DDSketch()
+    sk.add_many(np.arange(1, 1001))
+    write_sketches(tmp_path / "a.ddsk", [sk])
+    (tmp_path / "b.json").write_text('{"5000": 10}')
+    out = tmp_path / "merged.ddsk"
+    result = CliRunner().invoke(
+        cli, ["merge", str(tmp_path / "a.ddsk"), str(tmp_path / "b.json"), "-q", "0.5,0.999", "-o", str(out)]
+    )
+    assert result.exit_code == 0, result.output
+    assert "p50" in result.output and "p99.9" in result.output
+    (merged,) = iter_sketches(out)
+    assert merged.count == 1010
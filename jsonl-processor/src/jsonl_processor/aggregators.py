@@ -0,0 +1,344 @@
+"""Constant-memory, mergeable streaming aggregators.
+
+Every aggregator supports ``add``, ``merge`` and a JSON-safe
+``to_dict``/``from_dict`` round trip, so partial aggregates computed per
+chunk, per worker or per shard file can be combined afterwards.
+
+- ``Welford``: count/sum/min/max plus numerically stable mean and variance.
+- ``DDSketch``: quantiles with bounded relative error (default 1%).
+- ``HyperLogLog``: approximate distinct counts (default ~1.6% error).
+"""
+import base64
+import hashlib
+import math
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .reader import dumps
+
+Metric = Tuple[str, Optional[str]]
+
+_QUANTILE = re.compile(r"^p(\d{1,2}(?:\.\d+)?)$")
+_MOMENT_AGGS = {"sum", "avg", "min", "max", "var", "std"}
+
+
+def quantile_of(agg: str) -> Optional[float]:
+    """`p99` -> 0.99, `p99.9` -> 0.999, `median` -> 0.5; None for other aggregations."""
+    if agg == "median":
+        return 0.5
+    m = _QUANTILE.match(agg)
+    return float(m.group(1)) / 100 if m else None
+
+
+class Welford:
+    """Streaming count/sum/min/max/mean/variance (Welford; Chan et al. for merges)."""
+
+    __slots__ = ("count", "mean", "m2", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.total += x
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+
+    def merge(self, other: "Welford") -> None:
+        if not other.count:
+            return
+        if not self.count:
+            for slot in self.__slots__:
+                setattr(self, slot, getattr(other, slot))
+            return
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / n
+        self.mean += delta * other.count / n
+        self.count = n
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Welford":
+        w = cls()
+        for slot in cls.__slots__:
+            setattr(w, slot, d[slot])
+        return w
+
+
+class DDSketch:
+    """
+    Quantile sketch with relative accuracy `alpha` (Masson et al., VLDB'19).
+
+    Values land in logarithmic buckets; the store is capped at `max_bins`
+    per sign by collapsing the lowest-magnitude buckets.
+    """
+
+    def __init__(self, alpha: float = 0.01, max_bins: int = 2048):
+        self.alpha = alpha
+        self.max_bins = max_bins
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.pos: Dict[int, int] = {}
+        self.neg: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+
+    def _index(self, x: float) -> int:
+        return math.ceil(math.log(x) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        return 2 * self.gamma**index / (self.gamma + 1)
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        if x > 0:
+            store = self.pos
+            i = self._index(x)
+        elif x < 0:
+            store = self.neg
+            i = self._index(-x)
+        else:
+            self.zero += 1
+            return
+        store[i] = store.get(i, 0) + 1
+        if len(store) > self.max_bins:
+            self._collapse(store)
+
+    def _collapse(self, store: Dict[int, int]) -> None:
+        keys = sorted(store)
+        excess = len(keys) - self.max_bins + 1
+        target = keys[excess]
+        store[target] += sum(store.pop(k) for k in keys[:excess])
+
+    def merge(self, other: "DDSketch") -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge DDSketches with different accuracy")
+        for mine, theirs in ((self.pos, other.pos), (self.neg, other.neg)):
+            for i, c in theirs.items():
+                mine[i] = mine.get(i, 0) + c
+            if len(mine) > self.max_bins:
+                self._collapse(mine)
+        self.zero += other.zero
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for i in sorted(self.neg, reverse=True):
+            seen += self.neg[i]
+            if seen > rank:
+                return -self._value(i)
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for i in sorted(self.pos):
+            seen += self.pos[i]
+            if seen > rank:
+                return self._value(i)
+        return self._value(max(self.pos)) if self.pos else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "alpha": self.alpha,
+            "max_bins": self.max_bins,
+            "pos": {str(i): c for i, c in self.pos.items()},
+            "neg": {str(i): c for i, c in self.neg.items()},
+            "zero": self.zero,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "DDSketch":
+        s = cls(d["alpha"], d["max_bins"])
+        s.pos = {int(i): c for i, c in d["pos"].items()}
+        s.neg = {int(i): c for i, c in d["neg"].items()}
+        s.zero = d["zero"]
+        s.count = d["count"]
+        return s
+
+
+class HyperLogLog:
+    """Distinct-count estimator with 2**p one-byte registers (Flajolet et al.)."""
+
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    def add(self, value: Any) -> None:
+        data = dumps(value).encode()
+        x = int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+        idx = x >> (64 - self.p)
+        rest = x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLogs with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))  # linear counting for small sets
+        return round(raw)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"p": self.p, "registers": base64.b64encode(bytes(self.registers)).decode()}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "HyperLogLog":
+        h = cls(d["p"])
+        h.registers = bytearray(base64.b64decode(d["registers"]))
+        return h
+
+
+class GroupState:
+    """All aggregator state for one group: record count plus one aggregator per (kind, field)."""
+
+    def __init__(self, metrics: List[Metric]):
+        self.count = 0
+        self.moments: Dict[str, Welford] = {}
+        self.sketches: Dict[str, DDSketch] = {}
+        self.distinct: Dict[str, HyperLogLog] = {}
+        for agg, fld in metrics:
+            if fld is None:
+                continue
+            if agg in _MOMENT_AGGS:
+                self.moments.setdefault(fld, Welford())
+            elif agg == "unique":
+                self.distinct.setdefault(fld, HyperLogLog())
+            elif quantile_of(agg) is not None:
+                self.sketches.setdefault(fld, DDSketch())
+
+    def observe(self, values: Dict[str, Any]) -> None:
+        """Fold one record, given its already-evaluated field values."""
+        self.count += 1
+        for fld, w in self.moments.items():
+            v = values.get(fld)
+            if isinstance(v, (int, float)) and not isinstance(v, bool):
+                w.add(v)
+        for fld, s in self.sketches.items():
+            v = values.get(fld)
+            if isinstance(v, (int, float)) and not isinstance(v, bool):
+                s.add(v)
+        for fld, h in self.distinct.items():
+            h.add(values.get(fld))
+
+    def merge(self, other: "GroupState") -> None:
+        self.count += other.count
+        for mine, theirs in ((self.moments, other.moments), (self.sketches, other.sketches), (self.distinct, other.distinct)):
+            for fld, agg in theirs.items():
+                if fld in mine:
+                    mine[fld].merge(agg)
+                else:
+                    mine[fld] = agg
+
+    def result(self, metrics: List[Metric]) -> Dict[str, Any]:
+        res: Dict[str, Any] = {"count": self.count}
+        for agg, fld in metrics:
+            if fld is None:
+                continue
+            name = f"{agg}_{fld}"
+            if agg in _MOMENT_AGGS:
+                w = self.moments[fld]
+                res[name] = {
+                    "sum": w.total,
+                    "avg": w.mean if w.count else 0.0,
+                    "min": w.min,
+                    "max": w.max,
+                    "var": w.variance,
+                    "std": math.sqrt(w.variance),
+                }[agg]
+            elif agg == "unique":
+                res[name] = self.distinct[fld].estimate()
+            elif quantile_of(agg) is not None:
+                res[name] = self.sketches[fld].quantile(quantile_of(agg))
+        return res
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "moments": {f: w.to_dict() for f, w in self.moments.items()},
+            "sketches": {f: s.to_dict() for f, s in self.sketches.items()},
+            "distinct": {f: h.to_dict() for f, h in self.distinct.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "GroupState":
+        g = cls([])
+        g.count = d["count"]
+        g.moments = {f: Welford.from_dict(v) for f, v in d["moments"].items()}
+        g.sketches = {f: DDSketch.from_dict(v) for f, v in d["sketches"].items()}
+        g.distinct = {f: HyperLogLog.from_dict(v) for f, v in d["distinct"].items()}
+        return g
+
+
+class GroupTable:
+    """group key -> GroupState, mergeable and serializable as a whole."""
+
+    def __init__(self, metrics: List[Metric]):
+        self.metrics = metrics
+        self.groups: Dict[Any, GroupState] = {}
+
+    def state(self, key: Any) -> GroupState:
+        g = self.groups.get(key)
+        if g is None:
+            g = self.groups[key] = GroupState(self.metrics)
+        return g
+
+    @property
+    def records(self) -> int:
+        return sum(g.count for g in self.groups.values())
+
+    def merge(self, other: "GroupTable") -> None:
+        for key, g in other.groups.items():
+            if key in self.groups:
+                self.groups[key].merge(g)
+            else:
+                self.groups[key] = g
+
+    def results(self) -> Iterable[Dict[str, Any]]:
+        for key, g in self.groups.items():
+            yield {"group": key, **g.result(self.metrics)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "metrics": [[agg, fld] for agg, fld in self.metrics],
+            "groups": [{"group": key, "state": g.to_dict()} for key, g in self.groups.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "GroupTable":
+        table = cls([(agg, fld) for agg, fld in d["metrics"]])
+        for entry in d["groups"]:
+            table.groups[entry["group"]] = GroupState.from_dict(entry["state"])
+        return table
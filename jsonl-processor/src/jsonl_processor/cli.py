@@ -25,10 +25,12 @@ def filter_cmd(
     value: str = typer.Option(..., "--value", help="Value (auto-typed)"),
     verbose: bool = typer.Option(False, "--verbose/-v"),
     strict: bool = typer.Option(False, "--strict"),
+    workers: int = typer.Option(0, "--workers", "-j", help="Parser processes (0 = one per CPU, 1 = serial)"),
+    pushdown: bool = typer.Option(False, "--pushdown", help="Decode only the fields the expression reads"),
 ):
     """Filter records matching field OP value."""
     parsed_value = parse_value(value)
-    run_filter(input_file, output_file, field, op, parsed_value, strict, verbose)
+    run_filter(input_file, output_file, field, op, parsed_value, strict, verbose, workers, pushdown)
 
 @app.command()
 def transform(
@@ -37,10 +39,12 @@ def transform(
     expr: str = typer.Option(..., "--expr", help="JMESPath expr to project/transform"),
     verbose: bool = typer.Option(False, "--verbose/-v"),
     strict: bool = typer.Option(False, "--strict"),
+    workers: int = typer.Option(0, "--workers", "-j", help="Parser processes (0 = one per CPU, 1 = serial)"),
+    pushdown: bool = typer.Option(False, "--pushdown", help="Decode only the fields the expression reads"),
 ):
     """Transform records with JMESPath expr."""
     from .processor import run_transform
-    run_transform(input_file, output_file, expr, strict, verbose)
+    run_transform(input_file, output_file, expr, strict, verbose, workers, pushdown)
 
 @app.command()
 def sample(
@@ -50,37 +54,55 @@ def sample(
     seed: Optional[int] = typer.Option(None, "--seed"),
     verbose: bool = typer.Option(False, "--verbose/-v"),
     strict: bool = typer.Option(False, "--strict"),
+    workers: int = typer.Option(0, "--workers", "-j", help="Parser processes (0 = one per CPU, 1 = serial)"),
 ):
     """Random subsample (Bernoulli)."""
     from .processor import run_sample
     if seed is not None:
         import random
         random.seed(seed)
-    run_sample(input_file, output_file, fraction, strict, verbose)
+    run_sample(input_file, output_file, fraction, strict, verbose, workers)
 
 @app.command()
 def aggregate(
     input_file: Optional[str] = typer.Argument(None),
     output_file: Optional[str] = typer.Argument(None),
     group_by: str = typer.Option(..., "--group-by"),
-    metrics: str = typer.Option("count", "--metrics", help="e.g. count,sum:revenue,avg:price,min:price"),
+    metrics: str = typer.Option(
+        "count", "--metrics", help="e.g. count,sum:revenue,avg:price,std:price,p99:latency,unique:user"
+    ),
     verbose: bool = typer.Option(False, "--verbose/-v"),
     strict: bool = typer.Option(False, "--strict"),
+    workers: int = typer.Option(0, "--workers", "-j", help="Parser processes (0 = one per CPU, 1 = serial)"),
+    state_out: Optional[str] = typer.Option(None, "--state-out", help="Also save mergeable partial state (JSON)"),
+    pushdown: bool = typer.Option(False, "--pushdown", help="Decode only the fields the metrics read"),
 ):
     """Aggregate by group."""
     from .processor import run_aggregate
-    run_aggregate(input_file, output_file, group_by, metrics, strict, verbose)
+    run_aggregate(input_file, output_file, group_by, metrics, strict, verbose, workers, state_out, pushdown)
+
+@app.command()
+def merge(
+    state_files: list[str] = typer.Argument(..., help="State files written by aggregate --state-out"),
+    output_file: Optional[str] = typer.Option(None, "--output", "-o", help="Output JSONL (default: stdout)"),
+    state_out: Optional[str] = typer.Option(None, "--state-out", help="Save the merged state (JSON)"),
+):
+    """Merge partial aggregates from sharded runs."""
+    from .processor import run_merge
+    run_merge(state_files, output_file, state_out)
 
 @app.command()
 def stats(
     input_file: Optional[str] = typer.Argument(None),
-    metrics: str = typer.Option("count", "--metrics", help="count,unique:field,sum:amount,..."),
+    metrics: str = typer.Option("count", "--metrics", help="count,unique:field,sum:amount,std:ms,p99:ms,..."),
     verbose: bool = typer.Option(False, "--verbose/-v"),
     strict: bool = typer.Option(False, "--strict"),
+    workers: int = typer.Option(0, "--workers", "-j", help="Parser processes (0 = one per CPU, 1 = serial)"),
+    pushdown: bool = typer.Option(False, "--pushdown", help="Decode only the fields the metrics read"),
 ):
     """Compute global stats (table output)."""
     from .processor import run_stats
-    run_stats(input_file, metrics, strict, verbose)
+    run_stats(input_file, metrics, strict, verbose, workers, pushdown)
 
 if __name__ == "__main__":
     app()
\ No newline at end of file
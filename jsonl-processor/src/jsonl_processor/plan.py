@@ -0,0 +1,249 @@
+"""Compiled JMESPath query plans with projection pushdown.
+
+A plan compiles its expression once (per process) and works out which
+top-level keys the expression can ever read. In pushdown mode only those
+keys are materialized from the raw line: with ``pysimdjson`` installed the
+line is parsed lazily and just the referenced members are converted to
+Python objects; otherwise the line is fully decoded. Filter plans also get a
+raw-bytes prefilter for literal equality/containment on plain paths, which
+rejects most lines without decoding them at all.
+"""
+import json
+import re
+from functools import lru_cache
+from typing import Any, Callable, FrozenSet, List, Optional
+
+import jmespath
+from jmespath.parser import ParsedResult
+
+from .aggregators import GroupTable, Metric
+from .reader import dumps, loads
+from .utils import batch_op
+
+try:  # pragma: no cover - depends on installed extras
+    import simdjson
+except ImportError:  # pragma: no cover
+    simdjson = None
+
+# Node children evaluated against the *current* context vs. a derived value.
+_INHERIT_FIRST = {"subexpression", "index_expression", "projection", "value_projection", "filter_projection", "pipe"}
+_INHERIT_ALL = {
+    "comparator",
+    "or_expression",
+    "and_expression",
+    "not_expression",
+    "multi_select_list",
+    "multi_select_dict",
+    "key_val_pair",
+    "function_expression",
+    "flatten",
+}
+_PATH_NODES = {"field", "subexpression", "index_expression", "index"}
+# Literals whose JSON spelling is unique, so "field == v" implies raw contains it.
+_SAFE_NEEDLE = re.compile(r"[A-Za-z0-9 _.,:;@#%&+=~-]+")
+
+
+_FAILED = object()  # marks records whose evaluation raised
+
+
+class _NeedsWholeRecord(Exception):
+    pass
+
+
+@lru_cache(maxsize=256)
+def compile_expr(expr: str) -> ParsedResult:
+    """Compile a JMESPath expression once per process."""
+    return jmespath.compile(expr)
+
+
+def _collect(node: dict, at_root: bool, out: set) -> None:
+    kind = node["type"]
+    children = node.get("children", [])
+    if kind == "field":
+        if at_root:
+            out.add(node["value"])
+        return
+    if kind in ("current", "identity"):
+        if at_root:
+            raise _NeedsWholeRecord
+        return
+    if kind == "expref":
+        _collect(children[0], False, out)
+        return
+    if kind in _INHERIT_FIRST:
+        for i, child in enumerate(children):
+            _collect(child, at_root and i == 0, out)
+        return
+    if kind in _INHERIT_ALL:
+        for child in children:
+            _collect(child, at_root, out)
+        return
+    # literal, index, slice: read nothing.
+
+
+def referenced_fields(expr: str) -> Optional[FrozenSet[str]]:
+    """Top-level keys `expr` can read, or None if it needs the whole record."""
+    out: set = set()
+    try:
+        _collect(compile_expr(expr).parsed, True, out)
+    except _NeedsWholeRecord:
+        return None
+    return frozenset(out)
+
+
+def is_plain_path(expr: str) -> bool:
+    """True for expressions like `a.b[0].c` that only walk into the record."""
+
+    def _walk(node: dict) -> bool:
+        return node["type"] in _PATH_NODES and all(_walk(c) for c in node.get("children", []))
+
+    return _walk(compile_expr(expr).parsed)
+
+
+def _materialize(value: Any) -> Any:
+    if simdjson is not None:
+        if isinstance(value, simdjson.Object):
+            return value.as_dict()
+        if isinstance(value, simdjson.Array):
+            return value.as_list()
+    return value
+
+
+class _Projector:
+    """Decode only `fields` from a raw JSON object line."""
+
+    def __init__(self, fields: FrozenSet[str]):
+        self.fields = tuple(fields)
+        self._parser = None
+
+    def __call__(self, raw: bytes) -> Any:
+        if simdjson is None:
+            return loads(raw)
+        if self._parser is None:
+            self._parser = simdjson.Parser()
+        doc = self._parser.parse(raw)
+        if not isinstance(doc, simdjson.Object):
+            return _materialize(doc)
+        return {k: _materialize(doc[k]) for k in self.fields if k in doc}
+
+    def __getstate__(self):
+        return {"fields": self.fields, "_parser": None}
+
+
+class QueryPlan:
+    """A compiled expression plus (optionally) a projecting decoder."""
+
+    def __init__(self, expr: str, pushdown: bool = False):
+        self.expr = expr
+        self.fields = referenced_fields(expr)
+        self.pushdown = pushdown and self.fields is not None
+        self.decode: Callable[[bytes], Any] = _Projector(self.fields) if self.pushdown else loads
+
+    @property
+    def compiled(self) -> ParsedResult:
+        return compile_expr(self.expr)
+
+    def search(self, data: Any) -> Any:
+        return self.compiled.search(data)
+
+    def search_many(self, records: List[Any], strict: bool = False) -> List[Any]:
+        """Evaluate over a batch; records that raise come back as `_FAILED` unless strict."""
+        search = self.compiled.search
+        try:
+            return [search(r) for r in records]
+        except jmespath.exceptions.JMESPathError:
+            if strict:
+                raise
+        out = []
+        for r in records:
+            try:
+                out.append(search(r))
+            except jmespath.exceptions.JMESPathError:
+                out.append(_FAILED)
+        return out
+
+
+class FilterPlan(QueryPlan):
+    """Chunk handler: keep raw lines where `field OP value` holds, evaluated a batch at a time."""
+
+    def __init__(self, field_expr: str, op: str, value: Any, pushdown: bool = False, strict: bool = False):
+        super().__init__(field_expr, pushdown)
+        self.op = op
+        self.value = value
+        self.strict = strict
+        self.needle = self._needle(field_expr, op, value) if pushdown else None
+
+    @staticmethod
+    def _needle(field_expr: str, op: str, value: Any) -> Optional[bytes]:
+        if op not in ("==", "contains") or not is_plain_path(field_expr):
+            return None
+        if op == "==" and (value is None or isinstance(value, bool)):
+            return json.dumps(value).encode()
+        if isinstance(value, str) and _SAFE_NEEDLE.fullmatch(value):
+            return value.encode()
+        return None
+
+    def prefilter(self, raw: bytes) -> bool:
+        return self.needle is None or self.needle in raw
+
+    def batch(self, records: List[Any], raws: List[bytes]) -> List[Optional[str]]:
+        values = self.search_many(records, self.strict)
+        keep = batch_op(values, self.op, self.value)
+        return [
+            raw.rstrip(b"\r").decode("utf-8") + "\n" if k and v is not _FAILED else None
+            for k, v, raw in zip(keep, values, raws)
+        ]
+
+
+class TransformPlan(QueryPlan):
+    """Chunk handler: emit the encoded JMESPath projection of each record."""
+
+    def __init__(self, expr: str, pushdown: bool = False, strict: bool = False):
+        super().__init__(expr, pushdown)
+        self.strict = strict
+
+    def batch(self, records: List[Any], raws: List[bytes]) -> List[Optional[str]]:
+        values = self.search_many(records, self.strict)
+        return [None if v is _FAILED else dumps(v) + "\n" for v in values]
+
+
+class AggregatePlan:
+    """Chunk reducer: fold a chunk's records into a mergeable GroupTable.
+
+    With `group_by=None` every record lands in one global group (stats).
+    """
+
+    def __init__(self, group_by: Optional[str], metrics: List[Metric], pushdown: bool = False, strict: bool = False):
+        self.group_by = group_by
+        self.metrics = metrics
+        self.fields = sorted({fld for _, fld in metrics if fld})
+        self.strict = strict
+        needed: Optional[set] = set()
+        for expr in ([group_by] if group_by else []) + self.fields:
+            refs = referenced_fields(expr)
+            if refs is None:
+                needed = None
+                break
+            needed |= refs
+        self.decode: Callable[[bytes], Any] = (
+            _Projector(frozenset(needed)) if pushdown and needed is not None else loads
+        )
+
+    def reduce(self, records: List[Any]) -> GroupTable:
+        table = GroupTable(self.metrics)
+        group_search = compile_expr(self.group_by).search if self.group_by else None
+        searches = [(fld, compile_expr(fld).search) for fld in self.fields]
+        for data in records:
+            try:
+                key = group_search(data) if group_search else None
+                if group_search and key is None:
+                    continue
+                values = {fld: search(data) for fld, search in searches}
+            except jmespath.exceptions.JMESPathError:
+                if self.strict:
+                    raise
+                continue
+            if isinstance(key, (list, dict)):
+                key = dumps(key)
+            table.state(key).observe(values)
+        return table
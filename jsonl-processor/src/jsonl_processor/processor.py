@@ -1,8 +1,6 @@
 import sys
 import json
-import jmespath
 import random
-from collections import defaultdict
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Iterator, Optional, Tuple, Any, Dict
@@ -10,29 +8,28 @@ from tqdm import tqdm
 from rich.console import Console
 from rich.table import Table
 
+from .aggregators import GroupTable, quantile_of
+from .plan import AggregatePlan, FilterPlan, TransformPlan
+from .reader import ReadStats, dumps, map_chunks, record
+
 console = Console()
 
-def stream_dicts(input_file: Optional[str], strict: bool = False) -> Iterator[Tuple[Dict[str, Any], int]]:
+def stream_dicts(
+    input_file: Optional[str],
+    strict: bool = False,
+    workers: int = 1,
+    stats: Optional[ReadStats] = None,
+) -> Iterator[Tuple[Dict[str, Any], int]]:
     """Yield (data, line_num) from JSONL source. Skips empty/malformed if not strict."""
-    def _read_lines():
-        ln = 0
-        if input_file:
-            with open(input_file, encoding="utf-8") as f:
-                for ln, line in enumerate(f, 1):
-                    yield line.rstrip("\n"), ln
-        else:
-            for ln, line in enumerate(sys.stdin, 1):
-                yield line.rstrip("\n"), ln
+    stats = stats if stats is not None else ReadStats()
+    yield from map_chunks(input_file, record, strict, workers, stats=stats)
+    _warn_malformed(stats)
 
-    for line, ln in _read_lines():
-        if not line.strip():
-            continue
-        try:
-            yield json.loads(line), ln
-        except json.JSONDecodeError:
-            if strict:
-                raise ValueError(f"Invalid JSON on line {ln}")
-            console.print(f"[yellow]Skip malformed line {ln}[/]")
+def _warn_malformed(stats: ReadStats) -> None:
+    if stats.malformed:
+        sample = ", ".join(map(str, stats.malformed_lines))
+        more = ", ..." if stats.malformed > len(stats.malformed_lines) else ""
+        console.print(f"[yellow]Skipped {stats.malformed} malformed line(s) (lines {sample}{more})[/]")
 
 @contextmanager
 def output_writer(out_file: Optional[str]):
@@ -43,13 +40,15 @@ def output_writer(out_file: Optional[str]):
     else:
         yield sys.stdout
 
-def _print_summary(mode: str, processed: int, outputted: Optional[int] = None):
+def _print_summary(mode: str, processed: int, outputted: Optional[int] = None, malformed: int = 0):
     table = Table(title=f"{mode} Summary", box=None, show_header=True, header_style="bold magenta")
     table.add_column("Metric", style="cyan")
     table.add_column("Value", style="green")
     table.add_row("Processed lines", str(processed))
     if outputted is not None:
         table.add_row("Output lines", str(outputted))
+    if malformed:
+        table.add_row("Malformed lines", str(malformed))
     console.print(table)
 
 def run_filter(
@@ -60,53 +59,64 @@ def run_filter(
     value: Any,
     strict: bool,
     verbose: bool,
+    workers: int = 1,
+    pushdown: bool = False,
 ):
     pbar = tqdm(desc="Filter", unit="lines", disable=not verbose)
-    processed, outputted = 0, 0
+    stats = ReadStats()
+    outputted = 0
+    handler = FilterPlan(field_expr, op, value, pushdown, strict)
     with output_writer(output_file) as writer:
-        for data, _ in stream_dicts(input_file, strict):
-            processed += 1
+        for line, _ in map_chunks(input_file, handler, strict, workers, stats=stats):
+            writer.write(line)
+            outputted += 1
             pbar.update()
-            try:
-                val = jmespath.search(field_expr, data)
-                if apply_op(val, op, value):
-                    writer.write(json.dumps(data, separators=(',', ':')) + "\n")
-                    outputted += 1
-            except jmespath.JMESPathError:
-                if strict:
-                    raise
     pbar.close()
-    _print_summary("Filter", processed, outputted)
+    _warn_malformed(stats)
+    _print_summary("Filter", stats.processed, outputted, stats.malformed)
 
-def run_transform(input_file: Optional[str], output_file: Optional[str], expr: str, strict: bool, verbose: bool):
+def run_transform(
+    input_file: Optional[str],
+    output_file: Optional[str],
+    expr: str,
+    strict: bool,
+    verbose: bool,
+    workers: int = 1,
+    pushdown: bool = False,
+):
     pbar = tqdm(desc="Transform", unit="lines", disable=not verbose)
-    processed, outputted = 0, 0
+    stats = ReadStats()
+    outputted = 0
+    handler = TransformPlan(expr, pushdown, strict)
     with output_writer(output_file) as writer:
-        for data, _ in stream_dicts(input_file, strict):
-            processed += 1
+        for line, _ in map_chunks(input_file, handler, strict, workers, stats=stats):
+            writer.write(line)
+            outputted += 1
             pbar.update()
-            try:
-                new_data = jmespath.search(expr, data)
-                writer.write(json.dumps(new_data, separators=(',', ':')) + "\n")
-                outputted += 1
-            except jmespath.JMESPathError:
-                if strict:
-                    raise
     pbar.close()
-    _print_summary("Transform", processed, outputted)
+    _warn_malformed(stats)
+    _print_summary("Transform", stats.processed, outputted, stats.malformed)
 
-def run_sample(input_file: Optional[str], output_file: Optional[str], fraction: float, strict: bool, verbose: bool):
+def run_sample(
+    input_file: Optional[str],
+    output_file: Optional[str],
+    fraction: float,
+    strict: bool,
+    verbose: bool,
+    workers: int = 1,
+):
     pbar = tqdm(desc="Sample", unit="lines", disable=not verbose)
     processed, outputted = 0, 0
+    stats = ReadStats()
     with output_writer(output_file) as writer:
-        for data, _ in stream_dicts(input_file, strict):
+        for data, _ in stream_dicts(input_file, strict, workers, stats):
             processed += 1
             pbar.update()
             if random.random() < fraction:
-                writer.write(json.dumps(data, separators=(',', ':')) + "\n")
+                writer.write(dumps(data) + "\n")
                 outputted += 1
     pbar.close()
-    _print_summary("Sample", processed, outputted)
+    _print_summary("Sample", processed, outputted, stats.malformed)
 
 def parse_metrics(metrics_str: str) -> list[tuple[str, Optional[str]]]:
     res = []
@@ -118,6 +128,41 @@ def parse_metrics(metrics_str: str) -> list[tuple[str, Optional[str]]]:
             res.append((part.lower(), None))
     return res
 
+def _reduce(
+    input_file: Optional[str],
+    plan: AggregatePlan,
+    strict: bool,
+    verbose: bool,
+    workers: int,
+    desc: str,
+) -> Tuple[GroupTable, ReadStats]:
+    """Fold the input into one GroupTable, merging per-chunk partials in order."""
+    pbar = tqdm(desc=desc, unit="lines", disable=not verbose)
+    read_stats = ReadStats()
+    table = GroupTable(plan.metrics)
+    for partial, _ in map_chunks(input_file, plan, strict, workers, stats=read_stats):
+        table.merge(partial)
+        pbar.update(read_stats.processed - pbar.n)
+    pbar.close()
+    _warn_malformed(read_stats)
+    return table, read_stats
+
+def _write_groups(output_file: Optional[str], table: GroupTable) -> int:
+    outputted = 0
+    with output_writer(output_file) as writer:
+        for res in table.results():
+            writer.write(dumps(res) + "\n")
+            outputted += 1
+    return outputted
+
+def save_state(path: str, table: GroupTable, group_by: Optional[str]) -> None:
+    """Write a partial aggregate that `merge` can combine with other shards."""
+    Path(path).write_text(dumps({"group_by": group_by, **table.to_dict()}), encoding="utf-8")
+
+def load_state(path: str) -> Tuple[GroupTable, Optional[str]]:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return GroupTable.from_dict(data), data.get("group_by")
+
 def run_aggregate(
     input_file: Optional[str],
     output_file: Optional[str],
@@ -125,105 +170,67 @@ def run_aggregate(
     metrics_str: str,
     strict: bool,
     verbose: bool,
+    workers: int = 1,
+    state_out: Optional[str] = None,
+    pushdown: bool = False,
 ):
-    parsed_metrics = parse_metrics(metrics_str)
-    pbar = tqdm(desc="Aggregate", unit="lines", disable=not verbose)
-    processed = 0
-    groups: Dict[Any, Dict[str, Any]] = defaultdict(dict)
-    for data, _ in stream_dicts(input_file, strict):
-        processed += 1
-        pbar.update()
-        try:
-            key = jmespath.search(group_by, data)
-            if key is None:
-                continue
-            group = groups[key]
-            group["_count"] = group.get("_count", 0) + 1
-            for agg, fld in parsed_metrics:
-                if fld is None:
-                    continue
-                val = jmespath.search(fld, data)
-                if not isinstance(val, (int, float)):
-                    continue
-                if agg in ("sum", "avg"):
-                    sk = f"sum_{fld}"
-                    group[sk] = group.get(sk, 0.0) + val
-                elif agg == "min":
-                    mk = f"min_{fld}"
-                    group[mk] = min(group.get(mk, float("inf")), val)
-                elif agg == "max":
-                    mk = f"max_{fld}"
-                    group[mk] = max(group.get(mk, float("-inf")), val)
-        except jmespath.JMESPathError:
-            if strict:
-                raise
-    pbar.close()
-    outputted = 0
-    with output_writer(output_file) as writer:
-        for key, group in groups.items():
-            res: Dict[str, Any] = {"group": key, "count": group["_count"]}
-            for agg, fld in parsed_metrics:
-                if fld is None:
-                    continue
-                if agg == "sum":
-                    res[f"{agg}_{fld}"] = group.get(f"sum_{fld}", 0.0)
-                elif agg == "avg":
-                    cnt = group["_count"]
-                    res[f"{agg}_{fld}"] = group.get(f"sum_{fld}", 0.0) / cnt if cnt else 0.0
-                elif agg in ("min", "max"):
-                    res[f"{agg}_{fld}"] = group.get(f"{agg}_{fld}", None)
-            writer.write(json.dumps(res, separators=(',', ':')) + "\n")
-            outputted += 1
-    _print_summary("Aggregate", processed, outputted)
+    plan = AggregatePlan(group_by, parse_metrics(metrics_str), pushdown, strict)
+    table, read_stats = _reduce(input_file, plan, strict, verbose, workers, "Aggregate")
+    if state_out:
+        save_state(state_out, table, group_by)
+    outputted = _write_groups(output_file, table)
+    _print_summary("Aggregate", read_stats.processed, outputted, read_stats.malformed)
 
-def run_stats(input_file: Optional[str], metrics_str: str, strict: bool, verbose: bool):
+def run_merge(state_files: list[str], output_file: Optional[str], state_out: Optional[str] = None):
+    """Merge partial aggregate states (e.g. one per shard) and emit final results."""
+    merged: Optional[GroupTable] = None
+    group_by: Optional[str] = None
+    for path in state_files:
+        table, shard_group_by = load_state(path)
+        if merged is None:
+            merged, group_by = table, shard_group_by
+            continue
+        if table.metrics != merged.metrics or shard_group_by != group_by:
+            raise ValueError(f"{path}: state was built with different --group-by/--metrics")
+        merged.merge(table)
+    if merged is None:
+        raise ValueError("No state files given")
+    if state_out:
+        save_state(state_out, merged, group_by)
+    outputted = _write_groups(output_file, merged)
+    _print_summary("Merge", merged.records, outputted)
+
+def run_stats(
+    input_file: Optional[str],
+    metrics_str: str,
+    strict: bool,
+    verbose: bool,
+    workers: int = 1,
+    pushdown: bool = False,
+):
     parsed_metrics = parse_metrics(metrics_str)
-    pbar = tqdm(desc="Stats", unit="lines", disable=not verbose)
-    processed = 0
-    stats: Dict[str, Any] = {"_count": 0}
-    uniques: Dict[str, set] = {}
-    for data, _ in stream_dicts(input_file, strict):
-        processed += 1
-        pbar.update()
-        stats["_count"] += 1
-        for agg, fld in parsed_metrics:
-            if agg == "unique" and fld:
-                uniques.setdefault(fld, set()).add(json.dumps(jmespath.search(fld, data)))
-            # Global sum/min/max similar to aggregate but single group
-            try:
-                val = jmespath.search(fld, data)
-                if isinstance(val, (int, float)):
-                    if agg in ("sum", "avg"):
-                        sk = f"sum_{fld}"
-                        stats[sk] = stats.get(sk, 0.0) + val
-                    elif agg == "min":
-                        mk = f"min_{fld}"
-                        stats[mk] = min(stats.get(mk, float("inf")), val)
-                    elif agg == "max":
-                        mk = f"max_{fld}"
-                        stats[mk] = max(stats.get(mk, float("-inf")), val)
-            except jmespath.JMESPathError:
-                pass
-    pbar.close()
-    # Compute
+    plan = AggregatePlan(None, parsed_metrics, pushdown, strict)
+    totals, read_stats = _reduce(input_file, plan, strict, verbose, workers, "Stats")
+    res = totals.state(None).result(parsed_metrics)
     table = Table(title="Stats", box=None)
     table.add_column("Metric", style="cyan")
     table.add_column("Value", justify="right", style="green")
-    table.add_row("Processed", str(processed))
-    table.add_row("Count", str(stats["_count"]))
+    table.add_row("Processed", str(read_stats.processed))
+    if read_stats.malformed:
+        table.add_row("Malformed", str(read_stats.malformed))
+    table.add_row("Count", str(res["count"]))
     for agg, fld in parsed_metrics:
         if fld is None:
             continue
+        val = res[f"{agg}_{fld}"]
         if agg == "unique":
-            table.add_row(f"Unique {fld}", str(len(uniques.get(fld, set()))))
+            table.add_row(f"Unique {fld}", f"~{val}")
         elif agg == "sum":
-            table.add_row(f"Sum {fld}", f"{stats.get(f'sum_{fld}', 0):,.2f}")
-        elif agg == "avg":
-            avg = stats.get(f"sum_{fld}", 0.0) / stats["_count"] if stats["_count"] else 0
-            table.add_row(f"Avg {fld}", f"{avg:.2f}")
+            table.add_row(f"Sum {fld}", f"{val:,.2f}")
+        elif agg in ("avg", "var", "std"):
+            table.add_row(f"{agg.capitalize()} {fld}", f"{val:.2f}")
         elif agg in ("min", "max"):
-            table.add_row(f"{agg.capitalize()} {fld}", str(stats.get(f"{agg}_{fld}", "N/A")))
+            table.add_row(f"{agg.capitalize()} {fld}", str(val if val is not None else "N/A"))
+        elif quantile_of(agg) is not None:
+            table.add_row(f"{agg} {fld}", f"{val:.4g}" if val is not None else "N/A")
     console.print(table)
-
-# Alias for utils
-from .utils import apply_op, parse_value
\ No newline at end of file
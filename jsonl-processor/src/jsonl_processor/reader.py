@@ -0,0 +1,228 @@
+"""Chunked, memory-mapped JSONL reader with an optional process pool.
+
+Files are memory-mapped and split into newline-aligned byte ranges; each
+range is decoded (and optionally filtered/encoded) by a picklable handler,
+either in-process or in a ``ProcessPoolExecutor``. Results come back in
+chunk order, so output is deterministic regardless of worker count.
+"""
+import itertools
+import json
+import mmap
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+
+CHUNK_SIZE = 16 * 1024 * 1024
+
+try:  # pragma: no cover - depends on installed extras
+    import orjson
+
+    loads: Callable[[bytes], Any] = orjson.loads
+    DECODER = "orjson"
+
+    def dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:  # e.g. ints wider than 64 bits
+            return json.dumps(obj, separators=(",", ":"))
+
+except ImportError:  # pragma: no cover
+    try:
+        import simdjson
+
+        loads = simdjson.loads
+        DECODER = "simdjson"
+    except ImportError:
+        loads = json.loads
+        DECODER = "json"
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+
+# A chunk is either a (path, start, end) byte range of a file or raw bytes (stdin).
+ChunkRef = Union[Tuple[str, int, int], bytes]
+Handler = Callable[[Any, bytes], Any]
+
+
+@dataclass
+class ChunkResult:
+    items: List[Tuple[int, Any]]  # (line number within chunk, handler output)
+    lines: int
+    records: int = 0
+    malformed: int = 0
+    bad_lines: List[int] = field(default_factory=list)  # first few, within chunk
+
+
+@dataclass
+class ReadStats:
+    """Batched counters; malformed lines are tallied, not reported one by one."""
+
+    processed: int = 0
+    malformed: int = 0
+    malformed_lines: List[int] = field(default_factory=list)
+
+    MAX_SAMPLES = 10
+
+    def add(self, result: ChunkResult, line_offset: int) -> None:
+        self.processed += result.records
+        self.malformed += result.malformed
+        room = self.MAX_SAMPLES - len(self.malformed_lines)
+        if room > 0:
+            self.malformed_lines.extend(line_offset + ln for ln in result.bad_lines[:room])
+
+
+def record(data: Any, raw: bytes) -> Any:
+    """Default handler: yield the decoded record."""
+    return data
+
+
+def newline_ranges(buf: Union[mmap.mmap, bytes], chunk_size: int = CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """Split `buf` into [start, end) ranges that each end just after a newline (or at EOF)."""
+    size = len(buf)
+    ranges = []
+    start = 0
+    while start < size:
+        cut = buf.find(b"\n", min(start + chunk_size, size) - 1)
+        end = size if cut == -1 else cut + 1
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _load(ref: ChunkRef) -> bytes:
+    if isinstance(ref, bytes):
+        return ref
+    path, start, end = ref
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm[start:end]
+
+
+def parse_chunk(ref: ChunkRef, handler: Handler = record, strict: bool = False) -> ChunkResult:
+    """
+    Decode every line of a chunk and run the handler; None outputs are dropped.
+
+    Handlers are `handler(data, raw_line)` callables, or plan objects that may
+    provide `decode(raw)` (projecting decoder), `prefilter(raw)` (cheap raw-bytes
+    rejection before decoding), `batch(records, raws)` (whole-chunk evaluation) or
+    `reduce(records)` (one partial result for the whole chunk, line number 0).
+    """
+    lines = _load(ref).split(b"\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    decode = getattr(handler, "decode", loads)
+    prefilter = getattr(handler, "prefilter", None)
+    batch = getattr(handler, "batch", None)
+    reduce = getattr(handler, "reduce", None)
+    kept: List[Tuple[int, Any, bytes]] = []
+    bad: List[int] = []
+    records = 0
+    for ln, raw in enumerate(lines, 1):
+        if not raw.strip():
+            continue
+        records += 1
+        if prefilter is not None and not prefilter(raw):
+            continue
+        try:
+            data = decode(raw)
+        except ValueError:
+            records -= 1
+            bad.append(ln)
+            if strict:
+                break
+            continue
+        kept.append((ln, data, raw))
+    if reduce is not None:
+        partial = reduce([data for _, data, _ in kept])
+        return ChunkResult([(0, partial)], len(lines), records, len(bad), bad[: ReadStats.MAX_SAMPLES])
+    if batch is not None:
+        outs = batch([data for _, data, _ in kept], [raw for _, _, raw in kept])
+    else:
+        outs = [handler(data, raw) for _, data, raw in kept]
+    items = [(ln, out) for (ln, _, _), out in zip(kept, outs) if out is not None]
+    return ChunkResult(items, len(lines), records, len(bad), bad[: ReadStats.MAX_SAMPLES])
+
+
+def iter_chunk_refs(input_file: Optional[str], chunk_size: int = CHUNK_SIZE) -> Iterator[ChunkRef]:
+    """Newline-aligned chunks: mmap byte ranges for files, buffered blocks for stdin."""
+    if input_file:
+        size = os.path.getsize(input_file)
+        if size == 0:
+            return
+        with open(input_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ranges = newline_ranges(mm, chunk_size)
+        for start, end in ranges:
+            yield (input_file, start, end)
+        return
+    stream = sys.stdin.buffer
+    pending = b""
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            break
+        block = pending + block
+        cut = block.rfind(b"\n")
+        if cut == -1:
+            pending = block
+            continue
+        pending = block[cut + 1 :]
+        yield block[: cut + 1]
+    if pending:
+        yield pending
+
+
+def resolve_workers(workers: int) -> int:
+    """0 means one worker per CPU."""
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def map_chunks(
+    input_file: Optional[str],
+    handler: Handler = record,
+    strict: bool = False,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+    stats: Optional[ReadStats] = None,
+) -> Iterator[Tuple[Any, int]]:
+    """
+    Yield (handler output, absolute line number) in input order.
+
+    With `workers > 1` chunks are processed in a process pool with a bounded
+    number of chunks in flight, so memory stays ~2 chunks per worker.
+    """
+    stats = stats if stats is not None else ReadStats()
+    workers = resolve_workers(workers)
+    refs = iter_chunk_refs(input_file, chunk_size)
+    head = list(itertools.islice(refs, 2))
+    refs = itertools.chain(head, refs)
+
+    def _consume(result: ChunkResult, offset: int) -> Iterator[Tuple[Any, int]]:
+        stats.add(result, offset)
+        if strict and result.bad_lines:
+            raise ValueError(f"Invalid JSON on line {offset + result.bad_lines[0]}")
+        for ln, out in result.items:
+            yield out, offset + ln
+
+    offset = 0
+    if workers <= 1 or len(head) < 2:
+        for ref in refs:
+            result = parse_chunk(ref, handler, strict)
+            yield from _consume(result, offset)
+            offset += result.lines
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for ref in refs:
+            pending.append(pool.submit(parse_chunk, ref, handler, strict))
+            if len(pending) >= 2 * workers:
+                result = pending.popleft().result()
+                yield from _consume(result, offset)
+                offset += result.lines
+        while pending:
+            result = pending.popleft().result()
+            yield from _consume(result, offset)
+            offset += result.lines
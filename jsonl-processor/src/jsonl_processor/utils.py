@@ -1,5 +1,6 @@
 import json
-from typing import Any, Callable
+import operator
+from typing import Any, Callable, List
 
 def parse_value(val_str: str) -> Any:
     """Parse CLI str to JSON-native type."""
@@ -14,19 +15,37 @@ def parse_value(val_str: str) -> Any:
     except (ValueError, json.JSONDecodeError):
         return stripped  # str
 
+_ORDERING: dict[str, Callable[[Any, Any], bool]] = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+
+def batch_op(values: List[Any], op: str, right: Any) -> List[bool]:
+    """Evaluate `value OP right` for a whole batch of left-hand values.
+
+    The operator and the right-hand type checks are resolved once per batch,
+    leaving a single comprehension over `values`.
+    """
+    if op == "!=":
+        return [v != right for v in values]
+    if op in _ORDERING:
+        if not isinstance(right, (int, float)):
+            return [False] * len(values)
+        cmp = _ORDERING[op]
+        return [isinstance(v, (int, float)) and cmp(v, right) for v in values]
+    if op == "contains":
+        if not isinstance(right, str):
+            return [False] * len(values)
+        return [isinstance(v, str) and right in v for v in values]
+    return [v == right for v in values]
+
+
 def apply_op(left: Any, operator: str, right: Any) -> bool:
     """Safe operator application."""
-    ops: dict[str, Callable[[Any, Any], bool]] = {
-        "==": lambda l, r: l == r,
-        "!=": lambda l, r: l != r,
-        ">": lambda l, r: (isinstance(l, (int, float)) and isinstance(r, (int, float)) and l > r),
-        "<": lambda l, r: (isinstance(l, (int, float)) and isinstance(r, (int, float)) and l < r),
-        ">=": lambda l, r: (isinstance(l, (int, float)) and isinstance(r, (int, float)) and l >= r),
-        "<=": lambda l, r: (isinstance(l, (int, float)) and isinstance(r, (int, float)) and l <= r),
-        "contains": lambda l, r: isinstance(l, str) and isinstance(r, str) and r in l,
-    }
-    op_func = ops.get(operator, ops["=='])
     try:
-        return op_func(left, right)
+        return batch_op([left], operator, right)[0]
     except (TypeError, ValueError):
-        return False
\ No newline at end of file
+        return False
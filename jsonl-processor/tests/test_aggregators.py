@@ -0,0 +1,110 @@
+import json
+import random
+import statistics
+from pathlib import Path
+
+import pytest
+
+from jsonl_processor.aggregators import DDSketch, GroupTable, HyperLogLog, Welford, quantile_of
+from jsonl_processor.processor import run_aggregate, run_merge, run_stats
+
+
+def test_quantile_of():
+    assert quantile_of("p99") == 0.99
+    assert quantile_of("p99.9") == pytest.approx(0.999)
+    assert quantile_of("median") == 0.5
+    assert quantile_of("sum") is None
+
+
+def test_welford_merge_matches_statistics():
+    rng = random.Random(1)
+    xs = [rng.gauss(100, 15) for _ in range(1000)]
+    a, b = Welford(), Welford()
+    for x in xs[:300]:
+        a.add(x)
+    for x in xs[300:]:
+        b.add(x)
+    a.merge(Welford.from_dict(json.loads(json.dumps(b.to_dict()))))
+    assert a.count == 1000
+    assert a.mean == pytest.approx(statistics.mean(xs))
+    assert a.variance == pytest.approx(statistics.variance(xs))
+    assert (a.min, a.max) == (min(xs), max(xs))
+
+
+def test_ddsketch_relative_error_and_merge():
+    rng = random.Random(2)
+    xs = [rng.lognormvariate(3, 1) for _ in range(20000)] + [-1.0, 0.0]
+    parts = [DDSketch() for _ in range(4)]
+    for i, x in enumerate(xs):
+        parts[i % 4].add(x)
+    merged = parts[0]
+    for p in parts[1:]:
+        merged.merge(DDSketch.from_dict(p.to_dict()))
+    xs.sort()
+    for q in (0.5, 0.9, 0.99):
+        exact = xs[int(q * (len(xs) - 1))]
+        assert merged.quantile(q) == pytest.approx(exact, rel=0.02)
+    assert merged.quantile(0.0) < 0
+
+
+def test_ddsketch_bounded_bins():
+    s = DDSketch(max_bins=64)
+    for i in range(1, 100000, 7):
+        s.add(float(i))
+    assert len(s.pos) <= 64
+
+
+def test_hyperloglog_estimate_and_merge():
+    a, b = HyperLogLog(), HyperLogLog()
+    for i in range(30000):
+        (a if i % 2 else b).add(f"user{i % 20000}")
+    a.merge(HyperLogLog.from_dict(b.to_dict()))
+    assert a.estimate() == pytest.approx(20000, rel=0.05)
+    small = HyperLogLog()
+    for v in ["US", "EU", "ASIA", "US"]:
+        small.add(v)
+    assert small.estimate() == 3
+
+
+def test_group_table_roundtrip():
+    t = GroupTable([("avg", "x"), ("p50", "x"), ("unique", "u")])
+    for i in range(10):
+        t.state("g").observe({"x": i, "u": i % 3})
+    t2 = GroupTable.from_dict(json.loads(json.dumps(t.to_dict())))
+    t2.merge(t)
+    (res,) = list(t2.results())
+    assert res["count"] == 20
+    assert res["avg_x"] == pytest.approx(4.5)
+    assert res["unique_u"] == 3
+
+
+def test_sharded_aggregate_merges_to_same_result(tmp_path: Path, sample_jsonl: Path):
+    lines = sample_jsonl.read_text().splitlines()
+    shard_a, shard_b = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    shard_a.write_text("\n".join(lines[:3]))
+    shard_b.write_text("\n".join(lines[3:]))
+    metrics = "count,sum:revenue,avg:age,p50:age,unique:id"
+    whole = tmp_path / "whole.jsonl"
+    run_aggregate(str(sample_jsonl), str(whole), "region", metrics, False, False)
+    for shard in (shard_a, shard_b):
+        run_aggregate(str(shard), str(tmp_path / "ignored.jsonl"), "region", metrics, False, False,
+                      state_out=str(shard) + ".state")
+    merged = tmp_path / "merged.jsonl"
+    run_merge([str(shard_a) + ".state", str(shard_b) + ".state"], str(merged))
+    by_group = lambda p: {r["group"]: r for r in map(json.loads, p.read_text().splitlines())}
+    assert by_group(merged) == by_group(whole)
+    assert by_group(whole)["US"]["unique_id"] == 2
+
+
+def test_merge_rejects_mismatched_metrics(tmp_path: Path, sample_jsonl: Path):
+    run_aggregate(str(sample_jsonl), str(tmp_path / "o"), "region", "sum:revenue", False, False, state_out=str(tmp_path / "a"))
+    run_aggregate(str(sample_jsonl), str(tmp_path / "o"), "region", "avg:age", False, False, state_out=str(tmp_path / "b"))
+    with pytest.raises(ValueError):
+        run_merge([str(tmp_path / "a"), str(tmp_path / "b")], str(tmp_path / "m"))
+
+
+def test_stats_quantiles(sample_jsonl: Path, capsys):
+    run_stats(str(sample_jsonl), "count,std:age,p99:age", strict=False, verbose=False)
+    out = capsys.readouterr().out
+    assert "Std age" in out
+    assert "p99 age" in out
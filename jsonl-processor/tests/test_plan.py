@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from jsonl_processor import plan
+from jsonl_processor.plan import FilterPlan, TransformPlan, is_plain_path, referenced_fields
+from jsonl_processor.processor import run_filter, run_transform
+
+
+@pytest.mark.parametrize(
+    "expr,fields",
+    [
+        ("age", {"age"}),
+        ("user.name", {"user"}),
+        ("items[0].price", {"items"}),
+        ("items[?price > `10`].sku", {"items"}),
+        ("{n: user.name, r: region}", {"user", "region"}),
+        ("length(tags) > `1` && region == 'US'", {"tags", "region"}),
+        ("sort_by(items, &price)[0]", {"items"}),
+        ("a | [0]", {"a"}),
+        ("@", None),
+        ("*", None),
+        ("keys(@)", None),
+    ],
+)
+def test_referenced_fields(expr, fields):
+    got = referenced_fields(expr)
+    assert (got if got is None else set(got)) == fields
+
+
+def test_is_plain_path():
+    assert is_plain_path("a.b[0].c")
+    assert not is_plain_path("upper(name)")
+    assert not is_plain_path("items[*].sku")
+
+
+def test_needle_only_for_safe_literals():
+    assert FilterPlan("region", "==", "US", pushdown=True).needle == b"US"
+    assert FilterPlan("flag", "==", True, pushdown=True).needle == b"true"
+    assert FilterPlan("age", "==", 25, pushdown=True).needle is None  # 25 vs 25.0
+    assert FilterPlan("name", "==", 'a"b', pushdown=True).needle is None  # escaped in JSON
+    assert FilterPlan("to_string(age)", "==", "US", pushdown=True).needle is None
+    assert FilterPlan("region", "==", "US").needle is None
+
+
+def test_batch_skips_failed_records():
+    p = FilterPlan("length(v)", "!=", 3)
+    out = p.batch([{"v": "ab"}, {"v": 5}], [b'{"v":"ab"}', b'{"v":5}'])
+    assert out == ['{"v":"ab"}\n', None]
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_pushdown_matches_full_decode(tmp_path: Path, sample_jsonl: Path, monkeypatch, lazy):
+    if not lazy:
+        monkeypatch.setattr(plan, "simdjson", None)
+    full, pushed = tmp_path / "full.jsonl", tmp_path / "pushed.jsonl"
+    run_filter(str(sample_jsonl), str(full), "region", "==", "US", strict=False, verbose=False, workers=1)
+    run_filter(str(sample_jsonl), str(pushed), "region", "==", "US", False, False, 1, pushdown=True)
+    assert full.read_text() == pushed.read_text()
+    assert len(full.read_text().splitlines()) == 2
+
+    run_transform(str(sample_jsonl), str(full), "{r: region, t: tags[0]}", False, False, 1)
+    run_transform(str(sample_jsonl), str(pushed), "{r: region, t: tags[0]}", False, False, 1, pushdown=True)
+    assert full.read_text() == pushed.read_text()
+
+
+@pytest.mark.skipif(plan.simdjson is None, reason="pysimdjson not installed")
+def test_projector_decodes_only_referenced_keys():
+    p = TransformPlan("user.name", pushdown=True)
+    assert p.decode(b'{"user":{"name":"x"},"blob":[1,2,3]}') == {"user": {"name": "x"}}
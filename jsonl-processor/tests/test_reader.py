@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from jsonl_processor.reader import ReadStats, map_chunks, newline_ranges, parse_chunk
+from jsonl_processor.processor import run_filter
+
+
+@pytest.fixture
+def big_jsonl(tmp_path: Path) -> Path:
+    lines = []
+    for i in range(2000):
+        lines.append("not json" if i % 250 == 7 else json.dumps({"id": i, "v": i % 10}))
+    p = tmp_path / "big.jsonl"
+    p.write_text("\n".join(lines) + "\n")
+    return p
+
+
+def test_newline_ranges_align():
+    buf = b'{"a":1}\n{"a":22}\n{"a":333}\n{"a":4}'
+    ranges = newline_ranges(buf, chunk_size=10)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(buf)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert buf[end - 1 : end] == b"\n"
+
+
+def test_parse_chunk_counts_malformed():
+    result = parse_chunk(b'{"a":1}\nbad\n\n{"a":2}\n')
+    assert [ln for ln, _ in result.items] == [1, 4]
+    assert result.lines == 4
+    assert result.records == 2
+    assert result.malformed == 1
+    assert result.bad_lines == [2]
+
+
+def test_parallel_matches_serial(big_jsonl: Path):
+    serial_stats, parallel_stats = ReadStats(), ReadStats()
+    serial = list(map_chunks(str(big_jsonl), workers=1, chunk_size=4096, stats=serial_stats))
+    parallel = list(map_chunks(str(big_jsonl), workers=2, chunk_size=4096, stats=parallel_stats))
+    assert serial == parallel
+    assert serial[0] == ({"id": 0, "v": 0}, 1)
+    assert parallel_stats.malformed == serial_stats.malformed == 8
+    assert parallel_stats.malformed_lines[0] == 8
+    assert parallel_stats.processed == 1992
+
+
+def test_strict_reports_absolute_line(big_jsonl: Path):
+    with pytest.raises(ValueError, match="line 8"):
+        list(map_chunks(str(big_jsonl), strict=True, workers=2, chunk_size=64))
+
+
+def test_parallel_filter_writes_raw_lines_in_order(tmp_path: Path, big_jsonl: Path):
+    out = tmp_path / "out.jsonl"
+    run_filter(str(big_jsonl), str(out), "v", "==", 3, strict=False, verbose=False, workers=2)
+    ids = [json.loads(l)["id"] for l in out.read_text().splitlines()]
+    assert ids == [i for i in range(2000) if i % 10 == 3 and i % 250 != 7]
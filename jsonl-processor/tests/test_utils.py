@@ -1,5 +1,5 @@
 import pytest
-from jsonl_processor.utils import parse_value, apply_op
+from jsonl_processor.utils import parse_value, apply_op, batch_op
 
 
 @pytest.mark.parametrize(
@@ -35,4 +35,11 @@ def test_apply_op(left, right, op, exp):
 
 def test_apply_op_type_fail():
     assert not apply_op("a", 1, ">")
-    assert not apply_op(None, None, "contains")
\ No newline at end of file
+    assert not apply_op(None, None, "contains")
+
+def test_batch_op():
+    values = [20, 17, "x", None, 18.5, True]
+    assert batch_op(values, ">", 18) == [True, False, False, False, True, False]
+    assert batch_op(["foo", "bar", 3], "contains", "o") == [True, False, False]
+    assert batch_op([1, 2], ">", "1") == [False, False]
+    assert batch_op([1, "1"], "==", 1) == [True, False]
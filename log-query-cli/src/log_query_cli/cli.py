@@ -1,15 +1,16 @@
 import typer
 from pathlib import Path
-import polars as pl
 from tqdm import tqdm
 import rich_click as click
 
 click.rich_click.COMPLETE_KEYBINDING = "tab"
 
-from .parser import parse_line
+from .parser import parse_lines
 from .config import load_patterns
 from .engine import run_query
+from .follow import follow
 from .renderer import render_df
+from .store import DEFAULT_CACHE_DIR, ParquetStore, rows_to_frame
 
 
 app = typer.Typer(help="Blazing-fast log querying CLI.")
@@ -22,44 +23,80 @@ def query(
     config: Path = typer.Option(None, "--config", help="YAML config for custom patterns"),
     fmt: str = typer.Option("table", "--format", help="Output: table, json, csv, chart"),
     limit: int = typer.Option(None, "--limit", help="Limit rows (post-query)"),
+    cache_dir: Path = typer.Option(DEFAULT_CACHE_DIR, "--cache-dir", envvar="LOGQ_CACHE_DIR", help="Parsed-log Parquet cache"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Parse in memory; don't read or write the cache"),
+    follow_: bool = typer.Option(False, "--follow", "-f", help="Tail files and re-run the query per time window"),
+    window: float = typer.Option(60.0, "--window", help="Follow: window length in seconds"),
+    slide: float = typer.Option(None, "--slide", help="Follow: seconds between evaluations (default: tumbling)"),
+    from_start: bool = typer.Option(False, "--from-start", help="Follow: include lines already in the files"),
 ) -> None:
     """Query log files with SQL."""
     patterns = load_patterns(config)
 
+    if follow_:
+        _follow(sql, files, patterns, fmt, limit, window, slide, from_start)
+        return
+    store = None if no_cache else ParquetStore(cache_dir)
+
     all_rows = []
-    total_files = len(files)
+    parts = []
+    total = 0
 
     with tqdm(files, desc="Parsing files", unit="file") as pbar:
         for file_path in pbar:
             if not file_path.exists():
                 typer.echo(f"❌ File not found: {file_path}", err=True)
                 continue
-            rows = []
             try:
+                if store is not None:
+                    manifest = store.sync(file_path, patterns)
+                    entry = store.entry_dir(file_path, patterns)
+                    parts.extend(entry / part for part in manifest.files)
+                    total += manifest.total_rows
+                    pbar.set_postfix(parsed=manifest.total_rows)
+                    continue
                 with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    for line_num, line in enumerate(f, 1):
-                        parsed = parse_line(line, patterns)
-                        if parsed:
-                            rows.append(parsed)
-                file_df = pl.DataFrame(rows)
+                    rows = list(parse_lines(f, patterns))
                 all_rows.extend(rows)  # For concat
+                total += len(rows)
                 pbar.set_postfix(parsed=len(rows))
             except Exception as e:
                 typer.echo(f"⚠️  Error parsing {file_path}: {e}", err=True)
 
-    if not all_rows:
+    if not total:
         typer.echo("No logs parsed.", err=True)
         raise typer.Exit(1)
 
-    df = pl.DataFrame(all_rows)
-    typer.echo(f"✅ Parsed {len(df):,} log entries", fg="green")
+    source = parts if store is not None else rows_to_frame(all_rows)
+    typer.echo(f"✅ Parsed {total:,} log entries")
 
     try:
-        result = run_query(df, sql)
+        result = run_query(source, sql)
         if limit:
             result = result.head(limit)
         render_df(result, fmt)
     except Exception as e:
         typer.echo(f"❌ Query error: {e}", err=True)
         typer.echo("Hint: Ensure SQL uses 'logs' table, columns match parsed fields.", err=True)
-        raise typer.Exit(1)
\ No newline at end of file
+        raise typer.Exit(1)
+
+
+def _follow(sql, files, patterns, fmt, limit, window, slide, from_start) -> None:
+    try:
+        windows = follow(files, sql, patterns, window, slide, from_start=from_start)
+        for result, report in windows:
+            if result is not None:
+                render_df(result.head(limit) if limit else result, fmt)
+            typer.echo(
+                f"⏱  window {report.index}: {report.rows:,} rows · "
+                f"parse {report.parse_ms:.1f} ms · eval {report.eval_ms:.1f} ms",
+                err=True,
+            )
+    except KeyboardInterrupt:
+        return
+    except ValueError as e:
+        typer.echo(f"❌ {e}", err=True)
+        raise typer.Exit(1)
+    except RuntimeError as e:
+        typer.echo(f"❌ Query error: {e}", err=True)
+        raise typer.Exit(1)
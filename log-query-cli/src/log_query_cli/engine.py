@@ -1,23 +1,47 @@
 import duckdb
 import polars as pl
 
-from typing import Union
+from pathlib import Path
+from typing import Optional, Sequence, Union
 
 QueryResult = Union[pl.DataFrame, pl.LazyFrame]
+LogSource = Union[pl.DataFrame, Sequence[Path]]
 
+_con: Optional[duckdb.DuckDBPyConnection] = None
 
-def run_query(df: pl.DataFrame, sql: str) -> pl.DataFrame:
+
+def _connection() -> duckdb.DuckDBPyConnection:
+    """One in-memory DuckDB connection per process, reused across queries."""
+    global _con
+    if _con is None:
+        _con = duckdb.connect()
+    return _con
+
+
+def _bind_logs(con: duckdb.DuckDBPyConnection, source: LogSource) -> None:
+    con.execute("DROP VIEW IF EXISTS logs")
+    try:
+        con.unregister("logs")
+    except duckdb.Error:
+        pass
+    if isinstance(source, pl.DataFrame):
+        con.register("logs", source)
+        return
+    # Parquet parts are scanned lazily: DuckDB pushes filters/projections into the reader.
+    paths = ", ".join("'" + str(p).replace("'", "''") + "'" for p in source)
+    con.execute(f"CREATE VIEW logs AS SELECT * FROM read_parquet([{paths}], union_by_name = true)")
+
+
+def run_query(source: LogSource, sql: str) -> pl.DataFrame:
     """
-    Execute SQL query on DataFrame via DuckDB.
+    Execute SQL query on DataFrame or Parquet parts via DuckDB.
 
     Assumes 'logs' table.
     """
-    con = duckdb.connect()
+    con = _connection()
     try:
-        con.register("logs", df)
+        _bind_logs(con, source)
         result = con.sql(sql).pl()
         return result
     except Exception as e:
         raise RuntimeError(f"SQL execution failed: {e}\nQuery: {sql}")
-    finally:
-        con.close()
\ No newline at end of file
@@ -0,0 +1,127 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
+
+import polars as pl
+
+from .engine import run_query
+from .parser import parse_lines
+from .store import rows_to_frame
+
+
+class Tailer:
+    """Read complete lines appended to a file since the last call."""
+
+    def __init__(self, path: Path, from_start: bool = False):
+        self.path = path
+        self.offset = 0 if from_start or not path.exists() else path.stat().st_size
+        self._partial = b""
+
+    def read_lines(self) -> List[str]:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return []
+        if size < self.offset:  # truncated or rotated in place
+            self.offset, self._partial = 0, b""
+        if size == self.offset:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        self.offset += len(data)
+        data = self._partial + data
+        cut = data.rfind(b"\n") + 1
+        self._partial = data[cut:]
+        return data[:cut].decode("utf-8", errors="ignore").splitlines()
+
+
+@dataclass
+class WindowReport:
+    index: int
+    start: float
+    end: float
+    rows: int
+    parse_ms: float
+    eval_ms: float
+
+
+class WindowBuffer:
+    """
+    Panes of parsed rows, one per `slide` seconds, covering the last `window`
+    seconds. Tumbling when slide == window; memory is bounded to
+    ceil(window / slide) panes however long the tail runs.
+    """
+
+    def __init__(self, window: float, slide: Optional[float] = None):
+        if window <= 0 or (slide is not None and not 0 < slide <= window):
+            raise ValueError("window must be > 0 and 0 < slide <= window")
+        self.window = window
+        self.slide = slide or window
+        self.panes: Deque[Tuple[float, pl.DataFrame]] = deque()
+
+    def add(self, end: float, frame: pl.DataFrame) -> None:
+        """Close a pane ending at `end` and drop panes that fell out of the window."""
+        if frame.height:
+            self.panes.append((end, frame))
+        while self.panes and self.panes[0][0] <= end - self.window:
+            self.panes.popleft()
+
+    @property
+    def rows(self) -> int:
+        return sum(frame.height for _, frame in self.panes)
+
+    def frame(self) -> pl.DataFrame:
+        if not self.panes:
+            return pl.DataFrame()
+        return pl.concat([frame for _, frame in self.panes], how="diagonal_relaxed")
+
+
+def follow(
+    files: List[Path],
+    sql: str,
+    patterns: Optional[List[str]],
+    window: float,
+    slide: Optional[float] = None,
+    poll: float = 0.5,
+    from_start: bool = False,
+    max_windows: Optional[int] = None,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[Tuple[Optional[pl.DataFrame], WindowReport]]:
+    """
+    Tail `files` and yield (result, report) every `slide` seconds.
+
+    The result is `sql` evaluated over the rows that arrived in the last
+    `window` seconds, or None if the window is empty.
+    """
+    tailers = [Tailer(p, from_start) for p in files]
+    buffer = WindowBuffer(window, slide)
+    pending: list = []
+    parse_s = 0.0
+    index = 0
+    tick = clock() + buffer.slide
+    while max_windows is None or index < max_windows:
+        t0 = time.perf_counter()
+        for tailer in tailers:
+            pending.extend(parse_lines(tailer.read_lines(), patterns))
+        parse_s += time.perf_counter() - t0
+        now = clock()
+        if now < tick:
+            sleep(min(poll, tick - now))
+            continue
+
+        t0 = time.perf_counter()
+        buffer.add(tick, rows_to_frame(pending) if pending else pl.DataFrame())
+        frame = buffer.frame()
+        parse_s += time.perf_counter() - t0
+        t0 = time.perf_counter()
+        result = run_query(frame, sql) if frame.height else None
+        eval_s = time.perf_counter() - t0
+
+        index += 1
+        yield result, WindowReport(index, tick - buffer.window, tick, frame.height, parse_s * 1e3, eval_s * 1e3)
+        pending, parse_s = [], 0.0
+        tick += buffer.slide
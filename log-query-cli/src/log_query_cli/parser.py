@@ -1,6 +1,7 @@
 import json
 import re
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Iterator, Optional, List, Tuple
 import pendulum
 
 # Default patterns for common log formats
@@ -13,7 +14,17 @@ DEFAULT_PATTERNS = [
 JSON_DETECTOR = re.compile(r'^\s*\{')
 
 
-def parse_line(line: str, patterns: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+@lru_cache(maxsize=32)
+def compile_patterns(patterns: Tuple[str, ...]) -> Tuple[re.Pattern, ...]:
+    """Compile a pattern list once; keyed by the (hashable) pattern tuple."""
+    return tuple(re.compile(p) for p in patterns)
+
+
+def parse_line(
+    line: str,
+    patterns: Optional[List[str]] = None,
+    parsed_at: Optional[pendulum.DateTime] = None,
+) -> Optional[Dict[str, Any]]:
     """
     Parse a log line to structured dict.
 
@@ -22,6 +33,7 @@ def parse_line(line: str, patterns: Optional[List[str]] = None) -> Optional[Dict
     - Regex patterns (timestamp, level, etc.)
     - Fallback to raw
     """
+    parsed_at = parsed_at or pendulum.now("UTC")
     line = line.strip()
     if not line:
         return None
@@ -30,15 +42,15 @@ def parse_line(line: str, patterns: Optional[List[str]] = None) -> Optional[Dict
     if JSON_DETECTOR.match(line):
         try:
             data = json.loads(line)
-            data.setdefault("parsed_at", pendulum.now("UTC"))
+            data.setdefault("parsed_at", parsed_at)
             return data
         except json.JSONDecodeError:
             pass
 
     # Regex patterns
-    pats = patterns or DEFAULT_PATTERNS
+    pats = compile_patterns(tuple(patterns or DEFAULT_PATTERNS))
     for pat in pats:
-        match = re.match(pat, line)
+        match = pat.match(line)
         if match:
             data = match.groupdict()
             if "timestamp" in data:
@@ -48,11 +60,20 @@ def parse_line(line: str, patterns: Optional[List[str]] = None) -> Optional[Dict
                 except ValueError:
                     data["timestamp"] = ts_str  # Keep string
             data["raw_line"] = line
-            data["parsed_at"] = pendulum.now("UTC")
+            data["parsed_at"] = parsed_at
             return data
 
     # Fallback
     return {
         "raw_line": line,
-        "parsed_at": pendulum.now("UTC"),
-    }
\ No newline at end of file
+        "parsed_at": parsed_at,
+    }
+
+
+def parse_lines(lines: Iterable[str], patterns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Parse many lines with one `parsed_at` stamp; empty lines are dropped."""
+    parsed_at = pendulum.now("UTC")
+    for line in lines:
+        parsed = parse_line(line, patterns, parsed_at)
+        if parsed:
+            yield parsed
\ No newline at end of file
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pendulum
+import polars as pl
+
+from .parser import DEFAULT_PATTERNS, parse_lines
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("LOGQ_CACHE_DIR", Path.home() / ".cache" / "logq"))
+ROWS_PER_PART = 250_000
+# Bytes just before the parsed offset; if they change, the file was rewritten, not appended to.
+_FINGERPRINT_BYTES = 4096
+
+
+@dataclass
+class Manifest:
+    """What has been parsed from one log file into Parquet parts."""
+
+    source: str
+    patterns_key: str
+    mtime_ns: int = 0
+    offset: int = 0  # bytes consumed (always ends on a newline)
+    fingerprint: str = ""
+    parts: List[str] = field(default_factory=list)
+    rows: int = 0
+    # Rows of an unterminated last line; re-parsed once the line is complete.
+    tail: Optional[str] = None
+    tail_rows: int = 0
+
+    @property
+    def files(self) -> List[str]:
+        return self.parts + ([self.tail] if self.tail else [])
+
+    @property
+    def total_rows(self) -> int:
+        return self.rows + self.tail_rows
+
+
+def _patterns_key(patterns: Optional[List[str]]) -> str:
+    return hashlib.sha256(json.dumps(patterns or DEFAULT_PATTERNS).encode()).hexdigest()[:16]
+
+
+def _fingerprint(f, offset: int) -> str:
+    start = max(0, offset - _FINGERPRINT_BYTES)
+    f.seek(start)
+    return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def _column(name: str, values: List[Any]) -> pl.Series:
+    """Build one column, coercing mixed types (e.g. ISO strings next to datetimes)."""
+    kinds = {type(v) for v in values if v is not None}
+    has_dt = any(issubclass(k, datetime) for k in kinds)
+    if has_dt and str in kinds:
+        try:
+            values = [pendulum.parse(v) if isinstance(v, str) else v for v in values]
+        except ValueError:  # pendulum's ParserError is a ValueError
+            values = [None if v is None else str(v) for v in values]
+    elif len(kinds) > 1 and kinds & {dict, list}:
+        values = [v if v is None or isinstance(v, str) else json.dumps(v, default=str) for v in values]
+    try:
+        return pl.Series(name, values, strict=False)
+    except Exception:
+        return pl.Series(name, [None if v is None else str(v) for v in values])
+
+
+def rows_to_frame(rows: List[Dict[str, Any]]) -> pl.DataFrame:
+    """Columnar frame from heterogeneous parsed rows (missing keys become null)."""
+    columns: Dict[str, List[Any]] = {}
+    for i, row in enumerate(rows):
+        for key, value in row.items():
+            col = columns.get(key)
+            if col is None:
+                col = columns[key] = [None] * i
+            col.append(value)
+        for col in columns.values():
+            if len(col) <= i:
+                col.append(None)
+    return pl.DataFrame([_column(name, values) for name, values in columns.items()])
+
+
+class ParquetStore:
+    """
+    Parsed-log cache: one directory of Parquet parts per (file path, patterns).
+
+    `sync` re-validates against the file's mtime/size. When the file only grew
+    and the bytes before the last parsed offset are unchanged, just the
+    appended bytes are parsed into a new part; otherwise the entry is rebuilt.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, rows_per_part: int = ROWS_PER_PART):
+        self.cache_dir = Path(cache_dir)
+        self.rows_per_part = rows_per_part
+
+    def entry_dir(self, path: Path, patterns: Optional[List[str]]) -> Path:
+        key = hashlib.sha256(f"{path.resolve()}\0{_patterns_key(patterns)}".encode()).hexdigest()[:24]
+        return self.cache_dir / key
+
+    def _load_manifest(self, entry: Path) -> Optional[Manifest]:
+        try:
+            return Manifest(**json.loads((entry / "manifest.json").read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _save_manifest(self, entry: Path, manifest: Manifest) -> None:
+        tmp = entry / "manifest.json.tmp"
+        tmp.write_text(json.dumps(asdict(manifest)))
+        tmp.replace(entry / "manifest.json")
+
+    def _reset(self, entry: Path, path: Path, patterns: Optional[List[str]]) -> Manifest:
+        for part in entry.glob("*.parquet"):
+            part.unlink()
+        return Manifest(source=str(path.resolve()), patterns_key=_patterns_key(patterns))
+
+    def sync(self, path: Path, patterns: Optional[List[str]] = None) -> Manifest:
+        """Bring the cache for `path` up to date and return its manifest."""
+        entry = self.entry_dir(path, patterns)
+        entry.mkdir(parents=True, exist_ok=True)
+        st = path.stat()
+        manifest = self._load_manifest(entry)
+        if manifest is None or manifest.patterns_key != _patterns_key(patterns):
+            manifest = self._reset(entry, path, patterns)
+        if manifest.mtime_ns == st.st_mtime_ns and manifest.offset <= st.st_size:
+            return manifest
+
+        with open(path, "rb") as f:
+            appended = (
+                manifest.offset <= st.st_size
+                and manifest.fingerprint == _fingerprint(f, manifest.offset)
+            )
+            if not appended:
+                manifest = self._reset(entry, path, patterns)
+            if manifest.tail:
+                (entry / manifest.tail).unlink(missing_ok=True)
+                manifest.tail, manifest.tail_rows = None, 0
+            f.seek(manifest.offset)
+            for rows, consumed in self._parse_from(f, patterns):
+                if consumed == 0:  # unterminated last line
+                    if rows:
+                        manifest.tail, manifest.tail_rows = "tail.parquet", len(rows)
+                        rows_to_frame(rows).write_parquet(entry / manifest.tail)
+                    continue
+                if rows:
+                    part = f"part-{len(manifest.parts):05d}.parquet"
+                    rows_to_frame(rows).write_parquet(entry / part)
+                    manifest.parts.append(part)
+                    manifest.rows += len(rows)
+                manifest.offset += consumed
+            manifest.fingerprint = _fingerprint(f, manifest.offset)
+        manifest.mtime_ns = st.st_mtime_ns
+        self._save_manifest(entry, manifest)
+        return manifest
+
+    def _parse_from(self, f, patterns: Optional[List[str]]) -> Iterator[tuple]:
+        """
+        Yield (rows, bytes consumed) batches of complete lines. An unterminated
+        last line comes last as (rows, 0): it is queryable but not consumed.
+        """
+        batch: List[str] = []
+        consumed = 0
+        tail = None
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                tail = raw
+                break
+            consumed += len(raw)
+            batch.append(raw.decode("utf-8", errors="ignore"))
+            if len(batch) >= self.rows_per_part:
+                yield list(parse_lines(batch, patterns)), consumed
+                batch, consumed = [], 0
+        if batch or consumed:
+            yield list(parse_lines(batch, patterns)), consumed
+        if tail is not None:
+            yield list(parse_lines([tail.decode("utf-8", errors="ignore")], patterns)), 0
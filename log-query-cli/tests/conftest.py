@@ -1,6 +1,5 @@
 import pytest
 import sys
-import os
 from pathlib import Path
 from typer.testing import CliRunner
 
@@ -12,6 +11,14 @@ from log_query_cli.cli import app
 runner = CliRunner()
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch) -> Path:
+    """Keep the parsed-log cache out of the user's home directory."""
+    path = tmp_path / "logq-cache"
+    monkeypatch.setenv("LOGQ_CACHE_DIR", str(path))
+    return path
+
+
 @pytest.fixture
 def sample_log(tmp_path: Path) -> Path:
     log_file = tmp_path / "sample.log"
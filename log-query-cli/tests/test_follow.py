@@ -0,0 +1,64 @@
+import polars as pl
+import pytest
+
+from log_query_cli.follow import Tailer, WindowBuffer, follow
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFollow:
+    def test_tailer_partial_lines(self, tmp_path):
+        log = tmp_path / "app.log"
+        log.write_text("old\n")
+        tailer = Tailer(log)
+        assert tailer.read_lines() == []
+        with open(log, "a") as f:
+            f.write("one\ntw")
+        assert tailer.read_lines() == ["one"]
+        with open(log, "a") as f:
+            f.write("o\n")
+        assert tailer.read_lines() == ["two"]
+        log.write_text("new\n")  # truncated
+        assert tailer.read_lines() == ["new"]
+
+    def test_window_buffer_sliding(self):
+        buf = WindowBuffer(window=3, slide=1)
+        for end in range(1, 6):
+            buf.add(end, pl.DataFrame({"x": [end]}))
+        assert sorted(buf.frame()["x"].to_list()) == [3, 4, 5]
+        assert len(buf.panes) == 3
+
+    def test_window_buffer_validates(self):
+        with pytest.raises(ValueError):
+            WindowBuffer(window=1, slide=2)
+
+    def test_tumbling_windows(self, tmp_path):
+        log = tmp_path / "app.log"
+        log.write_text("")
+        clock = FakeClock()
+        batches = iter([
+            ['{"level": "ERROR"}', '{"level": "INFO"}'],
+            ['{"level": "ERROR"}'],
+            [],
+        ])
+
+        def sleep(seconds):
+            lines = next(batches, [])
+            with open(log, "a") as f:
+                f.writelines(line + "\n" for line in lines)
+            clock.now += 10
+
+        out = list(follow(
+            [log], "SELECT COUNT(*) AS n FROM logs WHERE level = 'ERROR'", None,
+            window=10, max_windows=3, clock=clock, sleep=sleep,
+        ))
+        counts = [None if res is None else res.item() for res, _ in out]
+        assert counts == [1, 1, None]
+        assert [r.rows for _, r in out] == [2, 1, 0]
+        assert all(r.parse_ms >= 0 and r.eval_ms >= 0 for _, r in out)
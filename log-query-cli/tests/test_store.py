@@ -0,0 +1,44 @@
+import polars as pl
+
+from log_query_cli.engine import run_query
+from log_query_cli.store import ParquetStore, rows_to_frame
+
+
+class TestStore:
+    def test_rows_to_frame_mixed(self, sample_log):
+        from log_query_cli.parser import parse_lines
+
+        df = rows_to_frame(list(parse_lines(sample_log.read_text().splitlines())))
+        assert len(df) == 4
+        assert df.schema["timestamp"] == pl.Datetime("us", "UTC") or df["timestamp"].null_count() == 0
+
+    def test_sync_caches(self, sample_log, tmp_path):
+        store = ParquetStore(tmp_path / "cache")
+        first = store.sync(sample_log)
+        assert first.total_rows == 4 and len(first.files) == 2  # last line has no newline
+        again = store.sync(sample_log)
+        assert again.parts == first.parts and again.offset == first.offset
+
+    def test_append_is_incremental(self, sample_log, tmp_path):
+        store = ParquetStore(tmp_path / "cache")
+        first = store.sync(sample_log)
+        with open(sample_log, "a") as f:
+            f.write('\n{"level": "ERROR", "service": "db", "message": "again"}\n')
+            f.write('{"level": "INFO", "service": "db"')  # partial line: not parsed yet
+        second = store.sync(sample_log)
+        assert second.total_rows == first.total_rows + 2
+        assert second.parts[: len(first.parts)] == first.parts
+        parts = [store.entry_dir(sample_log, None) / p for p in second.files]
+        result = run_query(parts, "SELECT COUNT(*) FROM logs WHERE service = 'db'")
+        assert result.item() == 2
+
+    def test_rewrite_rebuilds(self, sample_log, tmp_path):
+        store = ParquetStore(tmp_path / "cache")
+        store.sync(sample_log)
+        sample_log.write_text('{"level": "DEBUG"}\n')
+        manifest = store.sync(sample_log)
+        assert manifest.total_rows == 1 and manifest.files == ["part-00000.parquet"]
+
+    def test_patterns_keyed(self, sample_log, tmp_path):
+        store = ParquetStore(tmp_path / "cache")
+        assert store.entry_dir(sample_log, None) != store.entry_dir(sample_log, [r"(?P<message>.*)"])
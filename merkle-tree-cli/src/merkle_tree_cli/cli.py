@@ -1,16 +1,98 @@
+import json
+from pathlib import Path
+from typing import List, Optional
+
 import typer
 from rich.console import Console
 
+from .store import MerkleFile, append_source, build as build_tree
+from .tree import CHUNK_SIZE, hash_leaf
+from .verify import verify_multiproof
+
 app = typer.Typer(help="Merkle tree builder and verifier")
 console = Console()
 
 @app.command()
-def build(path: str):
-    console.print(f"Building tree for {path}")
+def build(
+    path: Path,
+    out: Path = typer.Option(Path("tree.mrkl"), "--out", "-o", help="Tree file to write"),
+    chunk_size: int = typer.Option(CHUNK_SIZE, "--chunk-size", help="Leaf chunk size in bytes"),
+    workers: int = typer.Option(0, "--workers", "-j", help="Hashing threads (0 = all CPUs)"),
+):
+    with build_tree(path, out, chunk_size, workers) as tree:
+        console.print(f"{tree.leaf_count} leaves, root {tree.root.hex()}")
+
+@app.command()
+def root(tree: Path):
+    with MerkleFile.open(tree) as t:
+        console.print(t.root.hex())
+
+@app.command()
+def prove(
+    tree: Path,
+    index: List[int] = typer.Option(..., "--index", "-i", help="Leaf index; repeat for a multi-proof"),
+    out: Optional[Path] = typer.Option(None, "--out", "-o", help="Write the proof JSON here"),
+):
+    with MerkleFile.open(tree) as t:
+        try:
+            proof = {
+                "root": t.root.hex(),
+                "leaf_count": t.leaf_count,
+                "chunk_size": t.chunk_size,
+                "leaves": {str(i): t.leaf(i).hex() for i in sorted(set(index))},
+                "proof": [h.hex() for h in t.prove(index)],
+            }
+        except IndexError:
+            console.print(f"[red]Index out of range (tree has {t.leaf_count} leaves)[/red]")
+            raise typer.Exit(1)
+    text = json.dumps(proof, indent=2)
+    if out:
+        out.write_text(text)
+    else:
+        print(text)
+
+@app.command()
+def verify(
+    tree: Optional[Path] = typer.Argument(None, help="Tree file holding the trusted root"),
+    proof: Path = typer.Option(..., "--proof", "-p"),
+    root_hex: Optional[str] = typer.Option(None, "--root", help="Trusted root (hex) instead of a tree file"),
+    leaf_count: Optional[int] = typer.Option(None, "--leaf-count", help="Trusted leaf count; required with --root"),
+):
+    data = json.loads(proof.read_text())
+    if root_hex:
+        if leaf_count is None:
+            console.print("[red]--root needs the trusted --leaf-count too[/red]")
+            raise typer.Exit(2)
+        trusted = bytes.fromhex(root_hex)
+    elif tree:
+        with MerkleFile.open(tree) as t:
+            trusted, leaf_count = t.root, t.leaf_count
+    else:
+        console.print("[red]Give a tree file or --root[/red]")
+        raise typer.Exit(2)
+    # The proof's own root and leaf_count are untrusted and never used.
+    leaves = {int(i): bytes.fromhex(h) for i, h in data["leaves"].items()}
+    ok = verify_multiproof(trusted, leaves, [bytes.fromhex(h) for h in data["proof"]], leaf_count)
+    console.print("[green]valid[/green]" if ok else "[red]invalid[/red]")
+    if not ok:
+        raise typer.Exit(1)
+
+@app.command()
+def append(
+    tree: Path,
+    path: Path,
+    workers: int = typer.Option(0, "--workers", "-j", help="Hashing threads (0 = all CPUs)"),
+):
+    with MerkleFile.open(tree) as t:
+        added = append_source(t, path, workers)
+        console.print(f"+{added} leaves, root {t.root.hex()}")
 
 @app.command()
-def prove(tree: str, index: int):
-    console.print(f"Proof for index {index}")
+def update(tree: Path, index: int, chunk: Path):
+    """Replace leaf INDEX with the hash of CHUNK's contents."""
+    with MerkleFile.open(tree) as t:
+        t.set_leaves({index: hash_leaf(chunk.read_bytes())})
+        console.print(t.root.hex())
 
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    app()
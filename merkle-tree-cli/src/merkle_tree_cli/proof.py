@@ -1,6 +1,34 @@
-from typing import List
+from typing import Iterable, List, Sequence
 
-def generate_proof(tree: List[bytes], index: int) -> List[bytes]:
-    proof = []
-    # production implementation elided for brevity but fully correct
-    return proof
\ No newline at end of file
+Levels = Sequence[Sequence[bytes]]
+
+
+def proof_positions(leaf_count: int, indices: Iterable[int]) -> List[tuple]:
+    """
+    (level, index) of every sibling hash a multi-proof for `indices` must
+    carry, in the order the proof lists them. Siblings that are themselves
+    on a proven path, and unpaired nodes promoted without hashing, need none.
+    """
+    known = sorted(set(indices))
+    if not known or known[0] < 0 or known[-1] >= leaf_count:
+        raise IndexError("Leaf index out of range")
+    positions = []
+    count, level = leaf_count, 0
+    while count > 1:
+        members = set(known)
+        for i in known:
+            sibling = i ^ 1
+            if sibling < count and sibling not in members:
+                positions.append((level, sibling))
+        known = sorted({i // 2 for i in known})
+        count, level = (count + 1) // 2, level + 1
+    return positions
+
+
+def generate_multiproof(levels: Levels, indices: Iterable[int]) -> List[bytes]:
+    """Sibling hashes proving all `indices` at once; O(k log n) lookups."""
+    return [levels[level][i] for level, i in proof_positions(len(levels[0]), indices)]
+
+
+def generate_proof(levels: Levels, index: int) -> List[bytes]:
+    return generate_multiproof(levels, [index])
@@ -0,0 +1,209 @@
+"""Persistent Merkle tree: every level stored in one memory-mapped file.
+
+Layout: a fixed header, then one region per level. Level k has room for
+ceil(capacity / 2**k) hashes, so leaves can be appended in place until the
+capacity is reached; the file is then rewritten with double the capacity
+(amortized O(1) per leaf). Proofs read O(log n) hashes straight from the map.
+"""
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .proof import generate_multiproof
+from .tree import CHUNK_SIZE, HASH_SIZE, count_chunks, hash_leaves, iter_chunks, parent_count, parent_of
+
+MAGIC = b"MRKL"
+VERSION = 2  # 2: domain-separated leaf/node hashes
+_HEADER = struct.Struct("<4sB3xQQQ")  # magic, version, chunk_size, leaf_count, capacity
+
+
+def _capacities(capacity: int) -> List[int]:
+    caps = [capacity]
+    while caps[-1] > 1:
+        caps.append(parent_count(caps[-1]))
+    return caps
+
+
+class Level(Sequence[bytes]):
+    """Read-only view of one level's hashes inside the mapped file."""
+
+    def __init__(self, buf: mmap.mmap, offset: int, count: int):
+        self._buf = buf
+        self._offset = offset
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> bytes:
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        start = self._offset + i * HASH_SIZE
+        return self._buf[start : start + HASH_SIZE]
+
+
+class MerkleFile:
+    def __init__(self, path: Path, buf: mmap.mmap, fh, chunk_size: int, leaf_count: int, capacity: int):
+        self.path = path
+        self._buf = buf
+        self._fh = fh
+        self.chunk_size = chunk_size
+        self.leaf_count = leaf_count
+        self.capacity = capacity
+        self._offsets = self._layout(capacity)
+
+    # -- lifecycle ------------------------------------------------------------
+
+    @staticmethod
+    def _layout(capacity: int) -> List[int]:
+        offsets, pos = [], _HEADER.size
+        for cap in _capacities(capacity):
+            offsets.append(pos)
+            pos += cap * HASH_SIZE
+        return offsets
+
+    @classmethod
+    def _file_size(cls, capacity: int) -> int:
+        return _HEADER.size + sum(_capacities(capacity)) * HASH_SIZE
+
+    @classmethod
+    def create(cls, path: Path, chunk_size: int, capacity: int = 1) -> "MerkleFile":
+        capacity = max(1, capacity)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, chunk_size, 0, capacity))
+            f.truncate(cls._file_size(capacity))
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path: Path) -> "MerkleFile":
+        fh = open(path, "r+b")
+        buf = mmap.mmap(fh.fileno(), 0)
+        magic, version, chunk_size, leaf_count, capacity = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            buf.close()
+            fh.close()
+            raise ValueError(f"{path} is not a Merkle tree file")
+        return cls(Path(path), buf, fh, chunk_size, leaf_count, capacity)
+
+    def close(self) -> None:
+        self._write_header()
+        self._buf.flush()
+        self._buf.close()
+        self._fh.close()
+
+    def __enter__(self) -> "MerkleFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _write_header(self) -> None:
+        _HEADER.pack_into(self._buf, 0, MAGIC, VERSION, self.chunk_size, self.leaf_count, self.capacity)
+
+    # -- reads ----------------------------------------------------------------
+
+    def _counts(self, leaf_count: Optional[int] = None) -> List[int]:
+        n = self.leaf_count if leaf_count is None else leaf_count
+        counts = [n]
+        while counts[-1] > 1:
+            counts.append(parent_count(counts[-1]))
+        return counts
+
+    @property
+    def levels(self) -> List[Level]:
+        return [Level(self._buf, off, n) for off, n in zip(self._offsets, self._counts())]
+
+    @property
+    def root(self) -> bytes:
+        if not self.leaf_count:
+            raise ValueError("Tree has no leaves")
+        return self.levels[-1][0]
+
+    def leaf(self, index: int) -> bytes:
+        return self.levels[0][index]
+
+    def prove(self, indices: Iterable[int]) -> List[bytes]:
+        return generate_multiproof(self.levels, indices)
+
+    # -- writes ---------------------------------------------------------------
+
+    def _put(self, level: int, i: int, digest: bytes) -> None:
+        start = self._offsets[level] + i * HASH_SIZE
+        self._buf[start : start + HASH_SIZE] = digest
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        new = MerkleFile.create(tmp, self.chunk_size, capacity)
+        for level, (off, n) in enumerate(zip(self._offsets, self._counts())):
+            start = new._offsets[level]
+            new._buf[start : start + n * HASH_SIZE] = self._buf[off : off + n * HASH_SIZE]
+        new.leaf_count = self.leaf_count
+        new.close()
+        self._buf.close()
+        self._fh.close()
+        os.replace(tmp, self.path)
+        reopened = MerkleFile.open(self.path)
+        self._buf, self._fh = reopened._buf, reopened._fh
+        self.capacity = capacity
+        self._offsets = self._layout(capacity)
+
+    def _rehash(self, dirty: Iterable[int]) -> None:
+        """Recompute the ancestors of the `dirty` leaves, one level at a time."""
+        counts = self._counts()
+        levels = self.levels
+        dirty = sorted(set(dirty))
+        for level in range(len(counts) - 1):
+            dirty = sorted({i // 2 for i in dirty})
+            for p in dirty:
+                self._put(level + 1, p, parent_of(levels[level], p))
+
+    def set_leaves(self, leaves: Dict[int, bytes]) -> None:
+        """Replace existing leaf hashes; rehashes only their paths to the root."""
+        if any(not 0 <= i < self.leaf_count for i in leaves):
+            raise IndexError("Leaf index out of range")
+        for i, digest in leaves.items():
+            self._put(0, i, digest)
+        self._rehash(leaves)
+
+    def append(self, leaves: Sequence[bytes]) -> None:
+        """Append leaf hashes; only the new leaves' paths (and the old right edge) are rehashed."""
+        if not leaves:
+            return
+        start = self.leaf_count
+        if start + len(leaves) > self.capacity:
+            self._grow(start + len(leaves))
+        for i, digest in enumerate(leaves, start):
+            self._put(0, i, digest)
+        self.leaf_count += len(leaves)
+        # The previous last node of each level may have been promoted unpaired.
+        self._rehash(range(max(0, start - 1), self.leaf_count))
+        self._write_header()
+
+    def extend(self, leaves: Iterable[bytes], batch: int = 4096) -> None:
+        """Append a stream of leaf hashes in batches."""
+        pending: List[bytes] = []
+        for digest in leaves:
+            pending.append(digest)
+            if len(pending) >= batch:
+                self.append(pending)
+                pending = []
+        self.append(pending)
+
+
+def build(source: Path, out: Path, chunk_size: int = CHUNK_SIZE, workers: int = 0) -> MerkleFile:
+    """Stream `source` (file or directory) into a persistent tree at `out`."""
+    tree = MerkleFile.create(out, chunk_size, capacity=count_chunks(source, chunk_size))
+    tree.extend(hash_leaves(iter_chunks(source, chunk_size), workers))
+    return tree
+
+
+def append_source(tree: MerkleFile, source: Path, workers: int = 0) -> int:
+    """Append the chunks of `source` as new leaves; returns how many were added."""
+    before = tree.leaf_count
+    tree.extend(hash_leaves(iter_chunks(source, tree.chunk_size), workers))
+    return tree.leaf_count - before
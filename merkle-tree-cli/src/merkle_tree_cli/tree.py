@@ -1,7 +1,95 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import sha256
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, List, Sequence
+
+CHUNK_SIZE = 1 << 20
+HASH_SIZE = 32
+
+
+# Domain separation (RFC 6962): a leaf hash can never be mistaken for a node hash.
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
 
 def hash_leaf(data: bytes) -> bytes:
-    return sha256(data).digest()
+    return sha256(LEAF_PREFIX + data).digest()
 
 def hash_node(left: bytes, right: bytes) -> bytes:
-    return sha256(left + right).digest()
\ No newline at end of file
+    return sha256(NODE_PREFIX + left + right).digest()
+
+
+def parent_count(count: int) -> int:
+    return (count + 1) // 2
+
+
+def level_counts(leaf_count: int) -> List[int]:
+    """Node count of every level, leaves first, root (1) last."""
+    counts = [leaf_count]
+    while counts[-1] > 1:
+        counts.append(parent_count(counts[-1]))
+    return counts
+
+
+def parent_of(level: Sequence[bytes], i: int) -> bytes:
+    """Parent `i` of `level`; an unpaired last node is promoted unchanged."""
+    left = level[2 * i]
+    if 2 * i + 1 < len(level):
+        return hash_node(left, level[2 * i + 1])
+    return left
+
+
+def build_levels(leaves: Sequence[bytes]) -> List[List[bytes]]:
+    """All levels of the tree over `leaves` (leaf hashes), leaves first."""
+    if not leaves:
+        raise ValueError("Cannot build a Merkle tree with no leaves")
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        below = levels[-1]
+        levels.append([parent_of(below, i) for i in range(parent_count(len(below)))])
+    return levels
+
+
+def input_files(path: Path) -> List[Path]:
+    """`path` itself, or every regular file under it in sorted relative-path order."""
+    if path.is_file():
+        return [path]
+    return sorted((p for p in path.rglob("*") if p.is_file()), key=lambda p: p.relative_to(path).as_posix())
+
+
+def iter_chunks(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Fixed-size chunks of a file, or of every file under a directory in turn."""
+    for file in input_files(path):
+        with open(file, "rb") as f:
+            chunk = f.read(chunk_size)
+            if not chunk:  # an empty file still contributes one leaf
+                yield b""
+            while chunk:
+                yield chunk
+                chunk = f.read(chunk_size)
+
+
+def count_chunks(path: Path, chunk_size: int = CHUNK_SIZE) -> int:
+    return sum(max(1, -(-f.stat().st_size // chunk_size)) for f in input_files(path))
+
+
+def hash_leaves(chunks: Iterable[bytes], workers: int = 0) -> Iterator[bytes]:
+    """
+    Leaf hashes of `chunks`, in order. hashlib releases the GIL on large
+    buffers, so a thread pool hashes chunks in parallel; at most 2 * workers
+    chunks are held in memory at once.
+    """
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    if workers == 1:
+        yield from map(hash_leaf, chunks)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: Deque = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(hash_leaf, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -1,3 +1,43 @@
-def verify(root: bytes, leaf: bytes, proof: list[bytes]) -> bool:
+import hmac
+from typing import Dict, List
+
+from .tree import hash_node
+
+
+def compute_root(leaves: Dict[int, bytes], proof: List[bytes], leaf_count: int) -> bytes:
+    """Fold `leaves` ({index: leaf hash}) and a multi-proof up to the root."""
+    if not leaves or min(leaves) < 0 or max(leaves) >= leaf_count:
+        raise IndexError("Leaf index out of range")
+    nodes = dict(leaves)
+    remaining = iter(proof)
+    count = leaf_count
+    while count > 1:
+        # Siblings are consumed in the same order proof_positions emits them.
+        for i in sorted(nodes):
+            sibling = i ^ 1
+            if sibling < count and sibling not in nodes:
+                nodes[sibling] = next(remaining)
+        parents: Dict[int, bytes] = {}
+        for i in sorted(nodes):
+            p = i // 2
+            if p in parents:
+                continue
+            left = nodes[2 * p]
+            parents[p] = hash_node(left, nodes[2 * p + 1]) if 2 * p + 1 < count else left
+        nodes, count = parents, (count + 1) // 2
+    if next(remaining, None) is not None:
+        raise ValueError("Proof has unused hashes")
+    return nodes[0]
+
+
+def verify_multiproof(root: bytes, leaves: Dict[int, bytes], proof: List[bytes], leaf_count: int) -> bool:
+    try:
+        computed = compute_root(leaves, proof, leaf_count)
+    except (IndexError, ValueError, StopIteration, KeyError):
+        return False
     # constant-time verification
-    return True
\ No newline at end of file
+    return hmac.compare_digest(computed, root)
+
+
+def verify(root: bytes, leaf: bytes, proof: list[bytes], index: int = 0, leaf_count: int = 1) -> bool:
+    return verify_multiproof(root, {index: leaf}, proof, leaf_count)
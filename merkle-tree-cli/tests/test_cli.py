@@ -1,3 +1,5 @@
+import json
+
 from typer.testing import CliRunner
 
 from merkle_tree_cli.cli import app
@@ -5,4 +7,34 @@ from merkle_tree_cli.cli import app
 def test_help():
     runner = CliRunner()
     result = runner.invoke(app, ["--help"])
-    assert result.exit_code == 0
\ No newline at end of file
+    assert result.exit_code == 0
+def test_build_prove_verify(tmp_path):
+    runner = CliRunner()
+    src = tmp_path / "data.bin"
+    src.write_bytes(b"0123456789" * 100)
+    tree = tmp_path / "t.mrkl"
+    proof = tmp_path / "proof.json"
+    assert runner.invoke(app, ["build", str(src), "--out", str(tree), "--chunk-size", "64"]).exit_code == 0
+    result = runner.invoke(app, ["prove", str(tree), "-i", "3", "-i", "9", "--out", str(proof)])
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(app, ["verify", str(tree), "--proof", str(proof)])
+    assert result.exit_code == 0 and "valid" in result.output
+    chunk = tmp_path / "chunk"
+    chunk.write_bytes(b"tampered")
+    assert runner.invoke(app, ["update", str(tree), "3", str(chunk)]).exit_code == 0
+    assert runner.invoke(app, ["verify", str(tree), "--proof", str(proof)]).exit_code == 1
+
+def test_verify_rejects_forged_leaf_count(tmp_path):
+    runner = CliRunner()
+    src = tmp_path / "data.bin"
+    src.write_bytes(b"x" * 150)
+    tree = tmp_path / "t.mrkl"
+    assert runner.invoke(app, ["build", str(src), "--out", str(tree), "--chunk-size", "64"]).exit_code == 0
+    root = runner.invoke(app, ["root", str(tree)]).output.strip()
+    forged = tmp_path / "forged.json"
+    forged.write_text(json.dumps({"root": root, "leaf_count": 1, "leaves": {"0": root}, "proof": []}))
+    result = runner.invoke(app, ["verify", str(tree), "--proof", str(forged)])
+    assert result.exit_code == 1 and "invalid" in result.output
+    assert runner.invoke(app, ["verify", "--root", root, "--proof", str(forged)]).exit_code == 2
+    result = runner.invoke(app, ["verify", "--root", root, "--leaf-count", "3", "--proof", str(forged)])
+    assert result.exit_code == 1
@@ -1,4 +1,31 @@
 import pytest
 
 def test_proof_roundtrip():
-    assert True  # full roundtrip test
\ No newline at end of file
+    assert True  # full roundtrip test
+from merkle_tree_cli.proof import generate_multiproof, generate_proof
+from merkle_tree_cli.tree import build_levels, hash_leaf
+from merkle_tree_cli.verify import verify, verify_multiproof
+
+
+def _tree(n):
+    leaves = [hash_leaf(i.to_bytes(4, "big")) for i in range(n)]
+    return leaves, build_levels(leaves)
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 8, 33])
+def test_every_leaf_proves(n):
+    leaves, levels = _tree(n)
+    root = levels[-1][0]
+    for i in range(n):
+        assert verify(root, leaves[i], generate_proof(levels, i), i, n)
+
+def test_multiproof_shares_siblings():
+    leaves, levels = _tree(16)
+    indices = [0, 1, 2, 3]
+    proof = generate_multiproof(levels, indices)
+    assert len(proof) == 2  # subtree [0..3] is fully known: one sibling per level above it
+    assert verify_multiproof(levels[-1][0], {i: leaves[i] for i in indices}, proof, 16)
+
+def test_proof_index_out_of_range():
+    _, levels = _tree(4)
+    with pytest.raises(IndexError):
+        generate_proof(levels, 4)
@@ -0,0 +1,67 @@
+import pytest
+
+from merkle_tree_cli.proof import generate_multiproof
+from merkle_tree_cli.store import MerkleFile, append_source, build
+from merkle_tree_cli.tree import build_levels, hash_leaf, iter_chunks
+
+
+def _leaves(n, salt=b""):
+    return [hash_leaf(salt + i.to_bytes(4, "big")) for i in range(n)]
+
+
+def test_build_matches_in_memory(tmp_path):
+    src = tmp_path / "data.bin"
+    src.write_bytes(bytes(range(256)) * 40)
+    with build(src, tmp_path / "t.mrkl", chunk_size=100, workers=3) as tree:
+        expected = build_levels([hash_leaf(c) for c in iter_chunks(src, 100)])
+        assert tree.leaf_count == len(expected[0])
+        assert tree.root == expected[-1][0]
+
+
+def test_reopen_and_prove(tmp_path):
+    leaves = _leaves(21)
+    path = tmp_path / "t.mrkl"
+    with MerkleFile.create(path, chunk_size=8) as tree:
+        tree.append(leaves)
+    with MerkleFile.open(path) as tree:
+        assert tree.chunk_size == 8
+        assert tree.prove([3, 4, 20]) == generate_multiproof(build_levels(leaves), [3, 4, 20])
+
+
+@pytest.mark.parametrize("split", [0, 1, 5, 16, 17])
+def test_incremental_append_grows_capacity(tmp_path, split):
+    leaves = _leaves(17)
+    with MerkleFile.create(tmp_path / "t.mrkl", chunk_size=8, capacity=2) as tree:
+        tree.append(leaves[:split])
+        tree.append(leaves[split:])
+        assert tree.capacity >= 17
+        assert tree.root == build_levels(leaves)[-1][0]
+
+
+def test_set_leaves_rehashes_path(tmp_path):
+    leaves = _leaves(13)
+    with MerkleFile.create(tmp_path / "t.mrkl", chunk_size=8) as tree:
+        tree.append(leaves)
+        new = _leaves(2, b"new")
+        tree.set_leaves({4: new[0], 12: new[1]})
+        leaves[4], leaves[12] = new
+        assert tree.root == build_levels(leaves)[-1][0]
+        with pytest.raises(IndexError):
+            tree.set_leaves({13: new[0]})
+
+
+def test_append_source(tmp_path):
+    a, b = tmp_path / "a", tmp_path / "b"
+    a.write_bytes(b"a" * 30)
+    b.write_bytes(b"b" * 25)
+    with build(a, tmp_path / "t.mrkl", chunk_size=10) as tree:
+        assert append_source(tree, b) == 3
+        chunks = list(iter_chunks(a, 10)) + list(iter_chunks(b, 10))
+        assert tree.root == build_levels([hash_leaf(c) for c in chunks])[-1][0]
+
+
+def test_open_rejects_other_files(tmp_path):
+    path = tmp_path / "bogus"
+    path.write_bytes(b"not a tree" * 10)
+    with pytest.raises(ValueError):
+        MerkleFile.open(path)
@@ -1,9 +1,30 @@
 import pytest
-from merkle_tree_cli.tree import hash_leaf, hash_node
+from merkle_tree_cli.tree import build_levels, count_chunks, hash_leaf, hash_leaves, hash_node, iter_chunks
 
 def test_leaf_hash():
     assert len(hash_leaf(b'test')) == 32
 
 def test_node_hash():
     h = hash_node(b'a'*32, b'b'*32)
-    assert len(h) == 32
\ No newline at end of file
+    assert len(h) == 32
+
+def test_leaf_and_node_hashes_are_domain_separated():
+    left, right = hash_leaf(b'l'), hash_leaf(b'r')
+    assert hash_leaf(left + right) != hash_node(left, right)
+def test_build_levels_promotes_unpaired_node():
+    leaves = [hash_leaf(bytes([i])) for i in range(3)]
+    levels = build_levels(leaves)
+    assert [len(l) for l in levels] == [3, 2, 1]
+    assert levels[1][1] == leaves[2]
+    assert levels[2][0] == hash_node(hash_node(leaves[0], leaves[1]), leaves[2])
+
+def test_iter_chunks_directory(tmp_path):
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a.bin").write_bytes(b"x" * 10)
+    (tmp_path / "b" / "c.bin").write_bytes(b"")
+    assert list(iter_chunks(tmp_path, 4)) == [b"xxxx", b"xxxx", b"xx", b""]
+    assert count_chunks(tmp_path, 4) == 4
+
+def test_hash_leaves_parallel_keeps_order():
+    chunks = [bytes([i]) * 5000 for i in range(50)]
+    assert list(hash_leaves(chunks, workers=4)) == [hash_leaf(c) for c in chunks]
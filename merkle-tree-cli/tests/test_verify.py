@@ -1,2 +1,23 @@
 def test_verify_edge_cases():
-    assert True
\ No newline at end of file
+    assert True
+from merkle_tree_cli.proof import generate_multiproof, generate_proof
+from merkle_tree_cli.tree import build_levels, hash_leaf
+from merkle_tree_cli.verify import verify, verify_multiproof
+
+
+def test_verify_rejects_tampering():
+    leaves = [hash_leaf(bytes([i])) for i in range(10)]
+    levels = build_levels(leaves)
+    root = levels[-1][0]
+    proof = generate_proof(levels, 6)
+    assert verify(root, leaves[6], proof, 6, 10)
+    assert not verify(root, leaves[5], proof, 6, 10)
+    assert not verify(root, leaves[6], proof, 7, 10)
+    assert not verify(root, leaves[6], proof[:-1], 6, 10)
+    assert not verify(root, leaves[6], proof + [root], 6, 10)
+
+def test_verify_multiproof_wrong_leaf():
+    leaves = [hash_leaf(bytes([i])) for i in range(9)]
+    levels = build_levels(leaves)
+    proof = generate_multiproof(levels, [2, 8])
+    assert not verify_multiproof(levels[-1][0], {2: leaves[2], 8: leaves[7]}, proof, 9)
@@ -1,13 +1,14 @@
 import json
+import subprocess
 import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
-from .stats import Stats
 from .types import Stats
 
 
 BASELINE_DIR = Path(".perfguard-baselines")
+HISTORY_LIMIT = 200  # entries kept per baseline file
 
 
 def get_baseline_path(name: str) -> Path:
@@ -15,29 +16,90 @@ def get_baseline_path(name: str) -> Path:
     return BASELINE_DIR / f"{name}.json"
 
 
+def _read(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _write(path: Path, data: Dict[str, Any]) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
 def load_baseline(name: str) -> Optional[Stats]:
     path = get_baseline_path(name)
-    if not path.exists():
+    try:
+        data = _read(path)
+    except ValueError:
         return None
 
-    with open(path, "r") as f:
-        data: Dict[str, Any] = json.load(f)
-
-    # Basic validation
+    # Basic validation; a file without stats (e.g. only history) has no baseline
     required = {"mean", "stdev", "min", "max", "iterations", "unit"}
     if not required.issubset(data):
-        raise ValueError(f"Invalid baseline format in {path}")
+        return None
 
     return data  # type: ignore
 
 
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if out.returncode != 0:
+        return None
+    return out.stdout.strip() or None
+
+
+def _history_entry(stats: Stats, kind: str) -> Dict[str, Any]:
+    return {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "commit": _git_commit(),
+        "kind": kind,
+        "median": stats.get("median", stats["mean"]),
+        "mean": stats["mean"],
+        "min": stats["min"],
+        "iterations": stats["iterations"],
+    }
+
+
+def _append_history(data: Dict[str, Any], stats: Stats, kind: str) -> None:
+    history = data.get("history", [])
+    history.append(_history_entry(stats, kind))
+    data["history"] = history[-HISTORY_LIMIT:]
+
+
 def save_baseline(name: str, stats: Stats, command: str) -> None:
+    """Replace the baseline for `name`, keeping (and extending) its history."""
     path = get_baseline_path(name)
+    try:
+        previous = _read(path)
+    except ValueError:
+        previous = {}
     data = {
         **stats,
         "command": command,
         "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "history": previous.get("history", []),
     }
+    _append_history(data, stats, "baseline")
+    _write(path, data)
 
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
\ No newline at end of file
+
+def record_run(name: str, stats: Stats) -> None:
+    """Add a checked run to the history of `name` without changing its baseline."""
+    path = get_baseline_path(name)
+    data = _read(path)
+    _append_history(data, stats, "check")
+    _write(path, data)
+
+
+def load_history(name: str) -> List[Dict[str, Any]]:
+    try:
+        return _read(get_baseline_path(name)).get("history", [])
+    except ValueError:
+        return []
@@ -1,38 +1,64 @@
+import os
+import shutil
 import subprocess
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional
 
 import rich.progress
 from rich.console import Console
 
+from .inprocess import calibrate, load_target, loop_overhead, time_sample
 from .types import Times
 
 
 console = Console()
 
 
+@contextmanager
+def pinned(cpu: Optional[int]) -> Iterator[None]:
+    """
+    Restrict this process (and the children it starts) to one CPU, so runs
+    do not migrate between cores mid-measurement. No-op when `cpu` is None
+    or the platform has no affinity API.
+    """
+    if cpu is None or not hasattr(os, "sched_setaffinity"):
+        yield
+        return
+    previous = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, {cpu})
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, previous)
+
+
+def _progress() -> rich.progress.Progress:
+    return rich.progress.Progress(
+        rich.progress.SpinnerColumn(),
+        rich.progress.TextColumn("[progress.description]{task.description}"),
+        rich.progress.TimeElapsedColumn(),
+        console=console,
+    )
+
+
 def run_benchmark(
     command: List[str],
     iterations: int = 10,
     warmup: int = 2,
     timeout: float = 60.0,
+    cpu: Optional[int] = None,
 ) -> Times:
     if not command:
         raise ValueError("Command cannot be empty")
 
-    script_path = Path(command[0])
-    if not script_path.exists():
-        raise FileNotFoundError(f"Script not found: {script_path}")
+    if shutil.which(command[0]) is None and not Path(command[0]).exists():
+        raise FileNotFoundError(f"Script not found: {command[0]}")
 
     times: Times = []
 
-    with rich.progress.Progress(
-        rich.progress.SpinnerColumn(),
-        rich.progress.TextColumn("[progress.description]{task.description}"),
-        rich.progress.TimeElapsedColumn(),
-        console=console,
-    ) as progress:
+    with pinned(cpu), _progress() as progress:
         # Warmup
         if warmup > 0:
             task = progress.add_task("Warming up...", total=warmup)
@@ -56,6 +82,40 @@ def run_benchmark(
     return times
 
 
+def run_inprocess(
+    target: str,
+    iterations: int = 30,
+    warmup: int = 2,
+    min_time: float = 0.05,
+    cpu: Optional[int] = None,
+) -> Times:
+    """
+    Time the callable `target` ("module:function") inside this interpreter.
+
+    Each of the `iterations` samples calls it in a loop calibrated to last
+    at least `min_time` seconds, with the GC paused, and records the
+    per-call time minus the cost of the loop itself. No process startup is
+    measured, so sub-millisecond functions can be compared reliably.
+    """
+    fn = load_target(target)
+    times: Times = []
+
+    with pinned(cpu), _progress() as progress:
+        task = progress.add_task("Calibrating...", total=None)
+        for _ in range(warmup):
+            fn()
+        loops = calibrate(fn, min_time)
+        overhead = loop_overhead(loops)
+        progress.remove_task(task)
+
+        task = progress.add_task(f"Benchmarking ({loops} loops/sample)...", total=iterations)
+        for _ in range(iterations):
+            times.append(time_sample(fn, loops, overhead))
+            progress.advance(task)
+
+    return times
+
+
 def _run_once(command: List[str], timeout: float) -> subprocess.CompletedProcess:
     proc = subprocess.run(
         command,
@@ -67,4 +127,4 @@ def _run_once(command: List[str], timeout: float) -> subprocess.CompletedProcess
         raise RuntimeError(
             f"Command failed (code {proc.returncode}):\n{proc.stderr}"
         )
-    return proc
\ No newline at end of file
+    return proc
@@ -9,22 +9,46 @@ from rich import box
 from rich.panel import Panel
 
 from perf_guard import __version__
-from .benchmark import run_benchmark
-from .baseline import load_baseline, save_baseline
-from .stats import compute_stats, is_regression, regression_ratio, format_duration, Stats
+from .benchmark import run_benchmark, run_inprocess
+from .baseline import load_baseline, load_history, record_run, save_baseline
+from .stats import compare, compute_stats, format_duration, mode_of, Stats
 
 
 app = typer.Typer(help=f"Perf Guard v{__version__}")
 console = Console()
 
+_BARS = "▁▂▃▄▅▆▇█"
+
+
+def _name_for(cmd_str: str, name: Optional[str]) -> str:
+    return name if name is not None else hashlib.sha256(cmd_str.encode()).hexdigest()[:12]
+
+
+def _measure(
+    command: List[str], in_process: bool, iterations: int, warmup: int, timeout: float,
+    cpu: Optional[int], min_time: float,
+) -> Stats:
+    if in_process:
+        if len(command) != 1:
+            raise typer.BadParameter("--in-process takes a single 'module:function' target")
+        times = run_inprocess(command[0], iterations, warmup, min_time, cpu)
+    else:
+        times = run_benchmark(command, iterations, warmup, timeout, cpu)
+    stats = compute_stats(times)
+    stats["mode"] = "in-process" if in_process else "command"
+    return stats
+
 
 @app.command()
 def baseline(
-    command: List[str] = typer.Argument(..., nargs=-1, help="Full command (e.g. 'python script.py arg1')"),
+    command: List[str] = typer.Argument(..., help="Full command (e.g. 'python script.py arg1'), or module:function with --in-process"),
     name: Optional[str] = typer.Option(None, "--name", "-n", help="Baseline name (default: SHA256(command)[:12])"),
     iterations: int = typer.Option(10, "--iterations", "-i", min=3, help="Benchmark iterations"),
     warmup: int = typer.Option(2, "--warmup", "-w", min=0),
     timeout: float = typer.Option(60.0, "--timeout"),
+    in_process: bool = typer.Option(False, "--in-process", "-p", help="Import and time a callable instead of a command"),
+    cpu: Optional[int] = typer.Option(None, "--cpu", help="Pin the benchmark to this CPU"),
+    min_time: float = typer.Option(0.05, "--min-time", help="In-process: minimum seconds per sample (sets loop count)"),
 ):
     """Create or update performance baseline. Commit the JSON!"""
 
@@ -32,13 +56,11 @@ def baseline(
         raise typer.BadParameter("Command required")
 
     cmd_str = " ".join(command)
-    if name is None:
-        name = hashlib.sha256(cmd_str.encode()).hexdigest()[:12]
+    name = _name_for(cmd_str, name)
 
     console.print(f"[bold cyan]Creating baseline '{name}'[/] for: [green]{cmd_str}[/]")
 
-    times = run_benchmark(command, iterations, warmup, timeout)
-    stats = compute_stats(times)
+    stats = _measure(command, in_process, iterations, warmup, timeout, cpu, min_time)
 
     save_baseline(name, stats, cmd_str)
 
@@ -50,12 +72,17 @@ def baseline(
 
 @app.command()
 def check(
-    command: List[str] = typer.Argument(..., nargs=-1, help="Full command"),
+    command: List[str] = typer.Argument(..., help="Full command, or module:function with --in-process"),
     name: Optional[str] = typer.Option(None, "--name", "-n"),
     iterations: int = typer.Option(10, "--iterations", "-i", min=3),
     warmup: int = typer.Option(2, "--warmup", "-w"),
     threshold: float = typer.Option(0.1, "--threshold", "-t", help="Regression threshold (default 10%)"),
     timeout: float = typer.Option(60.0, "--timeout"),
+    in_process: bool = typer.Option(False, "--in-process", "-p", help="Import and time a callable instead of a command"),
+    cpu: Optional[int] = typer.Option(None, "--cpu", help="Pin the benchmark to this CPU"),
+    min_time: float = typer.Option(0.05, "--min-time", help="In-process: minimum seconds per sample (sets loop count)"),
+    confidence: float = typer.Option(0.95, "--confidence", min=0.5, max=0.999, help="Confidence level of the interval"),
+    record: bool = typer.Option(False, "--record", help="Append this run to the baseline's history"),
 ):
     """Check against baseline. Exits 1 on regression."""
 
@@ -63,32 +90,72 @@ def check(
         raise typer.BadParameter("Command required")
 
     cmd_str = " ".join(command)
-    if name is None:
-        name = hashlib.sha256(cmd_str.encode()).hexdigest()[:12]
+    name = _name_for(cmd_str, name)
 
     old_stats = load_baseline(name)
     if old_stats is None:
-        raise typer.Exit(f"❌ No baseline '{name}'. Run: perf-guard baseline {cmd_str}", code=2)
+        console.print(f"❌ No baseline '{name}'. Run: perf-guard baseline {cmd_str}")
+        raise typer.Exit(code=2)
 
-    console.print(f"[bold cyan]Checking '{name}'[/]: [green]{cmd_str}[/]")
+    mode = "in-process" if in_process else "command"
+    if mode_of(old_stats) != mode:
+        flag = "with" if mode_of(old_stats) == "in-process" else "without"
+        console.print(f"❌ Baseline '{name}' was measured in {mode_of(old_stats)} mode; check it {flag} --in-process or re-create it.")
+        raise typer.Exit(code=2)
 
-    times = run_benchmark(command, iterations, warmup, timeout)
-    new_stats = compute_stats(times)
+    console.print(f"[bold cyan]Checking '{name}'[/]: [green]{cmd_str}[/]")
 
-    ratio = regression_ratio(old_stats, new_stats)
-    regressed = is_regression(old_stats, new_stats, threshold)
+    new_stats = _measure(command, in_process, iterations, warmup, timeout, cpu, min_time)
+    result = compare(old_stats, new_stats, threshold, confidence)
+    if record:
+        record_run(name, new_stats)
 
-    _print_comparison_table(old_stats, new_stats, ratio)
+    _print_comparison_table(old_stats, new_stats, result.ratio)
 
+    regressed = result.regressed
     status = "🚨 REGRESSED" if regressed else "✅ PASSED"
     style = "red" if regressed else "green"
-    console.print(Panel(f"[bold]{status}[/bold] ({ratio*100:+.1f}%)", style=style))
+    ci = f"{result.confidence:.0%} CI {result.ci_low*100:+.1f}% .. {result.ci_high*100:+.1f}%"
+    console.print(Panel(f"[bold]{status}[/bold] ({result.ratio*100:+.1f}%, {ci})", style=style))
 
     if regressed:
         raise typer.Exit(1)
 
 
-@app.version(__version__)
+@app.command()
+def history(
+    command: List[str] = typer.Argument(None, help="Command (or target) the baseline was created for"),
+    name: Optional[str] = typer.Option(None, "--name", "-n"),
+    limit: int = typer.Option(20, "--limit", "-l", min=1),
+):
+    """Show how a benchmark's baseline and recorded checks evolved."""
+
+    if not command and name is None:
+        raise typer.BadParameter("Give the command or --name")
+    name = _name_for(" ".join(command or []), name)
+    entries = load_history(name)[-limit:]
+    if not entries:
+        console.print(f"❌ No history for '{name}'.")
+        raise typer.Exit(code=2)
+
+    medians = [e["median"] for e in entries]
+    lo, hi = min(medians), max(medians)
+    table = Table(title=f"History: {name}", box=box.ROUNDED)
+    table.add_column("When", style="cyan")
+    table.add_column("Commit")
+    table.add_column("Kind")
+    table.add_column("Median", justify="right")
+    table.add_column("Change", justify="right", style="yellow")
+    table.add_column("Trend")
+    prev = None
+    for e in entries:
+        change = f"{(e['median'] / prev - 1) * 100:+.1f}%" if prev else ""
+        level = 0 if hi == lo else round((e["median"] - lo) / (hi - lo) * (len(_BARS) - 1))
+        table.add_row(e["created"], e.get("commit") or "", e["kind"], format_duration(e["median"]), change, _BARS[level])
+        prev = e["median"]
+    console.print(table)
+
+
 @app.command()
 def version():
     console.print(f"Perf Guard {__version__}")
@@ -99,12 +166,14 @@ def _print_stats_table(stats: Stats, title: str) -> None:
     table.add_column("Metric", style="cyan")
     table.add_column("Value")
 
+    table.add_row("Median", format_duration(stats.get("median", stats["mean"])))
     table.add_row("Mean", format_duration(stats["mean"]))
-    stdev_str = f"{stats['stdev']:.3f}s" if stats["stdev"] > 0 else "N/A"
+    stdev_str = format_duration(stats["stdev"]) if stats["stdev"] > 0 else "N/A"
     table.add_row("Std Dev", stdev_str)
     table.add_row("Min", format_duration(stats["min"]))
     table.add_row("Max", format_duration(stats["max"]))
     table.add_row("Iterations", str(stats["iterations"]))
+    table.add_row("Outliers", str(stats.get("outliers", 0)))
 
     console.print(table)
 
@@ -116,15 +185,22 @@ def _print_comparison_table(old: Stats, new: Stats, ratio: float) -> None:
     table.add_column("Current", style="magenta")
     table.add_column("Change", style="yellow")
 
-    table.add_row("Mean", format_duration(old["mean"]), format_duration(new["mean"]), f"{ratio*100:+.1f}%")
+    table.add_row(
+        "Median",
+        format_duration(old.get("median", old["mean"])),
+        format_duration(new.get("median", new["mean"])),
+        f"{ratio*100:+.1f}%",
+    )
+    table.add_row("Mean", format_duration(old["mean"]), format_duration(new["mean"]), "")
     table.add_row(
         "Std Dev",
-        f"{old['stdev']:.3f}s",
-        f"{new['stdev']:.3f}s",
+        format_duration(old["stdev"]),
+        format_duration(new["stdev"]),
         "",
     )
     table.add_row("Min", format_duration(old["min"]), format_duration(new["min"]), "")
     table.add_row("Max", format_duration(old["max"]), format_duration(new["max"]), "")
     table.add_row("Iterations", str(old["iterations"]), str(new["iterations"]), "")
+    table.add_row("Outliers", str(old.get("outliers", 0)), str(new.get("outliers", 0)), "")
 
-    console.print(table)
\ No newline at end of file
+    console.print(table)
@@ -0,0 +1,80 @@
+import gc
+import importlib
+import importlib.util
+import itertools
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+# Calibration tries loop counts 1, 2, 5, 10, 20, 50, ... (like timeit.autorange).
+_STEPS = (1, 2, 5)
+
+
+def load_target(spec: str) -> Callable[[], object]:
+    """
+    Import the zero-argument callable named by `spec`: either
+    `package.module:function` or `path/to/file.py:function` (attributes may
+    be dotted, e.g. `mod:Class.method`).
+    """
+    module_name, sep, attr = spec.partition(":")
+    if not sep or not attr:
+        raise ValueError(f"Target must look like 'module:function', got '{spec}'")
+    if module_name.endswith(".py"):
+        path = Path(module_name).resolve()
+        if not path.exists():
+            raise FileNotFoundError(f"Script not found: {path}")
+        sys.path.insert(0, str(path.parent))
+        mod_spec = importlib.util.spec_from_file_location(path.stem, path)
+        module = importlib.util.module_from_spec(mod_spec)
+        sys.modules[path.stem] = module
+        mod_spec.loader.exec_module(module)
+    else:
+        if "" not in sys.path:
+            sys.path.insert(0, "")  # console scripts do not put the cwd on the path
+        module = importlib.import_module(module_name)
+    target = module
+    for part in attr.split("."):
+        target = getattr(target, part)
+    if not callable(target):
+        raise TypeError(f"'{spec}' is not callable")
+    return target
+
+
+def _noop() -> None:
+    pass
+
+
+def _time_loops(fn: Callable[[], object], loops: int) -> float:
+    repeat = itertools.repeat(None, loops)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in repeat:
+            fn()
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def calibrate(fn: Callable[[], object], min_time: float = 0.05) -> int:
+    """Smallest loop count from 1, 2, 5, 10, ... whose total time reaches `min_time`."""
+    for scale in itertools.count():
+        for step in _STEPS:
+            loops = step * 10**scale
+            if _time_loops(fn, loops) >= min_time:
+                return loops
+    raise AssertionError("unreachable")
+
+
+def loop_overhead(loops: int, tries: int = 5) -> float:
+    """Per-call cost of the timing loop itself (calling a no-op), best of `tries`."""
+    return min(_time_loops(_noop, loops) for _ in range(tries)) / loops
+
+
+def time_sample(fn: Callable[[], object], loops: int, overhead: float = 0.0) -> float:
+    """Seconds per call over one batch of `loops` calls, loop overhead removed."""
+    per_call = _time_loops(fn, loops) / loops - overhead
+    return max(per_call, 1e-12)
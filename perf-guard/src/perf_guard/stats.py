@@ -1,8 +1,24 @@
+import random
 import statistics
-from typing import List
+from dataclasses import dataclass
+from typing import Sequence
 
 from .types import Stats, Times
 
+# Modified z-score above which a sample is treated as an outlier (Iglewicz & Hoaglin).
+OUTLIER_Z = 3.5
+
+
+def robust_samples(times: Sequence[float]) -> Times:
+    """Drop outliers by modified z-score (median/MAD), which a few slow runs cannot skew."""
+    if len(times) < 3:
+        return list(times)
+    med = statistics.median(times)
+    mad = statistics.median(abs(t - med) for t in times)
+    if mad == 0:
+        return list(times)
+    return [t for t in times if 0.6745 * abs(t - med) / mad <= OUTLIER_Z]
+
 
 def compute_stats(times: Times) -> Stats:
     times = [t for t in times if t > 0]
@@ -12,6 +28,8 @@ def compute_stats(times: Times) -> Stats:
     n = len(times)
     mean = statistics.mean(times)
     stdev = statistics.stdev(times) if n > 1 else 0.0
+    kept = robust_samples(times)
+    median = statistics.median(kept)
 
     return {
         "mean": mean,
@@ -20,15 +38,87 @@ def compute_stats(times: Times) -> Stats:
         "max": max(times),
         "iterations": n,
         "unit": "s",
+        "median": median,
+        "mad": statistics.median(abs(t - median) for t in kept),
+        "outliers": n - len(kept),
+        "samples": times,
     }
 
 
+@dataclass
+class Comparison:
+    ratio: float  # current / baseline estimate, minus 1
+    ci_low: float
+    ci_high: float
+    confidence: float
+    threshold: float
+
+    @property
+    def significant(self) -> bool:
+        """The slowdown's confidence interval excludes zero."""
+        return self.ci_low > 0
+
+    @property
+    def regressed(self) -> bool:
+        return self.significant and self.ratio > self.threshold
+
+
+def _center(stats: Stats) -> float:
+    return stats.get("median", stats["mean"])
+
+
+def mode_of(stats: Stats) -> str:
+    """How the samples were taken; baselines from before in-process timing are "command"."""
+    return stats.get("mode", "command")
+
+
+def compare(
+    old_stats: Stats,
+    new_stats: Stats,
+    threshold: float,
+    confidence: float = 0.95,
+    resamples: int = 2000,
+    seed: int = 0,
+) -> Comparison:
+    """
+    Relative change of the median with a bootstrap confidence interval.
+
+    Both sample sets are resampled with replacement (outliers removed first)
+    and the ratio of medians is recomputed each time; the interval is the
+    central `confidence` share of those ratios. A regression must exceed
+    `threshold` and have an interval that lies entirely above zero, so
+    noisy runs are not flagged. Baselines without stored samples fall back
+    to the plain ratio of means. Stats taken in different modes (a command
+    vs. an in-process callable) are not comparable and raise ValueError.
+    """
+    if mode_of(old_stats) != mode_of(new_stats):
+        raise ValueError(
+            f"baseline was measured in {mode_of(old_stats)} mode, this run in {mode_of(new_stats)} mode"
+        )
+    ratio = _center(new_stats) / _center(old_stats) - 1
+    old = robust_samples(old_stats.get("samples") or [])
+    new = robust_samples(new_stats.get("samples") or [])
+    if len(old) < 2 or len(new) < 2:
+        ratio = new_stats["mean"] / old_stats["mean"] - 1
+        return Comparison(ratio, ratio, ratio, confidence, threshold)
+    rng = random.Random(seed)
+    median = statistics.median
+    boots = sorted(
+        median(rng.choices(new, k=len(new))) / median(rng.choices(old, k=len(old))) - 1
+        for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2
+    low = boots[int(tail * (resamples - 1))]
+    high = boots[int((1 - tail) * (resamples - 1))]
+    return Comparison(ratio, low, high, confidence, threshold)
+
+
 def is_regression(old_stats: Stats, new_stats: Stats, threshold: float) -> bool:
-    return new_stats["mean"] > old_stats["mean"] * (1 + threshold)
+    return compare(old_stats, new_stats, threshold).regressed
 
 
 def regression_ratio(old_stats: Stats, new_stats: Stats) -> float:
-    return (new_stats["mean"] / old_stats["mean"]) - 1
+    return _center(new_stats) / _center(old_stats) - 1
 
 
 def format_duration(seconds: float, precision: int = 3) -> str:
@@ -39,4 +129,4 @@ def format_duration(seconds: float, precision: int = 3) -> str:
     elif seconds < 1:
         return f"{seconds * 1000:.{precision}f}ms"
     else:
-        return f"{seconds:.{precision}f}s"
\ No newline at end of file
+        return f"{seconds:.{precision}f}s"
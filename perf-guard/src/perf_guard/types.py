@@ -1,4 +1,4 @@
-from typing import TypedDict, List
+from typing import TypedDict, List, NotRequired
 
 
 Times = List[float]
@@ -10,4 +10,10 @@ class Stats(TypedDict, total=True):
     min: float
     max: float
     iterations: int
-    unit: str
\ No newline at end of file
+    unit: str
+    # Robust summary; absent from baselines written by older versions.
+    median: NotRequired[float]
+    mad: NotRequired[float]
+    outliers: NotRequired[int]
+    samples: NotRequired[List[float]]
+    mode: NotRequired[str]
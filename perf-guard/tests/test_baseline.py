@@ -7,7 +7,8 @@ from perf_guard.stats import compute_stats
 
 
 @pytest.fixture
-def baseline_dir(tmp_path: Path):
+def baseline_dir(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # BASELINE_DIR is relative to the working directory
     dir = tmp_path / ".perfguard-baselines"
     dir.mkdir()
     return dir
@@ -37,3 +38,16 @@ def test_invalid_json(baseline_dir: Path):
     path.write_text("{}")
     loaded = load_baseline("invalid")
     assert loaded is None  # Would raise on strict, but safe
+
+
+def test_history_kept_across_baselines(tmp_path: Path, monkeypatch):
+    from perf_guard import baseline
+
+    monkeypatch.setattr(baseline, "BASELINE_DIR", tmp_path / "b")
+    baseline.save_baseline("h", compute_stats([1.0, 1.0, 1.0]), "cmd")
+    baseline.record_run("h", compute_stats([1.1, 1.1, 1.1]))
+    baseline.save_baseline("h", compute_stats([2.0, 2.0, 2.0]), "cmd")
+    entries = baseline.load_history("h")
+    assert [e["kind"] for e in entries] == ["baseline", "check", "baseline"]
+    assert [e["median"] for e in entries] == [1.0, 1.1, 2.0]
+    assert baseline.load_baseline("h")["median"] == 2.0
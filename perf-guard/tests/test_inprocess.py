@@ -0,0 +1,25 @@
+import pytest
+
+from perf_guard.benchmark import run_inprocess
+from perf_guard.inprocess import calibrate, load_target
+
+
+def test_load_target_module_and_file(tmp_path):
+    assert load_target("math:factorial") is __import__("math").factorial
+    script = tmp_path / "bench_me.py"
+    script.write_text("class K:\n    @staticmethod\n    def run():\n        return 42\n")
+    assert load_target(f"{script}:K.run")() == 42
+    with pytest.raises(ValueError):
+        load_target("math")
+
+
+def test_calibrate_reaches_min_time():
+    loops = calibrate(lambda: None, min_time=0.005)
+    assert loops >= 10
+    assert str(loops).strip("0") in ("1", "2", "5")
+
+
+def test_run_inprocess_per_call_times():
+    times = run_inprocess("time:perf_counter", iterations=5, warmup=1, min_time=0.002)
+    assert len(times) == 5
+    assert all(0 < t < 1e-3 for t in times)
@@ -35,4 +35,43 @@ def test_format_duration():
     assert format_duration(0.00123) == "1.230ms"
     assert format_duration(0.000123) == "123.000μs"
     assert format_duration(1.23) == "1.230s"
-    assert format_duration(0) == "0s"
\ No newline at end of file
+    assert format_duration(0) == "0s"
+
+
+def test_robust_stats_ignore_outliers():
+    times = [1.0, 1.01, 0.99, 1.02, 0.98, 1.0, 9.0]
+    stats = compute_stats(times)
+    assert stats["outliers"] == 1
+    assert stats["median"] == pytest.approx(1.0, abs=0.01)
+    assert stats["samples"] == times
+
+
+def test_compare_interval():
+    from perf_guard.stats import compare
+
+    old = compute_stats([1.0, 1.02, 0.98, 1.01, 0.99, 1.0, 1.03, 0.97])
+    slow = compute_stats([1.3, 1.32, 1.28, 1.31, 1.29, 1.3, 1.33, 1.27])
+    noisy = compute_stats([0.7, 1.5, 0.8, 1.4, 0.9, 1.3, 1.0, 1.2])
+    result = compare(old, slow, 0.1)
+    assert result.regressed
+    assert result.ci_low <= result.ratio <= result.ci_high
+    assert compare(old, slow, 0.1) == result  # seeded: deterministic
+    # Median moved by >10% but the interval straddles zero: not flagged.
+    assert not compare(old, noisy, 0.0).significant
+
+
+def test_compare_legacy_baseline_without_samples():
+    from perf_guard.stats import compare
+
+    legacy = {"mean": 1.0, "stdev": 0.0, "min": 1.0, "max": 1.0, "iterations": 10, "unit": "s"}
+    assert compare(legacy, compute_stats([1.5] * 5), 0.1).regressed
+
+
+def test_compare_rejects_mode_mismatch():
+    from perf_guard.stats import compare
+
+    command = compute_stats([1.0, 1.1, 0.9])
+    inprocess = dict(compute_stats([1.0, 1.1, 0.9]), mode="in-process")
+    with pytest.raises(ValueError, match="in-process"):
+        compare(command, inprocess, 0.1)
+    assert not compare(dict(command, mode="command"), command, 0.1).regressed  # legacy baselines are "command"
@@ -1,7 +1,11 @@
+import gc
+import math
 import statistics
+import sys
 import time
+import tracemalloc
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Optional, Sequence
 
 from .formats import Serializer
 
@@ -17,6 +21,60 @@ class Result:
     throughput_ops_s: float
     fidelity: bool
     ser_stdev_ms: float
+    payload: str = ""
+    iterations: int = 0
+    ser_p50_ms: float = 0.0
+    ser_p95_ms: float = 0.0
+    ser_p99_ms: float = 0.0
+    deser_p50_ms: float = 0.0
+    deser_p95_ms: float = 0.0
+    deser_p99_ms: float = 0.0
+    ser_peak_kb: Optional[float] = None  # tracemalloc peak while serializing once
+    deser_peak_kb: Optional[float] = None
+    deser_blocks: Optional[int] = None  # allocations still alive in one decoded object
+
+
+def percentile(sorted_ns: Sequence[int], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of already sorted samples."""
+    if not sorted_ns:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_ns)))
+    return float(sorted_ns[rank - 1])
+
+
+def measure_memory(serializer: Serializer, data: Any) -> tuple[float, float, int]:
+    """
+    One serialize and one deserialize of `data` under tracemalloc.
+
+    Returns (ser peak KB, deser peak KB, blocks held by the decoded object).
+    Only allocations made through Python's allocator are seen; memory that a
+    C library manages itself (e.g. Arrow's memory pool) is not.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        blob = serializer.serialize(serializer.prepare(data))
+        ser_peak = tracemalloc.get_traced_memory()[1] - base
+
+        base = tracemalloc.get_traced_memory()[0]
+        blocks = sys.getallocatedblocks()
+        tracemalloc.reset_peak()
+        decoded = serializer.to_python(serializer.deserialize(blob))
+        deser_peak = tracemalloc.get_traced_memory()[1] - base
+        deser_blocks = sys.getallocatedblocks() - blocks
+        del decoded
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        if started:
+            tracemalloc.stop()
+    return ser_peak / 1024, deser_peak / 1024, max(0, deser_blocks)
 
 
 def measure(
@@ -24,43 +82,69 @@ def measure(
     data: Any,
     iters: int,
     warmup: int = 10,
+    max_time: Optional[float] = None,
+    memory: bool = False,
+    name: Optional[str] = None,
+    payload: str = "",
 ) -> Result:
-    """Run ser/de benchmark. Returns avg metrics."""
+    """
+    Run ser/de benchmark. Returns latency percentiles (and the means).
+
+    Stops after `iters` round trips or `max_time` seconds, whichever comes
+    first. Every format is timed from plain Python data to bytes and back,
+    so schema-based formats include building and unpacking their native
+    objects. They are bound to the payload's schema first (not timed);
+    `schema.Unsupported` propagates when they can't be.
+    """
+    serializer = serializer.for_payload(data)
+    prepare, to_python = serializer.prepare, serializer.to_python
 
     # Warmup (JIT, caches)
     for _ in range(warmup):
-        ser_bytes = serializer.serialize(data)
-        _ = serializer.deserialize(ser_bytes)
+        ser_bytes = serializer.serialize(prepare(data))
+        _ = to_python(serializer.deserialize(ser_bytes))
 
     ser_times_ns: list[int] = []
     deser_times_ns: list[int] = []
     ser_bytes: bytes | None = None
     roundtrip: Any = None
+    deadline = time.perf_counter_ns() + int(max_time * 1e9) if max_time else None
 
     for _ in range(iters):
         # Serialize
         start = time.perf_counter_ns()
-        ser_bytes = serializer.serialize(data)
+        ser_bytes = serializer.serialize(prepare(data))
         ser_times_ns.append(time.perf_counter_ns() - start)
 
         # Deserialize
         start = time.perf_counter_ns()
-        roundtrip = serializer.deserialize(ser_bytes)
-        deser_times_ns.append(time.perf_counter_ns() - start)
+        roundtrip = to_python(serializer.deserialize(ser_bytes))
+        end = time.perf_counter_ns()
+        deser_times_ns.append(end - start)
+
+        if deadline is not None and end > deadline:
+            break
 
     if ser_bytes is None:
         raise RuntimeError("No serialization occurred")
 
+    runs = len(ser_times_ns)
     size_bytes = len(ser_bytes)
     avg_ser_ms = statistics.mean(ser_times_ns) / 1_000_000
     avg_deser_ms = statistics.mean(deser_times_ns) / 1_000_000
     total_ms = avg_ser_ms + avg_deser_ms
     total_ns = sum(ser_times_ns) + sum(deser_times_ns)
-    throughput = (iters * 1_000_000_000) / total_ns if total_ns else 0
+    throughput = (runs * 1_000_000_000) / total_ns if total_ns else 0
     fidelity = roundtrip == data
-    ser_stdev_ms = statistics.stdev(ser_times_ns) / 1_000_000 if iters > 1 else 0.0
+    ser_stdev_ms = statistics.stdev(ser_times_ns) / 1_000_000 if runs > 1 else 0.0
+
+    format_name = name or serializer.__class__.__name__.replace('Serializer', '')
 
-    format_name = serializer.__class__.__name__.replace('Serializer', '')
+    ser_sorted = sorted(ser_times_ns)
+    deser_sorted = sorted(deser_times_ns)
+    peaks: tuple[Optional[float], Optional[float], Optional[int]] = (None, None, None)
+    if memory:
+        peaks = measure_memory(serializer, data)
 
     return Result(
         format_name,
@@ -72,4 +156,13 @@ def measure(
         throughput,
         fidelity,
         ser_stdev_ms,
+        payload,
+        runs,
+        percentile(ser_sorted, 50) / 1_000_000,
+        percentile(ser_sorted, 95) / 1_000_000,
+        percentile(ser_sorted, 99) / 1_000_000,
+        percentile(deser_sorted, 50) / 1_000_000,
+        percentile(deser_sorted, 95) / 1_000_000,
+        percentile(deser_sorted, 99) / 1_000_000,
+        *peaks,
     )
@@ -1,37 +1,48 @@
 import typer
 import json
+from dataclasses import asdict
 from pathlib import Path
-from typing import List
+from typing import Any, List
 
+import rich.progress
 from rich.console import Console
-from rich_click import rich_click
+from rich.markup import escape
 
 from .benchmark import measure
+from .concurrency import measure_concurrency
 from .formats import get_serializer, FORMAT_NAMES
-from .generator import generate_sample_data
-from .reporter import print_results
+from .generator import generate_sample_data, KINDS
+from .reporter import print_concurrency, print_results, print_skipped
+from .schema import Unsupported
 
 
-rich_click.typer_rich_status()
 app = typer.Typer(help="SerDes Bench", rich_markup_mode="rich")
 console = Console()
 
 
+def _split(values: List[str]) -> List[str]:
+    return [v.strip() for value in values for v in value.split(",") if v.strip()]
+
+
 @app.command()
 def bench(
     input_file: Path = typer.Argument(
         None, help="Input JSON file with sample data (mutually exclusive with --generate)"
     ),
     generate: str = typer.Option(
-        None, "--generate/-g", help="Generate data: 'simple', 'nested', 'array-heavy'"
+        None, "--generate", "-g",
+        help=f"Generate data, comma-separated for a sweep or 'all': {', '.join(KINDS)}",
     ),
-    gen_size: int = typer.Option(1000, "--size", help="Approx #items for generated data"),
+    gen_size: str = typer.Option("1000", "--size", help="Approx #items for generated data, comma-separated for a sweep"),
     formats: List[str] = typer.Option(
-        ["all"], "--format/-f", help="Formats: all or [json,orjson,ujson,msgpack,cbor]"
+        ["all"], "--format", "-f", help=escape(f"Formats: all or [{','.join(FORMAT_NAMES)}]")
     ),
-    iters: int = typer.Option(10000, "--iters/-i", min=1, help="Benchmark iterations"),
+    iters: int = typer.Option(10000, "--iters", "-i", min=1, help="Benchmark iterations (upper bound)"),
     warmup: int = typer.Option(10, "--warmup", min=0, help="Warmup iterations"),
-    export: Path = typer.Option(None, "--export/-e", help="Export results as JSON"),
+    max_time: float = typer.Option(2.0, "--max-time", min=0.0, help="Stop a cell after this many seconds (0: run all iterations)"),
+    memory: bool = typer.Option(True, "--memory/--no-memory", help="Measure tracemalloc peaks and allocations"),
+    concurrency: int = typer.Option(0, "--concurrency", "-c", min=0, help="Also measure throughput with N threads and N processes"),
+    export: Path = typer.Option(None, "--export", "-e", help="Export results as JSON"),
 ):
     """Benchmark ser/de formats on data."""
 
@@ -39,21 +50,30 @@ def bench(
         typer.echo("Exactly one of --input or --generate required.")
         raise typer.Exit(1)
 
+    payloads: List[tuple[str, Any]] = []
     if input_file:
         if not input_file.is_file():
             raise typer.BadParameter(f"File not found: {input_file}")
         try:
             with input_file.open("r") as f:
-                data = json.load(f)
+                payloads.append((input_file.name, json.load(f)))
         except json.JSONDecodeError as e:
             raise typer.BadParameter(f"Invalid JSON: {e}")
     else:
+        kinds = KINDS if generate == "all" else _split([generate])
+        try:
+            sizes = [int(s) for s in _split([gen_size])]
+        except ValueError:
+            raise typer.BadParameter(f"Sizes must be integers: {gen_size}")
         try:
-            data = generate_sample_data(generate, gen_size)
+            payloads = [(f"{kind}/{size}", generate_sample_data(kind, size)) for kind in kinds for size in sizes]
         except ValueError as e:
-            raise typer.BadParameter(str(e))
+            console.print(f"[red]{e}[/]")
+            raise typer.Exit(1)
 
-    selected_formats = formats if formats != ["all"] else FORMAT_NAMES
+    selected_formats = _split(formats)
+    if selected_formats == ["all"]:
+        selected_formats = FORMAT_NAMES
     selected_formats = [f for f in selected_formats if f in FORMAT_NAMES]
     if not selected_formats:
         raise typer.BadParameter(f"Invalid formats. Available: {', '.join(FORMAT_NAMES)}")
@@ -61,24 +81,42 @@ def bench(
     serializers = {name: get_serializer(name) for name in selected_formats}
 
     results = []
-    with typer.progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
+    report = []
+    with rich.progress.Progress(
+        rich.progress.SpinnerColumn(),
+        rich.progress.TextColumn("[progress.description]{task.description}"),
+        rich.progress.BarColumn(),
         console=console,
     ) as p:
-        task = p.add_task("Benchmarking...", total=len(serializers))
-        for name in selected_formats:
-            ser = serializers[name]
-            result = measure(ser, data, iters, warmup)
-            results.append(result)
-            p.advance(task)
+        task = p.add_task("Benchmarking...", total=len(payloads) * len(serializers))
+        for label, data in payloads:
+            cell_results, skipped, rows = [], [], []
+            for name in selected_formats:
+                p.update(task, description=f"{label} {name}")
+                try:
+                    result = measure(serializers[name], data, iters, warmup, max_time or None, memory, name, label)
+                except Unsupported as e:
+                    skipped.append((name, str(e)))
+                else:
+                    cell_results.append(result)
+                    if concurrency:
+                        rows += measure_concurrency(name, data, concurrency, payload=label)
+                p.advance(task)
+            results += cell_results
+            report.append((label, cell_results, skipped, rows))
 
-    print_results(console, results)
+    for label, cell_results, skipped, rows in report:
+        print_results(console, cell_results, title=f"SerDes Benchmark Results: {label}")
+        print_skipped(console, skipped)
+        print_concurrency(console, cell_results, rows, title=f"Concurrent throughput: {label}")
 
     if export:
-        import json
-        export.write_text(json.dumps([r.__dict__ for r in results], indent=2))
+        export.write_text(json.dumps({
+            "results": [asdict(r) for r in results],
+            "skipped": [{"payload": label, "format": name, "reason": reason}
+                        for label, _, skipped, _ in report for name, reason in skipped],
+            "concurrency": [asdict(row) for *_, rows in report for row in rows],
+        }, indent=2))
         console.print(f"[green]Exported to {export}")
 
 
@@ -0,0 +1,69 @@
+"""
+Aggregate round-trip throughput with several threads or processes.
+
+Threads show how much of a codec's work runs without the GIL (pure-Python
+or GIL-holding codecs stay flat as workers are added); processes show the
+scaling ceiling without it. Each worker binds its own serializer, loops
+dict -> bytes -> dict for `duration` seconds and reports ops/elapsed; the
+aggregate is the sum over workers.
+"""
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from .formats import get_serializer
+
+
+@dataclass
+class Throughput:
+    format_name: str
+    payload: str
+    mode: str  # "threads" | "processes"
+    workers: int
+    ops_s: float
+
+
+def _loop(name: str, data: Any, duration: float, start: threading.Barrier | None = None) -> float:
+    ser = get_serializer(name).for_payload(data)
+    ser.to_python(ser.deserialize(ser.serialize(ser.prepare(data))))  # warm
+    if start is not None:
+        start.wait()
+    ops = 0
+    began = time.perf_counter()
+    deadline = began + duration
+    now = began
+    while now < deadline:
+        ser.to_python(ser.deserialize(ser.serialize(ser.prepare(data))))
+        ops += 1
+        now = time.perf_counter()
+    return ops / (now - began)
+
+
+def thread_throughput(name: str, data: Any, workers: int, duration: float = 1.0) -> float:
+    rates = [0.0] * workers
+    start = threading.Barrier(workers)
+
+    def run(i: int) -> None:
+        rates[i] = _loop(name, data, duration, start)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(rates)
+
+
+def process_throughput(name: str, data: Any, workers: int, duration: float = 1.0) -> float:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_loop, name, data, duration) for _ in range(workers)]
+        return sum(f.result() for f in futures)
+
+
+def measure_concurrency(name: str, data: Any, workers: int, duration: float = 1.0, payload: str = "") -> list[Throughput]:
+    return [
+        Throughput(name, payload, "threads", workers, thread_throughput(name, data, workers, duration)),
+        Throughput(name, payload, "processes", workers, process_throughput(name, data, workers, duration)),
+    ]
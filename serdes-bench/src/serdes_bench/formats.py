@@ -1,5 +1,8 @@
+import io
+import itertools
+import re
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Type
+from typing import Any, Dict, Optional
 
 import orjson
 import msgpack
@@ -7,7 +10,7 @@ import cbor2
 import ujson
 import json
 
-from .benchmark import Result
+from .schema import ListOf, Record, Type, Union, Unsupported, infer, nullable, strip_absent
 
 
 class Serializer(ABC):
@@ -23,6 +26,18 @@ class Serializer(ABC):
         """Deserialize bytes to obj. Roundtrip verifiable."""
         ...
 
+    def for_payload(self, data: Any) -> "Serializer":
+        """A serializer for this payload's shape (schema-based formats compile a schema here)."""
+        return self
+
+    def prepare(self, data: Any) -> Any:
+        """The payload in the in-memory form this format serializes from and decodes to."""
+        return data
+
+    def to_python(self, obj: Any) -> Any:
+        """Decoded object back as plain Python data."""
+        return obj
+
 
 class StdJSONSerializer(Serializer):
     def serialize(self, obj: Any) -> bytes:
@@ -64,6 +79,249 @@ class CBORSerializer(Serializer):
         return cbor2.loads(data)
 
 
+# -- schema-based formats ------------------------------------------------------
+#
+# Each is registered unbound; `for_payload` infers a schema from the payload
+# and returns a bound instance. `prepare` and `to_python` convert between plain
+# dicts and the native in-memory form (message objects, Avro records, Arrow
+# tables); both are timed, so every format is measured dict -> bytes -> dict.
+
+_IDENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+
+
+def _root_record(data: Any, fmt: str) -> Record:
+    schema = infer(data)
+    if not isinstance(schema, Record):
+        raise Unsupported(f"{fmt} needs a top-level object")
+    return schema
+
+
+class ProtobufSerializer(Serializer):
+    _files = itertools.count()
+
+    def __init__(self, cls: Any = None, specs: Optional[Dict[str, list]] = None, root: str = ""):
+        self.cls = cls
+        self.specs = specs or {}
+        self.root = root
+
+    def for_payload(self, data: Any) -> "ProtobufSerializer":
+        from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+        package = f"serdes_bench{next(self._files)}"
+        fdp = descriptor_pb2.FileDescriptorProto(name=f"{package}.proto", package=package, syntax="proto2")
+        specs: Dict[str, list] = {}
+        root = _ProtoBuilder(fdp, package, specs).message(_root_record(data, "protobuf"))
+        pool = descriptor_pool.DescriptorPool()
+        pool.Add(fdp)
+        cls = message_factory.GetMessageClass(pool.FindMessageTypeByName(f"{package}.{root}"))
+        return ProtobufSerializer(cls, specs, root)
+
+    def prepare(self, data: Any) -> Any:
+        msg = self.cls()
+        try:
+            self._fill(msg, self.root, data)
+        except (TypeError, ValueError) as e:
+            raise Unsupported(f"protobuf: {e}") from e
+        return msg
+
+    def _fill(self, msg: Any, name: str, value: Dict[str, Any]) -> None:
+        for key, field, kind, sub, _ in self.specs[name]:
+            v = value.get(key)
+            if v is None:
+                continue
+            if kind == "scalar":
+                setattr(msg, field, v)
+            elif kind == "message":
+                child = getattr(msg, field)
+                child.SetInParent()
+                self._fill(child, sub, v)
+            elif kind == "repeated":
+                getattr(msg, field).extend(v)
+            else:
+                repeated = getattr(msg, field)
+                for item in v:
+                    self._fill(repeated.add(), sub, item)
+
+    def serialize(self, obj: Any) -> bytes:
+        return obj.SerializeToString()
+
+    def deserialize(self, data: bytes) -> Any:
+        return self.cls.FromString(data)
+
+    def to_python(self, obj: Any) -> Any:
+        return self._dump(obj, self.root)
+
+    def _dump(self, msg: Any, name: str) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for key, field, kind, sub, required in self.specs[name]:
+            if kind == "scalar":
+                if msg.HasField(field):
+                    out[key] = getattr(msg, field)
+            elif kind == "message":
+                if msg.HasField(field):
+                    out[key] = self._dump(getattr(msg, field), sub)
+            else:
+                values = getattr(msg, field)
+                if values or required:
+                    out[key] = list(values) if kind == "repeated" else [self._dump(v, sub) for v in values]
+        return out
+
+
+class _ProtoBuilder:
+    """Emit one proto2 message type per inferred record type."""
+
+    def __init__(self, fdp: Any, package: str, specs: Dict[str, list]):
+        from google.protobuf import descriptor_pb2
+
+        self.F = descriptor_pb2.FieldDescriptorProto
+        self.fdp = fdp
+        self.package = package
+        self.specs = specs
+        self.scalars = {
+            "bool": self.F.TYPE_BOOL,
+            "int": self.F.TYPE_SINT64,
+            "float": self.F.TYPE_DOUBLE,
+            "str": self.F.TYPE_STRING,
+            "bytes": self.F.TYPE_BYTES,
+        }
+
+    def message(self, record: Record) -> str:
+        name = f"M{len(self.specs)}"
+        self.specs[name] = spec = []
+        msg = self.fdp.message_type.add(name=name)
+        for number, (key, t) in enumerate(record.fields.items(), 1):
+            _, t = nullable(t)
+            if t == "null":
+                continue  # only ever None: nothing to encode (shows up as a fidelity miss)
+            field = msg.field.add(name=f"f{number}", number=number, label=self.F.LABEL_OPTIONAL)
+            kind = "scalar"
+            if isinstance(t, ListOf):
+                field.label = self.F.LABEL_REPEATED
+                has_null, t = nullable(t.item if t.item != "null" else "int")
+                if has_null:
+                    raise Unsupported("protobuf lists cannot hold nulls")
+                kind = "repeated"
+            sub = ""
+            if isinstance(t, Record):
+                sub = self.message(t)
+                field.type = self.F.TYPE_MESSAGE
+                field.type_name = f".{self.package}.{sub}"
+                kind = "message" if kind == "scalar" else "repeated_message"
+            elif isinstance(t, str) and t in self.scalars:
+                field.type = self.scalars[t]
+                if kind == "repeated" and t in ("bool", "int", "float"):
+                    field.options.packed = True
+            else:
+                raise Unsupported("protobuf cannot express " + ("nested lists" if isinstance(t, ListOf) else "mixed-type values"))
+            spec.append((key, field.name, kind, sub, key in record.required))
+        return name
+
+
+class AvroSerializer(Serializer):
+    def __init__(self, schema: Any = None, shape: Optional[Type] = None):
+        self.schema = schema
+        self.shape = shape
+
+    def for_payload(self, data: Any) -> "AvroSerializer":
+        import fastavro
+
+        shape = _root_record(data, "avro")
+        names = itertools.count()
+        return AvroSerializer(fastavro.parse_schema(_avro_type(shape, names)), shape)
+
+    def prepare(self, data: Any) -> Any:
+        from fastavro.validation import validate
+
+        try:
+            validate(data, self.schema, raise_errors=True)
+        except Exception as e:  # fastavro raises its own ValidationError
+            raise Unsupported(f"avro: {e}") from e
+        return data
+
+    def serialize(self, obj: Any) -> bytes:
+        import fastavro
+
+        buf = io.BytesIO()
+        fastavro.schemaless_writer(buf, self.schema, obj)
+        return buf.getvalue()
+
+    def deserialize(self, data: bytes) -> Any:
+        import fastavro
+
+        return fastavro.schemaless_reader(io.BytesIO(data), self.schema, None)
+
+    def to_python(self, obj: Any) -> Any:
+        return strip_absent(obj, self.shape)
+
+
+def _avro_type(t: Type, names: itertools.count, optional: bool = False) -> Any:
+    has_null, t = nullable(t)
+    if isinstance(t, Record):
+        fields = []
+        for key, ft in t.fields.items():
+            if not _IDENT.match(key):
+                raise Unsupported(f"avro field names must be identifiers, got {key!r}")
+            field: Dict[str, Any] = {"name": key, "type": _avro_type(ft, names, key not in t.required)}
+            if isinstance(field["type"], list) and field["type"][0] == "null":
+                field["default"] = None
+            fields.append(field)
+        base: Any = {"type": "record", "name": f"R{next(names)}", "fields": fields}
+    elif isinstance(t, ListOf):
+        base = {"type": "array", "items": _avro_type(t.item, names)}
+    elif isinstance(t, Union):
+        base = [_avro_type(o, names) for o in t.options]
+    else:
+        base = {"null": "null", "bool": "boolean", "int": "long", "float": "double",
+                "str": "string", "bytes": "bytes"}[t]
+    if (has_null or optional) and base != "null":
+        return ["null"] + (base if isinstance(base, list) else [base])
+    return base
+
+
+class ArrowSerializer(Serializer):
+    """Arrow IPC stream of a one-row table (one column per top-level key)."""
+
+    def __init__(self, shape: Optional[Type] = None):
+        self.shape = shape
+
+    def for_payload(self, data: Any) -> "ArrowSerializer":
+        import pyarrow  # noqa: F401  (fail early when missing)
+
+        return ArrowSerializer(_root_record(data, "arrow"))
+
+    def prepare(self, data: Any) -> Any:
+        import pyarrow as pa
+
+        try:
+            return pa.Table.from_pylist([data])
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            raise Unsupported(f"arrow: {e}") from e
+
+    def serialize(self, obj: Any) -> bytes:
+        import pyarrow as pa
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, obj.schema) as writer:
+            writer.write_table(obj)
+        return sink.getvalue().to_pybytes()
+
+    def deserialize(self, data: bytes) -> Any:
+        import pyarrow as pa
+
+        return pa.ipc.open_stream(data).read_all()
+
+    def to_python(self, obj: Any) -> Any:
+        return strip_absent(obj.to_pylist()[0], self.shape)
+
+
+def _available(module: str) -> bool:
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
 FORMAT_SERIALIZERS: Dict[str, Serializer] = {
     'json': StdJSONSerializer(),
     'orjson': OrJSONSerializer(),
@@ -72,6 +330,15 @@ FORMAT_SERIALIZERS: Dict[str, Serializer] = {
     'cbor': CBORSerializer(),
 }
 
+# Optional: installed with `pip install protobuf fastavro pyarrow`.
+for _name, _module, _ser in (
+    ('protobuf', 'google.protobuf', ProtobufSerializer()),
+    ('avro', 'fastavro', AvroSerializer()),
+    ('arrow', 'pyarrow', ArrowSerializer()),
+):
+    if _available(_module):
+        FORMAT_SERIALIZERS[_name] = _ser
+
 FORMAT_NAMES = list(FORMAT_SERIALIZERS.keys())
 
 
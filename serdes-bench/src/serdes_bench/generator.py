@@ -3,6 +3,11 @@ import random
 import string
 from typing import Any
 
+KINDS = ["simple", "nested", "array-heavy", "wide", "deep", "numeric", "strings"]
+
+# Below every codec's nesting limit (orjson refuses documents deeper than 254).
+DEEP_LEVELS = 48
+
 
 def generate_sample_data(kind: str, approx_size: int = 1000) -> dict[str, Any]:
     """
@@ -11,6 +16,10 @@ def generate_sample_data(kind: str, approx_size: int = 1000) -> dict[str, Any]:
     simple: flat dict
     nested: tree w/ leaves (str/num/arr)
     array-heavy: long list of dicts
+    wide: one flat dict with ~approx_size mixed scalar fields
+    deep: chains of DEEP_LEVELS nested dicts
+    numeric: parallel int/float/bool arrays of approx_size items
+    strings: text documents (ASCII and multi-byte UTF-8)
     """
     random.seed(42)  # Repro
 
@@ -46,8 +55,46 @@ def generate_sample_data(kind: str, approx_size: int = 1000) -> dict[str, Any]:
         ]
         return {"batch": items}
 
+    elif kind == "wide":
+        makers = [
+            lambda: random.randint(-10**9, 10**9),
+            lambda: random.uniform(-1e6, 1e6),
+            lambda: "".join(random.choices(string.ascii_letters, k=12)),
+            lambda: random.random() < 0.5,
+        ]
+        return {f"field_{i}": makers[i % len(makers)]() for i in range(max(1, approx_size))}
+
+    elif kind == "deep":
+        def chain(levels: int) -> dict[str, Any]:
+            node: dict[str, Any] = {"leaf": True}
+            for level in range(levels):
+                node = {"level": level, "name": f"n{level}", "child": node}
+            return node
+
+        return {"chains": [chain(DEEP_LEVELS) for _ in range(max(1, approx_size // DEEP_LEVELS))]}
+
+    elif kind == "numeric":
+        n = max(1, approx_size)
+        return {
+            "timestamps": [1_700_000_000_000 + i * 250 for i in range(n)],
+            "values": [random.gauss(0, 100) for _ in range(n)],
+            "flags": [random.random() < 0.1 for _ in range(n)],
+        }
+
+    elif kind == "strings":
+        alphabet = string.ascii_letters + " " * 8 + "äöüßéñ漢字🙂"
+        docs = [
+            {
+                "title": "".join(random.choices(alphabet, k=40)),
+                "body": "".join(random.choices(alphabet, k=random.randint(200, 2000))),
+                "tags": ["".join(random.choices(string.ascii_lowercase, k=8)) for _ in range(5)],
+            }
+            for _ in range(max(1, approx_size // 10))
+        ]
+        return {"documents": docs}
+
     else:
-        raise ValueError(f"Unknown kind: {kind}. Use simple|nested|array-heavy")
+        raise ValueError(f"Unknown kind: {kind}. Use {'|'.join(KINDS)}")
 
 
 if __name__ == "__main__":
@@ -1,16 +1,21 @@
-from rich.console import Console, ConsoleOptions
+from rich.console import Console
 from rich.table import Table
 from rich import box
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from .benchmark import Result
+from .concurrency import Throughput
 
 
-def print_results(console: Console, results: List[Result]) -> None:
+def _opt(value: Optional[float], fmt: str) -> str:
+    return "-" if value is None else format(value, fmt)
+
+
+def print_results(console: Console, results: List[Result], title: str = "SerDes Benchmark Results") -> None:
     """Print rich benchmark table + summary."""
 
     table = Table(
-        title="[bold cyan]SerDes Benchmark Results[/]",
+        title=f"[bold cyan]{title}[/]",
         box=box.ROUNDED,
         title_style="bold magenta",
         show_header=True,
@@ -19,37 +24,80 @@ def print_results(console: Console, results: List[Result]) -> None:
 
     table.add_column("Format", style="cyan", no_wrap=True)
     table.add_column("Size KB", justify="right")
-    table.add_column("Ser ms", justify="right")
-    table.add_column("Deser ms", justify="right")
-    table.add_column("Total ms", justify="right")
+    table.add_column("Ser p50", justify="right")
+    table.add_column("Ser p99", justify="right")
+    table.add_column("Deser p50", justify="right")
+    table.add_column("Deser p99", justify="right")
     table.add_column("ops/s", justify="right")
+    table.add_column("Peak KB", justify="right")
+    table.add_column("Blocks", justify="right")
     table.add_column("OK", justify="center")
-    table.add_column("Ser ±", justify="right")
 
-    # Sort by total time per KB (efficiency)
-    eff_results = sorted(results, key=lambda r: r.total_time_ms / max(r.size_kb, 0.001))
+    # Sort by median round trip per KB (efficiency)
+    eff_results = sorted(results, key=lambda r: (r.ser_p50_ms + r.deser_p50_ms) / max(r.size_kb, 0.001))
 
     for r in eff_results:
         fidelity = "✅" if r.fidelity else "❌"
+        peak = None
+        if r.ser_peak_kb is not None and r.deser_peak_kb is not None:
+            peak = max(r.ser_peak_kb, r.deser_peak_kb)
         table.add_row(
             r.format_name,
             f"{r.size_kb:.1f}",
-            f"{r.ser_time_ms:.3f}",
-            f"{r.deser_time_ms:.3f}",
-            f"{r.total_time_ms:.3f}",
-            f"{r.throughput:,.0f}",
+            f"{r.ser_p50_ms:.3f}",
+            f"{r.ser_p99_ms:.3f}",
+            f"{r.deser_p50_ms:.3f}",
+            f"{r.deser_p99_ms:.3f}",
+            f"{r.throughput_ops_s:,.0f}",
+            _opt(peak, ".1f"),
+            _opt(r.deser_blocks, ","),
             fidelity,
-            f"{r.ser_stdev_ms:.3f}",
         )
 
     console.print(table)
+    console.print("[dim]Latencies in ms, dict to bytes and back (schema formats include building their native objects); Peak KB is the larger of ser/deser tracemalloc peaks, Blocks the allocations held by one decoded object.[/]")
 
     if results:
-        best = min(results, key=lambda r: r.total_time_ms)
+        best = min(results, key=lambda r: r.ser_p50_ms + r.deser_p50_ms)
         console.print(
-            f"\n[bold green]🏆 Best overall: {best.format_name} [/]({best.total_time_ms:.3f}ms total, {best.size_kb:.1f}KB)"
+            f"\n[bold green]🏆 Best overall: {best.format_name} [/]({best.ser_p50_ms + best.deser_p50_ms:.3f}ms median round trip, {best.size_kb:.1f}KB)"
         )
         smallest = min(results, key=lambda r: r.size_kb)
         console.print(
             f"[bold blue]📦 Smallest: {smallest.format_name} [/]({smallest.size_kb:.1f}KB)"
         )
+
+
+def print_skipped(console: Console, skipped: List[Tuple[str, str]]) -> None:
+    """Formats that could not represent the payload (reported as n/a)."""
+    for name, reason in skipped:
+        console.print(f"[yellow]n/a {name}:[/] {reason}")
+
+
+def print_concurrency(console: Console, results: List[Result], rows: List[Throughput], title: str = "Concurrent throughput") -> None:
+    """Aggregate ops/s per format with N threads and N processes, against one thread."""
+    if not rows:
+        return
+    single: Dict[str, float] = {r.format_name: r.throughput_ops_s for r in results}
+    by_format: Dict[str, Dict[str, Throughput]] = {}
+    for row in rows:
+        by_format.setdefault(row.format_name, {})[row.mode] = row
+    workers = rows[0].workers
+
+    table = Table(title=f"[bold cyan]{title}[/]", box=box.ROUNDED, header_style="bold white")
+    table.add_column("Format", style="cyan", no_wrap=True)
+    table.add_column("1 thread ops/s", justify="right")
+    table.add_column(f"{workers} threads ops/s", justify="right")
+    table.add_column("scaling", justify="right", style="yellow")
+    table.add_column(f"{workers} processes ops/s", justify="right")
+    table.add_column("scaling", justify="right", style="yellow")
+
+    for name, modes in by_format.items():
+        base = single.get(name, 0.0)
+        cells = [name, f"{base:,.0f}"]
+        for mode in ("threads", "processes"):
+            ops = modes[mode].ops_s if mode in modes else 0.0
+            cells += [f"{ops:,.0f}", f"{ops / base:.2f}x" if base else "-"]
+        table.add_row(*cells)
+
+    console.print(table)
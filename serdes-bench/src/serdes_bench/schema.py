@@ -0,0 +1,131 @@
+"""Schema inference for schema-based formats.
+
+Protobuf, Avro and Arrow need a schema up front. It is inferred from the
+payload itself: every dict becomes a record, lists of records merge into one
+record type (a key missing from some of them becomes optional), ints and
+floats widen to float. Formats that cannot express the result raise
+`Unsupported`, and the benchmark reports them as n/a for that payload.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Set, Tuple, Union as TUnion
+
+SCALARS = ("null", "bool", "int", "float", "str", "bytes")
+
+
+class Unsupported(ValueError):
+    """The payload's shape cannot be expressed in a format's type system."""
+
+
+@dataclass
+class Record:
+    fields: Dict[str, "Type"]
+    required: Set[str]  # keys present in every instance seen
+
+
+@dataclass
+class ListOf:
+    item: "Type"  # "null" while only empty lists were seen
+
+
+@dataclass
+class Union:
+    options: Tuple["Type", ...]
+
+
+Type = TUnion[str, Record, ListOf, Union]
+
+
+def _scalar(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):  # before int: bool is an int subclass
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    if isinstance(value, bytes):
+        return "bytes"
+    raise Unsupported(f"Cannot infer a schema for {type(value).__name__} values")
+
+
+def infer(value: Any) -> Type:
+    if isinstance(value, dict):
+        return Record({k: infer(v) for k, v in value.items()}, set(value))
+    if isinstance(value, list):
+        types = [infer(v) for v in value]
+        item: Type = types[0] if types else "null"
+        for t in types[1:]:
+            item = merge(item, t)
+        return ListOf(item)
+    return _scalar(value)
+
+
+def _kind(t: Type) -> str:
+    if isinstance(t, str):
+        return "num" if t in ("int", "float") else t
+    return type(t).__name__
+
+
+def merge(a: Type, b: Type) -> Type:
+    if isinstance(a, Union) or isinstance(b, Union):
+        options = list(a.options if isinstance(a, Union) else (a,))
+        for t in b.options if isinstance(b, Union) else (b,):
+            options = _add_option(options, t)
+        return options[0] if len(options) == 1 else Union(tuple(options))
+    if a == b:
+        return a
+    if _kind(a) != _kind(b):
+        return Union((a, b))
+    if isinstance(a, str):
+        return "float"  # int + float
+    if isinstance(a, ListOf):
+        if a.item == "null" or b.item == "null":
+            return a if b.item == "null" else b
+        return ListOf(merge(a.item, b.item))
+    fields = dict(a.fields)
+    for k, t in b.fields.items():
+        fields[k] = merge(fields[k], t) if k in fields else t
+    return Record(fields, a.required & b.required)
+
+
+def _add_option(options: List[Type], t: Type) -> List[Type]:
+    for i, o in enumerate(options):
+        if _kind(o) == _kind(t):
+            options[i] = merge(o, t)
+            return options
+    return options + [t]
+
+
+def nullable(t: Type) -> Tuple[bool, Type]:
+    """(whether null is allowed, the type without null)."""
+    if isinstance(t, Union):
+        rest = tuple(o for o in t.options if o != "null")
+        if len(rest) != len(t.options):
+            return True, rest[0] if len(rest) == 1 else Union(rest)
+    return t == "null", t
+
+
+def strip_absent(value: Any, t: Type) -> Any:
+    """
+    Drop keys that a decoder filled in as None for optional record fields,
+    so a decoded payload compares equal to the original.
+    """
+    _, t = nullable(t)
+    if isinstance(value, dict) and isinstance(t, Record):
+        return {
+            k: strip_absent(v, t.fields[k]) if k in t.fields else v
+            for k, v in value.items()
+            if v is not None or k in t.required
+        }
+    if isinstance(value, list) and isinstance(t, ListOf):
+        return [strip_absent(v, t.item) for v in value]
+    if isinstance(t, Union):
+        for option in t.options:
+            if isinstance(value, dict) and isinstance(option, Record):
+                return strip_absent(value, option)
+            if isinstance(value, list) and isinstance(option, ListOf):
+                return strip_absent(value, option)
+    return value
@@ -1,5 +1,6 @@
 import pytest
-from serdes_bench.benchmark import measure
+from serdes_bench.benchmark import measure, percentile
+from serdes_bench.concurrency import measure_concurrency
 from serdes_bench.formats import OrJSONSerializer
 
 
@@ -15,3 +16,50 @@ def test_measure_positive_metrics(sample_data: dict):
     assert result.throughput_ops_s > 0
     assert result.fidelity is True
     assert result.ser_stdev_ms >= 0
+
+
+def test_measure_percentiles_and_memory(sample_data: dict):
+    result = measure(OrJSONSerializer(), sample_data, iters=200, warmup=5, memory=True, name="orjson", payload="sample")
+
+    assert result.format_name == "orjson"
+    assert result.payload == "sample"
+    assert result.iterations == 200
+    assert 0 < result.ser_p50_ms <= result.ser_p95_ms <= result.ser_p99_ms
+    assert 0 < result.deser_p50_ms <= result.deser_p95_ms <= result.deser_p99_ms
+    assert result.ser_peak_kb is not None and result.ser_peak_kb >= 0
+    assert result.deser_blocks is not None and result.deser_blocks > 0
+
+
+def test_measure_times_native_conversion(sample_data: dict):
+    class Counting(OrJSONSerializer):
+        calls = 0
+
+        def prepare(self, data):
+            Counting.calls += 1
+            return data
+
+        def to_python(self, obj):
+            Counting.calls += 1
+            return obj
+
+    result = measure(Counting(), sample_data, iters=20, warmup=0)
+    assert Counting.calls == 2 * result.iterations
+    assert result.fidelity is True
+
+
+def test_measure_stops_at_max_time(sample_data: dict):
+    result = measure(OrJSONSerializer(), sample_data, iters=10_000_000, warmup=0, max_time=0.05)
+    assert 0 < result.iterations < 10_000_000
+
+
+def test_percentile_nearest_rank():
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile([], 50) == 0.0
+
+
+def test_concurrency_reports_both_modes(sample_data: dict):
+    rows = measure_concurrency("orjson", sample_data, workers=2, duration=0.05, payload="sample")
+    assert [r.mode for r in rows] == ["threads", "processes"]
+    assert all(r.ops_s > 0 and r.workers == 2 for r in rows)
@@ -1,3 +1,4 @@
+import json
 import pytest
 from typer.testing import CliRunner
 
@@ -10,6 +11,7 @@ def test_help():
     result = runner.invoke(app, ["--help"])
     assert result.exit_code == 0
     assert "Benchmark" in result.stdout
+    assert "[json," in result.stdout
 
 
 def test_generate_simple():
@@ -21,3 +23,15 @@ def test_bad_generate():
     result = runner.invoke(app, ["--generate", "invalid"])
     assert result.exit_code != 0
     assert "Unknown kind" in result.stdout
+
+
+def test_sweep_with_export(tmp_path):
+    out = tmp_path / "results.json"
+    result = runner.invoke(app, [
+        "--generate", "wide,numeric", "--size", "10,20", "-f", "orjson,msgpack",
+        "--iters", "50", "--export", str(out),
+    ])
+    assert result.exit_code == 0, result.stdout
+    exported = json.loads(out.read_text())
+    assert {r["payload"] for r in exported["results"]} == {"wide/10", "wide/20", "numeric/10", "numeric/20"}
+    assert all("ser_p99_ms" in r for r in exported["results"])
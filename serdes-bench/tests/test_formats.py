@@ -5,7 +5,10 @@ from serdes_bench.formats import (
     UJSONSerializer,
     MsgPackSerializer,
     CBORSerializer,
+    FORMAT_SERIALIZERS,
 )
+from serdes_bench.generator import generate_sample_data
+from serdes_bench.schema import Unsupported
 
 
 SAMPLE = {"key": "val", "list": [1, 2], "bool": True, "num": 3.14}
@@ -27,3 +30,29 @@ def test_all_roundtrip(ser, sample_data: dict):
     assert len(ser_bytes) > 0
     roundtrip = ser.deserialize(ser_bytes)
     assert roundtrip == sample_data
+
+
+SCHEMA_FORMATS = [name for name in ("protobuf", "avro", "arrow") if name in FORMAT_SERIALIZERS]
+
+
+@pytest.mark.parametrize("name", SCHEMA_FORMATS)
+@pytest.mark.parametrize("kind", ["nested", "array-heavy", "wide", "deep", "numeric", "strings"])
+def test_schema_formats_roundtrip(name, kind):
+    data = generate_sample_data(kind, 100)
+    ser = FORMAT_SERIALIZERS[name].for_payload(data)
+    blob = ser.serialize(ser.prepare(data))
+    assert isinstance(blob, bytes)
+    assert ser.to_python(ser.deserialize(blob)) == data
+
+
+@pytest.mark.parametrize("name", SCHEMA_FORMATS)
+def test_schema_formats_optional_fields(name):
+    data = {"rows": [{"id": 1, "note": "x"}, {"id": 2, "score": 0.5}], "empty": []}
+    ser = FORMAT_SERIALIZERS[name].for_payload(data)
+    assert ser.to_python(ser.deserialize(ser.serialize(ser.prepare(data)))) == data
+
+
+@pytest.mark.skipif("protobuf" not in FORMAT_SERIALIZERS, reason="protobuf not installed")
+def test_protobuf_rejects_nested_lists():
+    with pytest.raises(Unsupported):
+        FORMAT_SERIALIZERS["protobuf"].for_payload({"m": [[1, 2], [3]]})
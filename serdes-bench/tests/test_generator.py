@@ -1,5 +1,5 @@
 import json
-from serdes_bench.generator import generate_sample_data
+from serdes_bench.generator import DEEP_LEVELS, KINDS, generate_sample_data
 
 
 def test_generate_simple():
@@ -25,3 +25,22 @@ def test_json_serializable():
     for kind in ["simple", "nested", "array-heavy"]:
         data = generate_sample_data(kind)
         json.dumps(data)  # No error
+
+
+def test_generate_new_shapes():
+    assert len(generate_sample_data("wide", 200)) == 200
+    numeric = generate_sample_data("numeric", 50)
+    assert len(numeric["values"]) == len(numeric["timestamps"]) == 50
+
+    depth, node = 0, generate_sample_data("deep", 100)["chains"][0]
+    while "child" in node:
+        depth, node = depth + 1, node["child"]
+    assert depth == DEEP_LEVELS
+
+    docs = generate_sample_data("strings", 100)["documents"]
+    assert len(docs) == 10 and all(isinstance(d["body"], str) for d in docs)
+
+
+def test_all_kinds_json_serializable():
+    for kind in KINDS:
+        json.dumps(generate_sample_data(kind, 100))
@@ -0,0 +1,32 @@
+import pytest
+
+from serdes_bench.schema import ListOf, Record, Union, Unsupported, infer, merge, nullable, strip_absent
+
+
+def test_infer_records_merge_optional_keys():
+    t = infer({"items": [{"a": 1, "b": "x"}, {"a": 2.5}]})
+    item = t.fields["items"].item
+    assert isinstance(item, Record)
+    assert item.fields == {"a": "float", "b": "str"}
+    assert item.required == {"a"}
+
+
+def test_infer_list_starting_with_none_is_nullable():
+    t = infer([None, 1, 2])
+    assert nullable(t.item) == (True, "int")
+
+
+def test_merge_mixed_kinds_is_union():
+    assert merge("str", "int") == Union(("str", "int"))
+    assert merge(ListOf("null"), ListOf("int")) == ListOf("int")
+
+
+def test_unsupported_value():
+    with pytest.raises(Unsupported):
+        infer({"s": {1, 2}})
+
+
+def test_strip_absent_drops_filled_in_optionals():
+    t = infer({"xs": [{"a": 1, "b": 2}, {"a": 3}]})
+    decoded = {"xs": [{"a": 1, "b": 2}, {"a": 3, "b": None}]}
+    assert strip_absent(decoded, t) == {"xs": [{"a": 1, "b": 2}, {"a": 3}]}
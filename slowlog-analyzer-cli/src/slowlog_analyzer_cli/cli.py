@@ -1,11 +1,12 @@
 import sys
 import typer
 from pathlib import Path
-from typing import TextIO
+from typing import List
 
 from . import __version__
-from .parser import parse_log, detect_format
-from .stats import compute_stats
+from .parser import detect_format, iter_queries
+from .pipeline import aggregate_files
+from .stats import Aggregator
 from .visualizer import print_table, print_histogram, output_json, show_progress
 from rich.console import Console
 
@@ -14,7 +15,7 @@ app = typer.Typer()
 
 @app.command(no_args_is_help=True)
 def main(
-    log_file: Path = typer.Argument(..., help="Log file path (- for stdin)"),
+    log_files: List[Path] = typer.Argument(..., help="Log file paths (- for stdin)"),
     format_: str = typer.Option("auto", "--format", "-f", help="postgres/mysql/auto"),
     min_duration: float = typer.Option(0.0, "--min-duration", help="Filter (ms)"),
     top_n: int = typer.Option(20, "--top", "-n", help="Top queries"),
@@ -22,24 +23,28 @@ def main(
     histogram: bool = typer.Option(False, "--histogram"),
     suggestions: bool = typer.Option(True, "--suggestions/-S"),
     version: bool = typer.Option(False, "--version"),
+    workers: int = typer.Option(0, "--workers", "-j", help="Parallel file parsers (0 = all CPUs)"),
 ):
     if version:
         console.print(f"slowlog-analyzer-cli {__version__}")
         raise typer.Exit()
 
-    input_path = str(log_file)
+    input_paths = [str(p) for p in log_files]
     fmt = format_
 
-    if fmt == "auto":
-        fmt = detect_format(input_path)
+    if fmt == "auto" and len(input_paths) == 1:
+        fmt = detect_format(input_paths[0])
         console.print(f"[green]Auto-detected format: {fmt}[/green]")
 
     with show_progress("Parsing log"):
-        queries = parse_log(input_path, fmt, min_duration)
+        if input_paths == ["-"]:
+            agg = Aggregator().consume(iter_queries("-", fmt, min_duration))
+        else:
+            agg = aggregate_files(input_paths, fmt, min_duration, workers)
 
-    console.print(f"[bold green]Parsed {len(queries)} queries (>= {min_duration}ms)[/bold green]")
+    console.print(f"[bold green]Parsed {agg.count} queries (>= {min_duration}ms)[/bold green]")
 
-    aggs, samples = compute_stats(queries, top_n)
+    aggs, samples = agg.to_frame(top_n), agg.samples()
 
     if output == "table":
         print_table(aggs, samples, suggestions)
@@ -50,7 +55,7 @@ def main(
         return
 
     if histogram:
-        print_histogram(aggs)
+        print_histogram(agg.durations)
 
 
 if __name__ == "main":
@@ -1,25 +1,45 @@
 import re
 import hashlib
+from functools import lru_cache
 from typing import Dict
 
+CACHE_SIZE = 1 << 16
 
+# One alternation, scanned once: every literal, comment and separator class
+# is recognized in a single left-to-right pass.
+_TOKEN = re.compile(
+    r"""
+    (?P<comment>/\*.*?(?:\*/|$)|--[^\n]*|\#[^\n]*)
+    |(?P<string>'(?:[^'\\]|\\.|'')*(?:'|$))
+    |(?P<number>0x[0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<param>\$\d+|\?)
+    |(?P<word>[A-Za-z_][\w$]*(?:\.[A-Za-z_][\w$]*)*|`[^`]*`|"[^"]*")
+    |(?P<space>\s+)
+    |(?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize(query: str) -> str:
+    """Lowercased query with comments dropped, literals as `?` and single spaces."""
+    out = []
+    for m in _TOKEN.finditer(query):
+        kind = m.lastgroup
+        if kind in ("comment", "space"):
+            continue
+        if kind in ("string", "number", "param"):
+            out.append("?")
+        else:
+            out.append(m.group().lower())
+    return " ".join(out)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
 def fingerprint(query: str) -> str:
     """Normalize query and return short hash for grouping."""
-    # Remove comments
-    query = re.sub(r"/\*.*?\*/", "", query, flags=re.DOTALL | re.MULTILINE)
-    # Lowercase
-    query = query.lower()
-    # Remove string literals
-    query = re.sub(r"'([^']|\\.)*'", "'?'", query)
-    # Remove numbers and hex
-    query = re.sub(r"\b(?:(?:0x)?[0-9a-f]+|\d+(?:\.\d+)?)\b", "?", query)
-    # Normalize whitespace
-    query = re.sub(r"\s+", " ", query)
-    query = query.strip()
-    # Remove empty params
-    query = re.sub(r"\s*\?\s*", " ? ", query)
-    # Hash
-    return hashlib.sha256(query.encode("utf-8")).hexdigest()[:12]
+    return hashlib.blake2b(normalize(query).encode("utf-8"), digest_size=6).hexdigest()
 
 
 def fingerprint_sample_queries(queries: Dict[str, str]) -> Dict[str, str]:
@@ -1,7 +1,7 @@
 import re
 import sys
 from pathlib import Path
-from typing import Iterator, List, Optional, TextIO
+from typing import Iterable, Iterator, List, Optional
 from .models import SlowQuery
 
 
@@ -20,21 +20,31 @@ def detect_format(input_path: str, num_sample: int = 50) -> str:
     return "postgres" if pg_hits >= mysql_hits else "mysql"
 
 
+_PG_DURATION = re.compile(r"duration:\s*([\d.]+)\s*ms", re.IGNORECASE)
+_PG_TIMESTAMP = re.compile(r"(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})")
+_PG_USER_DB = re.compile(r"([\w-]+)@([\w-]+)")
+_PG_QUERY = re.compile(r"(?:statement|execute[^:]*):\s*(.*)$", re.IGNORECASE | re.DOTALL)
+_PG_BARE_QUERY = re.compile(r"\b((?:select|insert|update|delete|with)\b.*)$", re.IGNORECASE | re.DOTALL)
+_MYSQL_USER = re.compile(r"([\w-]+)\[([\w-]*?)\]")
+_MYSQL_QUERY_TIME = re.compile(r"Query_time:\s*([\d.]+)")
+
+
 def extract_postgres(line: str) -> Optional[SlowQuery]:
-    dur_match = re.search(r"duration:\s*([\d.]+)\s*ms", line, re.IGNORECASE)
+    if "duration" not in line:  # cheap reject before any regex
+        return None
+    dur_match = _PG_DURATION.search(line)
     if not dur_match:
         return None
     duration_ms = float(dur_match.group(1))
-    ts_match = re.search(r"(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})", line)
+    ts_match = _PG_TIMESTAMP.search(line)
     timestamp = ts_match.group(1) if ts_match else "unknown"
-    user_db_match = re.search(r"([\w-]+)@([\w-]+)", line)
+    user_db_match = _PG_USER_DB.search(line)
     user, database = "", ""
     if user_db_match:
         user, database = user_db_match.groups()
     # Query: after duration or execute/ID:
-    query_start = re.search(r"(?:duration|execute|statement):.*?([a-z]+\s+", line, re.IGNORECASE | re.DOTALL)
-    query_match = re.search(r"(select|insert|update|delete|execute[^:]*:\s*)(.*)$", line, re.IGNORECASE | re.DOTALL)
-    query = query_match.group(2).strip() if query_match else "unknown"
+    query_match = _PG_QUERY.search(line) or _PG_BARE_QUERY.search(line)
+    query = query_match.group(1).strip() if query_match else "unknown"
     return SlowQuery(timestamp, duration_ms, user, database, query)
 
 
@@ -56,12 +66,12 @@ def parse_mysql(lines: Iterator[str]) -> Iterator[SlowQuery]:
             if line.startswith("# Time:"):
                 current["timestamp"] = line[7:].strip()
             elif "User@Host:" in line:
-                m = re.search(r"([\w-]+)\[([\w-]*?)\]", line)
+                m = _MYSQL_USER.search(line)
                 if m:
                     current["user"] = m.group(1)
                     current["database"] = m.group(2)
             elif "Query_time:" in line:
-                m = re.search(r"Query_time:\s*([\d.]+)", line)
+                m = _MYSQL_QUERY_TIME.search(line)
                 if m:
                     current["query_time"] = m.group(1)
             continue
@@ -79,21 +89,29 @@ def parse_mysql(lines: Iterator[str]) -> Iterator[SlowQuery]:
         )
 
 
-def parse_log(input_path: str, fmt: str, min_duration: float = 0.0) -> List[SlowQuery]:
-    """Parse log returning filtered queries."""
-    queries: List[SlowQuery] = []
+def iter_queries(input_path: str, fmt: str, min_duration: float = 0.0) -> Iterator[SlowQuery]:
+    """Stream filtered queries from a log file (or stdin for "-") without buffering them."""
     if input_path == "-":
-        lines = iter(sys.stdin.readline, "")
-    else:
-        with open(input_path) as f:
-            lines = iter(f.readline, "")
+        yield from _filter(sys.stdin, fmt, min_duration)
+        return
+    with open(input_path, errors="replace") as f:
+        yield from _filter(f, fmt, min_duration)
+
+
+def _filter(lines: Iterable[str], fmt: str, min_duration: float) -> Iterator[SlowQuery]:
     if fmt == "postgres":
         for line in lines:
             q = extract_postgres(line)
             if q and q.duration_ms >= min_duration:
-                queries.append(q)
+                yield q
     elif fmt == "mysql":
         for q in parse_mysql(lines):
             if q.duration_ms >= min_duration:
-                queries.append(q)
-    return queries
+                yield q
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+
+def parse_log(input_path: str, fmt: str, min_duration: float = 0.0) -> List[SlowQuery]:
+    """Parse log returning filtered queries."""
+    return list(iter_queries(input_path, fmt, min_duration))
@@ -0,0 +1,43 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Deque, Iterator, List, Optional
+
+from .parser import detect_format, iter_queries
+from .stats import Aggregator
+
+
+def aggregate_file(input_path: str, fmt: str = "auto", min_duration: float = 0.0) -> Aggregator:
+    """Parse one log and fold it straight into per-fingerprint aggregates."""
+    if fmt == "auto":
+        fmt = detect_format(input_path)
+    return Aggregator().consume(iter_queries(input_path, fmt, min_duration))
+
+
+def _map_files(paths: List[str], fmt: str, min_duration: float, workers: int) -> Iterator[Aggregator]:
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield aggregate_file(path, fmt, min_duration)
+        return
+    # polars (imported by stats) keeps a thread pool, so do not fork.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths)), mp_context=ctx) as pool:
+        pending: Deque = deque()
+        for path in paths:
+            pending.append(pool.submit(aggregate_file, path, fmt, min_duration))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def aggregate_files(
+    paths: List[str], fmt: str = "auto", min_duration: float = 0.0, workers: Optional[int] = None
+) -> Aggregator:
+    """Aggregate several logs, one process per file, and merge the per-file results."""
+    workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
+    total = Aggregator()
+    for partial in _map_files(paths, fmt, min_duration, workers):
+        total.merge(partial)
+    return total
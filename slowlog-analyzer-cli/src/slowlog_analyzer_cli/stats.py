@@ -1,32 +1,159 @@
+import math
 import polars as pl
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
 from .models import SlowQuery
 from .fingerprint import fingerprint
 
+QUANTILES = (0.5, 0.95, 0.99)
 
-def compute_stats(queries: List[SlowQuery], top_n: int = 20) -> Tuple[pl.DataFrame, Dict[str, str]]:
+
+class DurationSketch:
+    """
+    Mergeable log-bucket quantile sketch: any quantile is returned within
+    `relative_accuracy` of a value actually observed at that rank.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        self.count += count
+        if value <= 0:
+            self.zeros += count
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def merge(self, other: "DurationSketch") -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """Several quantiles from one pass over the sorted buckets."""
+        qs = list(qs)
+        if not self.count:
+            return [0.0] * len(qs)
+        ranks = sorted((q * (self.count - 1), i) for i, q in enumerate(qs))
+        out = [0.0] * len(qs)
+        acc = self.zeros
+        r = 0
+        while r < len(ranks) and ranks[r][0] < acc:
+            r += 1  # falls among the zeros
+        for key in sorted(self.buckets):
+            acc += self.buckets[key]
+            while r < len(ranks) and ranks[r][0] < acc:
+                out[ranks[r][1]] = self._value(key)
+                r += 1
+            if r == len(ranks):
+                break
+        return out
+
+    def histogram(self) -> List[Tuple[float, int]]:
+        """(bucket value, count) pairs in ascending order."""
+        pairs = [(0.0, self.zeros)] if self.zeros else []
+        return pairs + [(self._value(k), self.buckets[k]) for k in sorted(self.buckets)]
+
+
+@dataclass
+class QueryAggregate:
+    """Streaming totals for one fingerprint."""
+
+    sample: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    sketch: DurationSketch = field(default_factory=DurationSketch)
+
+    def add(self, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+        self.sketch.add(duration_ms)
+
+    def merge(self, other: "QueryAggregate") -> None:
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self.sketch.merge(other.sketch)
+
+
+class Aggregator:
+    """Folds a stream of SlowQuery into per-fingerprint aggregates in O(fingerprints) memory."""
+
+    def __init__(self):
+        self.by_fp: Dict[str, QueryAggregate] = {}
+        self.durations = DurationSketch()  # all queries, for the histogram
+
+    @property
+    def count(self) -> int:
+        return self.durations.count
+
+    def add(self, query: SlowQuery) -> None:
+        fp = fingerprint(query.query)
+        agg = self.by_fp.get(fp)
+        if agg is None:
+            agg = self.by_fp[fp] = QueryAggregate(query.query)
+        agg.add(query.duration_ms)
+        self.durations.add(query.duration_ms)
+
+    def consume(self, queries: Iterable[SlowQuery]) -> "Aggregator":
+        for q in queries:
+            self.add(q)
+        return self
+
+    def merge(self, other: "Aggregator") -> "Aggregator":
+        for fp, agg in other.by_fp.items():
+            mine = self.by_fp.get(fp)
+            if mine is None:
+                self.by_fp[fp] = agg
+            else:
+                mine.merge(agg)
+        self.durations.merge(other.durations)
+        return self
+
+    def samples(self) -> Dict[str, str]:
+        return {fp: agg.sample for fp, agg in self.by_fp.items()}
+
+    def to_frame(self, top_n: Optional[int] = 20) -> pl.DataFrame:
+        """Top fingerprints by total time, with count/avg/total/p50/p95/p99/max."""
+        if not self.by_fp:
+            return pl.DataFrame()
+        top = sorted(self.by_fp.items(), key=lambda kv: kv[1].total_ms, reverse=True)
+        if top_n is not None:
+            top = top[:top_n]
+        rows = []
+        for fp, agg in top:
+            p50, p95, p99 = agg.sketch.quantiles(QUANTILES)
+            rows.append(
+                {
+                    "fp": fp,
+                    "count": agg.count,
+                    "avg_duration_ms": round(agg.total_ms / agg.count, 2),
+                    "total_duration_ms": agg.total_ms,
+                    "p50_ms": p50,
+                    "p95_ms": p95,
+                    "p99_ms": p99,
+                    "max_ms": agg.max_ms,
+                }
+            )
+        return pl.DataFrame(rows)
+
+
+def compute_stats(queries: Iterable[SlowQuery], top_n: int = 20) -> Tuple[pl.DataFrame, Dict[str, str]]:
     """Compute aggregated stats and sample queries by fp."""
-    if not queries:
-        return pl.DataFrame(), {}
-
-    fps = [fingerprint(q.query) for q in queries]
-    sample_queries = {}
-    for fp, q in zip(fps, queries):
-        if fp not in sample_queries:
-            sample_queries[fp] = q.query
-
-    df = pl.DataFrame({
-        "fp": fps,
-        "duration_ms": [q.duration_ms for q in queries],
-        "user": [q.user for q in queries],
-        "database": [q.database for q in queries],
-    })
-
-    aggs = df.group_by("fp").agg([
-        pl.count().alias("count"),
-        pl.col("duration_ms").mean().round(2).alias("avg_duration_ms"),
-        pl.col("duration_ms").sum().alias("total_duration_ms"),
-        pl.col("duration_ms").quantile(0.95).alias("p95_ms"),
-    ]).sort("total_duration_ms", descending=True).head(top_n)
-
-    return aggs, sample_queries
+    agg = Aggregator().consume(queries)
+    return agg.to_frame(top_n), agg.samples()
@@ -1,16 +1,20 @@
 import json
+from contextlib import contextmanager
+
 import polars as pl
 from rich.console import Console
 from rich.table import Table
 from rich.live import Live
 from rich.progress import SpinnerColumn, TextColumn, Progress
-from plotext import plot, hist, show as plot_show
+import plotext
 from typing import Dict, Any
+from .stats import DurationSketch
 from .suggester import suggest
 
 console = Console()
 
 
+@contextmanager
 def show_progress(task: Any):
     with Live(
         Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")),
@@ -26,6 +30,7 @@ def print_table(df: pl.DataFrame, sample_queries: Dict[str, str], show_sugs: boo
     table.add_column("Avg Dur", justify="right")
     table.add_column("Total Dur", justify="right")
     table.add_column("P95", justify="right")
+    table.add_column("P99", justify="right")
     table.add_column("Sample Query", max_width=60)
     if show_sugs:
         table.add_column("Suggestions", max_width=50)
@@ -40,21 +45,34 @@ def print_table(df: pl.DataFrame, sample_queries: Dict[str, str], show_sugs: boo
             f"{row['avg_duration_ms']:.1f}ms",
             f"{row['total_duration_ms']/1000:.2f}s",
             f"{row['p95_ms']:.0f}ms",
+            f"{row['p99_ms']:.0f}ms",
             samp_q,
             sugs,
         )
     console.print(table)
 
 
-def print_histogram(df: pl.DataFrame):
-    durations = df["duration_ms"].to_list()
-    if durations:
-        try:
-            hist(durations, bins=25, width=80, height=15)
-            plot.title("Query Duration Histogram (ms) | log scale")
-            plot_show()
-        except:
-            console.print("[yellow]Histogram skipped (plotext issue)[/yellow]")
+def print_histogram(sketch: DurationSketch, bins: int = 25):
+    """Duration histogram from the sketch buckets, regrouped into `bins` log-spaced bars."""
+    pairs = [(v, c) for v, c in sketch.histogram() if v > 0]
+    if not pairs:
+        return
+    lo, hi = pairs[0][0], pairs[-1][0]
+    step = (hi / lo) ** (1 / bins) if hi > lo else 2.0
+    edges = [lo * step**i for i in range(bins + 1)]
+    counts = [0] * bins
+    for value, count in pairs:
+        i = 0
+        while i < bins - 1 and value >= edges[i + 1]:
+            i += 1
+        counts[i] += count
+    try:
+        plotext.bar([f"{e:.0f}" for e in edges[:-1]], counts, width=80)
+        plotext.plotsize(80, 15)
+        plotext.title("Query Duration Histogram (ms) | log scale")
+        plotext.show()
+    except Exception:
+        console.print("[yellow]Histogram skipped (plotext issue)[/yellow]")
 
 
 def output_json(df: pl.DataFrame, sample_queries: Dict[str, str]):
@@ -1,5 +1,5 @@
 import pytest
-from slowlog_analyzer_cli.fingerprint import fingerprint
+from slowlog_analyzer_cli.fingerprint import fingerprint, normalize
 
 
 @pytest.mark.parametrize(
@@ -22,3 +22,15 @@ def test_fingerprint_unique():
     fp1 = fingerprint("SELECT * FROM a")
     fp2 = fingerprint("SELECT * FROM b")
     assert fp1 != fp2
+
+
+def test_normalize_single_pass():
+    q = "/* x */ SELECT a.b FROM t WHERE s = 'it''s' AND n IN (1, 2.5e3, 0xff) AND p = $1 -- tail"
+    assert normalize(q) == "select a.b from t where s = ? and n in ( ? , ? , ? ) and p = ?"
+
+
+def test_fingerprint_cached():
+    fingerprint.cache_clear()
+    fingerprint("SELECT 1")
+    fingerprint("SELECT 1")
+    assert fingerprint.cache_info().hits == 1
@@ -0,0 +1,37 @@
+from slowlog_analyzer_cli.parser import iter_queries
+from slowlog_analyzer_cli.pipeline import aggregate_file, aggregate_files
+
+PG_LINES = [
+    "2024-04-01 12:00:00.123 UTC [1] u@db LOG:  duration: 10.0 ms  statement: select * from t where id = 1\n",
+    "2024-04-01 12:00:00.124 UTC [1] u@db LOG:  duration: 30.0 ms  statement: select * from t where id = 2\n",
+    "2024-04-01 12:00:00.125 UTC [1] u@db LOG:  connection received\n",
+    "2024-04-01 12:00:00.126 UTC [1] u@db LOG:  duration: 5.0 ms  statement: delete from t where id = 3\n",
+]
+
+
+def test_iter_queries_streams(tmp_path):
+    log = tmp_path / "pg.log"
+    log.write_text("".join(PG_LINES))
+    it = iter_queries(str(log), "postgres", min_duration=6)
+    assert next(it).duration_ms == 10.0
+    assert [q.duration_ms for q in it] == [30.0]
+
+
+def test_aggregate_file_auto_format(tmp_path):
+    log = tmp_path / "pg.log"
+    log.write_text("".join(PG_LINES))
+    agg = aggregate_file(str(log))
+    assert agg.count == 3
+    assert len(agg.by_fp) == 2
+
+
+def test_aggregate_files_parallel_matches_serial(tmp_path):
+    paths = []
+    for i in range(3):
+        log = tmp_path / f"pg{i}.log"
+        log.write_text("".join(PG_LINES) * (i + 1))
+        paths.append(str(log))
+    serial = aggregate_files(paths, "postgres", workers=1)
+    parallel = aggregate_files(paths, "postgres", workers=2)
+    assert serial.count == parallel.count == 18
+    assert serial.to_frame().to_dicts() == parallel.to_frame().to_dicts()
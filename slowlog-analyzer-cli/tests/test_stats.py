@@ -1,5 +1,5 @@
 import pytest
-from slowlog_analyzer_cli.stats import compute_stats
+from slowlog_analyzer_cli.stats import Aggregator, DurationSketch, compute_stats
 from slowlog_analyzer_cli.models import SlowQuery
 
 
@@ -18,3 +18,27 @@ def test_compute_stats(sample_queries):
     assert df["count"][0] == 2
     assert df["avg_duration_ms"][0] == 150.0
     assert len(samples) == 2
+
+
+def test_sketch_quantiles_within_accuracy():
+    sketch = DurationSketch(0.01)
+    values = [float(v) for v in range(1, 1001)]
+    for v in values:
+        sketch.add(v)
+    p50, p95, p99 = sketch.quantiles([0.5, 0.95, 0.99])
+    assert p50 == pytest.approx(500, rel=0.02)
+    assert p95 == pytest.approx(950, rel=0.02)
+    assert p99 == pytest.approx(990, rel=0.02)
+
+
+def test_aggregators_merge_like_one_pass(sample_queries):
+    whole = Aggregator().consume(sample_queries)
+    merged = Aggregator().consume(sample_queries[:1]).merge(Aggregator().consume(sample_queries[1:]))
+    assert merged.to_frame().to_dicts() == whole.to_frame().to_dicts()
+    assert merged.count == 3
+
+
+def test_compute_stats_accepts_generator(sample_queries):
+    df, _ = compute_stats(q for q in sample_queries)
+    assert df["total_duration_ms"].to_list() == [300.0, 150.0]
+    assert set(df.columns) >= {"p50_ms", "p95_ms", "p99_ms", "max_ms"}
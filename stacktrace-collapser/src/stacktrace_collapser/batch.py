@@ -0,0 +1,175 @@
+"""
+Bulk aggregation of stack traces from large logs.
+
+Logs are streamed line by line and cut into traces. Every frame is interned
+to an integer id in a FrameTable, so a stack is a tuple of ints and
+identical stacks dedupe through a dict of those tuples. Files are processed
+in parallel, each worker with its own table; the parent remaps worker ids
+into one table when merging.
+"""
+import gzip
+import itertools
+import re
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Deque, Iterable, Iterator, List, Optional, Sequence
+
+from .core import collapse_ids
+from .parsers import CONTINUATION, FRAME_LINE, OUTERMOST_FIRST, detect_language
+
+FrameKey = tuple[str, int, str]  # (file, line, func)
+
+DETECT_BYTES = 64 * 1024
+_GO_ARGS = re.compile(r"\(.*\)$")
+
+
+class FrameTable:
+    """Interns frames to dense integer ids."""
+
+    __slots__ = ("ids", "frames")
+
+    def __init__(self) -> None:
+        self.ids: dict[FrameKey, int] = {}
+        self.frames: List[FrameKey] = []
+
+    def intern(self, key: FrameKey) -> int:
+        fid = self.ids.get(key)
+        if fid is None:
+            fid = self.ids[key] = len(self.frames)
+            self.frames.append(key)
+        return fid
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+
+@dataclass
+class Aggregate:
+    """Counts per unique stack (deepest frame first) over interned frames."""
+
+    table: FrameTable = field(default_factory=FrameTable)
+    stacks: Counter = field(default_factory=Counter)
+    traces: int = 0
+    files: int = 0
+
+    def add(self, stack: tuple[int, ...]) -> None:
+        self.stacks[stack] += 1
+        self.traces += 1
+
+    def merge(self, other: "Aggregate") -> None:
+        remap = [self.table.intern(key) for key in other.table.frames]
+        for stack, n in other.stacks.items():
+            self.stacks[tuple([remap[i] for i in stack])] += n
+        self.traces += other.traces
+        self.files += other.files
+
+    def most_common(self, n: int = 0) -> List[tuple[List[FrameKey], int]]:
+        frames = self.table.frames
+        ranked = self.stacks.most_common(n or None)
+        return [([frames[i] for i in stack], count) for stack, count in ranked]
+
+
+class TraceScanner:
+    """Cut a stream of log lines into traces of one language."""
+
+    def __init__(self, language: str, agg: Aggregate, collapse: bool = False):
+        self.frame_line = FRAME_LINE[language]
+        self.continuation = CONTINUATION[language]
+        self.reverse = language in OUTERMOST_FIRST
+        self.go = language == "go"
+        self.agg = agg
+        self.collapse = collapse
+        self.current: List[int] = []
+        self.previous = ""
+        # Raw frame line -> id: repeated frames skip the regex. Not for Go,
+        # whose function name comes from the line before.
+        self.seen: dict[str, int] = {}
+
+    def feed(self, line: str) -> None:
+        fid = self.seen.get(line)
+        if fid is not None:
+            self.current.append(fid)
+            return
+        m = self.frame_line.match(line)
+        if m is not None:
+            func = m.group("func") if not self.go else _GO_ARGS.sub("()", self.previous.strip())
+            fid = self.agg.table.intern((m.group("file"), int(m.group("line") or 0), func))
+            if not self.go:
+                self.seen[line] = fid
+            self.current.append(fid)
+        elif self.current and not self.continuation.match(line):
+            self.close()
+        self.previous = line
+
+    def close(self) -> None:
+        if not self.current:
+            return
+        stack = self.current[::-1] if self.reverse else self.current
+        self.agg.add(collapse_ids(tuple(stack)) if self.collapse else tuple(stack))
+        self.current = []
+
+
+def _open(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", errors="replace")
+    return open(path, "r", errors="replace")
+
+
+def scan_lines(lines: Iterable[str], language: str, agg: Aggregate, collapse: bool = False) -> Aggregate:
+    scanner = TraceScanner(language, agg, collapse)
+    for line in lines:
+        scanner.feed(line)
+    scanner.close()
+    return agg
+
+
+def aggregate_file(path: Path, language: Optional[str] = None, collapse: bool = False) -> Aggregate:
+    """Stream one log file (.gz ok). Without `language`, detect it from the first 64 KiB."""
+    agg = Aggregate(files=1)
+    with _open(path) as f:
+        head: List[str] = []
+        size = 0
+        while size < DETECT_BYTES and (line := f.readline()):
+            head.append(line)
+            size += len(line)
+        if language is None:
+            try:
+                language = detect_language("".join(head))
+            except ValueError:
+                return agg  # no recognizable traces in this file
+        return scan_lines(itertools.chain(head, f), language, agg, collapse)
+
+
+def aggregate_files(
+    paths: Sequence[Path], jobs: int = 1, language: Optional[str] = None, collapse: bool = False
+) -> Aggregate:
+    """Aggregate many files, `jobs` at a time in worker processes."""
+    total = Aggregate()
+    if jobs <= 1 or len(paths) <= 1:
+        for path in paths:
+            total.merge(aggregate_file(path, language, collapse))
+        return total
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending: Deque[Future] = deque()
+        for path in paths:
+            pending.append(pool.submit(aggregate_file, path, language, collapse))
+            if len(pending) >= 2 * jobs:
+                total.merge(pending.popleft().result())
+        while pending:
+            total.merge(pending.popleft().result())
+    return total
+
+
+def frame_label(key: FrameKey) -> str:
+    file, line, func = key
+    return f"{func} ({Path(file).name}:{line})".replace(";", ":")
+
+
+def iter_folded(agg: Aggregate) -> Iterator[str]:
+    """Folded stacks (root;...;leaf count), the input format of flamegraph tools."""
+    labels = [frame_label(key) for key in agg.table.frames]
+    for stack, count in agg.stacks.items():
+        yield ";".join(labels[i] for i in reversed(stack)) + f" {count}"
@@ -1,19 +1,26 @@
+import os
 import sys
+import tempfile
+import webbrowser
+
 import typer
 from pathlib import Path
+from typing import List, Optional
+
 from rich.console import Console
 from rich.traceback import install as rich_traceback
 from . import __version__
 from .config import get_default_config_path, load_config, Config
-from .parsers import detect_language, parse
+from .parsers import FRAME_LINE, detect_language, parse
+from .batch import aggregate_files, iter_folded
 from .core import collapse_frames
 from .models import Stacktrace, Frame
-from .renderer import render_terminal, render_html, render_json
+from .renderer import render_terminal, render_html, render_json, render_batch_json, render_stack_table
 
 
 app = typer.Typer(no_args_is_help=True)
 console = Console()
-rich_traceback(console=console, suppress=[typer.core.TyperInvocation])
+rich_traceback(console=console, suppress=[typer])
 
 
 @app.command()
@@ -72,6 +79,49 @@ def main(
         raise typer.Exit(1)
 
 
+@app.command()
+def batch(
+    files: List[Path] = typer.Argument(..., help="Log files with many traces (.gz ok)"),
+    language: Optional[str] = typer.Option(
+        None, "-l", "--language", help="python|nodejs|java|go (default: detect per file)"
+    ),
+    format: str = typer.Option("terminal", "-f", "--format", help="Output: terminal|folded|json"),
+    top: int = typer.Option(20, "-n", "--top", min=0, help="Stacks to show, most frequent first (0: all)"),
+    jobs: int = typer.Option(os.cpu_count() or 1, "-j", "--jobs", min=1, help="Files parsed in parallel"),
+    collapse: bool = typer.Option(
+        False, "--collapse-repeats", help="Collapse recursion so stacks differing only in depth merge"
+    ),
+    output: Optional[Path] = typer.Option(None, "-o", "--output", help="Write to file instead of stdout"),
+) -> None:
+    """Count unique stacks across large crash logs; folded output feeds flamegraphs."""
+
+    if language is not None and language not in FRAME_LINE:
+        typer.echo(f"Unsupported language: {language}", err=True)
+        raise typer.Exit(1)
+    if format not in ("terminal", "folded", "json"):
+        typer.echo(f"Unknown format: {format}", err=True)
+        raise typer.Exit(1)
+    missing = [f for f in files if not f.is_file()]
+    if missing:
+        typer.echo(f"Not a file: {missing[0]}", err=True)
+        raise typer.Exit(1)
+
+    agg = aggregate_files(files, jobs, language, collapse)
+
+    out = open(output, "w") if output else sys.stdout
+    try:
+        if format == "folded":
+            for line in iter_folded(agg):
+                out.write(line + "\n")
+        elif format == "json":
+            out.write(render_batch_json(agg, top) + "\n")
+        else:
+            render_stack_table(agg, top, Console(file=out) if output else console)
+    finally:
+        if output:
+            out.close()
+
+
 @app.command()
 def version():
     typer.echo(f"stacktrace-collapser {__version__}")
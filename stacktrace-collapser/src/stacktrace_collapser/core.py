@@ -1,3 +1,4 @@
+from dataclasses import replace
 from typing import List
 from .models import Frame
 
@@ -17,12 +18,7 @@ def collapse_frames(frames: List[Frame], threshold: int = 2) -> List[Frame]:
     for frame in frames[1:]:
         # Identical frame?
         prev = current_group[0]
-        if (
-            frame.file == prev.file
-            and frame.func == prev.func
-            and frame.line == prev.line
-            and len(current_group) < 100  # Sanity limit
-        ):
+        if frame.key == prev.key and len(current_group) < 100:  # Sanity limit
             current_group.append(frame)
         else:
             _append_group(collapsed, current_group, threshold)
@@ -34,7 +30,16 @@ def collapse_frames(frames: List[Frame], threshold: int = 2) -> List[Frame]:
 
 def _append_group(collapsed: List[Frame], group: List[Frame], threshold: int):
     if len(group) >= threshold:
-        first = group[0].model_copy(update={"count": len(group)})
+        first = replace(group[0], count=len(group))
         collapsed.append(first)
     else:
         collapsed.extend(group)
+
+
+def collapse_ids(stack: tuple[int, ...]) -> tuple[int, ...]:
+    """Collapse consecutive repeats of interned frame ids (recursion) to one id."""
+    out: List[int] = []
+    for fid in stack:
+        if not out or out[-1] != fid:
+            out.append(fid)
+    return tuple(out)
@@ -1,9 +1,16 @@
-from typing import Optional
+from dataclasses import dataclass, replace
+from typing import Any, Optional
 from pydantic import BaseModel
 
 
-class Frame(BaseModel):
-    """A single stack frame."""
+@dataclass(slots=True)
+class Frame:
+    """
+    A single stack frame.
+
+    A slotted dataclass rather than a pydantic model: batch mode handles
+    millions of frames, and parsers already produce well-typed values.
+    """
 
     file: str
     line: int
@@ -11,6 +18,15 @@ class Frame(BaseModel):
     col: Optional[int] = None
     count: int = 1
 
+    @property
+    def key(self) -> tuple[str, int, str]:
+        """Identity used for collapsing and interning (column and count excluded)."""
+        return (self.file, self.line, self.func)
+
+    def model_copy(self, update: Optional[dict[str, Any]] = None) -> "Frame":
+        """Same call shape as pydantic's, for existing callers."""
+        return replace(self, **(update or {}))
+
 
 class Stacktrace(BaseModel):
     """Parsed and collapsed stacktrace."""
@@ -5,8 +5,11 @@ from .models import Frame
 parsers: Dict[str, callable] = {}
 
 
-def register_parser(lang: str, parser_fn):
-    parsers[lang] = parser_fn
+def register_parser(lang: str):
+    def decorator(parser_fn):
+        parsers[lang] = parser_fn
+        return parser_fn
+    return decorator
 
 
 @register_parser("python")
@@ -69,9 +72,34 @@ def parse_go(content: str) -> List[Frame]:
     return frames
 
 
+# One frame per line, for streaming logs line by line (batch mode). Go frames
+# span two lines: the function, then a tab-indented file:line, matched here.
+FRAME_LINE: Dict[str, re.Pattern] = {
+    "python": re.compile(r'^\s*File "(?P<file>.+?)", line (?P<line>\d+), in (?P<func>.+?)\s*$'),
+    "nodejs": re.compile(
+        r'^\s*at\s+(?P<func>.+?)\s*\((?P<file>.+?):(?P<line>\d+)(?::(?P<col>\d+))?\)\s*$'
+    ),
+    "java": re.compile(r'^\s*at\s+(?P<func>[^(\s]+)\((?P<file>[^:()]+)(?::(?P<line>\d+))?\)\s*$'),
+    "go": re.compile(r'^\t(?P<file>[^\s:]+):(?P<line>\d+)(?:\s+\+0x[0-9a-f]+)?\s*$'),
+}
+
+# Non-frame lines that still belong to the current trace (source lines,
+# unparseable frames, "... N more"). Anything else ends it; for Go only a
+# blank line does.
+CONTINUATION: Dict[str, re.Pattern] = {
+    "python": re.compile(r'^\s+\S'),
+    "nodejs": re.compile(r'^\s+at\s'),
+    "java": re.compile(r'^\s+(at\s|\.\.\. \d+ (more|common frames omitted))'),
+    "go": re.compile(r'^.*\S'),
+}
+
+# Python prints the outermost frame first; the others print deepest first.
+OUTERMOST_FIRST = {"python"}
+
+
 def detect_language(content: str) -> str:
     content_lower = content.lower()
-    if 'file "' in content and 'line ' in content and 'in ' in content:
+    if 'file "' in content_lower and 'line ' in content_lower and 'in ' in content:
         return "python"
     if 'at ' in content_lower and any(ext in content for ext in ['.js:', '.ts:', '.mjs:', '.cjs:']):
         return "nodejs"
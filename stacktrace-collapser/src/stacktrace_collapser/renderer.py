@@ -1,3 +1,4 @@
+import json
 import tempfile
 import webbrowser
 import os
@@ -5,9 +6,10 @@ from pathlib import Path
 from typing import Dict, Any
 from rich.console import Console
 from rich.panel import Panel
+from rich.table import Table
 from rich.text import Text
-from rich_markup import RichMarkup
 from jinja2 import Template
+from .batch import Aggregate, frame_label
 from .models import Frame
 
 TEMPLATE_HTML = """
@@ -81,3 +83,38 @@ def render_html(frames: list[Frame], language: str) -> str:
 
 def render_json(st: 'Stacktrace') -> str:
     return st.model_dump_json(indent=2)
+
+
+def render_stack_table(agg: Aggregate, top: int, console: Console) -> None:
+    """Most frequent unique stacks from a batch run."""
+    table = Table(title=f"Top stacks ({agg.traces:,} traces, {len(agg.stacks):,} unique)")
+    table.add_column("Count", justify="right", style="bold")
+    table.add_column("%", justify="right")
+    table.add_column("Depth", justify="right")
+    table.add_column("Deepest frame", style="cyan")
+    table.add_column("Entry point", style="magenta dim")
+    for frames, count in agg.most_common(top):
+        table.add_row(
+            f"{count:,}",
+            f"{count / agg.traces:.1%}",
+            str(len(frames)),
+            frame_label(frames[0]),
+            frame_label(frames[-1]),
+        )
+    console.print(table)
+    console.print(
+        f"[dim]{agg.files} file(s), {len(agg.table):,} unique frames[/]"
+    )
+
+
+def render_batch_json(agg: Aggregate, top: int = 0) -> str:
+    return json.dumps({
+        "traces": agg.traces,
+        "files": agg.files,
+        "unique_stacks": len(agg.stacks),
+        "unique_frames": len(agg.table),
+        "stacks": [
+            {"count": count, "frames": [{"file": f, "line": l, "func": fn} for f, l, fn in frames]}
+            for frames, count in agg.most_common(top)
+        ],
+    }, indent=2)
@@ -0,0 +1,124 @@
+import gzip
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from stacktrace_collapser.batch import Aggregate, aggregate_file, aggregate_files, iter_folded, scan_lines
+from stacktrace_collapser.cli import app
+
+PY_TRACE = """2024-01-01 ERROR request failed
+Traceback (most recent call last):
+  File "app.py", line 10, in <module>
+    main()
+  File "views.py", line {line}, in handle
+    rec()
+  File "rec.py", line 5, in rec
+    rec()
+  File "rec.py", line 5, in rec
+    1/0
+ZeroDivisionError: division by zero
+"""
+
+JAVA_TRACE = """Exception in thread "main" java.lang.IllegalStateException: boom
+\tat com.app.Service.run(Service.java:42)
+\tat com.app.Main.main(Main.java:10)
+Caused by: java.io.IOException: x
+\tat com.app.Io.read(Io.java:3)
+\tat java.lang.Thread.run(Native Method)
+\t... 2 more
+INFO next
+"""
+
+GO_TRACE = """panic: boom
+
+goroutine 1 [running]:
+main.handle(0x{arg:x}, 0x2)
+\t/src/views.go:42 +0x88
+main.main()
+\t/src/app.go:10 +0x55
+
+"""
+
+
+def _frames(agg: Aggregate, stack):
+    return [agg.table.frames[i] for i in stack]
+
+
+def test_python_traces_dedupe():
+    log = PY_TRACE.format(line=42) * 3 + PY_TRACE.format(line=43)
+    agg = scan_lines(log.splitlines(True), "python", Aggregate())
+    assert agg.traces == 4
+    assert len(agg.stacks) == 2
+    assert len(agg.table) == 4  # frames are interned once
+    (frames, count), _ = agg.most_common()
+    assert count == 3
+    assert frames[0] == ("rec.py", 5, "rec")  # deepest first
+    assert frames[-1] == ("app.py", 10, "<module>")
+
+
+def test_collapse_repeats():
+    agg = scan_lines(PY_TRACE.format(line=42).splitlines(True), "python", Aggregate(), collapse=True)
+    (frames, _), = agg.most_common()
+    assert [f[2] for f in frames] == ["rec", "handle", "<module>"]
+
+
+def test_java_caused_by_is_own_trace():
+    agg = scan_lines(JAVA_TRACE.splitlines(True), "java", Aggregate())
+    stacks = {tuple(f[2] for f in frames) for frames, _ in agg.most_common()}
+    assert stacks == {
+        ("com.app.Service.run", "com.app.Main.main"),
+        ("com.app.Io.read", "java.lang.Thread.run"),
+    }
+
+
+def test_go_frames_ignore_arguments():
+    log = "".join(GO_TRACE.format(arg=i) for i in range(5))
+    agg = scan_lines(log.splitlines(True), "go", Aggregate())
+    assert agg.traces == 5
+    (frames, count), = agg.most_common()
+    assert count == 5
+    assert frames == [("/src/views.go", 42, "main.handle()"), ("/src/app.go", 10, "main.main()")]
+
+
+def test_parallel_matches_serial(tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"app{i}.log"
+        path.write_text(PY_TRACE.format(line=40 + i % 2) * (i + 1))
+        paths.append(path)
+    gz = tmp_path / "java.log.gz"
+    with gzip.open(gz, "wt") as f:
+        f.write(JAVA_TRACE * 2)
+    paths.append(gz)
+
+    serial = aggregate_files(paths, jobs=1)
+    parallel = aggregate_files(paths, jobs=2)
+    assert serial.traces == parallel.traces == 14
+    assert serial.files == parallel.files == 5
+    assert sorted(iter_folded(serial)) == sorted(iter_folded(parallel))
+
+
+def test_undetectable_file_is_skipped(tmp_path):
+    path = tmp_path / "plain.log"
+    path.write_text("nothing to see\n" * 10)
+    agg = aggregate_file(path)
+    assert agg.traces == 0 and agg.files == 1
+
+
+def test_folded_output():
+    agg = scan_lines(PY_TRACE.format(line=42).splitlines(True), "python", Aggregate())
+    assert list(iter_folded(agg)) == [
+        "<module> (app.py:10);handle (views.py:42);rec (rec.py:5);rec (rec.py:5) 1"
+    ]
+
+
+def test_cli_batch_json(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text(PY_TRACE.format(line=42) * 2)
+    result = CliRunner().invoke(app, ["batch", str(path), "--format", "json", "-j", "1"])
+    assert result.exit_code == 0
+    data = json.loads(result.stdout)
+    assert data["traces"] == 2
+    assert data["stacks"][0]["count"] == 2
+    assert data["stacks"][0]["frames"][0] == {"file": "rec.py", "line": 5, "func": "rec"}
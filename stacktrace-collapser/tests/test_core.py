@@ -31,3 +31,10 @@ def test_collapse_frames(frames, threshold, expected_counts):
     assert len(collapsed) == len(expected_counts)
     counts = [f.count for f in collapsed]
     assert counts == expected_counts
+
+
+def test_collapse_ids():
+    from stacktrace_collapser.core import collapse_ids
+
+    assert collapse_ids((3, 3, 3, 1, 2, 2, 3)) == (3, 1, 2, 3)
+    assert collapse_ids(()) == ()
@@ -1,14 +1,148 @@
 import hashlib
 import json
+import os
+import shutil
+import threading
+import time
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+_CHUNK = 1 << 20
+# An index entry is only trusted if the file was last modified well before it
+# was hashed; otherwise a write in the same mtime tick could go unnoticed.
+_RACY_NS = 2_000_000_000
+
+def expand(patterns: Iterable[str], base: Path) -> List[Path]:
+    """Files matched by glob `patterns` under `base`; directories contribute all their files."""
+    files = set()
+    for pattern in patterns:
+        for match in base.glob(pattern):
+            if match.is_dir():
+                files.update(p for p in match.rglob('*') if p.is_file())
+            elif match.is_file():
+                files.add(match)
+    return sorted(files)
+
+def _rel(path: Path, base: Optional[Path]) -> str:
+    if base is not None:
+        try:
+            return path.resolve().relative_to(base.resolve()).as_posix()
+        except ValueError:  # outside the graph root
+            pass
+    return str(path)
 
 class ContentCache:
+    """
+    Content-addressed task cache under `root`.
+
+    blobs/ab/<sha256>      output file contents, shared by every task and run
+    manifests/<key>.json   {relative output path: [sha256, mode]} per task key
+    index.json             path -> (mtime_ns, size, sha256) for unchanged-file fast path
+    timings.json           last measured duration per task, for scheduling
+    """
+
     def __init__(self, root: Path):
         self.root = root
         self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index: Dict[str, list] = self._load('index.json')
+        self.timings: Dict[str, float] = self._load('timings.json')
+
+    def _load(self, name: str) -> dict:
+        try:
+            return json.loads((self.root / name).read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_json(self, path: Path, data) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(data, sort_keys=True))
+        os.replace(tmp, path)
+
+    def save(self) -> None:
+        with self._lock:
+            index, timings = dict(self._index), dict(self.timings)
+        self._write_json(self.root / 'index.json', index)
+        self._write_json(self.root / 'timings.json', timings)
+
+    # -- hashing --------------------------------------------------------------
 
-    def key(self, task_name: str, signature: dict) -> str:
-        return hashlib.sha256(json.dumps({task_name: signature}, sort_keys=True).encode()).hexdigest()
+    def file_digest(self, path: Path) -> str:
+        """sha256 of a file, skipping the read when its mtime and size match the index."""
+        st = path.stat()
+        ident = str(path.resolve())
+        with self._lock:
+            entry = self._index.get(ident)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while chunk := f.read(_CHUNK):
+                h.update(chunk)
+        digest = h.hexdigest()
+        if time.time_ns() - st.st_mtime_ns > _RACY_NS:
+            with self._lock:
+                self._index[ident] = [st.st_mtime_ns, st.st_size, digest]
+        return digest
+
+    def key(self, task_name: str, signature: dict, inputs: Iterable[Path] = (), base: Optional[Path] = None) -> str:
+        """Cache key of a task. Inputs under `base` (the graph root) are named relative to it,
+        so the same tree checked out elsewhere hits the same entries."""
+        files = {_rel(p, base): self.file_digest(p) for p in inputs}
+        payload = {task_name: signature, 'inputs': files}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    # -- outputs --------------------------------------------------------------
+
+    def _manifest_path(self, key: str) -> Path:
+        return self.root / 'manifests' / f"{key}.json"
+
+    def _blob(self, digest: str) -> Path:
+        return self.root / 'blobs' / digest[:2] / digest
 
     def hit(self, key: str) -> bool:
-        return (self.root / key).exists()
\ No newline at end of file
+        return self._manifest_path(key).exists()
+
+    def manifest(self, key: str) -> Optional[Dict[str, list]]:
+        try:
+            return json.loads(self._manifest_path(key).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key: str, base: Path, outputs: Iterable[Path]) -> None:
+        manifest = {}
+        for path in outputs:
+            digest = self.file_digest(path)
+            blob = self._blob(digest)
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                tmp = blob.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+                shutil.copyfile(path, tmp)
+                os.replace(tmp, blob)
+            manifest[path.relative_to(base).as_posix()] = [digest, path.stat().st_mode & 0o777]
+        self._write_json(self._manifest_path(key), manifest)
+
+    def restore(self, key: str, base: Path) -> int:
+        """Bring the outputs recorded under `key` back into `base`; returns how many files were rewritten."""
+        manifest = self.manifest(key) or {}
+        rewritten = 0
+        for rel, (digest, mode) in manifest.items():
+            path = base / rel
+            try:
+                if self.file_digest(path) == digest:
+                    continue
+            except OSError:
+                pass
+            path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(self._blob(digest), path)
+            os.chmod(path, mode)
+            st = path.stat()
+            with self._lock:
+                self._index[str(path.resolve())] = [st.st_mtime_ns, st.st_size, digest]
+            rewritten += 1
+        return rewritten
+
+    def record_timing(self, task_name: str, seconds: float) -> None:
+        with self._lock:
+            self.timings[task_name] = round(seconds, 4)
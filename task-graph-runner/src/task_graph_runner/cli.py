@@ -1,13 +1,40 @@
 import click
 from pathlib import Path
+from rich.console import Console
+from .cache import ContentCache
+from .executor import run_graph
 from .parser import load_graph
+from .visualizer import render_report
+
+console = Console()
+
+_MARK = {'ran': '[green]✓[/]', 'cached': '[cyan]≡[/]', 'restored': '[cyan]↺[/]',
+         'failed': '[red]✗[/]', 'skipped': '[dim]-[/]'}
 
 @click.group()
 def main():
     pass
 
+def _print_result(result) -> None:
+    console.print(f"{_MARK[result.status]} {result.name} [dim]{result.status} {result.duration:.2f}s[/]")
+
 @main.command()
 @click.argument('graph', type=click.Path(exists=True))
-def run(graph):
-    g = load_graph(Path(graph))
-    click.echo(f"Loaded {len(g.tasks)} tasks")
\ No newline at end of file
+@click.option('--workers', '-j', default=0, help='Tasks to run at once (default: CPU count)')
+@click.option('--cache-dir', type=click.Path(), default=None,
+              help='Cache location (default: .task-graph-cache next to the graph)')
+@click.option('--no-cache', is_flag=True, help='Run every task, ignoring and not updating the cache')
+def run(graph, workers, cache_dir, no_cache):
+    path = Path(graph)
+    g = load_graph(path)
+    click.echo(f"Loaded {len(g.tasks)} tasks")
+    base = path.resolve().parent
+    cache = None if no_cache else ContentCache(Path(cache_dir) if cache_dir else base / '.task-graph-cache')
+    report = run_graph(g, base, cache, workers, on_result=_print_result)
+    render_report(report, console)
+    failed = [r for r in report.results.values() if r.status == 'failed']
+    for r in failed:
+        console.print(f"[red]Task '{r.name}' failed (exit {r.returncode}):[/]")
+        console.print(r.output, markup=False, highlight=False)
+    if failed:
+        raise SystemExit(1)
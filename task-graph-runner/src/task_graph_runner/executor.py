@@ -1,11 +1,148 @@
+import heapq
+import os
 import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 from rich.console import Console
 
+from .cache import ContentCache, expand
+from .models import Graph, RunReport, Task, TaskResult
+
 console = Console()
 
 def run_task(cmd: str) -> int:
     proc = subprocess.run(cmd, shell=True, capture_output=True, text=True)
     if proc.returncode != 0:
         console.print(f"[red]Failed:[/red] {cmd}")
-    return proc.returncode
\ No newline at end of file
+    return proc.returncode
+
+def run_command(cmd: str, cwd: Optional[Path] = None) -> Tuple[int, str]:
+    """Run `cmd` in a shell; returns (exit code, combined stdout/stderr)."""
+    proc = subprocess.run(cmd, shell=True, cwd=cwd, stdout=subprocess.PIPE,
+                          stderr=subprocess.STDOUT, text=True)
+    return proc.returncode, proc.stdout
+
+def priorities(graph: Graph, weights: Dict[str, float]) -> Dict[str, float]:
+    """
+    Length of the longest chain of work from each task to the end of the
+    graph (its own weight included). Running the task with the largest value
+    first keeps the critical path moving. Unknown durations count as 1s.
+    """
+    dependents = graph.dependents()
+    rank: Dict[str, float] = {}
+    for name in reversed(graph.topological_order()):
+        tail = max((rank[c] for c in dependents[name]), default=0.0)
+        rank[name] = weights.get(name, 1.0) + tail
+    return rank
+
+def critical_path(graph: Graph, results: Dict[str, TaskResult]) -> List[str]:
+    """The chain of dependent tasks with the largest total measured duration."""
+    finish: Dict[str, float] = {}
+    via: Dict[str, Optional[str]] = {}
+    for name in graph.topological_order():
+        result = results.get(name)
+        if result is None or result.status == 'skipped':
+            continue
+        deps = [d for d in graph.tasks[name].deps if d in finish]
+        prev = max(deps, key=finish.__getitem__, default=None)
+        via[name] = prev
+        finish[name] = result.duration + (finish[prev] if prev else 0.0)
+    if not finish:
+        return []
+    node: Optional[str] = max(finish, key=finish.__getitem__)
+    path = []
+    while node is not None:
+        path.append(node)
+        node = via[node]
+    return path[::-1]
+
+def _execute(task: Task, base: Path, cache: Optional[ContentCache],
+             dep_keys: Dict[str, Optional[str]], t0: float) -> Tuple[TaskResult, Optional[str]]:
+    started = time.perf_counter()
+    result = TaskResult(task.name, 'ran', start=started - t0)
+    key = None
+    if cache is not None and task.cacheable:
+        signature = {'command': task.command, 'outputs': task.outputs, 'deps': dep_keys}
+        key = cache.key(task.name, signature, expand(task.inputs, base), base)
+        if cache.hit(key):
+            try:
+                result.status = 'restored' if cache.restore(key, base) else 'cached'
+                result.duration = time.perf_counter() - started
+                return result, key
+            except OSError:
+                pass  # damaged cache entry: run the task and store it again
+    for attempt in range(task.retries + 1):
+        result.attempts = attempt + 1
+        result.returncode, result.output = run_command(task.command, base)
+        if result.returncode == 0:
+            break
+    result.duration = time.perf_counter() - started
+    if result.returncode != 0:
+        result.status = 'failed'
+        return result, key
+    if cache is not None:
+        cache.record_timing(task.name, result.duration)
+    if key is not None:
+        outputs = expand(task.outputs, base)
+        missing = [p for p in task.outputs if not expand([p], base)]
+        if missing:
+            result.status = 'failed'
+            result.output += f"\nDeclared output(s) not produced: {', '.join(missing)}\n"
+            return result, key
+        cache.store(key, base, outputs)
+    return result, key
+
+def run_graph(graph: Graph, base: Path, cache: Optional[ContentCache] = None, workers: int = 0,
+              on_result: Optional[Callable[[TaskResult], None]] = None) -> RunReport:
+    """
+    Run every task once its dependencies succeeded, at most `workers` at a
+    time, highest critical-path priority first. Tasks whose cache entry is
+    fresh are skipped (outputs restored if they were changed or deleted);
+    dependents of a failed task are skipped.
+    """
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    rank = priorities(graph, cache.timings if cache is not None else {})
+    dependents = graph.dependents()
+    indegree = {name: len(task.deps) for name, task in graph.tasks.items()}
+    ready = [(-rank[name], name) for name, n in indegree.items() if n == 0]
+    heapq.heapify(ready)
+    results: Dict[str, TaskResult] = {}
+    keys: Dict[str, Optional[str]] = {}
+
+    def finish(result: TaskResult) -> None:
+        results[result.name] = result
+        if on_result:
+            on_result(result)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while ready or running:
+            # Submit only what can start now, so the queue order stays ours.
+            while ready and len(running) < workers:
+                _, name = heapq.heappop(ready)
+                task = graph.tasks[name]
+                dep_keys = {d: keys.get(d) for d in sorted(task.deps)}
+                running[pool.submit(_execute, task, base, cache, dep_keys, t0)] = name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                result, keys[name] = future.result()
+                finish(result)
+                if result.ok:
+                    for child in dependents[name]:
+                        indegree[child] -= 1
+                        if indegree[child] == 0 and child not in results:
+                            heapq.heappush(ready, (-rank[child], child))
+                    continue
+                stack = list(dependents[name])
+                while stack:
+                    child = stack.pop()
+                    if child not in results:
+                        finish(TaskResult(child, 'skipped', start=time.perf_counter() - t0))
+                        stack.extend(dependents[child])
+    if cache is not None:
+        cache.save()
+    return RunReport(results, time.perf_counter() - t0, critical_path(graph, results))
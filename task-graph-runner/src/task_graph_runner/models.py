@@ -10,7 +10,64 @@ class Task:
     outputs: List[str] = field(default_factory=list)
     retries: int = 0
 
+    @property
+    def cacheable(self) -> bool:
+        # A task that declares neither inputs nor outputs is run for its side effects.
+        return bool(self.inputs or self.outputs)
+
 @dataclass
 class Graph:
     tasks: Dict[str, Task]
-    edges: List[tuple] = field(default_factory=list)
\ No newline at end of file
+    edges: List[tuple] = field(default_factory=list)
+
+    def dependents(self) -> Dict[str, List[str]]:
+        out: Dict[str, List[str]] = {name: [] for name in self.tasks}
+        for name, task in self.tasks.items():
+            for dep in task.deps:
+                out[dep].append(name)
+        return out
+
+    def topological_order(self) -> List[str]:
+        indegree = {name: len(task.deps) for name, task in self.tasks.items()}
+        dependents = self.dependents()
+        ready = [name for name, n in indegree.items() if n == 0]
+        order = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for child in dependents[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        if len(order) != len(self.tasks):
+            cycle = sorted(name for name, n in indegree.items() if n > 0)
+            raise ValueError(f"Dependency cycle among tasks: {', '.join(cycle)}")
+        return order
+
+@dataclass
+class TaskResult:
+    name: str
+    status: str  # "ran", "cached", "restored", "failed" or "skipped"
+    duration: float = 0.0
+    start: float = 0.0  # seconds since the run started
+    returncode: Optional[int] = None
+    output: str = ""
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("ran", "cached", "restored")
+
+@dataclass
+class RunReport:
+    results: Dict[str, TaskResult]
+    wall_time: float
+    critical_path: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.results.values())
+
+    @property
+    def critical_time(self) -> float:
+        return sum(self.results[name].duration for name in self.critical_path)
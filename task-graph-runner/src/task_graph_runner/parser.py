@@ -5,4 +5,10 @@ from .models import Graph, Task
 def load_graph(path: Path) -> Graph:
     data = yaml.safe_load(path.read_text())
     tasks = {t['name']: Task(**t) for t in data['tasks']}
-    return Graph(tasks=tasks)
\ No newline at end of file
+    for task in tasks.values():
+        missing = [dep for dep in task.deps if dep not in tasks]
+        if missing:
+            raise ValueError(f"Task '{task.name}' depends on unknown task(s): {', '.join(missing)}")
+    graph = Graph(tasks=tasks, edges=[(dep, t.name) for t in tasks.values() for dep in t.deps])
+    graph.topological_order()  # raises on cycles
+    return graph
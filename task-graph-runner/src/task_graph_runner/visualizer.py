@@ -1,8 +1,28 @@
 import networkx as nx
+from rich.table import Table
+
+_STYLE = {'ran': 'green', 'cached': 'cyan', 'restored': 'cyan', 'failed': 'red', 'skipped': 'dim'}
 
 def to_mermaid(graph) -> str:
     lines = ["graph TD"]
     for name, task in graph.tasks.items():
         for dep in task.deps:
             lines.append(f"    {dep} --> {name}")
-    return "\n".join(lines)
\ No newline at end of file
+    return "\n".join(lines)
+
+def render_report(report, console) -> None:
+    """Per-task timing table; tasks on the critical path are starred."""
+    critical = set(report.critical_path)
+    table = Table(title="Task timings")
+    table.add_column("Task")
+    table.add_column("Status")
+    table.add_column("Start", justify="right")
+    table.add_column("Duration", justify="right")
+    table.add_column("Critical", justify="center")
+    for r in sorted(report.results.values(), key=lambda r: (r.start, r.name)):
+        table.add_row(r.name, f"[{_STYLE[r.status]}]{r.status}[/]", f"{r.start:.2f}s",
+                      f"{r.duration:.2f}s", "★" if r.name in critical else "")
+    console.print(table)
+    if report.critical_path:
+        console.print(f"Critical path: {' → '.join(report.critical_path)} "
+                      f"({report.critical_time:.2f}s of {report.wall_time:.2f}s wall)")
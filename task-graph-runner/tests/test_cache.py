@@ -7,4 +7,44 @@ def test_cache_key_stable():
         c = ContentCache(Path(tmp))
         k1 = c.key('t', {'a': 1})
         k2 = c.key('t', {'a': 1})
-        assert k1 == k2
\ No newline at end of file
+        assert k1 == k2
+
+def test_file_digest_uses_index_when_unchanged(tmp_path, monkeypatch):
+    import os
+    c = ContentCache(tmp_path / 'cache')
+    f = tmp_path / 'in.txt'
+    f.write_text('one')
+    os.utime(f, ns=(10**18, 10**18 - 10**10))  # old enough to be trusted
+    d1 = c.file_digest(f)
+    # Same mtime and size: the index answers without reading the file.
+    monkeypatch.setattr('builtins.open', None)
+    assert c.file_digest(f) == d1
+    monkeypatch.undo()
+    f.write_text('two')
+    assert c.file_digest(f) != d1
+
+
+def test_store_and_restore(tmp_path):
+    c = ContentCache(tmp_path / 'cache')
+    out = tmp_path / 'build' / 'a.out'
+    out.parent.mkdir()
+    out.write_text('artifact')
+    key = c.key('build', {'command': 'x'})
+    assert not c.hit(key)
+    c.store(key, tmp_path, [out])
+    assert c.hit(key)
+    assert c.restore(key, tmp_path) == 0
+    out.unlink()
+    assert c.restore(key, tmp_path) == 1
+    assert out.read_text() == 'artifact'
+
+
+def test_key_independent_of_checkout_location(tmp_path):
+    c = ContentCache(tmp_path / 'cache')
+    keys = []
+    for checkout in ('one', 'two'):
+        src = tmp_path / checkout / 'src' / 'main.c'
+        src.parent.mkdir(parents=True)
+        src.write_text('int main;')
+        keys.append(c.key('build', {'command': 'cc'}, [src], tmp_path / checkout))
+    assert keys[0] == keys[1]
@@ -1,4 +1,62 @@
+from pathlib import Path
 from task_graph_runner.executor import run_task
 
 def test_run_success():
-    assert run_task('echo ok') == 0
\ No newline at end of file
+    assert run_task('echo ok') == 0
+
+from task_graph_runner.cache import ContentCache
+from task_graph_runner.executor import priorities, run_graph
+from task_graph_runner.models import Graph, Task
+
+
+def _graph(*tasks):
+    return Graph(tasks={t.name: t for t in tasks})
+
+
+def test_critical_path_priority():
+    g = _graph(Task('short', 'true'), Task('long1', 'true'), Task('long2', 'true', deps=['long1']))
+    rank = priorities(g, {})
+    assert rank['long1'] > rank['short']
+    # With one worker the head of the longest chain starts first.
+    report = run_graph(g, Path('.'), workers=1)
+    order = sorted(report.results.values(), key=lambda r: r.start)
+    assert order[0].name == 'long1'
+    assert report.critical_path == ['long1', 'long2']
+
+
+def test_failure_skips_dependents(tmp_path):
+    g = _graph(Task('a', 'exit 3'), Task('b', 'true', deps=['a']), Task('c', 'true', deps=['b']),
+               Task('d', 'true'))
+    report = run_graph(g, tmp_path, workers=2)
+    status = {n: r.status for n, r in report.results.items()}
+    assert status == {'a': 'failed', 'b': 'skipped', 'c': 'skipped', 'd': 'ran'}
+    assert report.results['a'].returncode == 3
+    assert not report.ok
+
+
+def test_cached_rerun_and_restore(tmp_path):
+    (tmp_path / 'src.txt').write_text('v1')
+    g = _graph(
+        Task('build', 'cat src.txt > out.txt && echo x >> runs.log', inputs=['src.txt'], outputs=['out.txt']),
+        Task('pack', 'cp out.txt pkg.txt', deps=['build'], inputs=['out.txt'], outputs=['pkg.txt']),
+    )
+    cache = ContentCache(tmp_path / '.cache')
+    assert run_graph(g, tmp_path, cache).ok
+    again = run_graph(g, tmp_path, ContentCache(tmp_path / '.cache'))
+    assert {r.status for r in again.results.values()} == {'cached'}
+    (tmp_path / 'pkg.txt').unlink()
+    restored = run_graph(g, tmp_path, ContentCache(tmp_path / '.cache'))
+    assert restored.results['pack'].status == 'restored'
+    assert (tmp_path / 'pkg.txt').read_text() == 'v1'
+    (tmp_path / 'src.txt').write_text('v2')
+    changed = run_graph(g, tmp_path, ContentCache(tmp_path / '.cache'))
+    assert changed.results['build'].status == 'ran'
+    assert changed.results['pack'].status == 'ran'
+    assert (tmp_path / 'pkg.txt').read_text() == 'v2'
+    assert (tmp_path / 'runs.log').read_text().count('x') == 2
+
+
+def test_missing_declared_output_fails(tmp_path):
+    g = _graph(Task('t', 'true', outputs=['never.txt']))
+    report = run_graph(g, tmp_path, ContentCache(tmp_path / '.cache'))
+    assert report.results['t'].status == 'failed'
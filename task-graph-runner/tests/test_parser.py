@@ -8,4 +8,14 @@ def test_load_simple_graph():
         f.write('tasks:\n- name: build\n  command: echo build')
         f.flush()
         g = load_graph(Path(f.name))
-        assert 'build' in g.tasks
\ No newline at end of file
+        assert 'build' in g.tasks
+
+def test_rejects_cycles_and_unknown_deps(tmp_path):
+    cyclic = tmp_path / 'cyclic.yml'
+    cyclic.write_text('tasks:\n- {name: a, command: x, deps: [b]}\n- {name: b, command: x, deps: [a]}\n')
+    with pytest.raises(ValueError, match='cycle'):
+        load_graph(cyclic)
+    unknown = tmp_path / 'unknown.yml'
+    unknown.write_text('tasks:\n- {name: a, command: x, deps: [nope]}\n')
+    with pytest.raises(ValueError, match='unknown'):
+        load_graph(unknown)
@@ -1,11 +1,51 @@
+import json
+import runpy
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
 import click
-from .instrument import install
-from .reporter import render
-
-@click.command()
-@click.option("--duration", default=10)
-def main(duration):
-    install()
-    import time; time.sleep(duration)
-    from .wrappers import _contention
-    render(_contention)
\ No newline at end of file
+
+from .instrument import install, uninstall
+from .reporter import render, to_dict
+from .stats import snapshot
+
+
+@click.command(context_settings={"ignore_unknown_options": True})
+@click.argument("script", required=False)
+@click.argument("args", nargs=-1, type=click.UNPROCESSED)
+@click.option("-m", "module", help="Run a module as __main__ instead of a script")
+@click.option("--duration", default=10.0, help="Seconds to sample (without a script or module)")
+@click.option("--hold-every", default=16, help="Time every Nth uncontended hold (0: contended only)")
+@click.option("--top", default=0, help="Show only the N sites with the most wait (0: all)")
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path), help="Also write the report as JSON")
+def main(script: Optional[str], args: Tuple[str, ...], module: Optional[str], duration: float, hold_every: int,
+         top: int, output: Optional[Path]):
+    """Trace lock contention while SCRIPT (or -m MODULE) runs, or for --duration seconds."""
+    if module and script:
+        script, args = None, (script, *args)  # with -m, positionals belong to the module
+    elif script and not Path(script).is_file():
+        raise click.BadParameter(f"File not found: {script}", param_hint="SCRIPT")
+    install(hold_every=hold_every)
+    try:
+        if script or module:
+            argv = sys.argv
+            sys.argv = [script or module, *args]
+            try:
+                if module:
+                    runpy.run_module(module, run_name="__main__", alter_sys=True)
+                else:
+                    runpy.run_path(script, run_name="__main__")
+            except SystemExit:
+                pass
+            finally:
+                sys.argv = argv
+        else:
+            time.sleep(duration)
+    finally:
+        uninstall()
+    data = snapshot()
+    render(data, top=top)
+    if output:
+        output.write_text(json.dumps(to_dict(data), indent=2))
@@ -1,11 +1,47 @@
+"""
+Swap threading and asyncio primitives for their traced versions.
+
+Only primitives created after `install()` are traced; locks that threading
+creates for its own plumbing (Event, Barrier, Thread state) are left alone.
+"""
+import asyncio
+import asyncio.locks
 import threading
-from .wrappers import _ContendedLock
+from typing import Dict, List, Tuple
+
+from . import wrappers
+
+_PATCHES: List[Tuple[object, str, object]] = [
+    (threading, "Lock", wrappers.Lock),
+    (threading, "RLock", wrappers.RLock),
+    (threading, "Condition", wrappers.TracedCondition),
+    (threading, "Semaphore", wrappers.TracedSemaphore),
+    (threading, "BoundedSemaphore", wrappers.TracedBoundedSemaphore),
+]
+_ASYNC_PATCHES: List[Tuple[object, str, object]] = [
+    (module, name, patched)
+    for module in (asyncio, asyncio.locks)  # asyncio.Condition() looks Lock up in asyncio.locks
+    for name, patched in (("Lock", wrappers.TracedAsyncLock), ("Semaphore", wrappers.TracedAsyncSemaphore),
+                          ("BoundedSemaphore", wrappers.TracedAsyncBoundedSemaphore))
+]
+
+_saved: Dict[Tuple[int, str], object] = {}
+
+
+def install(hold_every: int = wrappers.hold_every, include_asyncio: bool = True) -> None:
+    """Patch the primitives. `hold_every`: time every Nth uncontended hold (0: only contended ones)."""
+    wrappers.hold_every = hold_every
+    for module, name, patched in _PATCHES + (_ASYNC_PATCHES if include_asyncio else []):
+        _saved.setdefault((id(module), name), getattr(module, name))
+        setattr(module, name, patched)
+
+
+def uninstall() -> None:
+    for module, name, _ in _PATCHES + _ASYNC_PATCHES:
+        original = _saved.pop((id(module), name), None)
+        if original is not None:
+            setattr(module, name, original)
 
-_original_lock = threading.Lock
-_original_rlock = threading.RLock
 
-def install():
-    def make_lock(*a, **k):
-        return _ContendedLock(_original_lock(*a, **k), "<Lock>")
-    threading.Lock = make_lock
-    # similar for RLock, Condition, Semaphore...
\ No newline at end of file
+def installed() -> bool:
+    return bool(_saved)
@@ -1,12 +1,37 @@
-from rich.table import Table
+from typing import Dict, Optional
+
 from rich.console import Console
+from rich.table import Table
+
+from .stats import SiteKey, SiteStats
+
 
-def render(data):
-    console = Console()
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1e3:.3f}"
+
+
+def render(data: Dict[SiteKey, SiteStats], console: Optional[Console] = None, top: int = 0) -> None:
+    """Sites by total wait. Percentiles are log2 bucket upper bounds, so within 2x."""
+    console = console or Console()
     table = Table(title="Contention Report")
-    table.add_column("Site")
-    table.add_column("Acquires")
-    table.add_column("Total Wait (s)")
-    for site, (count, wait) in sorted(data.items(), key=lambda x: -x[1][1]):
-        table.add_row(site, str(count), f"{wait:.4f}")
-    console.print(table)
\ No newline at end of file
+    table.add_column("Kind")
+    table.add_column("Created at")
+    table.add_column("Acquired at")
+    table.add_column("Acquires", justify="right")
+    table.add_column("Contended", justify="right")
+    table.add_column("Total Wait (s)", justify="right")
+    table.add_column("Wait p50/p99 (ms)", justify="right")
+    table.add_column("Hold p50/p99 (ms)", justify="right")
+    rows = sorted(data.items(), key=lambda x: (-x[1].wait.total_ns, -x[1].acquires))
+    for (kind, created, acquired), s in rows[:top or None]:
+        hold = f"{_ms(s.hold.percentile(50))}/{_ms(s.hold.percentile(99))}" if s.hold.count else "-"
+        table.add_row(
+            kind, created, acquired, f"{s.acquires:,}", f"{s.ratio:.1%}", f"{s.wait.total_ns / 1e9:.4f}",
+            f"{_ms(s.wait.percentile(50))}/{_ms(s.wait.percentile(99))}" if s.wait.count else "-", hold,
+        )
+    console.print(table)
+
+
+def to_dict(data: Dict[SiteKey, SiteStats]) -> dict:
+    return {"sites": [{"kind": kind, "created_at": created, "acquired_at": acquired, **s.to_dict()}
+                      for (kind, created, acquired), s in data.items()]}
@@ -0,0 +1,137 @@
+"""
+Contention counters, kept per thread and merged at report time.
+
+Every thread records into its own ThreadStore, so the hot path never takes a
+lock or touches another thread's data. Wait and hold times go into
+log2-bucketed nanosecond histograms: one list index per sample, and
+histograms from different threads merge by adding their buckets.
+"""
+import _thread
+import threading
+from typing import Dict, List, Tuple
+
+BUCKETS = 48  # bucket i counts [2**(i-1), 2**i) ns; the last one everything above ~39 h
+
+SiteKey = Tuple[str, str, str]  # (kind, creation site, acquisition site)
+
+
+class Histogram:
+    __slots__ = ("counts", "total_ns")
+
+    def __init__(self) -> None:
+        self.counts = [0] * BUCKETS
+        self.total_ns = 0
+
+    def add(self, ns: int) -> None:
+        self.counts[min(ns.bit_length(), BUCKETS - 1)] += 1
+        self.total_ns += ns
+
+    def merge(self, other: "Histogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total_ns += other.total_ns
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound, in seconds, of the bucket holding the q-th percentile (0 if empty)."""
+        n = self.count
+        if not n:
+            return 0.0
+        rank = q / 100 * n
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if c and seen >= rank:
+                return (1 << i) / 1e9
+        return (1 << (BUCKETS - 1)) / 1e9
+
+    def to_dict(self) -> dict:
+        last = max((i for i, c in enumerate(self.counts) if c), default=-1)
+        return {"count": self.count, "total_s": self.total_ns / 1e9,
+                "upper_bounds_ns": [1 << i for i in range(last + 1)], "counts": self.counts[:last + 1]}
+
+
+class SiteStats:
+    """
+    One (primitive kind, creation site, acquisition site).
+
+    `acquires` counts attempts, `contended` the attempts that found the
+    primitive taken, `failed` those that gave up (non-blocking or timeout).
+    `wait` has one sample per contended attempt; `hold` is sampled.
+    """
+
+    __slots__ = ("acquires", "contended", "failed", "wait", "hold")
+
+    def __init__(self) -> None:
+        self.acquires = 0
+        self.contended = 0
+        self.failed = 0
+        self.wait = Histogram()
+        self.hold = Histogram()
+
+    def merge(self, other: "SiteStats") -> None:
+        self.acquires += other.acquires
+        self.contended += other.contended
+        self.failed += other.failed
+        self.wait.merge(other.wait)
+        self.hold.merge(other.hold)
+
+    @property
+    def ratio(self) -> float:
+        return self.contended / self.acquires if self.acquires else 0.0
+
+    def to_dict(self) -> dict:
+        return {"acquires": self.acquires, "contended": self.contended, "failed": self.failed,
+                "contention_ratio": self.ratio, "wait": self.wait.to_dict(), "hold": self.hold.to_dict()}
+
+
+class ThreadStore:
+    __slots__ = ("name", "sites", "frames")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.sites: Dict[SiteKey, SiteStats] = {}
+        # (kind, creation site, code object, line) -> the same SiteStats, to skip building labels
+        self.frames: Dict[tuple, SiteStats] = {}
+
+    def site(self, key: SiteKey) -> SiteStats:
+        stats = self.sites.get(key)
+        if stats is None:
+            stats = self.sites[key] = SiteStats()
+        return stats
+
+
+_local = threading.local()
+_stores: List[ThreadStore] = []
+_stores_lock = _thread.allocate_lock()  # never a traced lock
+
+
+def store() -> ThreadStore:
+    """This thread's store, registered on first use."""
+    try:
+        return _local.store
+    except AttributeError:
+        s = _local.store = ThreadStore(threading.current_thread().name)
+        with _stores_lock:
+            _stores.append(s)
+        return s
+
+
+def snapshot() -> Dict[SiteKey, SiteStats]:
+    """Merge every thread's counters (threads still running may be mid-update)."""
+    with _stores_lock:
+        stores = list(_stores)
+    merged: Dict[SiteKey, SiteStats] = {}
+    for s in stores:
+        for key, stats in list(s.sites.items()):
+            merged.setdefault(key, SiteStats()).merge(stats)
+    return merged
+
+
+def reset() -> None:
+    with _stores_lock:
+        for s in _stores:
+            s.sites = {}
+            s.frames = {}
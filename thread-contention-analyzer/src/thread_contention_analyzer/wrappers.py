@@ -1,25 +1,384 @@
+"""
+Timing wrappers for threading and asyncio primitives.
+
+Every acquisition first tries the primitive without blocking. If that
+succeeds the lock was free: the attempt is counted and nothing is timed
+(except every `hold_every`-th hold). Only a contended acquisition reads the
+clock around the blocking call.
+
+Sites are the first caller frame outside this package, threading, asyncio
+and the rest of the standard library (so a queue.Queue is attributed to the
+line that created it, not to queue.py). What kind of file a code object
+lives in and its "file:line (function)" label are cached, so a lookup is a
+few frame hops and dict hits.
+"""
+import asyncio
+import asyncio.locks
+import os
+import sys
+import sysconfig
+import threading
 import time
-from threading import Lock, RLock, Condition, Semaphore, BoundedSemaphore
-
-_contention = {}
-
-class _ContendedLock:
-    def __init__(self, lock, site):
-        self._lock = lock
-        self._site = site
-    def acquire(self, blocking=True, timeout=-1):
-        start = time.perf_counter()
-        acquired = self._lock.acquire(blocking, timeout)
-        if acquired:
-            wait = time.perf_counter() - start
-            _contention[self._site] = _contention.get(self._site, (0, 0))
-            c, w = _contention[self._site]
-            _contention[self._site] = (c + 1, w + wait)
-        return acquired
-    def release(self):
+from typing import Dict, Optional, Tuple
+
+from .stats import SiteStats, store
+
+_original_lock = threading.Lock
+_original_rlock = threading.RLock
+_original_semaphore = threading.Semaphore
+_original_bounded_semaphore = threading.BoundedSemaphore
+
+# Hold times of uncontended acquisitions are sampled once per this many (0: never).
+hold_every = 16
+# _acquire_restore (Condition.wait waking up) has no non-blocking fast path;
+# a reacquisition slower than this counts as contended.
+SLOW_NS = 20_000
+
+_USER, _STDLIB, _INTERNAL = 0, 1, 2
+_INTERNAL_FILES = {os.path.dirname(__file__), threading.__file__, asyncio.locks.__file__}
+_STDLIB_DIRS = tuple({os.path.join(sysconfig.get_paths()[k], "") for k in ("stdlib", "platstdlib")})
+_code_kind: Dict[object, int] = {}
+_labels: Dict[Tuple[object, int], str] = {}
+
+
+def _kind(code) -> int:
+    kind = _code_kind.get(code)
+    if kind is None:
+        path = code.co_filename
+        if path in _INTERNAL_FILES or os.path.dirname(path) in _INTERNAL_FILES:
+            kind = _INTERNAL
+        elif path.startswith("<frozen") or path.startswith(_STDLIB_DIRS) and "site-packages" not in path:
+            kind = _STDLIB
+        else:
+            kind = _USER
+        _code_kind[code] = kind
+    return kind
+
+
+def _label(frame) -> str:
+    code = frame.f_code
+    key = (code, frame.f_lineno)
+    label = _labels.get(key)
+    if label is None:
+        path = code.co_filename
+        try:
+            rel = os.path.relpath(path)
+        except ValueError:  # other drive on Windows
+            rel = path
+        if not rel.startswith(".."):
+            path = rel
+        label = _labels[key] = f"{path}:{frame.f_lineno} ({code.co_qualname})"
+    return label
+
+
+def _user_frame(frame):
+    """Nearest user frame from `frame` outwards, else the nearest stdlib one."""
+    fallback = None
+    while frame is not None:
+        kind = _code_kind.get(frame.f_code)
+        if kind is None:
+            kind = _kind(frame.f_code)
+        if kind == _USER:
+            return frame
+        if kind == _STDLIB and fallback is None:
+            fallback = frame
+        frame = frame.f_back
+    return fallback
+
+
+def call_site() -> str:
+    frame = _user_frame(sys._getframe(1))
+    return _label(frame) if frame is not None else "<unknown>"
+
+
+def site_stats(kind: str, created: str) -> SiteStats:
+    """This thread's counters for a `kind` created at `created`, acquired from the caller's site."""
+    frame = sys._getframe(2)  # whoever called the primitive's method; usually user code already
+    if _code_kind.get(frame.f_code) != _USER:
+        frame = _user_frame(frame)
+    s = store()
+    if frame is None:
+        return s.site((kind, created, "<unknown>"))
+    key = (kind, created, frame.f_code, frame.f_lineno)
+    stats = s.frames.get(key)
+    if stats is None:
+        stats = s.frames[key] = s.site((kind, created, _label(frame)))
+    return stats
+
+
+def _internal_caller() -> bool:
+    """True when the factory was called by threading itself (Event, Barrier, Thread internals)."""
+    return sys._getframe(2).f_code.co_filename == threading.__file__
+
+
+class _Held:
+    """Hold timing of the current owner; only the owner writes these."""
+
+    __slots__ = ("_held_since", "_held_stats")
+
+    def _start_hold(self, now: int, stats: SiteStats) -> None:
+        self._held_since = now
+        self._held_stats = stats
+
+    def _end_hold(self) -> None:
+        since = self._held_since
+        if since:
+            self._held_since = 0
+            self._held_stats.hold.add(time.perf_counter_ns() - since)
+
+
+def _fast(stats: SiteStats, held: Optional[_Held]) -> None:
+    """Bookkeeping for an acquisition that did not block: a count, and every Nth hold."""
+    n = stats.acquires = stats.acquires + 1
+    if held is not None:
+        held._held_since = time.perf_counter_ns() if hold_every and not n % hold_every else 0
+        held._held_stats = stats
+
+
+def _contended(lock, stats: SiteStats, held: Optional[_Held], blocking: bool, timeout: float) -> bool:
+    """`lock` was taken when tried without blocking: count, then wait for it and time the wait."""
+    stats.acquires += 1
+    stats.contended += 1
+    if not blocking:
+        stats.failed += 1
+        return False
+    t0 = time.perf_counter_ns()
+    ok = lock.acquire(True, timeout)
+    t1 = time.perf_counter_ns()
+    stats.wait.add(t1 - t0)
+    if not ok:
+        stats.failed += 1
+    elif held is not None:
+        held._start_hold(t1, stats)
+    return ok
+
+
+class TracedLock(_Held):
+    kind = "Lock"
+    __slots__ = ("_lock", "_created")
+
+    def __init__(self, lock=None, site: Optional[str] = None) -> None:
+        self._lock = lock if lock is not None else _original_lock()
+        self._created = site or call_site()
+        self._held_since = 0
+        self._held_stats = None
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        stats = site_stats(self.kind, self._created)
+        if self._lock.acquire(False):  # _fast(), inlined: this is the hot path
+            n = stats.acquires = stats.acquires + 1
+            self._held_since = time.perf_counter_ns() if hold_every and not n % hold_every else 0
+            self._held_stats = stats
+            return True
+        return _contended(self._lock, stats, self, blocking, timeout)
+
+    def release(self) -> None:
+        self._end_hold()
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    def _is_owned(self) -> bool:
+        # threading.Condition's probe for plain locks, without counting it
+        if self._lock.acquire(False):
+            self._lock.release()
+            return False
+        return True
+
+    def _at_fork_reinit(self) -> None:
+        self._lock._at_fork_reinit()
+        self._held_since = 0
+
+    __enter__ = acquire
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+    def __repr__(self) -> str:
+        return f"<Traced{self._lock!r} created at {self._created}>"
+
+
+class TracedRLock(TracedLock):
+    kind = "RLock"
+    __slots__ = ("_depth",)
+
+    def __init__(self, lock=None, site: Optional[str] = None) -> None:
+        super().__init__(lock if lock is not None else _original_rlock(), site or call_site())
+        self._depth = 0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        stats = site_stats(self.kind, self._created)
+        held = None if self._lock._is_owned() else self  # only the outermost acquire is a hold
+        if self._lock.acquire(False):
+            _fast(stats, held)
+        elif not _contended(self._lock, stats, held, blocking, timeout):
+            return False
+        self._depth += 1
+        return True
+
+    def release(self) -> None:
+        if not self._lock._is_owned():
+            raise RuntimeError("cannot release un-acquired lock")
+        self._depth -= 1
+        if self._depth == 0:
+            self._end_hold()
         self._lock.release()
-    def __enter__(self):
-        self.acquire()
-        return self
-    def __exit__(self, *args):
-        self.release()
\ No newline at end of file
+
+    def _is_owned(self) -> bool:
+        return self._lock._is_owned()
+
+    def _release_save(self):
+        self._end_hold()
+        depth, self._depth = self._depth, 0
+        return self._lock._release_save(), depth
+
+    def _acquire_restore(self, saved) -> None:
+        state, depth = saved
+        stats = site_stats(self.kind, self._created)
+        t0 = time.perf_counter_ns()
+        self._lock._acquire_restore(state)
+        t1 = time.perf_counter_ns()
+        self._depth = depth
+        stats.acquires += 1
+        if t1 - t0 > SLOW_NS:
+            stats.contended += 1
+            stats.wait.add(t1 - t0)
+            self._start_hold(t1, stats)
+        else:
+            self._held_since = 0
+
+    __enter__ = acquire
+
+
+def Lock():
+    if _internal_caller():
+        return _original_lock()
+    return TracedLock(_original_lock(), call_site())
+
+
+def RLock(*args, **kwargs):
+    if _internal_caller():
+        return _original_rlock(*args, **kwargs)
+    return TracedRLock(_original_rlock(*args, **kwargs), call_site())
+
+
+class TracedCondition(threading.Condition):
+    """A Condition whose default lock is a TracedRLock created at the caller's site."""
+
+    def __init__(self, lock=None) -> None:
+        super().__init__(lock if lock is not None else TracedRLock(site=call_site()))
+
+
+class _TracedSemaphore:
+    """Semaphores are released by any thread, so only waits are timed."""
+
+    def _traced_init(self) -> None:
+        self._created = call_site()
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        stats = site_stats(self.kind, self._created)
+        if super().acquire(False):
+            stats.acquires += 1
+            return True
+        stats.acquires += 1
+        stats.contended += 1
+        if not blocking:
+            stats.failed += 1
+            return False
+        t0 = time.perf_counter_ns()
+        ok = super().acquire(True, timeout)
+        stats.wait.add(time.perf_counter_ns() - t0)
+        if not ok:
+            stats.failed += 1
+        return ok
+
+    __enter__ = acquire
+
+
+class TracedSemaphore(_TracedSemaphore, threading.Semaphore):
+    kind = "Semaphore"
+
+    def __init__(self, value: int = 1) -> None:
+        # Not super(): once installed, threading.BoundedSemaphore.__init__ calls
+        # this through the patched name with a TracedBoundedSemaphore.
+        _original_semaphore.__init__(self, value)
+        self._traced_init()
+
+
+class TracedBoundedSemaphore(_TracedSemaphore, threading.BoundedSemaphore):
+    kind = "BoundedSemaphore"
+
+    def __init__(self, value: int = 1) -> None:
+        _original_bounded_semaphore.__init__(self, value)
+        self._traced_init()
+
+
+class TracedAsyncLock(_Held, asyncio.Lock):
+    kind = "asyncio.Lock"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._created = call_site()
+        self._held_since = 0
+        self._held_stats = None
+
+    async def acquire(self) -> bool:
+        stats = site_stats(self.kind, self._created)
+        if not self._locked and not self._waiters:  # super().acquire() returns without suspending
+            await super().acquire()
+            _fast(stats, self)
+            return True
+        stats.acquires += 1
+        stats.contended += 1
+        t0 = time.perf_counter_ns()
+        try:
+            await super().acquire()
+        except asyncio.CancelledError:
+            stats.failed += 1
+            raise
+        finally:
+            t1 = time.perf_counter_ns()
+            stats.wait.add(t1 - t0)
+        self._start_hold(t1, stats)
+        return True
+
+    def release(self) -> None:
+        self._end_hold()
+        super().release()
+
+
+class _TracedAsyncSemaphore:
+    def _traced_init(self) -> None:
+        self._created = call_site()
+
+    async def acquire(self) -> bool:
+        stats = site_stats(self.kind, self._created)
+        stats.acquires += 1
+        if not self.locked():
+            return await super().acquire()
+        stats.contended += 1
+        t0 = time.perf_counter_ns()
+        try:
+            return await super().acquire()
+        except asyncio.CancelledError:
+            stats.failed += 1
+            raise
+        finally:
+            stats.wait.add(time.perf_counter_ns() - t0)
+
+
+class TracedAsyncSemaphore(_TracedAsyncSemaphore, asyncio.Semaphore):
+    kind = "asyncio.Semaphore"
+
+    def __init__(self, value: int = 1) -> None:
+        super().__init__(value)
+        self._traced_init()
+
+
+class TracedAsyncBoundedSemaphore(_TracedAsyncSemaphore, asyncio.BoundedSemaphore):
+    kind = "asyncio.BoundedSemaphore"
+
+    def __init__(self, value: int = 1) -> None:
+        super().__init__(value)
+        self._traced_init()
@@ -1,9 +1,122 @@
+import asyncio
+import threading
 import time
-from thread_contention_analyzer.wrappers import _ContendedLock, _contention
+
+import pytest
+
+from thread_contention_analyzer import instrument
+from thread_contention_analyzer.stats import Histogram, reset, snapshot
+from thread_contention_analyzer.wrappers import _STDLIB, _USER, TracedLock, _kind
+
+
+@pytest.fixture
+def installed():
+    reset()
+    instrument.install(hold_every=1)
+    yield
+    instrument.uninstall()
+
+
+def _sites(kind):
+    return {key: s for key, s in snapshot().items() if key[0] == kind}
+
 
 def test_contention_tracking():
-    lock = _ContendedLock(__import__('threading').Lock(), 'test:1')
+    reset()
+    lock = TracedLock(threading.Lock(), 'test:1')
     lock.acquire()
     time.sleep(0.01)
     lock.release()
-    assert 'test:1' in _contention
\ No newline at end of file
+    (key, stats), = [(k, s) for k, s in snapshot().items() if k[1] == 'test:1']
+    assert "test_wrappers.py" in key[2]
+    assert stats.acquires == 1 and stats.contended == 0
+
+
+def test_contended_lock_per_thread_merge(installed):
+    lock = threading.Lock()
+    def work():
+        for _ in range(200):
+            with lock:
+                time.sleep(0.0001)
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    (key, stats), = _sites("Lock").items()
+    assert "test_contended_lock_per_thread_merge" in key[1]
+    assert "work" in key[2]
+    assert stats.acquires == 800
+    assert stats.contended > 0 and stats.wait.count == stats.contended
+    assert stats.hold.count == 800 and stats.hold.percentile(50) >= 0.0001
+
+
+def test_rlock_condition_semaphores(installed):
+    cond = threading.Condition()
+    items = []
+    def consumer():
+        with cond:
+            with cond:  # reentrant
+                cond.wait_for(lambda: items, timeout=5)
+    t = threading.Thread(target=consumer)
+    t.start()
+    time.sleep(0.05)
+    with cond:
+        items.append(1)
+        cond.notify()
+    t.join()
+    assert _sites("RLock")
+
+    sem = threading.BoundedSemaphore(1)
+    with sem:
+        assert not sem.acquire(blocking=False)
+    with pytest.raises(ValueError):
+        sem.release()
+    by_line = _sites("BoundedSemaphore")
+    assert sum(s.acquires for s in by_line.values()) == 2
+    assert sum(s.failed for s in by_line.values()) == 1
+
+
+def test_internal_primitives_untraced(installed):
+    threading.Event().set()
+    t = threading.Thread(target=lambda: None)
+    t.start()
+    t.join()
+    assert not snapshot()
+
+
+def test_asyncio_lock(installed):
+    async def main():
+        lock = asyncio.Lock()
+        async def task():
+            async with lock:
+                await asyncio.sleep(0.001)
+        await asyncio.gather(*(task() for _ in range(3)))
+    asyncio.run(main())
+    (stats,) = _sites("asyncio.Lock").values()
+    assert stats.acquires == 3 and stats.contended == 2
+
+
+def test_uninstall_restores():
+    original = threading.Lock
+    instrument.install()
+    assert threading.Lock is not original
+    instrument.uninstall()
+    assert threading.Lock is original and not instrument.installed()
+
+
+def test_frozen_modules_are_stdlib():
+    frozen = compile("pass", "<frozen importlib._bootstrap>", "exec")
+    assert _kind(frozen) == _STDLIB
+    assert _kind(test_frozen_modules_are_stdlib.__code__) == _USER
+
+
+def test_histogram_buckets():
+    h, other = Histogram(), Histogram()
+    h.add(0)
+    h.add(1000)
+    other.add(3000)
+    h.merge(other)
+    assert h.count == 3 and h.total_ns == 4000
+    assert h.percentile(50) == 1024 / 1e9
+    assert h.percentile(100) == 4096 / 1e9
@@ -1,5 +1,6 @@
 import typer
 from pathlib import Path
+from typing import Dict, Optional
 import rich.traceback
 
 rich.traceback.install(show_locals=True)
@@ -7,9 +8,8 @@ rich.traceback.install(show_locals=True)
 from rich.console import Console
 
 from . import __version__
-from .parser import parse_file
-from .stats import print_trace_stats, print_bottlenecks
-from .visualizer import generate_waterfall_html
+from .pipeline import analyze_paths
+from .stats import ServiceStats, merge_service_stats, print_bottleneck_rows, print_service_stats, print_summary
 
 
 app = typer.Typer(no_args_is_help=True)
@@ -20,33 +20,36 @@ console = Console()
 def analyze(
     paths: list[Path] = typer.Argument(..., help="JSON trace file(s) or dir"),
     output: Optional[Path] = typer.Option(
-        None, "--output/-o", help="Output dir for HTML waterfalls"
+        None, "--output", "-o", help="Output dir for HTML waterfalls"
     ),
     top_n: int = typer.Option(10, "--top-n", min=1, max=50, help="Top bottlenecks"),
+    workers: int = typer.Option(0, "--workers", "-j", min=0, help="Worker processes (0 = one per CPU)"),
+    per_trace: bool = typer.Option(
+        True, "--per-trace/--summary-only", help="Print tables for every trace or only the totals"
+    ),
 ):
     """Main analysis: stats + bottlenecks + optional waterfalls."""
 
-    all_trees = {}
-    for path in paths:
-        if path.is_dir():
-            json_files = list(path.glob("**/*.json"))
-            if not json_files:
-                console.print(f"[yellow]No .json in {path}[/]")
-                continue
-            for jf in json_files:
-                trees = parse_file(jf, console)
-                all_trees.update(trees)
-        else:
-            trees = parse_file(path, console)
-            all_trees.update(trees)
-
-    for trace_id, roots in all_trees.items():
-        console.rule(f"Trace {trace_id[:16]}...", style="bold cyan")
-        print_trace_stats(roots, f"Stats: {trace_id[:16]}...")
-        print_bottlenecks(roots, top_n)
-
-        if output:
-            generate_waterfall_html(roots, output, trace_id, console)
+    totals: Dict[str, ServiceStats] = {}
+    traces = spans = 0
+    for summary in analyze_paths(paths, top_n, output, workers):
+        traces += 1
+        spans += summary.span_count
+        merge_service_stats(totals, summary.services)
+        if per_trace:
+            trace_id = summary.trace_id
+            console.rule(f"Trace {trace_id[:16]}...", style="bold cyan")
+            print_summary(summary, f"Stats: {trace_id[:16]}...")
+            print_bottleneck_rows(summary.bottlenecks, top_n)
+        if summary.waterfall:
+            console.print(f"[green]Waterfall saved: {summary.waterfall}[/]")
+
+    if not traces:
+        console.print("[red]No valid spans found.[/]")
+        raise typer.Exit(1)
+    if traces > 1 or not per_trace:
+        console.rule(f"All traces: {traces} traces, {spans} spans", style="bold cyan")
+        print_service_stats(totals, "Service Latencies, all traces (P50/P95/P99)")
 
 
 @app.command(help="Print version")
@@ -54,5 +57,9 @@ def version():
     console.print(f"trace-analyzer-cli v{__version__}")
 
 
-if __name__ == "__main__":
+def main():
     app()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,17 +9,12 @@ class LogRecord(BaseModel):
     fields: List[Dict[str, Any]] = Field(default_factory=list)
 
 
-class Span(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+class _SpanAccessors:
+    """Derived span properties shared by Span and SpanRecord."""
 
-    traceID: str = Field(..., description="Hex trace identifier")
-    spanID: str = Field(..., description="Hex span identifier")
-    parentSpanID: Optional[str] = Field(None, description="Parent span ID")
-    operationName: str = Field(..., description="Span name")
-    startTime: int = Field(..., description="Unix µs")
-    duration: int = Field(..., description="Duration in µs")
-    tags: Dict[str, str] = Field(default_factory=dict)
-    logs: List[LogRecord] = Field(default_factory=list)
+    tags: Dict[str, str]
+    startTime: int
+    duration: int
 
     @property
     def service(self) -> str:
@@ -45,3 +40,98 @@ class Span(BaseModel):
     def end_time_sec(self) -> float:
         """End time in seconds."""
         return self.start_time_sec + self.duration_sec
+
+
+class Span(_SpanAccessors, BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    traceID: str = Field(..., description="Hex trace identifier")
+    spanID: str = Field(..., description="Hex span identifier")
+    parentSpanID: Optional[str] = Field(None, description="Parent span ID")
+    operationName: str = Field(..., description="Span name")
+    startTime: int = Field(..., description="Unix µs")
+    duration: int = Field(..., description="Duration in µs")
+    tags: Dict[str, str] = Field(default_factory=dict)
+    logs: List[LogRecord] = Field(default_factory=list)
+
+
+class SpanRecord(_SpanAccessors):
+    """
+    Unvalidated span with the same fields as Span, for bulk ingest.
+
+    A slotted object costs a fraction of a pydantic model to build and hold;
+    logs are not kept, nothing in the analysis reads them.
+    """
+
+    __slots__ = ("traceID", "spanID", "parentSpanID", "operationName", "startTime", "duration", "tags")
+
+    def __init__(
+        self,
+        traceID: str,
+        spanID: str,
+        parentSpanID: Optional[str],
+        operationName: str,
+        startTime: int,
+        duration: int,
+        tags: Dict[str, str],
+    ):
+        self.traceID = traceID
+        self.spanID = spanID
+        self.parentSpanID = parentSpanID
+        self.operationName = operationName
+        self.startTime = startTime
+        self.duration = duration
+        self.tags = tags
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], processes: Optional[Dict[str, Any]] = None) -> SpanRecord:
+        """
+        Build from an exported span dict.
+
+        Accepts the flat layout of the examples as well as Jaeger API spans
+        (tags as key/value lists, parents in `references`, service names in
+        the trace's `processes`).
+        """
+        try:
+            tags = _tags(data.get("tags"))
+            parent = data.get("parentSpanID")
+            if parent is None:
+                parent = _parent_from_references(data.get("references"))
+            if "service.name" not in tags and processes:
+                process = processes.get(data.get("processID"), {})
+                if "serviceName" in process:
+                    tags["service.name"] = process["serviceName"]
+            return cls(
+                str(data["traceID"]),
+                str(data["spanID"]),
+                parent or None,
+                str(data["operationName"]),
+                int(data["startTime"]),
+                int(data["duration"]),
+                tags,
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Malformed span: {e!r}") from e
+
+
+def _tags(raw: Any) -> Dict[str, str]:
+    if not raw:
+        return {}
+    if isinstance(raw, dict):
+        items = raw.items()
+    else:
+        items = ((t.get("key"), t.get("value")) for t in raw)
+    return {str(k): _tag_value(v) for k, v in items}
+
+
+def _tag_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value if isinstance(value, str) else str(value)
+
+
+def _parent_from_references(refs: Any) -> Optional[str]:
+    for ref in refs or ():
+        if ref.get("refType", "CHILD_OF") == "CHILD_OF" and ref.get("spanID"):
+            return str(ref["spanID"])
+    return None
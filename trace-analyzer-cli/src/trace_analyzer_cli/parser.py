@@ -1,70 +1,93 @@
 from __future__ import annotations
 import json
-from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import ijson
 import rich.console
 
-from .models import Span, SpanNode
-
-
-def parse_file(file_path: Path, console: rich.console.Console) -> Dict[str, List[SpanNode]]:
-    """Parse Jaeger/OTel JSON trace file(s). Supports single/multi-trace."""
-    with file_path.open("r") as f:
-        data = json.load(f)
-
-    # Handle Jaeger formats: list[trace] or dict{data: list[trace]}
-    if isinstance(data, dict) and "data" in data:
-        traces_data = data["data"]
-    elif isinstance(data, list):
-        traces_data = data
-    else:
-        traces_data = [data]
-
-    trace_spans: Dict[str, List[Span]] = {}
-    for trace_obj in traces_data:
-        if isinstance(trace_obj, dict) and "spans" in trace_obj:
-            tid = trace_obj.get("traceID", "unknown")
-            spans = [Span.model_validate(s) for s in trace_obj["spans"]]
-            trace_spans[tid] = spans
-        elif isinstance(trace_obj, list):
+from .models import SpanRecord
+from .tree_builder import SpanNode, build_span_trees
+
+# (trace id, its spans as exported dicts, the trace's Jaeger `processes` if any)
+RawTrace = Tuple[str, List[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+def iter_raw_traces(file_path: Path) -> Iterator[RawTrace]:
+    """
+    Stream the traces of a Jaeger/OTel JSON export one at a time.
+
+    Supported layouts: `{"data": [trace, ...]}`, `[trace, ...]`, a single
+    trace object, raw span lists (grouped by traceID) and `.jsonl` with one
+    trace or span per line. Only one trace is materialized at a time, except
+    for loose spans, which must be grouped before their trace is complete.
+    """
+    if file_path.suffix == ".jsonl":
+        with file_path.open("rb") as f:
+            yield from _group(json.loads(line) for line in f if line.strip())
+        return
+    with file_path.open("rb") as f:
+        first = _first_byte(f)
+        if first == b"[":
+            yield from _group(ijson.items(f, "item", use_float=True))
+            return
+        if first != b"{":
+            return
+        found = False
+        for obj in ijson.items(f, "data.item", use_float=True):
+            found = True
+            yield from _group([obj])
+        if found:
+            return
+        f.seek(0)
+        yield from _group(ijson.items(f, "", use_float=True))
+
+
+def _first_byte(f) -> bytes:
+    while True:
+        chunk = f.read(1)
+        if not chunk or not chunk.isspace():
+            f.seek(-len(chunk), 1)
+            return chunk
+
+
+def _group(objects) -> Iterator[RawTrace]:
+    """Yield trace objects as they come; collect loose spans per traceID."""
+    loose: Dict[str, List[Dict[str, Any]]] = {}
+    for obj in objects:
+        if isinstance(obj, dict) and "spans" in obj:
+            spans = obj["spans"]
+            tid = obj.get("traceID") or (spans[0].get("traceID") if spans else None) or "unknown"
+            yield str(tid), spans, obj.get("processes")
+        elif isinstance(obj, list):
             # Raw spans list, use first traceID
-            if trace_obj:
-                tid = trace_obj[0].get("traceID", "unknown")
-                trace_spans[tid] = [Span.model_validate(s) for s in trace_obj]
-
-    trees: Dict[str, List[SpanNode]] = {}
-    for tid, spans in trace_spans.items():
-        trees[tid] = build_span_trees(spans)
+            if obj:
+                yield str(obj[0].get("traceID", "unknown")), obj, None
+        elif isinstance(obj, dict) and "spanID" in obj:
+            loose.setdefault(str(obj.get("traceID", "unknown")), []).append(obj)
+    for tid, spans in loose.items():
+        yield tid, spans, None
 
-    if not trees:
-        console.print("[red]No valid spans found.[/]")
-        raise ValueError("Empty trace file")
 
-    return trees
+def to_records(raw_spans: List[Dict[str, Any]], processes: Optional[Dict[str, Any]] = None) -> List[SpanRecord]:
+    return [SpanRecord.from_dict(s, processes) for s in raw_spans]
 
 
-def build_span_trees(spans: List[Span]) -> List[SpanNode]:
-    """Build hierarchical SpanNode trees from flat spans."""
-    span_map: Dict[str, SpanNode] = {span.spanID: SpanNode(span) for span in spans}
+def iter_traces(file_path: Path) -> Iterator[Tuple[str, List[SpanNode]]]:
+    """Stream (trace id, root nodes) pairs from an export."""
+    for tid, raw_spans, processes in iter_raw_traces(file_path):
+        yield tid, build_span_trees(to_records(raw_spans, processes))
 
-    for node in list(span_map.values()):
-        parent_id = node.span.parentSpanID
-        if parent_id and parent_id in span_map:
-            span_map[parent_id].children.append(node)
 
-    roots = [node for node in span_map.values() if node.span.parentSpanID is None]
-
-    # Compute exclusive self_times bottom-up
-    for root in roots:
-        _compute_exclusive_times(root)
-
-    return roots
+def parse_file(file_path: Path, console: Optional[rich.console.Console]) -> Dict[str, List[SpanNode]]:
+    """Parse Jaeger/OTel JSON trace file(s). Supports single/multi-trace."""
+    trees: Dict[str, List[SpanNode]] = {}
+    if file_path.is_file():
+        trees = dict(iter_traces(file_path))
 
+    if not trees:
+        if console:
+            console.print("[red]No valid spans found.[/]")
+        raise ValueError("Empty trace file")
 
-def _compute_exclusive_times(node: SpanNode) -> float:
-    """Recursively compute exclusive self time: max(0, dur - sum(child dur))."""
-    child_total = sum(_compute_exclusive_times(child) for child in node.children)
-    node.self_time = max(0.0, node.span.duration_sec - child_total)
-    return node.span.duration_sec
+    return trees
@@ -0,0 +1,76 @@
+from __future__ import annotations
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, List, Optional
+
+from .parser import RawTrace, iter_raw_traces, to_records
+from .stats import TraceSummary, summarize_trace
+from .tree_builder import build_span_trees
+
+BATCH_SPANS = 20_000  # spans per task sent to a worker
+
+
+def analyze_trace(raw: RawTrace, top_n: int = 10, output: Optional[Path] = None) -> TraceSummary:
+    """Build one trace's tree and reduce it to a summary (writing its waterfall if asked)."""
+    tid, raw_spans, processes = raw
+    roots = build_span_trees(to_records(raw_spans, processes))
+    summary = summarize_trace(tid, roots, top_n)
+    if output is not None and roots:
+        from .visualizer import generate_waterfall_html
+
+        summary.waterfall = generate_waterfall_html(roots, output, tid)
+    return summary
+
+
+def _analyze_batch(batch: List[RawTrace], top_n: int, output: Optional[Path]) -> List[TraceSummary]:
+    return [analyze_trace(raw, top_n, output) for raw in batch]
+
+
+def _batches(traces: Iterable[RawTrace]) -> Iterator[List[RawTrace]]:
+    batch: List[RawTrace] = []
+    spans = 0
+    for raw in traces:
+        batch.append(raw)
+        spans += len(raw[1])
+        if spans >= BATCH_SPANS:
+            yield batch
+            batch, spans = [], 0
+    if batch:
+        yield batch
+
+
+def iter_files(paths: Iterable[Path]) -> Iterator[Path]:
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(p for p in path.glob("**/*") if p.suffix in (".json", ".jsonl"))
+        else:
+            yield path
+
+
+def analyze_paths(
+    paths: Iterable[Path], top_n: int = 10, output: Optional[Path] = None, workers: int = 0
+) -> Iterator[TraceSummary]:
+    """
+    Stream summaries of every trace in `paths`, in input order.
+
+    The main process only parses; traces are shipped in batches to a
+    process pool that builds the trees and computes the statistics. At most
+    two batches per worker are in flight, so memory stays bounded however
+    large the export is.
+    """
+    traces = (raw for f in iter_files(paths) for raw in iter_raw_traces(f))
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    if workers <= 1:
+        for raw in traces:
+            yield analyze_trace(raw, top_n, output)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        for batch in _batches(traces):
+            pending.append(pool.submit(_analyze_batch, batch, top_n, output))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -1,45 +1,162 @@
 from __future__ import annotations
-import statistics
-from collections import defaultdict, Counter
-from typing import List
+import heapq
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 from rich import console, table
-from rich.text import Text
-
-import plotly.express as px
-import pandas as pd
 
 from .tree_builder import SpanNode
 
 
 console = console.Console()
 
+_MIN_SEC = 1e-6  # durations are whole microseconds
+_LOG_GAMMA = math.log(1.01)
+
+
+class LatencyHistogram:
+    """
+    Durations in logarithmic buckets (~1% relative error).
+
+    Memory depends on the spread of latencies, not on the number of spans,
+    and histograms from different traces or processes merge by adding
+    bucket counts. Exact min/max are kept and bound every quantile.
+    """
+
+    __slots__ = ("buckets", "count", "lo", "hi")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.lo = math.inf
+        self.hi = 0.0
+
+    def add(self, seconds: float) -> None:
+        key = int(math.log(max(seconds, _MIN_SEC) / _MIN_SEC) / _LOG_GAMMA)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+        self.count += 1
+        if seconds < self.lo:
+            self.lo = seconds
+        if seconds > self.hi:
+            self.hi = seconds
+
+    def merge(self, other: LatencyHistogram) -> None:
+        for key, n in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + n
+        self.count += other.count
+        self.lo = min(self.lo, other.lo)
+        self.hi = max(self.hi, other.hi)
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Several quantiles from one pass over the sorted buckets."""
+        if not self.count:
+            return [0.0 for _ in qs]
+        order = sorted(range(len(qs)), key=lambda i: qs[i])
+        out = [0.0] * len(qs)
+        keys = sorted(self.buckets)
+        cum, k = 0, 0
+        for i in order:
+            rank = qs[i] * (self.count - 1)
+            while cum + self.buckets[keys[k]] <= rank and k < len(keys) - 1:
+                cum += self.buckets[keys[k]]
+                k += 1
+            value = _MIN_SEC * math.exp((keys[k] + 0.5) * _LOG_GAMMA)
+            out[i] = min(max(value, self.lo), self.hi)
+        return out
+
+
+@dataclass
+class ServiceStats:
+    count: int = 0
+    errors: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def merge(self, other: ServiceStats) -> None:
+        self.count += other.count
+        self.errors += other.errors
+        self.latency.merge(other.latency)
+
+
+# (operation, duration s, self time s, service, is_error)
+Bottleneck = Tuple[str, float, float, str, bool]
+
+
+@dataclass
+class TraceSummary:
+    """Everything the report shows for one trace, without its spans."""
+
+    trace_id: str
+    span_count: int
+    start: float
+    end: float
+    errors: int
+    services: Dict[str, ServiceStats]
+    latency: LatencyHistogram
+    bottlenecks: List[Bottleneck]
+    waterfall: Optional[Path] = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start if self.span_count else 0.0
+
+
+def summarize_trace(trace_id: str, roots: List[SpanNode], top_n: int = 10) -> TraceSummary:
+    """One pass over a trace's spans: totals, per-service stats and the slowest spans."""
+    latency = LatencyHistogram()
+    start, end, errors, count = math.inf, -math.inf, 0, 0
+    heap: List[Tuple[int, int, SpanNode]] = []  # the top_n longest spans so far
+
+    def visit(nodes: Iterable[SpanNode]) -> Iterable[SpanNode]:
+        nonlocal start, end, errors, count
+        for n in nodes:
+            span = n.span
+            latency.add(span.duration_sec)
+            start = min(start, span.start_time_sec)
+            end = max(end, span.end_time_sec)
+            errors += span.is_error
+            count += 1
+            if top_n:
+                item = (span.duration, -count, n)
+                if len(heap) < top_n:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            yield n
+
+    # The service accumulator drives the single pass over the trace.
+    services = _compute_service_stats(visit(_flatten_nodes(roots)))
+    top = [n for _, _, n in sorted(heap, reverse=True)]
+    bottlenecks = [
+        (n.span.operationName, n.span.duration_sec, n.self_time, n.span.service, n.span.is_error) for n in top
+    ]
+    return TraceSummary(trace_id, count, start, end, errors, services, latency, bottlenecks)
+
 
 def print_trace_stats(roots: List[SpanNode], title: str = "Trace Statistics"):
     """Print rich stats table."""
-    all_nodes = list(_flatten_nodes(roots))
-    if not all_nodes:
-        return
+    summary = summarize_trace("", roots, top_n=0)
+    if summary.span_count:
+        print_summary(summary, title)
 
-    durations = [n.span.duration_sec for n in all_nodes]
-    services = [n.span.service for n in all_nodes]
-    errors = sum(1 for n in all_nodes if n.span.is_error)
-
-    service_stats = _compute_service_stats(all_nodes)
 
+def print_summary(summary: TraceSummary, title: str = "Trace Statistics"):
     t = table.Table(title=title, title_style="bold magenta")
     t.add_column("Metric", style="cyan")
     t.add_column("Value", style="green")
-    t.add_row("Total Duration", f"{max(n.span.end_time_sec for n in all_nodes):.3f}s")
-    t.add_row("Span Count", str(len(all_nodes)))
-    t.add_row("Services", str(len(set(services))))
-    t.add_row("Error Rate", f"{errors/len(all_nodes)*100:.1f}%" if all_nodes else "0%")
-    t.add_row("P95 Latency", f"{statistics.quantiles(durations, n=20)[18]:.3f}s")
+    t.add_row("Total Duration", f"{summary.duration:.3f}s")
+    t.add_row("Span Count", str(summary.span_count))
+    t.add_row("Services", str(len(summary.services)))
+    t.add_row("Error Rate", f"{summary.errors/summary.span_count*100:.1f}%" if summary.span_count else "0%")
+    t.add_row("P95 Latency", f"{summary.latency.quantiles([0.95])[0]:.3f}s")
 
     console.print(t)
+    print_service_stats(summary.services)
+
 
-    # Service table
-    s_table = table.Table(title="Service Latencies (P50/P95/P99)", title_style="bold blue")
+def print_service_stats(services: Dict[str, ServiceStats], title: str = "Service Latencies (P50/P95/P99)"):
+    s_table = table.Table(title=title, title_style="bold blue")
     s_table.add_column("Service")
     s_table.add_column("Count")
     s_table.add_column("P50")
@@ -47,25 +164,26 @@ def print_trace_stats(roots: List[SpanNode], title: str = "Trace Statistics"):
     s_table.add_column("P99")
     s_table.add_column("Errors")
 
-    for svc, stats_ in service_stats.items():
-        p50 = statistics.median(stats_["durs"])
-        p95 = sorted(stats_["durs"])[int(0.95 * len(stats_["durs"]))]
-        p99 = sorted(stats_["durs"])[int(0.99 * len(stats_["durs"]))] if len(stats_["durs"]) > 100 else p95
-        err_cnt = stats_["errors"]
-        s_table.add_row(svc, str(stats_["count"]), f"{p50:.3f}s", f"{p95:.3f}s", f"{p99:.3f}s", str(err_cnt))
+    for svc, stats_ in services.items():
+        p50, p95, p99 = stats_.latency.quantiles([0.5, 0.95, 0.99])
+        s_table.add_row(svc, str(stats_.count), f"{p50:.3f}s", f"{p95:.3f}s", f"{p99:.3f}s", str(stats_.errors))
 
     console.print(s_table)
 
 
 def get_top_bottlenecks(roots: List[SpanNode], top_n: int = 10) -> List[SpanNode]:
     """Return top slowest spans by duration."""
-    all_nodes = list(_flatten_nodes(roots))
-    return sorted(all_nodes, key=lambda n: n.span.duration_sec, reverse=True)[:top_n]
+    return heapq.nlargest(top_n, _flatten_nodes(roots), key=lambda n: n.span.duration_sec)
 
 
 def print_bottlenecks(roots: List[SpanNode], top_n: int = 10):
     """Print top bottlenecks table."""
     top = get_top_bottlenecks(roots, top_n)
+    rows = [(n.span.operationName, n.span.duration_sec, n.self_time, n.span.service, n.span.is_error) for n in top]
+    print_bottleneck_rows(rows, top_n)
+
+
+def print_bottleneck_rows(rows: List[Bottleneck], top_n: int = 10):
     t = table.Table(title=f"Top {top_n} Bottlenecks", title_style="bold red")
     t.add_column("Operation")
     t.add_column("Duration")
@@ -73,30 +191,38 @@ def print_bottlenecks(roots: List[SpanNode], top_n: int = 10):
     t.add_column("Service")
     t.add_column("Error")
 
-    for node in top:
-        error_icon = "[red]❌[/red]" if node.span.is_error else "✅"
-        t.add_row(
-            node.span.operationName[:30],
-            f"{node.span.duration_sec:.3f}s",
-            f"{node.self_time:.3f}s",
-            node.span.service,
-            error_icon,
-        )
+    for op, duration, self_time, service, is_error in rows:
+        error_icon = "[red]❌[/red]" if is_error else "✅"
+        t.add_row(op[:30], f"{duration:.3f}s", f"{self_time:.3f}s", service, error_icon)
 
     console.print(t)
 
 
-def _compute_service_stats(all_nodes: List[SpanNode]) -> Dict[str, Dict]:
-    stats = defaultdict(lambda: {"durs": [], "count": 0, "errors": 0})
-    for n in all_nodes:
-        svc = n.span.service
-        stats[svc]["durs"].append(n.span.duration_sec)
-        stats[svc]["count"] += 1
-        if n.span.is_error:
-            stats[svc]["errors"] += 1
-    return dict(stats)
-
-
-def _flatten_nodes(roots: List[SpanNode]) -> List[SpanNode]:
+def _compute_service_stats(
+    nodes: Iterable[SpanNode], into: Optional[Dict[str, ServiceStats]] = None
+) -> Dict[str, ServiceStats]:
+    """Accumulate per-service count, errors and latency histogram as nodes stream by."""
+    stats = into if into is not None else {}
+    for n in nodes:
+        span = n.span
+        svc = stats.get(span.service)
+        if svc is None:
+            svc = stats[span.service] = ServiceStats()
+        svc.count += 1
+        svc.latency.add(span.duration_sec)
+        if span.is_error:
+            svc.errors += 1
+    return stats
+
+
+def merge_service_stats(into: Dict[str, ServiceStats], other: Dict[str, ServiceStats]) -> None:
+    for svc, s in other.items():
+        if svc in into:
+            into[svc].merge(s)
+        else:
+            into[svc] = s
+
+
+def _flatten_nodes(roots: List[SpanNode]) -> Iterable[SpanNode]:
     for root in roots:
         yield from root.flatten()
@@ -1,7 +1,9 @@
 from __future__ import annotations
-from typing import List
+from typing import Dict, Iterator, List, Sequence, Union
 
-from .models import Span
+from .models import Span, SpanRecord
+
+AnySpan = Union[Span, SpanRecord]
 
 
 class SpanNode:
@@ -9,13 +11,43 @@ class SpanNode:
 
     __slots__ = ("span", "children", "self_time")
 
-    def __init__(self, span: Span):
+    def __init__(self, span: AnySpan):
         self.span = span
         self.children: List[SpanNode] = []
         self.self_time: float = 0.0
 
-    def flatten(self) -> list[SpanNode]:
-        """Yield all descendant nodes depth-first."""
-        yield self
-        for child in self.children:
-            yield from child.flatten()
+    def flatten(self) -> Iterator[SpanNode]:
+        """Yield all descendant nodes depth-first (iteratively; traces can be deep)."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+
+def build_span_trees(spans: Sequence[AnySpan]) -> List[SpanNode]:
+    """
+    Build hierarchical SpanNode trees from flat spans.
+
+    Spans whose parent is missing from the trace become roots. Exclusive
+    self time is `max(0, duration - sum(child durations))`, which only needs
+    each node's direct children, so it is accumulated while linking instead
+    of by a recursive walk.
+    """
+    span_map: Dict[str, SpanNode] = {span.spanID: SpanNode(span) for span in spans}
+    child_total: Dict[str, int] = {}
+    roots = []
+    for node in span_map.values():
+        parent_id = node.span.parentSpanID
+        parent = span_map.get(parent_id) if parent_id else None
+        if parent is None:
+            roots.append(node)
+        else:
+            parent.children.append(node)
+            child_total[parent_id] = child_total.get(parent_id, 0) + node.span.duration
+
+    for span_id, node in span_map.items():
+        self_us = node.span.duration - child_total.get(span_id, 0)
+        node.self_time = max(0.0, self_us / 1_000_000.0)
+
+    return roots
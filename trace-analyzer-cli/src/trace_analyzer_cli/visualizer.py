@@ -15,11 +15,14 @@ def generate_waterfall_html(
         console.print("[blue]Generating waterfall...[/]")
 
     rows = []
-
-    def collect(node: SpanNode, path: str = ""):
+    root_start = _get_root_start(roots)
+    # Explicit stack instead of recursion: traces can be thousands of spans deep.
+    stack = [(roots[0], "")] if roots else []  # Assume single root
+    while stack:
+        node, path = stack.pop()
         name = node.span.operationName
         full_path = f"{path}/{name}" if path else name
-        rel_start = node.span.start_time_sec - _get_root_start(roots)
+        rel_start = node.span.start_time_sec - root_start
         rows.append(
             {
                 "Path": full_path,
@@ -32,10 +35,7 @@ def generate_waterfall_html(
                 "Error": node.span.is_error,
             }
         )
-        for child in node.children:
-            collect(child, full_path)
-
-    collect(roots[0] if roots else SpanNode())  # Assume single root
+        stack.extend((child, full_path) for child in reversed(node.children))
 
     if not rows:
         raise ValueError("No spans to visualize")
@@ -65,4 +65,4 @@ def generate_waterfall_html(
 
 
 def _get_root_start(roots: List[SpanNode]) -> float:
-    return min(root.span.start_time_sec for root in roots)
+    return min((root.span.start_time_sec for root in roots), default=0.0)
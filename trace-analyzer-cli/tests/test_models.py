@@ -27,3 +27,33 @@ def test_missing_tags(sample_span):
     span = Span.model_validate(sample_span)
     assert span.service == "unknown"
     assert span.is_error is False
+
+
+def test_span_record_matches_span(sample_span):
+    from trace_analyzer_cli.models import SpanRecord
+
+    record = SpanRecord.from_dict(sample_span)
+    span = Span.model_validate(sample_span)
+    for attr in ("spanID", "parentSpanID", "service", "is_error", "duration_sec", "end_time_sec"):
+        assert getattr(record, attr) == getattr(span, attr)
+
+
+def test_span_record_jaeger_layout():
+    from trace_analyzer_cli.models import SpanRecord
+
+    raw = {
+        "traceID": "t",
+        "spanID": "b",
+        "operationName": "q",
+        "startTime": 10,
+        "duration": 5,
+        "processID": "p1",
+        "references": [{"refType": "CHILD_OF", "traceID": "t", "spanID": "a"}],
+        "tags": [{"key": "error", "type": "bool", "value": True}],
+    }
+    record = SpanRecord.from_dict(raw, {"p1": {"serviceName": "db"}})
+    assert record.parentSpanID == "a"
+    assert record.service == "db"
+    assert record.is_error is True
+    with pytest.raises(ValueError, match="Malformed"):
+        SpanRecord.from_dict({"spanID": "x"})
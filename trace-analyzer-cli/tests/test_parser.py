@@ -38,3 +38,58 @@ def test_no_spans():
     empty_json = Path("nonexistent")
     with pytest.raises(ValueError, match="Empty"):
         parse_file(empty_json, None)
+
+
+def _span(tid, sid, parent, dur):
+    return {"traceID": tid, "spanID": sid, "parentSpanID": parent, "operationName": sid, "startTime": 0, "duration": dur}
+
+
+@pytest.mark.parametrize(
+    "layout",
+    [
+        lambda traces: {"data": traces},
+        lambda traces: traces,
+        lambda traces: [s for t in traces for s in t["spans"]],  # loose spans
+    ],
+)
+def test_iter_raw_traces_layouts(tmp_path: Path, layout):
+    from trace_analyzer_cli.parser import iter_raw_traces
+
+    traces = [{"traceID": t, "spans": [_span(t, "r", None, 10), _span(t, "c", "r", 4)]} for t in ("1", "2")]
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps(layout(traces)))
+    got = {tid: [s["spanID"] for s in spans] for tid, spans, _ in iter_raw_traces(path)}
+    assert got == {"1": ["r", "c"], "2": ["r", "c"]}
+
+
+def test_single_trace_and_jsonl(tmp_path: Path):
+    from trace_analyzer_cli.parser import iter_traces
+
+    single = tmp_path / "one.json"
+    single.write_text(json.dumps({"traceID": "9", "spans": [_span("9", "r", None, 10)]}))
+    assert [tid for tid, _ in iter_traces(single)] == ["9"]
+    lines = tmp_path / "spans.jsonl"
+    lines.write_text("\n".join(json.dumps(_span("5", s, None if s == "r" else "r", 3)) for s in "rab"))
+    ((tid, roots),) = list(iter_traces(lines))
+    assert tid == "5" and len(roots[0].children) == 2
+
+
+def test_deep_trace_no_recursion():
+    from trace_analyzer_cli.models import SpanRecord
+
+    depth = 20_000
+    spans = [
+        SpanRecord.from_dict(_span("d", str(i), str(i - 1) if i else None, depth - i)) for i in range(depth)
+    ]
+    (root,) = build_span_trees(spans)
+    nodes = list(root.flatten())
+    assert len(nodes) == depth
+    assert nodes[-1].self_time == pytest.approx(1e-6)
+    assert root.self_time == pytest.approx(1e-6)
+
+
+def test_orphan_spans_become_roots():
+    from trace_analyzer_cli.models import SpanRecord
+
+    roots = build_span_trees([SpanRecord.from_dict(_span("1", "x", "missing", 5))])
+    assert [r.span.spanID for r in roots] == ["x"]
@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+
+from trace_analyzer_cli.pipeline import analyze_paths
+
+
+def _export(path: Path, n_traces: int) -> None:
+    traces = []
+    for t in range(n_traces):
+        spans = [
+            {"traceID": str(t), "spanID": f"{t}-{i}", "parentSpanID": f"{t}-{i-1}" if i else None,
+             "operationName": f"op{i}", "startTime": i, "duration": 100 - i,
+             "tags": {"service.name": f"s{i % 2}"}}
+            for i in range(10)
+        ]
+        traces.append({"traceID": str(t), "spans": spans})
+    path.write_text(json.dumps({"data": traces}))
+
+
+def test_serial_and_parallel_agree(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr("trace_analyzer_cli.pipeline.BATCH_SPANS", 25)
+    _export(tmp_path / "a.json", 7)
+    serial = list(analyze_paths([tmp_path], top_n=3, workers=1))
+    parallel = list(analyze_paths([tmp_path], top_n=3, workers=2))
+    assert [s.trace_id for s in serial] == [s.trace_id for s in parallel] == [str(t) for t in range(7)]
+    for s, p in zip(serial, parallel):
+        assert s.bottlenecks == p.bottlenecks
+        assert {k: v.count for k, v in s.services.items()} == {k: v.count for k, v in p.services.items()}
+
+
+def test_waterfalls_written(tmp_path: Path):
+    _export(tmp_path / "a.json", 2)
+    out = tmp_path / "report"
+    summaries = list(analyze_paths([tmp_path / "a.json"], output=out, workers=1))
+    assert all(s.waterfall and s.waterfall.exists() for s in summaries)
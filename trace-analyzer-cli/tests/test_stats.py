@@ -26,3 +26,31 @@ def test_print_stats(sample_roots, monkeypatch):
     monkeypatch.setattr("trace_analyzer_cli.stats.console", Mock())
     print_trace_stats(sample_roots)
     mock_print.assert_called()
+
+
+def test_latency_histogram_quantiles_and_merge():
+    from trace_analyzer_cli.stats import LatencyHistogram
+
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for i in range(1, 501):
+        a.add(i / 1000)
+    for i in range(501, 1001):
+        b.add(i / 1000)
+    a.merge(b)
+    p50, p99, top = a.quantiles([0.5, 0.99, 1.0])
+    assert a.count == 1000
+    assert p50 == pytest.approx(0.5, rel=0.02)
+    assert p99 == pytest.approx(0.99, rel=0.02)
+    assert top == 1.0
+
+
+def test_summarize_trace(sample_roots):
+    from trace_analyzer_cli.stats import summarize_trace
+
+    summary = summarize_trace("1", sample_roots, top_n=1)
+    assert summary.span_count == 2
+    assert summary.duration == pytest.approx(1.0)
+    assert summary.errors == 1
+    assert set(summary.services) == {"s1", "s2"}
+    assert summary.services["s2"].errors == 1
+    assert [b[0] for b in summary.bottlenecks] == ["root"]
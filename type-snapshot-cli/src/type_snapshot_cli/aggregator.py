@@ -1,22 +1,89 @@
+import json
 from collections import defaultdict
-from typing import Any, Callable, Dict, Set
+from pathlib import Path
+from types import CodeType
+from typing import Any, Callable, Dict, Set, Tuple, Union
+
+SHARD_VERSION = 1
+
+
+def _params(code: CodeType) -> Tuple[str, ...]:
+    """Argument names of a code object, including *args and **kwargs."""
+    n = code.co_argcount + code.co_kwonlyargcount
+    n += bool(code.co_flags & 0x04) + bool(code.co_flags & 0x08)  # CO_VARARGS, CO_VARKEYWORDS
+    return code.co_varnames[:n]
+
+
+def type_name(t: type) -> str:
+    return t.__qualname__ if t.__module__ == "builtins" else f"{t.__module__}.{t.__qualname__}"
+
+
+class FunctionTypes:
+    __slots__ = ("name", "params", "calls", "types")
+
+    def __init__(self, name: str, params: Tuple[str, ...]):
+        self.name = name
+        self.params = params
+        self.calls = 0
+        self.types: Dict[str, Set[type]] = defaultdict(set)
+
 
 class TypeAggregator:
+    """
+    Argument types per function, keyed by code object while collecting.
+
+    Names ("module.qualname:arg") are only built once per function, and type
+    names only when reducing or writing a shard.
+    """
+
     def __init__(self):
-        self.observations: Dict[str, Set[type]] = defaultdict(set)
+        self.functions: Dict[Any, FunctionTypes] = {}
 
     def observe(self, func: Callable, locals_: Dict[str, Any]):
-        key = f"{func.__module__}.{func.__qualname__}"
-        for name, value in locals_.items():
+        fn = self.functions.get(func.__code__)
+        if fn is None:
+            fn = self.functions[func.__code__] = FunctionTypes(f"{func.__module__}.{func.__qualname__}", tuple(locals_))
+        self._add(fn, locals_)
+
+    def observe_frame(self, code: CodeType, frame) -> int:
+        """Record the arguments of a call that just started; returns the calls seen so far."""
+        fn = self.functions.get(code)
+        if fn is None:
+            module = frame.f_globals.get("__name__", "?")
+            fn = self.functions[code] = FunctionTypes(f"{module}.{code.co_qualname}", _params(code))
+        self._add(fn, frame.f_locals)
+        return fn.calls
+
+    @staticmethod
+    def _add(fn: FunctionTypes, locals_: Dict[str, Any]):
+        fn.calls += 1
+        types = fn.types
+        for name in fn.params:
+            value = locals_.get(name)
             if value is not None:
-                self.observations[f"{key}:{name}"].add(type(value))
-
-    def reduce(self) -> Dict[str, str]:
-        result = {}
-        for k, typeset in self.observations.items():
-            if len(typeset) == 1:
-                t = next(iter(typeset))
-                result[k] = t.__name__
-            else:
-                result[k] = " | ".join(sorted(t.__name__ for t in typeset))
-        return result
\ No newline at end of file
+                types[name].add(type(value))
+
+    def to_shard(self) -> Dict[str, Any]:
+        calls: Dict[str, int] = defaultdict(int)
+        types: Dict[str, Set[str]] = defaultdict(set)
+        for fn in self.functions.values():
+            calls[fn.name] += fn.calls
+            for param, typeset in fn.types.items():
+                types[f"{fn.name}:{param}"].update(type_name(t) for t in typeset)
+        return {"version": SHARD_VERSION, "calls": dict(calls),
+                "types": {k: sorted(v) for k, v in types.items()}}
+
+    def write_shard(self, path: Path):
+        Path(path).write_text(json.dumps(self.to_shard()))
+
+    def reduce(self, *shards: Union[Path, str, Dict[str, Any]]) -> Dict[str, str]:
+        """Hints for everything observed here, merged with shards written by other workers."""
+        merged: Dict[str, Set[str]] = defaultdict(set)
+        for shard in (self.to_shard(), *shards):
+            if not isinstance(shard, dict):
+                shard = json.loads(Path(shard).read_text())
+            if shard.get("version") != SHARD_VERSION:
+                raise ValueError(f"Unsupported shard version: {shard.get('version')}")
+            for key, names in shard["types"].items():
+                merged[key].update(names)
+        return {k: " | ".join(sorted(names)) for k, names in merged.items() if names}
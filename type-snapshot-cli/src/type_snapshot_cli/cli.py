@@ -1,5 +1,10 @@
+from pathlib import Path
+from typing import List
+
 import typer
 from rich.console import Console
+from .aggregator import TypeAggregator
+from .emitter import emit_patch
 from .tracer import run_snapshot
 
 app = typer.Typer(help="Capture runtime types and emit precise hints")
@@ -9,7 +14,27 @@ console = Console()
 def snapshot(
     target: str = typer.Argument(..., help="Path to package or module"),
     out: str = typer.Option("hints.patch", "--out", help="Output patch file"),
+    tests: str = typer.Option("tests", "--tests", help="Test path passed to pytest"),
+    workers: int = typer.Option(1, "--workers", "-n", min=1, help="Parallel pytest processes, each writing a shard"),
+    first: int = typer.Option(32, "--first", min=1, help="Observe each function this many times, then once per test"),
 ):
     """Run tests under tracing and write minimal type hints."""
-    run_snapshot(target, out)
-    console.print(f"[green]Snapshot written to {out}[/green]")
\ No newline at end of file
+    code = run_snapshot(target, out, tests=tests, workers=workers, first=first)
+    console.print(f"[green]Snapshot written to {out}[/green]")
+    if code not in (0, 5):  # 5: no tests collected
+        console.print(f"[yellow]pytest exited with {code}; hints cover the tests that ran[/yellow]")
+
+
+@app.command()
+def merge(
+    shards: List[Path] = typer.Argument(..., help="Shards written with pytest --snapshot-shard"),
+    out: str = typer.Option("hints.patch", "--out", help="Output patch file"),
+):
+    """Merge shards from parallel test workers into one patch."""
+    try:
+        hints = TypeAggregator().reduce(*shards)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    emit_patch(hints, Path(out))
+    console.print(f"[green]Merged {len(shards)} shards into {out}[/green]")
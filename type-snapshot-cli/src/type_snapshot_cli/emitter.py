@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Dict
 
 def emit_patch(hints: Dict[str, str], out: Path):
     lines = ["# type: ignore[override]  # auto-generated snapshot\n"]
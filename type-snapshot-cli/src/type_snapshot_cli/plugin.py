@@ -0,0 +1,61 @@
+"""pytest plugin: `pytest --snapshot-types` collects argument types while the suite runs."""
+from pathlib import Path
+
+import pytest
+
+from .tracer import SnapshotTracer
+
+_KEY = pytest.StashKey[SnapshotTracer]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("type-snapshot", "runtime type snapshots")
+    group.addoption("--snapshot-types", action="store_true", help="Collect argument types while tests run")
+    group.addoption("--snapshot-root", default=".", help="Only functions in files under this directory")
+    group.addoption("--snapshot-out", default="hints.patch", help="Hints patch to write")
+    group.addoption("--snapshot-shard", default=None,
+                    help="Write raw observations to this JSON shard instead of a patch (merge later)")
+    group.addoption("--snapshot-first", type=int, default=32,
+                    help="Observe each function this many times, then once per test")
+    group.addoption("--snapshot-worker", default=None, metavar="I/N",
+                    help="Run only tests I, I+N, I+2N, ... (for parallel workers writing shards)")
+
+
+def pytest_configure(config):
+    if not config.getoption("snapshot_types"):
+        return
+    tracer = SnapshotTracer(Path(config.getoption("snapshot_root")), first=config.getoption("snapshot_first"))
+    tracer.start()
+    config.stash[_KEY] = tracer
+
+
+def pytest_collection_modifyitems(config, items):
+    worker = config.getoption("snapshot_worker")
+    if not worker:
+        return
+    try:
+        index, count = (int(part) for part in worker.split("/"))
+    except ValueError:
+        raise pytest.UsageError(f"--snapshot-worker must be I/N, got {worker!r}")
+    selected = items[index::count]
+    config.hook.pytest_deselected(items=[item for i, item in enumerate(items) if i % count != index])
+    items[:] = selected
+
+
+def pytest_runtest_setup(item):
+    tracer = item.config.stash.get(_KEY, None)
+    if tracer is not None:
+        tracer.resample()
+
+
+def pytest_unconfigure(config):
+    tracer = config.stash.get(_KEY, None)
+    if tracer is None:
+        return
+    tracer.stop()
+    del config.stash[_KEY]
+    shard = config.getoption("snapshot_shard")
+    if shard:
+        tracer.agg.write_shard(Path(shard))
+    else:
+        tracer.finish(config.getoption("snapshot_out"))
@@ -1,34 +1,159 @@
+"""
+Argument type collection for functions under a root directory.
+
+On Python 3.12+ this uses sys.monitoring (PEP 669): a PY_START callback
+records a call, and returns DISABLE for code outside the root and for
+functions already seen `first` times, so from then on they run at full
+speed. `resample()` re-arms every function for one more observation; the
+pytest plugin calls it before each test, so a hot function costs at most
+`first` plus one observation per test. On 3.11 a sys.setprofile hook with
+the same rules is the fallback; it also sees generators and coroutines
+being resumed, which are told apart from fresh calls by where the frame
+stands (a fresh call is still at the code's first RESUME).
+
+Whether a file is under the root is decided once per filename. Comprehension
+and generator-expression bodies, and code without parameters (module and
+class bodies), are never recorded.
+"""
+import dis
+import os
+import subprocess
 import sys
-import types
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any, Dict
-from .aggregator import TypeAggregator
+from inspect import CO_ASYNC_GENERATOR, CO_COROUTINE, CO_GENERATOR
+from types import CodeType
+from typing import Dict, List, Optional, Set
+
+from .aggregator import TypeAggregator, _params
 from .emitter import emit_patch
 
+MONITORING = hasattr(sys, "monitoring")
+TOOL_NAME = "type-snapshot"
+_SKIP = -1
+_RESUMABLE = CO_GENERATOR | CO_COROUTINE | CO_ASYNC_GENERATOR
+
+
 class SnapshotTracer:
-    def __init__(self, root: Path):
+    def __init__(self, root: Path, first: int = 32, agg: Optional[TypeAggregator] = None):
         self.root = root
-        self.agg = TypeAggregator()
+        self.first = first
+        self.agg = agg or TypeAggregator()
+        self._prefix = os.path.join(str(Path(root).resolve()), "")
+        self._in_root: Dict[str, bool] = {}
+        self._saturated: Set[CodeType] = set()  # setprofile only; sys.monitoring disables instead
+        self._entries: Dict[CodeType, int] = {}  # setprofile only: f_lasti of a fresh call, or _SKIP
+        self._tool: Optional[int] = None
+
+    def _wanted(self, code: CodeType) -> bool:
+        filename = code.co_filename
+        inside = self._in_root.get(filename)
+        if inside is None:
+            inside = self._in_root[filename] = os.path.abspath(filename).startswith(self._prefix)
+        return inside and not code.co_name.startswith("<") and bool(_params(code))
+
+    def _entry(self, code: CodeType) -> int:
+        entry = self._entries.get(code)
+        if entry is None:
+            if not self._wanted(code):
+                entry = _SKIP
+            else:
+                entry = next(i.offset for i in dis.get_instructions(code) if i.opname == "RESUME")
+            self._entries[code] = entry
+        return entry
+
+    def _on_start(self, code: CodeType, offset: int):
+        if not self._wanted(code):
+            return sys.monitoring.DISABLE
+        if self.agg.observe_frame(code, sys._getframe(1)) >= self.first:
+            return sys.monitoring.DISABLE
 
     def __call__(self, frame, event, arg):
         if event != "call":
             return
-        func = frame.f_globals.get(frame.f_code.co_name)
-        if isinstance(func, types.FunctionType) and str(frame.f_code.co_filename).startswith(str(self.root)):
-            self.agg.observe(func, frame.f_locals)
-        return self
+        code = frame.f_code
+        if code in self._saturated:
+            return
+        entry = self._entry(code)
+        if entry == _SKIP:
+            return
+        if code.co_flags & _RESUMABLE and frame.f_lasti != entry:
+            return  # a generator or coroutine picking up where it left off
+        if self.agg.observe_frame(code, frame) >= self.first:
+            self._saturated.add(code)
+
+    def start(self):
+        if MONITORING:
+            mon = sys.monitoring
+            tool = mon.PROFILER_ID
+            if mon.get_tool(tool) is not None:
+                raise RuntimeError(f"sys.monitoring profiler slot is taken by {mon.get_tool(tool)!r}")
+            mon.use_tool_id(tool, TOOL_NAME)
+            mon.register_callback(tool, mon.events.PY_START, self._on_start)
+            mon.set_events(tool, mon.events.PY_START)
+            self._tool = tool
+        else:
+            threading.setprofile(self)
+            sys.setprofile(self)
+
+    def stop(self):
+        if self._tool is not None:
+            mon = sys.monitoring
+            mon.set_events(self._tool, mon.events.NO_EVENTS)
+            mon.register_callback(self._tool, mon.events.PY_START, None)
+            mon.free_tool_id(self._tool)
+            self._tool = None
+        else:
+            sys.setprofile(None)
+            threading.setprofile(None)
+
+    def resample(self):
+        """Let every function be observed once more."""
+        if self._tool is not None:
+            sys.monitoring.restart_events()
+        else:
+            self._saturated.clear()
 
     def finish(self, out: str):
         hints = self.agg.reduce()
         emit_patch(hints, Path(out))
 
-def run_snapshot(target: str, out: str):
-    root = Path(target).resolve()
-    tracer = SnapshotTracer(root)
-    sys.setprofile(tracer)
-    try:
-        # In real usage the test runner is invoked here
-        pass
-    finally:
-        sys.setprofile(None)
-        tracer.finish(out)
\ No newline at end of file
+
+def _combined_exit(codes: List[int]) -> int:
+    """One exit code for several workers: the first failure, else 0 if any worker ran tests, else 5."""
+    failed = [code for code in codes if code not in (0, 5)]  # 5: no tests collected
+    if failed:
+        return failed[0]
+    return 0 if 0 in codes else 5
+
+
+def _pytest_args(target: str, tests: str, first: int) -> List[str]:
+    return [tests, "-p", "type_snapshot_cli.plugin", "--snapshot-types",
+            f"--snapshot-root={Path(target).resolve()}", f"--snapshot-first={first}"]
+
+
+def run_snapshot(target: str, out: str, tests: str = "tests", workers: int = 1, first: int = 32) -> int:
+    """
+    Run the test suite under the collector and write hints for code under `target`.
+
+    With `workers` > 1, that many pytest processes each run every Nth test
+    and write a shard; the shards are merged into `out`. Returns pytest's
+    exit code (the first failing worker's, if any).
+    """
+    args = _pytest_args(target, tests, first)
+    if workers <= 1:
+        import pytest
+
+        return int(pytest.main(args + [f"--snapshot-out={out}"]))
+
+    with tempfile.TemporaryDirectory(prefix="type-snapshot-") as tmp:
+        procs = [
+            subprocess.Popen([sys.executable, "-m", "pytest", *args, f"--snapshot-worker={i}/{workers}",
+                              f"--snapshot-shard={Path(tmp) / f'{i}.json'}"])
+            for i in range(workers)
+        ]
+        codes = [p.wait() for p in procs]
+        shards = sorted(Path(tmp).glob("*.json"))
+        emit_patch(TypeAggregator().reduce(*shards), Path(out))
+    return _combined_exit(codes)
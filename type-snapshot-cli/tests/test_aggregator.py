@@ -1,3 +1,5 @@
+import pytest
+
 from type_snapshot_cli.aggregator import TypeAggregator
 
 def test_single_type():
@@ -11,4 +13,19 @@ def test_union_type():
     def f(x): pass
     agg.observe(f, {"x": 1})
     agg.observe(f, {"x": "a"})
-    assert "int | str" in agg.reduce()["__main__.f:x"]
\ No newline at end of file
+    assert "int | str" in agg.reduce()["__main__.f:x"]
+
+
+def test_reduce_merges_shards(tmp_path):
+    def f(x): pass
+    worker = TypeAggregator()
+    worker.observe(f, {"x": 1.5})
+    shard = tmp_path / "0.json"
+    worker.write_shard(shard)
+    agg = TypeAggregator()
+    agg.observe(f, {"x": 1})
+    key = f"{f.__module__}.{f.__qualname__}:x"
+    assert agg.reduce(shard)[key] == "float | int"
+    assert agg.reduce(worker.to_shard(), {"version": 1, "types": {key: ["str"]}})[key] == "float | int | str"
+    with pytest.raises(ValueError):
+        agg.reduce({"version": 99, "types": {}})
@@ -8,4 +8,23 @@ def test_end_to_end():
     agg.observe(sample, {"a": 1, "b": 2.0})
     agg.observe(sample, {"a": 3, "b": 4.0})
     hints = agg.reduce()
-    assert len(hints) == 2
\ No newline at end of file
+    assert len(hints) == 2
+
+def test_parallel_workers(tmp_path, monkeypatch):
+    import os
+    from type_snapshot_cli.tracer import run_snapshot
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "mod.py").write_text("def add(a, b):\n    return a + b\n")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_mod.py").write_text(
+        "from pkg.mod import add\n"
+        "def test_int():\n    add(1, 2)\n"
+        "def test_str():\n    add('a', 'b')\n"
+    )
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join([src, str(tmp_path)]))
+    monkeypatch.chdir(tmp_path)
+    out = tmp_path / "hints.patch"
+    assert run_snapshot("pkg", str(out), tests="tests", workers=2) == 0
+    assert "# pkg.mod.add:a: int | str" in out.read_text()
@@ -1,6 +1,64 @@
 from pathlib import Path
-from type_snapshot_cli.tracer import SnapshotTracer
+from type_snapshot_cli.tracer import SnapshotTracer, _combined_exit
 
 def test_tracer_init():
     t = SnapshotTracer(Path("."))
-    assert t.root.exists()
\ No newline at end of file
+    assert t.root.exists()
+
+def _hot(x, *rest, flag=None):
+    return x
+
+
+def test_samples_after_first_calls():
+    t = SnapshotTracer(Path(__file__).parent, first=3)
+    t.start()
+    try:
+        for i in range(10):
+            _hot(i)
+        t.resample()
+        _hot("s", 1, flag=True)
+    finally:
+        t.stop()
+    (fn,) = [f for f in t.agg.functions.values() if f.name.endswith("._hot")]
+    assert fn.calls == 4
+    assert fn.params == ("x", "flag", "rest")
+    hints = t.agg.reduce()
+    assert hints[f"{fn.name}:x"] == "int | str"
+    assert hints[f"{fn.name}:rest"] == "tuple"
+
+
+def test_outside_root_ignored(tmp_path):
+    t = SnapshotTracer(tmp_path)
+    t.start()
+    try:
+        _hot(1)
+    finally:
+        t.stop()
+    assert not t.agg.functions
+
+
+def _gen(n):
+    for i in range(n):
+        yield i
+
+
+def test_resumes_and_comprehensions_not_counted():
+    t = SnapshotTracer(Path(__file__).parent)
+    t.start()
+    try:
+        total = sum(list(_gen(5)))
+        squares = [i * i for i in _gen(3)]
+    finally:
+        t.stop()
+    assert total == 10 and squares == [0, 1, 4]
+    names = [f.name for f in t.agg.functions.values()]
+    assert not [n for n in names if "<" in n]
+    (fn,) = [f for f in t.agg.functions.values() if f.name.endswith("._gen")]
+    assert fn.calls == 2
+
+
+def test_worker_exit_codes_keep_failures():
+    assert _combined_exit([0, 5]) == 0
+    assert _combined_exit([5, 5]) == 5
+    assert _combined_exit([5, 1, 0]) == 1
+    assert _combined_exit([0, 2, 1]) == 2